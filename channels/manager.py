@@ -3,26 +3,70 @@ Channel manager — lifecycle management for all chat platform channels.
 
 Starts/stops channels, routes inbound messages to the agent pipeline,
 and dispatches outbound responses back to the originating channel.
+
+Inbound messages are dispatched per conversation (channel type + chat id +
+thread). Each conversation has its own bounded queue and worker, so
+messages within a conversation are handled strictly in order while
+different conversations run concurrently, up to max_concurrent handlers
+in total. A message arriving on a conversation whose queue is full is
+dropped (and counted) so one stuck conversation never stalls the router.
+Idle conversation workers exit after idle_timeout seconds.
 """
 
 import asyncio
 import logging
+import statistics
+import time
+from collections import deque
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 
 from channels.base import BaseChannel, InboundMessage, OutboundMessage
 
 logger = logging.getLogger("frood.channels.manager")
 
+# Warn when a message waited this long between arrival and dispatch.
+SLOW_DISPATCH_WARN_SECONDS = 30.0
+
+
+def conversation_key(message: InboundMessage) -> str:
+    """Ordering key for a message: channel type, chat id and thread (if any)."""
+    thread = message.metadata.get("thread_ts") or message.metadata.get("thread_id") or ""
+    return f"{message.channel_type}:{message.channel_id}:{thread}"
+
+
+@dataclass
+class _Conversation:
+    """Per-conversation FIFO and the worker task draining it."""
+
+    queue: asyncio.Queue
+    worker: asyncio.Task | None = None
+    last_active: float = field(default_factory=time.monotonic)
+
 
 class ChannelManager:
     """Manages the lifecycle and message routing for all channels."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        conversation_queue_size: int = 100,
+        idle_timeout: float = 300.0,
+    ):
         self._channels: dict[str, BaseChannel] = {}
         self._message_handler: (
             Callable[[InboundMessage], Awaitable[OutboundMessage | None]] | None
         ) = None
         self._running = False
+        self.max_concurrent = max(1, max_concurrent)
+        self.conversation_queue_size = max(1, conversation_queue_size)
+        self.idle_timeout = idle_timeout
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._conversations: dict[str, _Conversation] = {}
+        self._in_flight = 0
+        self._dispatched = 0
+        self._dropped = 0
+        self._dispatch_ages: deque[float] = deque(maxlen=500)
 
     def register(self, channel: BaseChannel):
         """Register a channel for management."""
@@ -50,8 +94,13 @@ class ChannelManager:
             await asyncio.gather(*tasks, return_exceptions=True)
 
     async def stop_all(self):
-        """Stop all registered channels."""
+        """Stop all registered channels and their conversation workers."""
         self._running = False
+        workers = [c.worker for c in self._conversations.values() if c.worker]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._conversations.clear()
         for name, channel in self._channels.items():
             try:
                 await channel.stop()
@@ -68,15 +117,11 @@ class ChannelManager:
         await channel.send(message)
 
     async def _route_messages(self, channel: BaseChannel):
-        """Route inbound messages from a channel to the handler."""
+        """Route inbound messages from a channel to their conversation queues."""
         while self._running:
             try:
                 message = await asyncio.wait_for(channel.receive(), timeout=5.0)
-
-                if self._message_handler:
-                    response = await self._message_handler(message)
-                    if response:
-                        await channel.send(response)
+                await self._dispatch(channel, message)
             except TimeoutError:
                 continue
             except Exception as e:
@@ -85,6 +130,68 @@ class ChannelManager:
                     exc_info=True,
                 )
 
+    async def _dispatch(self, channel: BaseChannel, message: InboundMessage):
+        """Queue a message on its conversation, starting a worker if needed.
+
+        Never blocks: if the conversation's queue is full the message is
+        dropped and counted, so a stuck conversation cannot hold up the
+        router for every other conversation on the channel.
+        """
+        key = conversation_key(message)
+        conv = self._conversations.get(key)
+        if conv is None:
+            conv = _Conversation(queue=asyncio.Queue(maxsize=self.conversation_queue_size))
+            conv.worker = asyncio.create_task(self._conversation_worker(key, conv, channel))
+            self._conversations[key] = conv
+        try:
+            conv.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            logger.warning(
+                f"Dropped message in {key}: conversation queue full "
+                f"({self.conversation_queue_size} pending)"
+            )
+
+    async def _conversation_worker(
+        self, key: str, conv: _Conversation, channel: BaseChannel
+    ) -> None:
+        """Handle one conversation's messages in order; exit once idle."""
+        while True:
+            try:
+                message = await asyncio.wait_for(conv.queue.get(), timeout=self.idle_timeout)
+            except TimeoutError:
+                if conv.queue.empty():
+                    # No await between the check and removal, so no message can
+                    # be queued on this conversation after its worker is gone.
+                    if self._conversations.get(key) is conv:
+                        del self._conversations[key]
+                    return
+                continue
+
+            async with self._slots:
+                self._record_dispatch(key, message)
+                self._in_flight += 1
+                try:
+                    if self._message_handler:
+                        response = await self._message_handler(message)
+                        if response:
+                            await channel.send(response)
+                except Exception as e:
+                    logger.error(
+                        f"Error handling message in {key}: {e}",
+                        exc_info=True,
+                    )
+                finally:
+                    self._in_flight -= 1
+                    conv.last_active = time.monotonic()
+
+    def _record_dispatch(self, key: str, message: InboundMessage) -> None:
+        age = max(0.0, time.time() - message.timestamp)
+        self._dispatched += 1
+        self._dispatch_ages.append(age)
+        if age > SLOW_DISPATCH_WARN_SECONDS:
+            logger.warning(f"Message in {key} waited {age:.1f}s before dispatch")
+
     def list_channels(self) -> list[dict]:
         """List all registered channels and their status."""
         return [
@@ -95,3 +202,19 @@ class ChannelManager:
             }
             for name, channel in self._channels.items()
         ]
+
+    def dispatch_stats(self) -> dict:
+        """Backlog snapshot: conversations, queue depth and message age at dispatch."""
+        ages = sorted(self._dispatch_ages)
+        p95_index = min(len(ages) - 1, int(len(ages) * 0.95)) if ages else 0
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self._in_flight,
+            "conversations": len(self._conversations),
+            "queued": sum(c.queue.qsize() for c in self._conversations.values()),
+            "dispatched": self._dispatched,
+            "dropped": self._dropped,
+            "age_seconds_p50": round(statistics.median(ages), 3) if ages else 0.0,
+            "age_seconds_p95": round(ages[p95_index], 3) if ages else 0.0,
+            "age_seconds_max": round(ages[-1], 3) if ages else 0.0,
+        }
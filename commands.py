@@ -156,3 +156,52 @@ class CliSetupCommandHandler(CommandHandler):
             logger.error("cli-setup %s failed: %s", action, e)
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
+
+
+class RotateSecretCommandHandler(CommandHandler):
+    """Handles the 'rotate-secret' subcommand.
+
+    Re-encrypts every secret stored under JWT_SECRET (admin API keys and
+    GitHub tokens in the data directory) with a new secret. The new secret
+    is read from the environment variable named by ``--new-secret-env`` or
+    prompted for, never taken on the command line. Every store is checked
+    before any file is rewritten.
+    """
+
+    def run(self, args: argparse.Namespace):
+        import getpass
+        import os
+
+        from core.github_accounts import GitHubAccountStore
+        from core.key_store import KeyStore
+
+        old_secret = os.getenv("JWT_SECRET", "")
+        new_secret = os.getenv(args.new_secret_env, "")
+        if not new_secret:
+            new_secret = getpass.getpass("New JWT_SECRET: ")
+            if new_secret != getpass.getpass("Repeat new JWT_SECRET: "):
+                print("Error: secrets do not match", file=sys.stderr)
+                sys.exit(2)
+        if not new_secret or new_secret == old_secret:
+            print("Error: new secret must be non-empty and differ from JWT_SECRET", file=sys.stderr)
+            sys.exit(2)
+
+        data_dir = Path(args.data_dir)
+        stores = {
+            "API keys": KeyStore(data_dir / "settings.json"),
+            "GitHub tokens": GitHubAccountStore(data_dir / "github_accounts.json"),
+        }
+        try:
+            for store in stores.values():
+                store.rotate_secret(old_secret, new_secret, dry_run=True)
+            if args.dry_run:
+                print("Dry run: every stored secret can be rotated")
+                return
+            for label, store in stores.items():
+                count = store.rotate_secret(old_secret, new_secret)
+                print(f"Re-encrypted {count} {label}")
+        except Exception as e:
+            logger.error("Secret rotation failed: %s", e)
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print("Set JWT_SECRET to the new secret in .env and restart (existing sessions end).")
@@ -93,6 +93,13 @@ class Settings:
     # Rate limiting
     login_rate_limit: int = 5  # Max login attempts per minute per IP
     max_websocket_connections: int = 50
+    ws_max_queue: int = 256  # Per-client send queue length before drops
+    ws_max_lag_seconds: float = 15.0  # Disconnect clients lagging further behind
+
+    # Intelligence event stream (dashboard activity feed)
+    intelligence_events_max: int = 200  # Ring buffer capacity
+    intelligence_events_path: str = ""  # JSONL file to survive restarts (empty = memory only)
+    intelligence_events_max_kb: int = 1024  # Compact the file past this size
     tool_rate_limiting_enabled: bool = True
     tool_rate_limit_overrides: str = (
         ""  # JSON: {"shell": {"max_calls": 500, "window_seconds": 3600}}
@@ -139,8 +146,19 @@ class Settings:
     # Tools (Phase 4)
     brave_api_key: str = ""
     mcp_servers_json: str = ""  # Path to MCP servers config file
+    # Pooled MCP client connections — idle servers are stopped after the timeout
+    mcp_pool_idle_timeout: float = 300.0
+    mcp_pool_max_concurrency: int = 4  # In-flight calls per MCP server
     cron_jobs_path: str = "cron_jobs.json"
+    cron_max_concurrent: int = 4  # Cron jobs running at once across all jobs
     custom_tools_dir: str = ""  # Path to directory with custom Tool .py files
+    # python_exec warm worker pool — 0 workers = cold subprocess per snippet
+    python_exec_pool_size: int = 2
+    python_exec_preload: str = (
+        "json,math,re,datetime,collections,itertools,functools,statistics,decimal,random,csv"
+    )
+    python_exec_max_runs: int = 200  # Recycle a worker after this many snippets
+    python_exec_memory_mb: int = 1024  # Address-space limit per snippet (0 = unlimited)
 
     # Dynamic model routing
     model_routing_file: str = "data/dynamic_routing.json"
@@ -209,6 +227,8 @@ class Settings:
     knowledge_chunk_size: int = 500  # Tokens per chunk
     knowledge_chunk_overlap: int = 50  # Overlap tokens between chunks
     knowledge_max_results: int = 10  # Max results per query
+    knowledge_import_workers: int = 4  # Parse processes for imports
+    knowledge_embed_batch_size: int = 64  # Chunks per embedding request
 
     # Vision / image analysis
     vision_max_image_mb: int = 10
@@ -326,6 +346,27 @@ class Settings:
     sidecar_enabled: bool = False
     standalone_mode: bool = False  # Simplified dashboard mode (Claude Code only)
     mcp_tool_allowlist: str = ""  # Comma-separated tool names for /mcp/tool proxy (Phase 28)
+    # Sidecar admission control — 0 = size from CPU count and available memory
+    sidecar_max_workers: int = 0
+    sidecar_max_queue: int = 0  # 0 = 4x max workers
+    sidecar_queue_timeout: float = 120.0  # Seconds a run may wait for a worker slot
+    sidecar_min_free_memory_mb: int = 0  # Shed with 503 below this (0 = disabled)
+    # Sidecar idempotency store — "memory" (per process), "sqlite" or "redis"
+    sidecar_idempotency_backend: str = "memory"
+    sidecar_idempotency_db: str = ".frood/sidecar_runs.db"
+    sidecar_result_ttl: int = 86400  # Seconds a finished run's response is replayed
+
+    # LLM proxy response cache — deterministic (temperature=0) chat and embeddings
+    llm_cache_enabled: bool = False
+    llm_cache_db: str = ".frood/llm_cache.db"
+    llm_cache_ttl: int = 86400  # Seconds
+    llm_cache_max_entries: int = 5000
+    llm_cache_max_mb: int = 256
+
+    # WebFetchTool HTTP cache — honours Cache-Control / ETag / Last-Modified
+    web_cache_enabled: bool = True
+    web_cache_db: str = ".frood/web_cache.db"
+    web_cache_max_mb: int = 128
 
     # N8N Workflow Integration (Phase 42)
     n8n_url: str = ""  # e.g. "http://localhost:5678"
@@ -422,6 +463,11 @@ class Settings:
             approval_log_path=os.getenv("APPROVAL_LOG_PATH", ".frood/approvals.jsonl"),
             login_rate_limit=int(os.getenv("LOGIN_RATE_LIMIT", "5")),
             max_websocket_connections=int(os.getenv("MAX_WEBSOCKET_CONNECTIONS", "50")),
+            ws_max_queue=int(os.getenv("WS_MAX_QUEUE", "256")),
+            ws_max_lag_seconds=float(os.getenv("WS_MAX_LAG_SECONDS", "15")),
+            intelligence_events_max=int(os.getenv("INTELLIGENCE_EVENTS_MAX", "200")),
+            intelligence_events_path=os.getenv("INTELLIGENCE_EVENTS_PATH", ""),
+            intelligence_events_max_kb=int(os.getenv("INTELLIGENCE_EVENTS_MAX_KB", "1024")),
             tool_rate_limiting_enabled=os.getenv("TOOL_RATE_LIMITING_ENABLED", "true").lower()
             in ("true", "1", "yes"),
             tool_rate_limit_overrides=os.getenv("TOOL_RATE_LIMIT_OVERRIDES", ""),
@@ -460,8 +506,18 @@ class Settings:
             # Tools
             brave_api_key=os.getenv("BRAVE_API_KEY", ""),
             mcp_servers_json=os.getenv("MCP_SERVERS_JSON", ""),
+            mcp_pool_idle_timeout=float(os.getenv("MCP_POOL_IDLE_TIMEOUT", "300")),
+            mcp_pool_max_concurrency=int(os.getenv("MCP_POOL_MAX_CONCURRENCY", "4")),
             cron_jobs_path=os.getenv("CRON_JOBS_PATH", "cron_jobs.json"),
+            cron_max_concurrent=int(os.getenv("CRON_MAX_CONCURRENT", "4")),
             custom_tools_dir=os.getenv("CUSTOM_TOOLS_DIR", ""),
+            python_exec_pool_size=int(os.getenv("PYTHON_EXEC_POOL_SIZE", "2")),
+            python_exec_preload=os.getenv(
+                "PYTHON_EXEC_PRELOAD",
+                "json,math,re,datetime,collections,itertools,functools,statistics,decimal,random,csv",
+            ),
+            python_exec_max_runs=int(os.getenv("PYTHON_EXEC_MAX_RUNS", "200")),
+            python_exec_memory_mb=int(os.getenv("PYTHON_EXEC_MEMORY_MB", "1024")),
             # Dynamic model routing
             model_routing_file=os.getenv("MODEL_ROUTING_FILE", "data/dynamic_routing.json"),
             model_catalog_refresh_hours=float(os.getenv("MODEL_CATALOG_REFRESH_HOURS", "24")),
@@ -586,6 +642,8 @@ class Settings:
             knowledge_chunk_size=int(os.getenv("KNOWLEDGE_CHUNK_SIZE", "500")),
             knowledge_chunk_overlap=int(os.getenv("KNOWLEDGE_CHUNK_OVERLAP", "50")),
             knowledge_max_results=int(os.getenv("KNOWLEDGE_MAX_RESULTS", "10")),
+            knowledge_import_workers=int(os.getenv("KNOWLEDGE_IMPORT_WORKERS", "4")),
+            knowledge_embed_batch_size=int(os.getenv("KNOWLEDGE_EMBED_BATCH_SIZE", "64")),
             # Vision / image analysis
             vision_max_image_mb=int(os.getenv("VISION_MAX_IMAGE_MB", "10")),
             vision_model=os.getenv("VISION_MODEL", ""),
@@ -643,6 +701,23 @@ class Settings:
             sidecar_enabled=os.getenv("SIDECAR_ENABLED", "false").lower() in ("true", "1", "yes"),
             standalone_mode=os.getenv("STANDALONE_MODE", "false").lower() in ("true", "1", "yes"),
             mcp_tool_allowlist=os.getenv("MCP_TOOL_ALLOWLIST", ""),
+            sidecar_max_workers=int(os.getenv("SIDECAR_MAX_WORKERS", "0")),
+            sidecar_max_queue=int(os.getenv("SIDECAR_MAX_QUEUE", "0")),
+            sidecar_queue_timeout=float(os.getenv("SIDECAR_QUEUE_TIMEOUT", "120")),
+            sidecar_min_free_memory_mb=int(os.getenv("SIDECAR_MIN_FREE_MEMORY_MB", "0")),
+            sidecar_idempotency_backend=os.getenv("SIDECAR_IDEMPOTENCY_BACKEND", "memory"),
+            sidecar_idempotency_db=os.getenv("SIDECAR_IDEMPOTENCY_DB", ".frood/sidecar_runs.db"),
+            sidecar_result_ttl=int(os.getenv("SIDECAR_RESULT_TTL", "86400")),
+            llm_cache_enabled=os.getenv("LLM_CACHE_ENABLED", "false").lower()
+            in ("true", "1", "yes"),
+            llm_cache_db=os.getenv("LLM_CACHE_DB", ".frood/llm_cache.db"),
+            llm_cache_ttl=int(os.getenv("LLM_CACHE_TTL", "86400")),
+            llm_cache_max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+            llm_cache_max_mb=int(os.getenv("LLM_CACHE_MAX_MB", "256")),
+            web_cache_enabled=os.getenv("WEB_CACHE_ENABLED", "true").lower()
+            in ("true", "1", "yes"),
+            web_cache_db=os.getenv("WEB_CACHE_DB", ".frood/web_cache.db"),
+            web_cache_max_mb=int(os.getenv("WEB_CACHE_MAX_MB", "128")),
             # N8N Workflow Integration (Phase 42)
             n8n_url=os.getenv("N8N_URL", "").rstrip("/"),
             n8n_api_key=os.getenv("N8N_API_KEY", ""),
@@ -811,13 +886,14 @@ class Settings:
         if _key_store_path.exists():
             try:
                 _admin_keys = json.loads(_key_store_path.read_text()).get("api_keys", {})
+                # Decrypt the values before setting in environment
+                from core.encryption import decrypt_values
+                secret = os.getenv("JWT_SECRET", "")
+                _admin_keys = {_k: _v for _k, _v in _admin_keys.items() if _k and _v}
+                if secret:
+                    _admin_keys = decrypt_values(_admin_keys, secret)
                 for _k, _v in _admin_keys.items():
-                    if _k and _v:
-                        # Decrypt the value before setting in environment
-                        from core.encryption import decrypt_value
-                        secret = os.getenv("JWT_SECRET", "")
-                        decrypted_value = decrypt_value(_v, secret) if secret else _v
-                        os.environ[_k] = decrypted_value
+                    os.environ[_k] = _v
             except Exception:
                 pass  # Non-fatal — .env values are used as fallback
 
@@ -8,15 +8,33 @@ dependency via ``python-jose[cryptography]``.
 Stored format: ``fernet:1:<base64-ciphertext>``
 Legacy plaintext values (no prefix) pass through ``decrypt_value()`` unchanged,
 enabling zero-downtime migration — values are encrypted on next persist.
+
+Key derivation is deliberately slow, so the last few derived keys are cached
+in memory per (secret, salt, iterations). Stores holding several values use the batch
+helpers, and ``rotate_values`` moves them to a new secret in one pass.
 """
 
 import base64
 import logging
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
 
 logger = logging.getLogger("frood.encryption")
 
 _PREFIX = "fernet:1:"
+_SALT = b"agent42-fernet-v1"  # static salt is fine — secret is already high-entropy
+_ITERATIONS = 480_000
+
+# Derived Fernet instances keyed by (secret, salt, iterations), least recently
+# used first. Process memory only — never persisted. ``None`` records that
+# ``cryptography`` is missing.
+_KEY_CACHE_SIZE = 4
+_fernets: OrderedDict[tuple[str, bytes, int], object] = OrderedDict()
+_fernets_lock = threading.Lock()
+# One lock per key being derived, so concurrent callers wait for a single
+# derivation of their key without holding up callers of other keys.
+_derive_locks: dict[tuple[str, bytes, int], threading.Lock] = {}
 
 
 def is_encrypted(value: str) -> bool:
@@ -24,13 +42,15 @@ def is_encrypted(value: str) -> bool:
     return value.startswith(_PREFIX)
 
 
-@lru_cache(maxsize=4)
-def _get_fernet(secret: str):
-    """Derive a Fernet instance from *secret* via PBKDF2.
+def _cached_fernet(cache_key: tuple[str, bytes, int]):
+    """Return ``(hit, fernet)`` for *cache_key*; call with ``_fernets_lock`` held."""
+    if cache_key not in _fernets:
+        return False, None
+    _fernets.move_to_end(cache_key)
+    return True, _fernets[cache_key]
 
-    Cached per unique secret so repeated encrypt/decrypt calls are fast.
-    Returns ``None`` if ``cryptography`` is not installed.
-    """
+
+def _derive_fernet(secret: str, salt: bytes, iterations: int):
     try:
         from cryptography.fernet import Fernet
         from cryptography.hazmat.primitives import hashes
@@ -38,15 +58,48 @@ def _get_fernet(secret: str):
     except ImportError:
         logger.warning("cryptography not installed — encryption unavailable")
         return None
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=iterations)
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(secret.encode())))
+
 
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=b"agent42-fernet-v1",  # static salt is fine — secret is already high-entropy
-        iterations=480_000,
-    )
-    key = base64.urlsafe_b64encode(kdf.derive(secret.encode()))
-    return Fernet(key)
+def _get_fernet(secret: str, salt: bytes = _SALT, iterations: int = _ITERATIONS):
+    """Derive a Fernet instance from *secret* via PBKDF2.
+
+    The derivation runs once per (secret, salt, iterations), outside the
+    cache lock; the last few keys stay cached until evicted or dropped by
+    ``clear_key_cache``. Returns ``None`` if ``cryptography`` is not installed.
+    """
+    cache_key = (secret, salt, iterations)
+    with _fernets_lock:
+        hit, fernet = _cached_fernet(cache_key)
+        if hit:
+            return fernet
+        derive_lock = _derive_locks.setdefault(cache_key, threading.Lock())
+    with derive_lock:
+        with _fernets_lock:
+            hit, fernet = _cached_fernet(cache_key)
+            if hit:
+                return fernet
+        fernet = _derive_fernet(secret, salt, iterations)
+        with _fernets_lock:
+            _fernets[cache_key] = fernet
+            while len(_fernets) > _KEY_CACHE_SIZE:
+                _fernets.popitem(last=False)
+            _derive_locks.pop(cache_key, None)
+    return fernet
+
+
+def clear_key_cache(secret: str | None = None):
+    """Forget derived keys — for *secret* only, or all of them.
+
+    Call after rotating the secret so the old key does not linger in memory.
+    """
+    with _fernets_lock:
+        if secret is None:
+            _fernets.clear()
+            return
+        for cache_key in [k for k in _fernets if k[0] == secret]:
+            del _fernets[cache_key]
 
 
 def encrypt_value(plaintext: str, secret: str) -> str:
@@ -85,3 +138,76 @@ def decrypt_value(stored: str, secret: str) -> str:
     except Exception:
         logger.error("Decryption failed — returning raw value")
         return stored
+
+
+def encrypt_values(values: Mapping[str, str], secret: str) -> dict[str, str]:
+    """Encrypt every value in *values* with one key derivation.
+
+    Values that already carry the envelope are kept as they are; with no
+    *secret* or no ``cryptography`` everything is returned unchanged.
+    """
+    fernet = _get_fernet(secret) if secret else None
+    if fernet is None:
+        return dict(values)
+    return {
+        name: value if is_encrypted(value) else _PREFIX + fernet.encrypt(value.encode()).decode()
+        for name, value in values.items()
+    }
+
+
+def decrypt_values(values: Mapping[str, str], secret: str) -> dict[str, str]:
+    """Decrypt every value in *values*; same fallbacks as ``decrypt_value``."""
+    if not any(is_encrypted(v) for v in values.values()):
+        return dict(values)
+    if not secret:
+        logger.warning("Cannot decrypt: no secret provided")
+        return dict(values)
+    fernet = _get_fernet(secret)
+    if fernet is None:
+        logger.warning("Cannot decrypt: cryptography not installed")
+        return dict(values)
+    result = {}
+    for name, value in values.items():
+        if not is_encrypted(value):
+            result[name] = value
+            continue
+        try:
+            result[name] = fernet.decrypt(value[len(_PREFIX) :].encode()).decode()
+        except Exception:
+            logger.error("Decryption of %s failed — returning raw value", name)
+            result[name] = value
+    return result
+
+
+def rotate_values(values: Mapping[str, str], old_secret: str, new_secret: str) -> dict[str, str]:
+    """Re-encrypt *values* from *old_secret* to *new_secret* in one pass.
+
+    Legacy plaintext is encrypted; values already under *new_secret* are
+    re-issued, so an interrupted rotation can simply be run again. Raises
+    ``ValueError`` naming every value neither secret can decrypt, and
+    ``RuntimeError`` if ``cryptography`` is missing — nothing is returned
+    half-rotated.
+    """
+    if not new_secret:
+        raise ValueError("New secret must not be empty")
+    new = _get_fernet(new_secret)
+    old = _get_fernet(old_secret) if old_secret else None
+    if new is None:
+        raise RuntimeError("cryptography not installed — cannot rotate")
+    from cryptography.fernet import MultiFernet
+
+    keys = MultiFernet([new, old] if old is not None else [new])
+    result, failed = {}, []
+    for name, value in values.items():
+        try:
+            if is_encrypted(value):
+                token = keys.rotate(value[len(_PREFIX) :].encode())
+            else:
+                token = new.encrypt(value.encode())
+        except Exception:
+            failed.append(name)
+            continue
+        result[name] = _PREFIX + token.decode()
+    if failed:
+        raise ValueError(f"Cannot decrypt with the current secret: {', '.join(sorted(failed))}")
+    return result
@@ -40,29 +40,27 @@ class GitHubAccountStore:
         if not self._path.exists():
             return
         try:
-            from core.encryption import decrypt_value
+            from core.encryption import decrypt_values
 
-            secret = self._jwt_secret()
             data = json.loads(self._path.read_text())
-            for acct in data.get("accounts", []):
-                if "id" in acct and "token" in acct:
-                    acct["token"] = decrypt_value(acct["token"], secret)
-                    self._accounts[acct["id"]] = acct
+            accounts = [a for a in data.get("accounts", []) if "id" in a and "token" in a]
+            tokens = decrypt_values({a["id"]: a["token"] for a in accounts}, self._jwt_secret())
+            for acct in accounts:
+                acct["token"] = tokens[acct["id"]]
+                self._accounts[acct["id"]] = acct
         except (json.JSONDecodeError, OSError) as e:
             logger.error("Failed to load github accounts: %s", e)
 
     def _persist(self):
-        from core.encryption import encrypt_value
+        from core.encryption import encrypt_values
 
-        secret = self._jwt_secret()
-        self._path.parent.mkdir(parents=True, exist_ok=True)
         # Encrypt tokens before writing
-        accounts_out = []
-        for acct in self._accounts.values():
-            out = dict(acct)
-            if secret:
-                out["token"] = encrypt_value(acct["token"], secret)
-            accounts_out.append(out)
+        tokens = {aid: acct["token"] for aid, acct in self._accounts.items()}
+        tokens = encrypt_values(tokens, self._jwt_secret())
+        self._write([{**acct, "token": tokens[aid]} for aid, acct in self._accounts.items()])
+
+    def _write(self, accounts_out: list[dict]):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
         payload = {"accounts": accounts_out}
         self._path.write_text(json.dumps(payload, indent=2))
         try:
@@ -70,6 +68,26 @@ class GitHubAccountStore:
         except OSError:
             pass
 
+    def rotate_secret(self, old_secret: str, new_secret: str, dry_run: bool = False) -> int:
+        """Re-encrypt stored tokens under *new_secret*; see KeyStore.rotate_secret."""
+        from core.encryption import clear_key_cache, decrypt_values, rotate_values
+
+        with self._lock:
+            if not self._path.exists():
+                return 0
+            accounts = [
+                a
+                for a in json.loads(self._path.read_text()).get("accounts", [])
+                if "id" in a and "token" in a
+            ]
+            tokens = rotate_values({a["id"]: a["token"] for a in accounts}, old_secret, new_secret)
+            if not dry_run:
+                self._write([{**a, "token": tokens[a["id"]]} for a in accounts])
+                plain = decrypt_values(tokens, new_secret)
+                self._accounts = {a["id"]: {**a, "token": plain[a["id"]]} for a in accounts}
+                clear_key_cache(old_secret)
+            return len(tokens)
+
     # -- public API ------------------------------------------------------------
 
     def list_accounts(self) -> list[dict]:
@@ -13,7 +13,7 @@ import stat
 import threading
 from pathlib import Path
 
-from core.encryption import decrypt_value, encrypt_value
+from core.encryption import clear_key_cache, decrypt_values, encrypt_values, rotate_values
 
 logger = logging.getLogger("frood.key_store")
 
@@ -53,33 +53,53 @@ class KeyStore:
     def _jwt_secret() -> str:
         return os.getenv("JWT_SECRET", "")
 
+    def _read_stored(self) -> dict[str, str]:
+        data = json.loads(self._path.read_text())
+        return {
+            k: v
+            for k, v in data.get("api_keys", {}).items()
+            if k in ADMIN_CONFIGURABLE_KEYS and isinstance(v, str) and v
+        }
+
     def _load(self):
         """Load keys from JSON file, decrypting any encrypted values."""
         if not self._path.exists():
             return
         try:
-            secret = self._jwt_secret()
-            data = json.loads(self._path.read_text())
-            self._keys = {
-                k: decrypt_value(v, secret)
-                for k, v in data.get("api_keys", {}).items()
-                if k in ADMIN_CONFIGURABLE_KEYS and isinstance(v, str) and v
-            }
+            self._keys = decrypt_values(self._read_stored(), self._jwt_secret())
         except (json.JSONDecodeError, OSError) as e:
             logger.error("Failed to load key store: %s", e)
 
     def _persist(self):
         """Write keys to JSON file with encryption and restrictive permissions."""
-        secret = self._jwt_secret()
+        self._write(encrypt_values(self._keys, self._jwt_secret()))
+
+    def _write(self, stored: dict[str, str]):
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        # Encrypt values before writing
-        stored = {k: encrypt_value(v, secret) if secret else v for k, v in self._keys.items()}
         self._path.write_text(json.dumps({"api_keys": stored}, indent=2))
         try:
             self._path.chmod(stat.S_IRUSR | stat.S_IWUSR)
         except OSError:
             pass  # chmod may fail on some filesystems
 
+    def rotate_secret(self, old_secret: str, new_secret: str, dry_run: bool = False) -> int:
+        """Re-encrypt the stored keys under *new_secret*; returns how many.
+
+        Works from the file rather than memory, so values that failed to
+        decrypt at load are never re-encrypted as if they were plaintext.
+        Raises ``ValueError`` (and writes nothing) if any value cannot be
+        decrypted with *old_secret*.
+        """
+        with self._lock:
+            if not self._path.exists():
+                return 0
+            stored = rotate_values(self._read_stored(), old_secret, new_secret)
+            if not dry_run:
+                self._write(stored)
+                self._keys = decrypt_values(stored, new_secret)
+                clear_key_cache(old_secret)
+            return len(stored)
+
     # -- public API ------------------------------------------------------------
 
     def inject_into_environ(self):
@@ -0,0 +1,390 @@
+"""Response cache and in-flight coalescing for the OpenAI-compatible LLM proxy.
+
+Agents and ConsolidationRouter send the same deterministic prompt over and
+over. When LLM_CACHE_ENABLED is set, /llm/v1/chat/completions and
+/llm/v1/embeddings look up a canonical hash of the request before going
+upstream:
+
+- hit        — stored response returned (streaming clients get the stored
+               SSE chunks replayed, or chunks synthesized from the stored
+               completion)
+- coalesced  — an identical request is already in flight; wait for it and
+               share its response instead of issuing a second upstream call
+- miss       — go upstream, then store the response
+
+Only deterministic requests are cached: chat completions with an explicit
+temperature of 0 and a single choice, and every embeddings request. Entries
+live in a WAL-mode SQLite file with a TTL and entry-count / byte-size caps
+(least-recently-hit entries are evicted first).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from core.llm_streaming import SSE_DONE, ChatStreamAccumulator
+from core.sqlite_db import open_db
+from core.tiered_routing_bridge import model_price
+
+logger = logging.getLogger("frood.llm_cache")
+
+# Request fields that change the upstream answer. Everything else (stream,
+# user, metadata, stream_options) is ignored when hashing.
+_CHAT_KEY_FIELDS = (
+    "model",
+    "messages",
+    "tools",
+    "tool_choice",
+    "parallel_tool_calls",
+    "response_format",
+    "temperature",
+    "top_p",
+    "max_tokens",
+    "max_completion_tokens",
+    "stop",
+    "seed",
+    "presence_penalty",
+    "frequency_penalty",
+    "logit_bias",
+    "n",
+)
+_EMBED_KEY_FIELDS = ("model", "input", "encoding_format", "dimensions")
+
+
+def cache_key(kind: str, body: dict[str, Any]) -> str:
+    """Return a canonical SHA-256 key for a proxy request.
+
+    kind namespaces the entry ("chat", "chat-tools", "embeddings") so
+    responses stored in different shapes never collide.
+    """
+    fields = _EMBED_KEY_FIELDS if kind == "embeddings" else _CHAT_KEY_FIELDS
+    canonical = {k: body[k] for k in fields if body.get(k) is not None}
+    blob = json.dumps([kind, canonical], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def is_cacheable(kind: str, body: dict[str, Any]) -> bool:
+    """Whether a request is deterministic enough to be served from cache."""
+    if kind == "embeddings":
+        return True
+    temperature = body.get("temperature")
+    if temperature is None:
+        return False
+    try:
+        return float(temperature) == 0.0 and int(body.get("n") or 1) == 1
+    except (TypeError, ValueError):
+        return False
+
+
+def estimate_cost_usd(usage: dict[str, Any], model: str = "") -> float:
+    """Estimate the upstream cost of a response from its usage block and model pricing."""
+    prompt_price, completion_price = model_price(model)
+    prompt = usage.get("prompt_tokens", 0) or 0
+    completion = usage.get("completion_tokens", 0) or 0
+    return prompt * prompt_price + completion * completion_price
+
+
+def completion_to_sse(completion: dict[str, Any]) -> list[str]:
+    """Render a stored chat.completion as chat.completion.chunk SSE frames."""
+    choice = (completion.get("choices") or [{}])[0]
+    message = choice.get("message") or {}
+    base = {
+        "id": completion.get("id", "chatcmpl-cache"),
+        "object": "chat.completion.chunk",
+        "created": completion.get("created", int(time.time())),
+        "model": completion.get("model", ""),
+    }
+
+    def _frame(delta: dict[str, Any], finish_reason: str | None = None, **extra) -> str:
+        chunk = {
+            **base,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            **extra,
+        }
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    frames = [_frame({"role": "assistant", "content": ""})]
+    if message.get("content"):
+        frames.append(_frame({"content": message["content"]}))
+    if message.get("tool_calls"):
+        frames.append(
+            _frame(
+                {"tool_calls": [{**tc, "index": i} for i, tc in enumerate(message["tool_calls"])]}
+            )
+        )
+    frames.append(
+        _frame({}, choice.get("finish_reason") or "stop", usage=completion.get("usage") or {})
+    )
+    frames.append("data: [DONE]\n\n")
+    return frames
+
+
+@dataclass
+class CachedResponse:
+    """A stored proxy response.
+
+    payload is the JSON body a non-streaming client receives; chunks, when
+    present, are the raw SSE frames a streaming client received. Its "model"
+    field prices the saving on a hit.
+    """
+
+    payload: dict[str, Any]
+    chunks: list[str] | None = None
+    usage: dict[str, Any] = field(default_factory=dict)
+
+
+def cached_from_sse(stream_text: str) -> "CachedResponse | None":
+    """Build a cache entry from a recorded upstream SSE stream.
+
+    Returns None for streams that errored or ended before [DONE] — a
+    truncated answer must never be replayed.
+    """
+    acc = ChatStreamAccumulator()
+    meta: dict[str, Any] = {}
+    done = False
+    for line in stream_text.splitlines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == SSE_DONE:
+            done = True
+            break
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(chunk, dict):
+            for k in ("id", "created", "model"):
+                if chunk.get(k) and k not in meta:
+                    meta[k] = chunk[k]
+            acc.feed(chunk)
+    if not done or acc.error is not None:
+        return None
+    completion = {**meta, "object": "chat.completion", **acc.as_completion()}
+    return CachedResponse(payload=completion, chunks=[stream_text], usage=acc.usage)
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL, size caps and request coalescing."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        ttl: float = 86400,
+        max_entries: int = 5000,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = open_db(
+            self._db_path,
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                chunks TEXT,
+                usage TEXT,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_hit REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_last_hit ON llm_cache(last_hit);
+            """,
+            timeout=5.0,
+        )
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "evictions": 0,
+            "tokens_saved": 0,
+            "saved_cost_usd": 0.0,
+        }
+
+    # -- Storage (sync, run in a worker thread) -------------------------------
+
+    def _get_sync(self, key: str) -> CachedResponse | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, chunks, usage FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_hit = ? WHERE key = ?", (now, key))
+        payload, chunks, usage = row
+        return CachedResponse(
+            payload=json.loads(payload),
+            chunks=json.loads(chunks) if chunks else None,
+            usage=json.loads(usage) if usage else {},
+        )
+
+    def _put_sync(self, key: str, response: CachedResponse) -> int:
+        """Store response; returns how many entries were evicted to make room."""
+        payload = json.dumps(response.payload, default=str)
+        chunks = json.dumps(response.chunks) if response.chunks else None
+        size = len(payload) + (len(chunks) if chunks else 0)
+        if size > self.max_bytes:
+            return 0
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, payload, chunks, usage, size, expires_at, last_hit) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, payload, chunks, json.dumps(response.usage), size, now + self.ttl, now),
+            )
+            return self._evict_locked(now)
+
+    def _evict_locked(self, now: float) -> int:
+        evicted = self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            # Drop least-recently-hit entries until both caps are satisfied.
+            rows = self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_hit ASC"
+            ).fetchall()
+            doomed = []
+            for key, size in rows:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                doomed.append((key,))
+                count -= 1
+                total -= size
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+            evicted += len(doomed)
+        return evicted
+
+    # -- Async API ------------------------------------------------------------
+
+    async def get(self, key: str) -> CachedResponse | None:
+        """Return a live entry and count it as a hit, or None (a miss)."""
+        try:
+            entry = await asyncio.to_thread(self._get_sync, key)
+        except Exception as e:
+            logger.warning("LLM cache read failed (non-critical): %s", e)
+            entry = None
+        if entry is None:
+            self._stats["misses"] += 1
+        else:
+            self._record_saving("hits", entry)
+        return entry
+
+    async def put(self, key: str, response: CachedResponse) -> None:
+        """Store a response. Never raises."""
+        # Counters are only touched on the event loop, never in the worker.
+        try:
+            evicted = await asyncio.to_thread(self._put_sync, key, response)
+            self._stats["stores"] += 1
+            self._stats["evictions"] += evicted
+        except Exception as e:
+            logger.warning("LLM cache write failed (non-critical): %s", e)
+
+    def join(self, key: str) -> asyncio.Future | None:
+        """Join an identical in-flight request, or register the caller as its leader.
+
+        Returns the leader's future for followers, or None when the caller is
+        now the leader and must call finish() exactly once.
+        """
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return fut
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        return None
+
+    async def finish(self, key: str, response: CachedResponse | None) -> None:
+        """Release followers waiting on key and store response (None = not cacheable)."""
+        fut = self._inflight.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.set_result(response)
+        if response is not None:
+            await self.put(key, response)
+
+    def release(self, key: str) -> None:
+        """Release followers without a response when the leader gave up before fetching.
+
+        They fall back to fetching on their own instead of waiting out their
+        timeout.
+        """
+        fut = self._inflight.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.set_result(None)
+
+    async def wait(self, fut: asyncio.Future, timeout: float = 300.0) -> CachedResponse | None:
+        """Await a leader's response as a follower. None means fetch it yourself."""
+        try:
+            response = await asyncio.wait_for(asyncio.shield(fut), timeout=timeout)
+        except TimeoutError:
+            return None
+        if response is not None:
+            self._record_saving("coalesced", response)
+        return response
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[CachedResponse | None]],
+    ) -> tuple[CachedResponse | None, str]:
+        """Serve from cache, share an in-flight call, or run fetch() once.
+
+        Returns (response, source) with source "hit", "coalesced" or "miss".
+        fetch() returns None for responses that must not be cached (errors);
+        followers then fall back to fetching on their own.
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached, "hit"
+        fut = self.join(key)
+        if fut is not None:
+            shared = await self.wait(fut)
+            if shared is not None:
+                return shared, "coalesced"
+            return await fetch(), "miss"
+        response = None
+        try:
+            response = await fetch()
+        finally:
+            await self.finish(key, response)
+        return response, "miss"
+
+    # -- Observability --------------------------------------------------------
+
+    def _record_saving(self, counter: str, response: CachedResponse) -> None:
+        self._stats[counter] += 1
+        usage = response.usage or {}
+        self._stats["tokens_saved"] += (usage.get("prompt_tokens", 0) or 0) + (
+            usage.get("completion_tokens", 0) or 0
+        )
+        self._stats["saved_cost_usd"] += estimate_cost_usd(
+            usage, str(response.payload.get("model") or "")
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for /api/stats/tokens and /api/reports."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "saved_cost_usd": round(self._stats["saved_cost_usd"], 6),
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            "inflight": len(self._inflight),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
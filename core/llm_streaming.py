@@ -0,0 +1,144 @@
+"""Shared upstream streaming helpers for OpenAI-compatible chat completions.
+
+Used by the dashboard LLM proxy (/llm/v1/chat/completions passthrough) and by
+the sidecar orchestrator's streaming execute path, so both open upstream
+streams the same way and agree on how SSE chunks are decoded.
+
+- open_chat_stream()       — POST with stream semantics, yields the httpx response
+- iter_sse_json()          — decode `data:` frames into dicts, stop at [DONE]
+- ChatStreamAccumulator    — fold chunk deltas back into a non-streaming response
+"""
+
+import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger("frood.llm_streaming")
+
+SSE_DONE = "[DONE]"
+
+
+@asynccontextmanager
+async def open_chat_stream(
+    client: httpx.AsyncClient,
+    url: str,
+    api_key: str,
+    body: dict[str, Any],
+) -> AsyncIterator[httpx.Response]:
+    """Open a streaming chat-completion request against an OpenAI-compatible upstream.
+
+    The caller owns status handling: a non-2xx response is yielded unread so the
+    proxy can surface the upstream error text and the orchestrator can honour
+    Retry-After on 429s.
+    """
+    async with client.stream(
+        "POST",
+        url,
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        },
+        json={**body, "stream": True},
+    ) as resp:
+        yield resp
+
+
+async def iter_sse_json(resp: httpx.Response) -> AsyncIterator[dict[str, Any]]:
+    """Yield each JSON payload from an SSE stream until the [DONE] sentinel.
+
+    Comment lines (`: keep-alive`), `event:` lines and undecodable frames are
+    skipped — some providers interleave heartbeats with data frames.
+    """
+    async for line in resp.aiter_lines():
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == SSE_DONE:
+            return
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            logger.debug("Skipping undecodable SSE frame: %s", data[:200])
+            continue
+        if isinstance(chunk, dict):
+            yield chunk
+
+
+class ChatStreamAccumulator:
+    """Rebuild a chat.completion response from chat.completion.chunk deltas.
+
+    feed() returns the text delta carried by a chunk (content, or
+    reasoning_content for reasoning models) so callers can forward tokens as
+    they arrive. as_completion() returns the same shape a non-streaming call
+    would have produced: {"choices": [{"message": ..., "finish_reason": ...}],
+    "usage": {...}}.
+    """
+
+    def __init__(self) -> None:
+        self.content: list[str] = []
+        self.reasoning: list[str] = []
+        self.tool_calls: dict[int, dict[str, Any]] = {}
+        self.finish_reason: str = ""
+        self.usage: dict[str, Any] = {}
+        self.error: Any = None
+
+    def feed(self, chunk: dict[str, Any]) -> str:
+        """Merge one chunk into the accumulated message. Returns its text delta."""
+        if chunk.get("error"):
+            self.error = chunk["error"]
+            return ""
+        if chunk.get("usage"):
+            self.usage = chunk["usage"]
+
+        choices = chunk.get("choices") or []
+        if not choices:
+            return ""
+        choice = choices[0]
+        if choice.get("finish_reason"):
+            self.finish_reason = choice["finish_reason"]
+
+        delta = choice.get("delta") or {}
+        for tc in delta.get("tool_calls") or []:
+            slot = self.tool_calls.setdefault(
+                tc.get("index", len(self.tool_calls)),
+                {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if tc.get("id"):
+                slot["id"] = tc["id"]
+            fn = tc.get("function") or {}
+            if fn.get("name"):
+                slot["function"]["name"] += fn["name"]
+            if fn.get("arguments"):
+                slot["function"]["arguments"] += fn["arguments"]
+
+        text = delta.get("content") or ""
+        if text:
+            self.content.append(text)
+            return text
+        reasoning = delta.get("reasoning_content") or delta.get("reasoning") or ""
+        if reasoning:
+            self.reasoning.append(reasoning)
+        return ""
+
+    def as_completion(self) -> dict[str, Any]:
+        """Return the accumulated stream as a non-streaming completion dict."""
+        message: dict[str, Any] = {
+            "role": "assistant",
+            "content": "".join(self.content) or None,
+        }
+        if self.reasoning:
+            message["reasoning_content"] = "".join(self.reasoning)
+        if self.tool_calls:
+            message["tool_calls"] = [self.tool_calls[i] for i in sorted(self.tool_calls)]
+        completion: dict[str, Any] = {
+            "choices": [{"index": 0, "message": message, "finish_reason": self.finish_reason}],
+            "usage": self.usage,
+        }
+        if self.error is not None:
+            completion["error"] = self.error
+        return completion
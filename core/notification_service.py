@@ -87,9 +87,9 @@ class NotificationService:
         for url in self._webhook_urls:
             # SSRF protection on webhook URLs
             try:
-                from core.url_policy import _is_ssrf_target
+                from core.url_policy import is_ssrf_target_async
 
-                ssrf = _is_ssrf_target(url)
+                ssrf = await is_ssrf_target_async(url)
                 if ssrf:
                     logger.warning(f"Webhook URL blocked by SSRF: {url} — {ssrf}")
                     continue
@@ -7,6 +7,10 @@ then creates or updates GitHub issues with findings via the gh CLI.
 Uses existing tools:
 - tools.security_audit.run_audit() — configuration posture (36 checks)
 - tools.security_analyzer.SecurityAnalyzerTool — secrets, dependencies, OWASP scans
+
+Workspace scans are incremental (the analyzer caches per-file results by
+content hash), and every finding is fingerprinted so GitHub issues and
+notifications only carry findings that were not present in the last scan.
 """
 
 import asyncio
@@ -44,6 +48,15 @@ class ScheduledSecurityScanner:
         self._notification_service = notification_service
         self._memory_store = memory_store
         self._running = False
+        self._analyzer = None
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from tools.security_analyzer import SecurityAnalyzerTool
+
+            self._analyzer = SecurityAnalyzerTool(self._workspace)
+        return self._analyzer
 
     async def start(self):
         """Background loop: startup delay, then scan at interval."""
@@ -84,19 +97,23 @@ class ScheduledSecurityScanner:
             - findings: list of {severity, category, description, detail}
             - counts: {critical, high, medium, low} finding counts
             - overall_severity: highest severity found
+            - new_findings: findings not present in the previous scan
+            - new_counts: severity counts for new_findings
         """
         logger.info("Starting security scan...")
-        findings = []
+        # Findings per scanner, for the scanners that ran to completion
+        completed: dict[str, list[dict]] = {}
 
         # 1. Configuration audit (tools/security_audit.py)
         try:
             from tools.security_audit import run_audit
 
             audit_report = run_audit()
+            config = []
             for check in audit_report.checks:
                 severity = _AUDIT_STATUS_SEVERITY.get(check.status, "none")
                 if _SEVERITY_ORDER.get(severity, 4) <= _SEVERITY_ORDER.get(self._min_severity, 2):
-                    findings.append(
+                    config.append(
                         {
                             "severity": severity,
                             "category": f"Config: {check.category}",
@@ -104,45 +121,49 @@ class ScheduledSecurityScanner:
                             "detail": check.detail,
                         }
                     )
+            completed["config"] = config
         except Exception as e:
             logger.error(f"Config audit failed: {e}")
 
-        # 2. Secrets scan (tools/security_analyzer.py)
+        # 2. Secrets scan (tools/security_analyzer.py) — incremental, off the event loop
         try:
-            from tools.security_analyzer import SecurityAnalyzerTool
-
-            analyzer = SecurityAnalyzerTool(self._workspace)
-            result = analyzer._scan_secrets()
-            findings.extend(self._parse_analyzer_output(result.output, "Secrets"))
+            secrets = await asyncio.to_thread(self.analyzer.scan_workspace, "secrets")
+            completed["secrets"] = self._structured_findings(secrets, "Secrets")
         except Exception as e:
             logger.error(f"Secrets scan failed: {e}")
 
         # 3. Dependency scan
         try:
-            from tools.security_analyzer import SecurityAnalyzerTool
-
-            analyzer = SecurityAnalyzerTool(self._workspace)
-            result = analyzer._scan_dependencies()
-            findings.extend(self._parse_analyzer_output(result.output, "Dependencies"))
+            result = self.analyzer._scan_dependencies()
+            completed["dependencies"] = self._parse_analyzer_output(result.output, "Dependencies")
         except Exception as e:
             logger.error(f"Dependency scan failed: {e}")
 
         # 4. OWASP scan
         try:
-            from tools.security_analyzer import SecurityAnalyzerTool
-
-            analyzer = SecurityAnalyzerTool(self._workspace)
-            result = analyzer._scan_owasp()
-            findings.extend(self._parse_analyzer_output(result.output, "OWASP"))
+            owasp = await asyncio.to_thread(self.analyzer.scan_workspace, "owasp")
+            completed["owasp"] = self._structured_findings(owasp, "OWASP")
         except Exception as e:
             logger.error(f"OWASP scan failed: {e}")
 
-        # Count findings by severity
-        counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        for f in findings:
-            sev = f["severity"]
-            if sev in counts:
-                counts[sev] += 1
+        findings = [f for scanner_findings in completed.values() for f in scanner_findings]
+        counts = self._count(findings)
+
+        # 5. Diff each scanner against its previous run. A scanner that failed
+        # this time is not recorded, so its known findings are kept rather
+        # than forgotten and re-reported as new once it recovers.
+        new_findings = findings
+        try:
+            from tools.security_analyzer import finding_fingerprint
+
+            new_findings = []
+            for scanner, scanner_findings in completed.items():
+                fingerprints = [finding_fingerprint(f["category"], f) for f in scanner_findings]
+                new = self.analyzer.cache.record_findings(f"scheduled:{scanner}", fingerprints)
+                new_findings.extend(f for f, fp in zip(scanner_findings, fingerprints) if fp in new)
+        except Exception as e:
+            logger.error(f"Could not diff findings against previous scan: {e}")
+            new_findings = findings
 
         # Determine overall severity
         overall = "none"
@@ -157,15 +178,40 @@ class ScheduledSecurityScanner:
             "counts": counts,
             "overall_severity": overall,
             "total": len(findings),
+            "new_findings": new_findings,
+            "new_counts": self._count(new_findings),
         }
 
         logger.info(
-            f"Security scan complete: {report['total']} findings "
+            f"Security scan complete: {report['total']} findings, {len(new_findings)} new "
             f"(critical={counts['critical']}, high={counts['high']}, "
             f"medium={counts['medium']}, low={counts['low']})"
         )
         return report
 
+    @staticmethod
+    def _count(findings: list[dict]) -> dict[str, int]:
+        counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+        for f in findings:
+            sev = f["severity"]
+            if sev in counts:
+                counts[sev] += 1
+        return counts
+
+    def _structured_findings(self, raw: list[dict], category: str) -> list[dict]:
+        """Convert analyzer findings to report findings, applying min_severity."""
+        threshold = _SEVERITY_ORDER.get(self._min_severity, 2)
+        return [
+            {
+                "severity": f["risk"],
+                "category": category,
+                "description": f["description"],
+                "detail": f.get("context", ""),
+            }
+            for f in raw
+            if _SEVERITY_ORDER.get(f["risk"], 4) <= threshold
+        ]
+
     def _parse_analyzer_output(self, output: str, category: str) -> list[dict]:
         """Parse SecurityAnalyzerTool output into structured findings.
 
@@ -224,6 +270,10 @@ class ScheduledSecurityScanner:
                 logger.info(f"Closed security scan issue #{existing} (clean scan)")
             return
 
+        if "new_findings" in report and not report["new_findings"]:
+            logger.info("Security scan found no new findings — issue left unchanged")
+            return
+
         body = self._format_report_body(report)
         title = (
             f"[Security Scan] {report['overall_severity'].upper()} — "
@@ -257,7 +307,12 @@ class ScheduledSecurityScanner:
             "",
         ]
 
-        # Group findings by category
+        # Group findings by category, marking those new since the last scan
+        new_ids = {id(f) for f in report.get("new_findings", report["findings"])}
+        mark_new = len(new_ids) != len(report["findings"])
+        if mark_new:
+            lines.append(f"**New since last scan:** {len(new_ids)}")
+            lines.append("")
         by_category: dict[str, list[dict]] = {}
         for f in report["findings"]:
             by_category.setdefault(f["category"], []).append(f)
@@ -266,7 +321,8 @@ class ScheduledSecurityScanner:
             lines.append(f"### {cat}")
             for f in cat_findings:
                 severity_badge = f"**[{f['severity'].upper()}]**"
-                lines.append(f"- {severity_badge} {f['description']}")
+                new_badge = " **NEW**" if mark_new and id(f) in new_ids else ""
+                lines.append(f"- {severity_badge}{new_badge} {f['description']}")
                 if f["detail"]:
                     lines.append(f"  - `{f['detail']}`")
             lines.append("")
@@ -401,7 +457,8 @@ class ScheduledSecurityScanner:
         """Send webhook notification for critical/high findings."""
         if not self._notification_service:
             return
-        if report["counts"]["critical"] == 0 and report["counts"]["high"] == 0:
+        counts = report.get("new_counts", report["counts"])
+        if counts["critical"] == 0 and counts["high"] == 0:
             return
 
         try:
@@ -0,0 +1,279 @@
+"""Sidecar admission control — bounded worker slots in front of the orchestrator.
+
+A burst of Paperclip wakeups used to start one run per request with no global
+cap (AgentManager tier semaphores only bound runs per tier). Each run holds a
+conversation, HTTP connections and tool subprocesses, so hundreds of them at
+once thrash the box.
+
+AdmissionController hands out a fixed number of worker slots. Requests that
+cannot start immediately wait in a bounded priority queue ordered by
+(tier rank, deadline, arrival). When the queue is full the request is shed
+with 429; when it would miss its deadline or the host is low on memory it is
+shed with 503. Both carry a Retry-After estimate.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import statistics
+import sys
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("frood.sidecar.admission")
+
+# Lower rank is served first. Unknown / provisional tiers share the last slot.
+TIER_PRIORITY: dict[str, int] = {"gold": 0, "silver": 1, "bronze": 2}
+_DEFAULT_TIER_RANK = 3
+
+# Rough resident footprint of one run (conversation, httpx pools, tool
+# subprocesses). Used only to derive the default worker count.
+RUN_MEMORY_ESTIMATE_MB = 256
+
+
+class AdmissionRejected(Exception):
+    """Raised when a run is shed instead of admitted.
+
+    status_code is 429 (queue full) or 503 (deadline / memory pressure);
+    retry_after is the suggested Retry-After in whole seconds.
+    """
+
+    def __init__(self, reason: str, status_code: int, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _available_memory_mb() -> float:
+    """Return available system memory in MB, or 0.0 when it cannot be read."""
+    try:
+        if sys.platform == "win32":
+            return 0.0
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return 0.0
+
+
+def default_worker_count() -> int:
+    """Size the worker pool from CPU count and available memory.
+
+    Runs are mostly I/O-bound (LLM calls), so two per core — capped by how
+    many RUN_MEMORY_ESTIMATE_MB footprints fit in half the free memory.
+    """
+    by_cpu = (os.cpu_count() or 1) * 2
+    mem_mb = _available_memory_mb()
+    if mem_mb <= 0:
+        return max(1, by_cpu)
+    by_mem = int((mem_mb * 0.5) // RUN_MEMORY_ESTIMATE_MB)
+    return max(1, min(by_cpu, by_mem))
+
+
+@dataclass(order=True)
+class _Waiter:
+    """A queued admission request. Ordered by (rank, deadline, seq)."""
+
+    rank: int
+    deadline: float
+    seq: int
+    run_id: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    """Bounded worker slots plus a bounded priority wait queue.
+
+    Usage::
+
+        async with controller.admit(run_id, tier="gold", deadline=time.time() + 60):
+            await orchestrator.execute_sync(run_id, ctx)
+
+    Streaming callers that outlive the route handler use acquire()/release()
+    directly.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        max_queue: int = 0,
+        queue_timeout: float = 120.0,
+        min_free_memory_mb: int = 0,
+    ):
+        self.max_workers = max_workers if max_workers > 0 else default_worker_count()
+        self.max_queue = max_queue if max_queue > 0 else self.max_workers * 4
+        self.queue_timeout = queue_timeout
+        self.min_free_memory_mb = min_free_memory_mb
+
+        self._active = 0
+        self._heap: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._admitted = 0
+        self._rejected: dict[int, int] = {429: 0, 503: 0}
+        self._queue_wait_ms: deque[float] = deque(maxlen=500)
+        self._run_seconds: deque[float] = deque(maxlen=100)
+        self._started_at: dict[str, float] = {}
+
+    # -- Admission -----------------------------------------------------------
+
+    async def acquire(self, run_id: str, tier: str = "", deadline: float | None = None) -> None:
+        """Wait for a worker slot or raise AdmissionRejected.
+
+        deadline is a wall-clock epoch timestamp; requests still queued when it
+        passes are shed with 503. Defaults to now + queue_timeout.
+        """
+        now = time.time()
+        if deadline is None:
+            deadline = now + self.queue_timeout
+
+        if self.min_free_memory_mb > 0:
+            free_mb = _available_memory_mb()
+            if 0 < free_mb < self.min_free_memory_mb:
+                self._reject(
+                    run_id,
+                    503,
+                    f"Host under memory pressure ({free_mb:.0f}MB free)",
+                )
+
+        if self._active < self.max_workers and not self._heap:
+            self._grant(run_id, waited_ms=0.0)
+            return
+
+        if len(self._heap) >= self.max_queue:
+            self._reject(run_id, 429, f"Admission queue full ({self.max_queue} waiting)")
+
+        if deadline <= now:
+            self._reject(run_id, 503, "Deadline already passed")
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            rank=TIER_PRIORITY.get(tier, _DEFAULT_TIER_RANK),
+            deadline=deadline,
+            seq=next(self._seq),
+            run_id=run_id,
+            enqueued_at=time.monotonic(),
+            future=loop.create_future(),
+        )
+        heapq.heappush(self._heap, waiter)
+        logger.info(
+            "Run %s queued for admission (tier=%s, depth=%d, active=%d/%d)",
+            run_id,
+            tier or "-",
+            len(self._heap),
+            self._active,
+            self.max_workers,
+        )
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=deadline - now)
+        except TimeoutError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot granted in the same tick the deadline fired — keep it.
+                return
+            waiter.future.cancel()
+            self._discard(waiter)
+            self._reject(run_id, 503, "Deadline expired while queued")
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was handed to us but the caller went away — pass it on.
+                self.release(run_id)
+            else:
+                waiter.future.cancel()
+                self._discard(waiter)
+            raise
+
+    def release(self, run_id: str) -> None:
+        """Return a worker slot and hand it to the highest-priority waiter.
+
+        Idempotent per run_id — releasing a run that holds no slot is a no-op.
+        """
+        started = self._started_at.pop(run_id, None)
+        if started is None:
+            return
+        self._run_seconds.append(time.monotonic() - started)
+        self._active -= 1
+
+        while self._heap and self._active < self.max_workers:
+            waiter = heapq.heappop(self._heap)
+            if waiter.future.done():
+                continue  # cancelled / timed out while queued
+            self._grant(
+                waiter.run_id,
+                waited_ms=(time.monotonic() - waiter.enqueued_at) * 1000,
+            )
+            waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def admit(self, run_id: str, tier: str = "", deadline: float | None = None):
+        """Context-managed acquire()/release()."""
+        await self.acquire(run_id, tier=tier, deadline=deadline)
+        try:
+            yield
+        finally:
+            self.release(run_id)
+
+    # -- Internals -----------------------------------------------------------
+
+    def _grant(self, run_id: str, waited_ms: float) -> None:
+        self._active += 1
+        self._admitted += 1
+        self._queue_wait_ms.append(waited_ms)
+        self._started_at[run_id] = time.monotonic()
+        if waited_ms:
+            logger.info("Run %s admitted after %.0fms in queue", run_id, waited_ms)
+
+    def _discard(self, waiter: _Waiter) -> None:
+        try:
+            self._heap.remove(waiter)
+            heapq.heapify(self._heap)
+        except ValueError:
+            pass
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a queued request would be admitted."""
+        avg_run = statistics.mean(self._run_seconds) if self._run_seconds else 30.0
+        backlog = len(self._heap) + 1
+        return max(1, int(avg_run * backlog / max(1, self.max_workers)))
+
+    def _reject(self, run_id: str, status_code: int, reason: str) -> None:
+        self._rejected[status_code] = self._rejected.get(status_code, 0) + 1
+        retry_after = self._retry_after()
+        logger.warning(
+            "Run %s shed with %d: %s (retry after %ds)", run_id, status_code, reason, retry_after
+        )
+        raise AdmissionRejected(reason, status_code, retry_after)
+
+    # -- Observability -------------------------------------------------------
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._heap)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot for /sidecar/health."""
+        waits = sorted(self._queue_wait_ms)
+        p95_index = min(len(waits) - 1, int(len(waits) * 0.95)) if waits else 0
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queue_depth": len(self._heap),
+            "admitted": self._admitted,
+            "rejected_429": self._rejected.get(429, 0),
+            "rejected_503": self._rejected.get(503, 0),
+            "queue_wait_ms_p50": round(statistics.median(waits), 1) if waits else 0.0,
+            "queue_wait_ms_p95": round(waits[p95_index], 1) if waits else 0.0,
+        }
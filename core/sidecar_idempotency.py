@@ -0,0 +1,326 @@
+"""Sidecar idempotency store — durable claim-or-get for Paperclip run keys.
+
+Paperclip may deliver the same heartbeat more than once. The first delivery
+claims the run key; later deliveries see either the in-flight claim or, once
+the run has finished, its stored outcome so the retry can be answered
+without re-executing.
+
+Backends (SIDECAR_IDEMPOTENCY_BACKEND):
+- memory  — per-process dict; the historical behaviour, fine for one worker
+- sqlite  — WAL-mode file shared by every worker on the host
+- redis   — SET NX with native TTLs, shared across hosts (needs REDIS_URL)
+
+All backends expire claims after a TTL so a crashed worker never pins a run
+key forever. Expiry checks are done on read; bulk pruning is amortized.
+"""
+
+import heapq
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from core.sqlite_db import open_db
+
+logger = logging.getLogger("frood.sidecar.idempotency")
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+RUN_STATUS_RUNNING = "running"
+RUN_STATUS_COMPLETED = "completed"
+
+# Bulk-prune at most this often; individual lookups already ignore expired rows.
+PRUNE_INTERVAL_SECONDS = 60.0
+
+
+@dataclass
+class RunClaim:
+    """Outcome of claim(): whether this caller owns the run, and its state."""
+
+    claimed: bool
+    status: str = RUN_STATUS_RUNNING
+    result: dict[str, Any] | None = None
+
+
+class IdempotencyStore(ABC):
+    """Atomic claim-or-get keyed by run key, with TTL expiry."""
+
+    name = "base"
+    # Whether calls do I/O (and may wait on locks or the network); async callers
+    # run those in a worker thread.
+    blocking = True
+
+    @abstractmethod
+    def claim(self, run_key: str, ttl: float) -> RunClaim:
+        """Claim run_key for ttl seconds, or return the live entry that holds it."""
+
+    @abstractmethod
+    def get(self, run_key: str) -> RunClaim | None:
+        """Return the live entry for run_key (claimed=False), or None."""
+
+    @abstractmethod
+    def complete(self, run_key: str, result: dict[str, Any], ttl: float) -> None:
+        """Store the run's outcome so retried deliveries get it for ttl seconds."""
+
+    @abstractmethod
+    def release(self, run_key: str) -> None:
+        """Drop the claim without storing an outcome (shed or failed runs)."""
+
+    def prune(self) -> int:
+        """Remove expired entries. Returns the number removed."""
+        return 0
+
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Per-process store. Expiries are tracked in a min-heap so pruning only
+    touches entries that have actually expired instead of scanning them all.
+    """
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float, str, dict[str, Any] | None]] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+
+    def _live(self, run_key: str, now: float) -> RunClaim | None:
+        entry = self._entries.get(run_key)
+        if entry is None or entry[0] <= now:
+            return None
+        return RunClaim(claimed=False, status=entry[1], result=entry[2])
+
+    def _put(self, run_key: str, expires_at: float, status: str, result: dict | None) -> None:
+        self._entries[run_key] = (expires_at, status, result)
+        heapq.heappush(self._expiry_heap, (expires_at, run_key))
+
+    def claim(self, run_key: str, ttl: float) -> RunClaim:
+        now = time.time()
+        self.prune()
+        existing = self._live(run_key, now)
+        if existing is not None:
+            return existing
+        self._put(run_key, now + ttl, RUN_STATUS_RUNNING, None)
+        return RunClaim(claimed=True)
+
+    def get(self, run_key: str) -> RunClaim | None:
+        return self._live(run_key, time.time())
+
+    def complete(self, run_key: str, result: dict[str, Any], ttl: float) -> None:
+        self._put(run_key, time.time() + ttl, RUN_STATUS_COMPLETED, result)
+
+    def release(self, run_key: str) -> None:
+        self._entries.pop(run_key, None)
+
+    def prune(self) -> int:
+        now = time.time()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, run_key = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(run_key)
+            # Skip stale heap records for keys that were re-claimed or completed.
+            if entry is not None and entry[0] == expires_at:
+                del self._entries[run_key]
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteIdempotencyStore(IdempotencyStore):
+    """SQLite store in WAL mode, safe for several worker processes on one host.
+
+    claim() runs inside BEGIN IMMEDIATE so the read-then-insert is atomic
+    across processes. expires_at is indexed; bulk deletes run at most once
+    per PRUNE_INTERVAL_SECONDS.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str | Path):
+        self._db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = open_db(
+            self._db_path,
+            """
+            CREATE TABLE IF NOT EXISTS sidecar_runs (
+                run_key TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                result TEXT,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sidecar_runs_expires ON sidecar_runs(expires_at);
+            """,
+            timeout=5.0,
+        )
+        self._last_prune = 0.0
+
+    @staticmethod
+    def _row_to_claim(row: tuple) -> RunClaim:
+        status, result = row
+        return RunClaim(
+            claimed=False,
+            status=status,
+            result=json.loads(result) if result else None,
+        )
+
+    def claim(self, run_key: str, ttl: float) -> RunClaim:
+        now = time.time()
+        self._maybe_prune(now)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT status, result FROM sidecar_runs WHERE run_key = ? AND expires_at > ?",
+                    (run_key, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sidecar_runs (run_key, status, result, expires_at) "
+                        "VALUES (?, ?, NULL, ?)",
+                        (run_key, RUN_STATUS_RUNNING, now + ttl),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is not None:
+            return self._row_to_claim(row)
+        return RunClaim(claimed=True)
+
+    def get(self, run_key: str) -> RunClaim | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result FROM sidecar_runs WHERE run_key = ? AND expires_at > ?",
+                (run_key, time.time()),
+            ).fetchone()
+        return self._row_to_claim(row) if row is not None else None
+
+    def complete(self, run_key: str, result: dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sidecar_runs (run_key, status, result, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (run_key, RUN_STATUS_COMPLETED, json.dumps(result, default=str), time.time() + ttl),
+            )
+
+    def release(self, run_key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sidecar_runs WHERE run_key = ?", (run_key,))
+
+    def _maybe_prune(self, now: float) -> None:
+        if now - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+            self.prune()
+
+    def prune(self) -> int:
+        now = time.time()
+        self._last_prune = now
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM sidecar_runs WHERE expires_at <= ?", (now,))
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Redis store — SET NX EX gives an atomic claim with native TTL expiry.
+
+    Each run key holds a JSON blob {"status": ..., "result": ...}.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, password: str = "", key_prefix: str = "frood"):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis package not installed")
+        kwargs: dict[str, Any] = {
+            "decode_responses": True,
+            "socket_timeout": 5,
+            "socket_connect_timeout": 5,
+            "retry_on_timeout": True,
+        }
+        if password:
+            kwargs["password"] = password
+        self._client = redis.from_url(url, **kwargs)
+        self._client.ping()
+        self._prefix = key_prefix
+
+    def _key(self, run_key: str) -> str:
+        return f"{self._prefix}:sidecar_run:{run_key}"
+
+    @staticmethod
+    def _decode(raw: str | None) -> RunClaim | None:
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            return RunClaim(claimed=False)
+        return RunClaim(
+            claimed=False,
+            status=data.get("status", RUN_STATUS_RUNNING),
+            result=data.get("result"),
+        )
+
+    def claim(self, run_key: str, ttl: float) -> RunClaim:
+        key = self._key(run_key)
+        payload = json.dumps({"status": RUN_STATUS_RUNNING, "result": None})
+        if self._client.set(key, payload, nx=True, ex=max(1, int(ttl))):
+            return RunClaim(claimed=True)
+        existing = self._decode(self._client.get(key))
+        if existing is None:
+            # Expired between SET and GET — claim again.
+            return self.claim(run_key, ttl)
+        return existing
+
+    def get(self, run_key: str) -> RunClaim | None:
+        return self._decode(self._client.get(self._key(run_key)))
+
+    def complete(self, run_key: str, result: dict[str, Any], ttl: float) -> None:
+        payload = json.dumps({"status": RUN_STATUS_COMPLETED, "result": result}, default=str)
+        self._client.set(self._key(run_key), payload, ex=max(1, int(ttl)))
+
+    def release(self, run_key: str) -> None:
+        self._client.delete(self._key(run_key))
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def build_idempotency_store(
+    backend: str,
+    db_path: str = "",
+    redis_url: str = "",
+    redis_password: str = "",
+) -> IdempotencyStore:
+    """Create the configured backend, falling back to memory when it cannot start."""
+    backend = (backend or "memory").lower()
+    try:
+        if backend == "redis":
+            if not redis_url:
+                raise RuntimeError("REDIS_URL not configured")
+            return RedisIdempotencyStore(redis_url, password=redis_password)
+        if backend == "sqlite":
+            return SqliteIdempotencyStore(db_path or ".frood/sidecar_runs.db")
+    except Exception as e:
+        logger.warning(
+            "Idempotency backend %s unavailable (%s) — using in-process store", backend, e
+        )
+        return MemoryIdempotencyStore()
+    if backend != "memory":
+        logger.warning("Unknown idempotency backend %r — using in-process store", backend)
+    return MemoryIdempotencyStore()
@@ -75,6 +75,8 @@ class HealthResponse(BaseModel):
     providers: dict[str, Any] = Field(default_factory=dict)
     providers_detail: list[ProviderStatusDetail] = Field(default_factory=list)
     qdrant: dict[str, Any] = Field(default_factory=dict)
+    streaming: dict[str, Any] = Field(default_factory=dict)
+    admission: dict[str, Any] = Field(default_factory=dict)
 
 
 class MemoryRecallRequest(BaseModel):
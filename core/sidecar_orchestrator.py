@@ -6,50 +6,108 @@ Paperclip's callback URL when complete.
 """
 
 import asyncio
+import contextvars
+import json
 import logging
+import statistics
 import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
 from core.config import settings
+from core.llm_streaming import ChatStreamAccumulator, iter_sse_json, open_chat_stream
+from core.sidecar_idempotency import IdempotencyStore, MemoryIdempotencyStore, RunClaim
 from core.sidecar_models import AdapterExecutionContext, CallbackPayload
 from core.url_policy import set_current_run_id
 
+if TYPE_CHECKING:
+    from tools.registry import SchemaSet
+
 logger = logging.getLogger("frood.sidecar.orchestrator")
 
-# Idempotency guard: runId -> expiry timestamp (D-08)
-_active_runs: dict[str, float] = {}
+# Set by execute_stream() for the duration of a streamed run. When present,
+# _call_provider streams each upstream turn and forwards token / tool events
+# to it. ContextVars are task-local, so concurrent non-streamed runs never
+# see another run's sink.
+_run_event_sink: contextvars.ContextVar[Callable[[dict], Awaitable[None]] | None] = (
+    contextvars.ContextVar("frood_sidecar_run_event_sink", default=None)
+)
+
+# Bounded per-stream event buffer — a slow client applies backpressure to the
+# upstream read instead of growing memory without limit.
+STREAM_QUEUE_MAX = 256
+
+# Idempotency guard (D-08): run key -> claim / stored outcome. The backend is
+# chosen by create_sidecar_app() from SIDECAR_IDEMPOTENCY_BACKEND; the
+# in-process default keeps single-worker deployments dependency-free.
 RUN_TTL_SECONDS = 3600  # 1 hour default
+_idempotency_store: IdempotencyStore = MemoryIdempotencyStore()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Return the active idempotency backend."""
+    return _idempotency_store
+
+
+def set_idempotency_store(store: IdempotencyStore) -> None:
+    """Swap the idempotency backend (called once at app startup)."""
+    global _idempotency_store
+    _idempotency_store = store
+
+
+async def _call_store(method: Callable[..., Any], *args: Any) -> Any:
+    """Run an idempotency store call, off the event loop for I/O-backed stores.
+
+    The SQLite backend can wait up to its busy timeout and Redis up to its
+    socket timeout; neither may stall every other request on the loop.
+    """
+    if _idempotency_store.blocking:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+
+async def claim_run(run_id: str) -> RunClaim:
+    """Atomically claim run_id, or return the in-flight / completed entry holding it."""
+    return await _call_store(_idempotency_store.claim, run_id, RUN_TTL_SECONDS)
 
 
-def _prune_expired_runs() -> None:
-    """Remove expired entries from the active runs dict."""
-    now = time.time()
-    expired = [k for k, exp in _active_runs.items() if exp < now]
-    for k in expired:
-        del _active_runs[k]
+async def complete_run(run_id: str, result: dict[str, Any]) -> None:
+    """Store a finished run's response so retried deliveries can replay it."""
+    await _call_store(_idempotency_store.complete, run_id, result, settings.sidecar_result_ttl)
+
+
+async def release_run(run_id: str) -> None:
+    """unregister_run() for async callers."""
+    await _call_store(_idempotency_store.release, run_id)
 
 
 def is_duplicate_run(run_id: str) -> bool:
-    """Check if a runId is already active (idempotency guard).
+    """Check if a runId is already claimed or completed (idempotency guard).
 
-    Also prunes expired entries on each call.
-    Returns True if the run_id is already registered and not expired.
+    Returns True if the run_id has a live (non-expired) entry.
     """
-    _prune_expired_runs()
-    return run_id in _active_runs and time.time() < _active_runs[run_id]
+    return _idempotency_store.get(run_id) is not None
 
 
 def register_run(run_id: str) -> None:
     """Register a runId as active with TTL-based expiry."""
-    _active_runs[run_id] = time.time() + RUN_TTL_SECONDS
+    _idempotency_store.claim(run_id, RUN_TTL_SECONDS)
 
 
 def unregister_run(run_id: str) -> None:
-    """Remove a runId from the active runs dict after completion."""
-    _active_runs.pop(run_id, None)
+    """Drop a runId's claim without storing an outcome."""
+    _idempotency_store.release(run_id)
+
+
+async def _emit_run_event(event: dict[str, Any]) -> None:
+    """Forward an event to the current run's stream sink, if one is attached."""
+    sink = _run_event_sink.get()
+    if sink is not None:
+        await sink(event)
 
 
 class SidecarOrchestrator:
@@ -73,6 +131,9 @@ class SidecarOrchestrator:
         self.tiered_routing_bridge = tiered_routing_bridge
         self.tool_registry = tool_registry
         self._http: httpx.AsyncClient | None = None
+        # Time-to-first-token samples (ms) for streamed runs
+        self._ttft_samples: deque[float] = deque(maxlen=200)
+        self._streams_total = 0
 
     async def _get_http_client(self) -> httpx.AsyncClient:
         """Lazy-init httpx client (per pitfall 6: create once, close properly)."""
@@ -90,7 +151,6 @@ class SidecarOrchestrator:
         phases with small tool sets and targeted prompts. Each phase gets
         only the tools it needs and a clear, short instruction.
         """
-        import json as _json
         import random
 
         task_prompt = ctx.task or ""
@@ -1279,6 +1339,87 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
 
         return result
 
+    async def execute_stream(
+        self, run_id: str, ctx: AdapterExecutionContext
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Execute an agent task and yield incremental events as they happen.
+
+        Runs execute_sync() in a child task with a run event sink attached, so
+        every path (generic tool loop and the deterministic workflows) streams
+        its upstream calls. Event types, in order of appearance:
+
+        - ``token``            — assistant text delta
+        - ``tool_call_start``  — tool name, call id, iteration
+        - ``tool_call_finish`` — tool name, call id, ok, duration_ms
+        - ``result``           — the execute_sync() result plus ttft_ms
+        - ``error``            — run raised; carries the error string
+
+        Closing the generator early (client disconnect) cancels the run.
+        """
+        queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=STREAM_QUEUE_MAX)
+        started = time.monotonic()
+        ttft_ms: float | None = None
+        consumer_closed = False
+
+        async def _sink(event: dict[str, Any]) -> None:
+            await queue.put({"runId": run_id, **event})
+
+        async def _runner() -> None:
+            _run_event_sink.set(_sink)
+            try:
+                result = await self.execute_sync(run_id, ctx)
+                await queue.put({"type": "result", "runId": run_id, **result})
+            except Exception as exc:
+                logger.error("Streamed run %s failed: %s", run_id, exc, exc_info=True)
+                await queue.put({"type": "error", "runId": run_id, "error": str(exc)})
+            finally:
+                try:
+                    queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    # A full queue only drains while the consumer is reading;
+                    # after a disconnect or cancellation the put would never return.
+                    current = asyncio.current_task()
+                    if not consumer_closed and not (current and current.cancelling()):
+                        await queue.put(None)
+
+        self._streams_total += 1
+        task = asyncio.create_task(_runner())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                if event["type"] == "token" and ttft_ms is None:
+                    ttft_ms = (time.monotonic() - started) * 1000
+                    self._ttft_samples.append(ttft_ms)
+                    logger.info("Run %s time-to-first-token: %.0fms", run_id, ttft_ms)
+                if event["type"] == "result":
+                    event["ttft_ms"] = round(ttft_ms, 1) if ttft_ms is not None else None
+                yield event
+        finally:
+            consumer_closed = True
+            if not task.done():
+                logger.info("Stream for run %s closed early — cancelling run", run_id)
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    def stream_stats(self) -> dict[str, Any]:
+        """Time-to-first-token summary for streamed runs (surfaced on /sidecar/health)."""
+        samples = sorted(self._ttft_samples)
+        if not samples:
+            return {"streams": self._streams_total, "ttft_samples": 0}
+        p95_index = min(len(samples) - 1, int(len(samples) * 0.95))
+        return {
+            "streams": self._streams_total,
+            "ttft_samples": len(samples),
+            "ttft_ms_p50": round(statistics.median(samples), 1),
+            "ttft_ms_p95": round(samples[p95_index], 1),
+            "ttft_ms_last": round(self._ttft_samples[-1], 1),
+        }
+
     async def execute_async(self, run_id: str, ctx: AdapterExecutionContext) -> None:
         """Execute an agent task and POST results to Paperclip callback.
 
@@ -1508,7 +1649,7 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                     )
                 )
 
-            unregister_run(run_id)
+            await release_run(run_id)
 
     # Tool whitelists per task type — only expose relevant tools.
     # NOTE: research phases use more specific whitelists, see _execute_research_workflow.
@@ -1549,8 +1690,13 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
         For research tasks, phase-specific whitelists override the task-type whitelist,
         ensuring each phase only sees the tools it needs (avoids model distraction).
         """
+        schema_set = self._get_tool_schema_set(task_type, phase)
+        return schema_set.schemas if schema_set else []
+
+    def _get_tool_schema_set(self, task_type: str = "", phase: str = "") -> "SchemaSet | None":
+        """Cached SchemaSet behind _get_tool_schemas, or None when no tools apply."""
         if not self.tool_registry:
-            return []
+            return None
 
         # Research phases use per-phase whitelists
         if task_type == "research" and phase in self._RESEARCH_PHASE_TOOLS:
@@ -1562,16 +1708,10 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
         # from "empty set" (→ allow no tools, e.g. for form_submit's
         # message-generation call which should be pure text).
         if whitelist == set():
-            return []
+            return None
 
-        schemas = []
-        for tool in self.tool_registry._tools.values():
-            if tool.name in self.tool_registry._disabled:
-                continue
-            if whitelist and tool.name not in whitelist:
-                continue
-            schemas.append(tool.to_schema())
-        return schemas
+        schema_set = self.tool_registry.schema_set(names=whitelist)
+        return schema_set if len(schema_set) else None
 
     async def _execute_tool_call(self, name: str, arguments: dict, agent_id: str) -> str:
         """Execute a tool call and return the result as a string."""
@@ -1612,7 +1752,6 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
 
         Returns [] on any parse failure — caller must handle the empty case.
         """
-        import json as _json
         import re
 
         if not text:
@@ -1636,8 +1775,8 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
             candidate = text[start : end + 1]
 
         try:
-            data = _json.loads(candidate)
-        except _json.JSONDecodeError:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
             return []
 
         if not isinstance(data, list):
@@ -1661,7 +1800,6 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
         Falls back through providers on failure. Handles tool calls in a loop
         (max 15 iterations) until the model returns a text response.
         """
-        import json as _json
         import os
 
         provider_config = {
@@ -1718,7 +1856,7 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                 dedup_attempts.append(prov_model)
         attempts = dedup_attempts
 
-        tool_schemas = self._get_tool_schemas(task_type, phase=phase)
+        tool_schemas = self._get_tool_schema_set(task_type, phase=phase)
         total_input = 0
         total_output = 0
         last_error = ""
@@ -1733,7 +1871,7 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                 continue
 
             use_model = attempt_model
-            logger.info("Calling %s/%s for run %s (tools=%d)", prov, use_model, run_id, len(tool_schemas))
+            logger.info("Calling %s/%s for run %s (tools=%d)", prov, use_model, run_id, len(tool_schemas or ()))
 
             headers = {
                 "Authorization": f"Bearer {api_key}",
@@ -1760,14 +1898,17 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                             "max_tokens": 8192,
                         }
                         if tool_schemas:
-                            payload["tools"] = tool_schemas
+                            payload["tools"] = tool_schemas.schemas
 
-                        resp = await client.post(config["url"], headers=headers, json=payload)
-                        if resp.status_code == 429:
+                        status_code, resp_headers, body = await self._request_completion(
+                            client, config["url"], api_key, headers, payload,
+                            tools_json=tool_schemas.encoded if tool_schemas else "",
+                        )
+                        if status_code == 429:
                             # Rate limited — check retry-after to decide retry vs fail-fast
                             retry_after = 5.0
                             try:
-                                retry_after = float(resp.headers.get("retry-after", "5"))
+                                retry_after = float(resp_headers.get("retry-after", "5"))
                             except Exception:
                                 pass
                             if retry_after > 30:
@@ -1779,13 +1920,13 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                             logger.warning("Rate limited on %s, sleeping %.1fs", prov, retry_after)
                             await asyncio.sleep(retry_after)
                             continue
-                        if resp.status_code >= 400:
-                            last_error = f"HTTP {resp.status_code}: {resp.text[:300]}"
+                        if status_code >= 400:
+                            last_error = f"HTTP {status_code}: {body[:300]}"
                             logger.warning("Provider %s failed for run %s: %s", prov, run_id, last_error)
                             provider_failed = True
                             break
 
-                        data = resp.json()
+                        data = body
                         resp_usage = data.get("usage", {})
                         total_input += resp_usage.get("prompt_tokens", 0)
                         total_output += resp_usage.get("completion_tokens", 0)
@@ -1808,8 +1949,8 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                                 fn = tc.get("function", {})
                                 tool_name = fn.get("name", "")
                                 try:
-                                    tool_args = _json.loads(fn.get("arguments", "{}"))
-                                except _json.JSONDecodeError:
+                                    tool_args = json.loads(fn.get("arguments", "{}"))
+                                except json.JSONDecodeError:
                                     tool_args = {}
 
                                 logger.info(
@@ -1818,9 +1959,24 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                                     str(tool_args)[:400],
                                 )
 
+                                call_id = tc.get("id", "")
+                                await _emit_run_event({
+                                    "type": "tool_call_start",
+                                    "name": tool_name,
+                                    "id": call_id,
+                                    "iteration": iteration,
+                                })
+                                tool_started = time.monotonic()
                                 tool_result = await self._execute_tool_call(
                                     tool_name, tool_args, agent_id,
                                 )
+                                await _emit_run_event({
+                                    "type": "tool_call_finish",
+                                    "name": tool_name,
+                                    "id": call_id,
+                                    "ok": not tool_result.startswith("Error"),
+                                    "duration_ms": round((time.monotonic() - tool_started) * 1000, 1),
+                                })
 
                                 # DEBUG-level — enable on demand when diagnosing
                                 # LLMs that generate malformed tool_call arguments.
@@ -1875,9 +2031,10 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
                             "max_tokens": 8192,  # headroom for reasoning models
                         }
                         # No tools in payload — force text response
-                        final_resp = await client.post(config["url"], headers=headers, json=final_payload)
-                        if final_resp.status_code < 400:
-                            final_data = final_resp.json()
+                        final_status, _, final_data = await self._request_completion(
+                            client, config["url"], api_key, headers, final_payload,
+                        )
+                        if final_status < 400:
                             final_usage = final_data.get("usage", {})
                             total_input += final_usage.get("prompt_tokens", 0)
                             total_output += final_usage.get("completion_tokens", 0)
@@ -1925,6 +2082,53 @@ Output ONLY the subject line + email body. No preamble, no markdown, no quotes."
 
         return {"summary": "", "error": last_error or "All providers failed", "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
 
+    async def _request_completion(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        api_key: str,
+        headers: dict[str, str],
+        payload: dict[str, Any],
+        tools_json: str = "",
+    ) -> tuple[int, Any, Any]:
+        """Send one chat-completion turn and return (status_code, headers, body).
+
+        body is the parsed completion dict on success and the error text on
+        HTTP >= 400. When a run event sink is attached (execute_stream), the
+        turn is streamed upstream and each text delta is forwarded as a
+        ``token`` event; the chunks are folded back into the same completion
+        shape so the tool loop does not care which path produced it.
+
+        tools_json, when given, is payload["tools"] already serialized (the
+        registry's cached SchemaSet.encoded); it is spliced into the request
+        body instead of re-encoding the tool schemas on every turn.
+        """
+        if _run_event_sink.get() is None:
+            if tools_json and "tools" in payload:
+                rest = json.dumps({k: v for k, v in payload.items() if k != "tools"})
+                content = f'{rest[:-1]}, "tools": {tools_json}}}'.encode()
+                resp = await client.post(url, headers=headers, content=content)
+            else:
+                resp = await client.post(url, headers=headers, json=payload)
+            if resp.status_code >= 400:
+                return resp.status_code, resp.headers, resp.text
+            return resp.status_code, resp.headers, resp.json()
+
+        stream_body = {**payload, "stream_options": {"include_usage": True}}
+        async with open_chat_stream(client, url, api_key, stream_body) as resp:
+            if resp.status_code >= 400:
+                err_text = (await resp.aread()).decode("utf-8", errors="replace")
+                return resp.status_code, resp.headers, err_text
+            acc = ChatStreamAccumulator()
+            async for chunk in iter_sse_json(resp):
+                delta = acc.feed(chunk)
+                if delta:
+                    await _emit_run_event({"type": "token", "delta": delta})
+            completion = acc.as_completion()
+            if completion.get("error"):
+                return 502, resp.headers, str(completion["error"])
+            return resp.status_code, resp.headers, completion
+
     async def _post_callback(
         self,
         run_id: str,
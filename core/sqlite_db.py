@@ -0,0 +1,52 @@
+"""Shared setup for the small SQLite stores used by caches and indexes.
+
+Each store keeps one connection per process, shared by worker threads and
+guarded by the store's own lock:
+
+- open_db()   — create the parent directory, connect in autocommit mode,
+                switch to WAL with synchronous=NORMAL and apply the schema
+- select_in() — run a `... IN (...)` query over any number of values,
+                chunked below SQLite's bound-parameter limit
+"""
+
+import sqlite3
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+# Values bound per IN (...) query; SQLite's default limit is 999 on old builds.
+IN_CHUNK = 500
+
+
+def open_db(db_path: str | Path, schema: str = "", timeout: float = 10.0) -> sqlite3.Connection:
+    """Open a WAL-mode connection usable from any thread.
+
+    isolation_level=None leaves transactions to explicit BEGIN/COMMIT.
+    Callers serialize access themselves.
+    """
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(path), isolation_level=None, check_same_thread=False, timeout=timeout
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if schema:
+        conn.executescript(schema)
+    return conn
+
+
+def select_in(
+    conn: sqlite3.Connection, sql: str, values: Sequence[Any], params: Sequence[Any] = ()
+) -> list[tuple]:
+    """Rows of sql for every value, querying IN_CHUNK values at a time.
+
+    sql holds one `{marks}` placeholder where the `?, ?, ...` list goes;
+    params are bound before each chunk's values.
+    """
+    rows: list[tuple] = []
+    for i in range(0, len(values), IN_CHUNK):
+        chunk = list(values[i : i + IN_CHUNK])
+        marks = ",".join("?" * len(chunk))
+        rows.extend(conn.execute(sql.format(marks=marks), (*params, *chunk)).fetchall())
+    return rows
@@ -92,6 +92,11 @@ _MODEL_PRICING: dict[str, tuple[float, float]] = {
 _PRICING_FALLBACK: tuple[float, float] = (5.00 / 1_000_000, 15.00 / 1_000_000)
 
 
+def model_price(model: str) -> tuple[float, float]:
+    """(input, output) USD per token for model; _PRICING_FALLBACK when unlisted."""
+    return _MODEL_PRICING.get(model, _PRICING_FALLBACK)
+
+
 # ---------------------------------------------------------------------------
 # RoutingDecision Dataclass (D-12)
 # ---------------------------------------------------------------------------
@@ -241,5 +246,5 @@ class TieredRoutingBridge:
             Estimated cost in USD, or 0.0 when token counts are zero.
             Uses _PRICING_FALLBACK for models not in the pricing table.
         """
-        price = _MODEL_PRICING.get(model, _PRICING_FALLBACK)
+        price = model_price(model)
         return round(input_tokens * price[0] + output_tokens * price[1], 8)
@@ -3,16 +3,30 @@ URL access policy — hostname allowlists, denylists, SSRF protection, and audit
 
 Consolidates all URL validation into a single module used by web_search, http_client,
 and browser tools. Inspired by OpenClaw v2026.2.12 hostname allowlist security fixes.
+
+SSRF verdicts come from resolving the hostname and checking every address it
+resolves to. Resolutions are cached per (host, port) for DNS_CACHE_TTL
+seconds, and async callers resolve through the event loop's getaddrinfo
+(check_async / resolve_url) so a slow resolver never stalls the loop. Callers
+that make the request themselves connect to Resolution.addresses — the
+addresses that were checked — rather than resolving the name again, which
+closes the DNS-rebinding window between check and connect.
+
+Blocked requests are appended to a JSONL audit log in batches, off the loop.
 """
 
 import asyncio
+import atexit
 import contextvars
 import ipaddress
 import json
 import logging
 import socket
+import threading
 import time
-from collections import defaultdict
+import weakref
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 from fnmatch import fnmatch
 from pathlib import Path
 from urllib.parse import urlparse
@@ -35,6 +49,7 @@ def set_current_run_id(run_id: str | None) -> None:
     """
     _current_run_id.set(run_id)
 
+
 # SSRF protection: blocked IP ranges (moved from web_search.py)
 _BLOCKED_IP_RANGES = [
     ipaddress.ip_network("127.0.0.0/8"),
@@ -64,6 +79,144 @@ _BLOCKED_HOSTNAMES = {
 }
 
 
+# Seconds a resolution (and its verdict) is reused; failed lookups are retried sooner.
+DNS_CACHE_TTL = 60.0
+DNS_FAILURE_TTL = 5.0
+DNS_CACHE_MAX = 1024
+DNS_TIMEOUT = 5.0
+# Seconds blocked-request audit entries are buffered before one batched write.
+AUDIT_FLUSH_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """A checked DNS answer: the addresses a connection to hostname may use.
+
+    reason is why the host is blocked, or None. addresses is empty when the
+    name did not resolve (the request will fail on its own).
+    """
+
+    hostname: str
+    addresses: tuple[str, ...] = ()
+    reason: str | None = None
+    expires: float = 0.0
+
+
+_resolutions: OrderedDict[tuple[str, int], Resolution] = OrderedDict()
+_resolutions_lock = threading.Lock()
+
+
+def _cached_resolution(key: tuple[str, int]) -> Resolution | None:
+    with _resolutions_lock:
+        res = _resolutions.get(key)
+        if res is None:
+            return None
+        if res.expires <= time.monotonic():
+            del _resolutions[key]
+            return None
+        _resolutions.move_to_end(key)
+        return res
+
+
+def _remember(key: tuple[str, int], res: Resolution) -> Resolution:
+    with _resolutions_lock:
+        _resolutions[key] = res
+        _resolutions.move_to_end(key)
+        while len(_resolutions) > DNS_CACHE_MAX:
+            _resolutions.popitem(last=False)
+    return res
+
+
+def clear_dns_cache() -> None:
+    """Forget every cached resolution (tests, or after a network change)."""
+    with _resolutions_lock:
+        _resolutions.clear()
+
+
+def _judge(hostname: str, addr_infos) -> Resolution:
+    addresses: list[str] = []
+    for _family, _, _, _, sockaddr in addr_infos:
+        ip = ipaddress.ip_address(sockaddr[0])
+        for blocked in _BLOCKED_IP_RANGES:
+            if ip in blocked:
+                return Resolution(
+                    hostname,
+                    reason=f"Blocked: {hostname} resolves to private/internal IP {ip}",
+                    expires=time.monotonic() + DNS_CACHE_TTL,
+                )
+        if sockaddr[0] not in addresses:
+            addresses.append(sockaddr[0])
+    return Resolution(hostname, tuple(addresses), expires=time.monotonic() + DNS_CACHE_TTL)
+
+
+def _split(url: str) -> tuple[str, int] | Resolution:
+    """(hostname, port) to resolve, or a Resolution when the URL has no host."""
+    parsed = urlparse(url)
+    if not parsed.hostname:
+        return Resolution("", reason="Invalid URL: no hostname")
+    return parsed.hostname, parsed.port or (443 if parsed.scheme == "https" else 80)
+
+
+def _named(hostname: str, port: int) -> tuple[tuple[str, int], Resolution | None]:
+    """Cache key for a host, and its Resolution if the name alone or the cache decides."""
+    key = (hostname.lower(), port)
+    if key[0] in _BLOCKED_HOSTNAMES:
+        return key, Resolution(hostname, reason=f"Blocked: {hostname} is a localhost alias")
+    return key, _cached_resolution(key)
+
+
+def _unresolved(key: tuple[str, int]) -> Resolution:
+    return _remember(key, Resolution(key[0], expires=time.monotonic() + DNS_FAILURE_TTL))
+
+
+def resolve_host_sync(hostname: str, port: int) -> Resolution:
+    """Blocking resolve_host, for threads and callers without an event loop."""
+    key, known = _named(hostname, port)
+    if known is not None:
+        return known
+    try:
+        addr_infos = socket.getaddrinfo(key[0], port, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        return _unresolved(key)
+    return _remember(key, _judge(key[0], addr_infos))
+
+
+async def resolve_host(hostname: str, port: int) -> Resolution:
+    """Resolve and check a host through the event loop's resolver, with caching."""
+    key, known = _named(hostname, port)
+    if known is not None:
+        return known
+    loop = asyncio.get_running_loop()
+    try:
+        addr_infos = await asyncio.wait_for(
+            loop.getaddrinfo(key[0], port, proto=socket.IPPROTO_TCP), DNS_TIMEOUT
+        )
+    except (socket.gaierror, UnicodeError, TimeoutError):
+        return _unresolved(key)
+    return _remember(key, _judge(key[0], addr_infos))
+
+
+def resolve_url_sync(url: str) -> Resolution:
+    """Blocking resolve_url."""
+    target = _split(url)
+    return target if isinstance(target, Resolution) else resolve_host_sync(*target)
+
+
+async def resolve_url(url: str) -> Resolution:
+    """Resolve and check a URL's host without blocking the event loop."""
+    target = _split(url)
+    return target if isinstance(target, Resolution) else await resolve_host(*target)
+
+
+_policies: "weakref.WeakSet[UrlPolicy]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_audit_logs() -> None:
+    for policy in list(_policies):
+        policy.flush_audit_log()
+
+
 class UrlPolicy:
     """Centralized URL access policy with allowlist, denylist, SSRF, and per-agent limits.
 
@@ -85,12 +238,40 @@ class UrlPolicy:
         self._agent_counts: dict[str, int] = defaultdict(int)
         self._audit_path = Path(audit_log_path)
         self._audit_path.parent.mkdir(parents=True, exist_ok=True)
+        self._audit_buffer: list[str] = []
+        self._audit_buffer_lock = threading.Lock()
+        self._audit_write_lock = threading.Lock()
+        self._audit_flush: asyncio.Task | None = None
+        _policies.add(self)
 
     def check(self, url: str, agent_id: str = "default") -> tuple[bool, str]:
         """Check if a URL is allowed.
 
-        Returns (True, "") if allowed, (False, reason) if blocked.
+        Returns (True, "") if allowed, (False, reason) if blocked. Resolves
+        the hostname on a cache miss; async callers should use check_async.
         """
+        bucket_key, reason = self._check_rules(url, agent_id)
+        if reason is None:
+            reason = self._check_ssrf(url)
+        return self._verdict(url, bucket_key, reason)
+
+    async def check_async(self, url: str, agent_id: str = "default") -> tuple[bool, str]:
+        """check() with the DNS lookup off the event loop."""
+        bucket_key, reason = self._check_rules(url, agent_id)
+        if reason is None:
+            reason = await self._check_ssrf_async(url)
+        return self._verdict(url, bucket_key, reason)
+
+    def _verdict(self, url: str, bucket_key: str, reason: str | None) -> tuple[bool, str]:
+        if reason:
+            self._audit_log(url, bucket_key, reason)
+            return False, reason
+        # Record successful request
+        self._agent_counts[bucket_key] += 1
+        return True, ""
+
+    def _check_rules(self, url: str, agent_id: str) -> tuple[str, str | None]:
+        """Everything but SSRF: limits, hostname, denylist, allowlist → (bucket, reason)."""
         # Prefer the current-run contextvar as the counter bucket so each
         # heartbeat run gets an independent URL budget. Falls back to the
         # explicit agent_id argument for callers outside a run (tests,
@@ -105,92 +286,85 @@ class UrlPolicy:
                 f"{scope} URL request limit reached ({self._max_requests}). "
                 f"{label} '{bucket_key}' has made {self._agent_counts[bucket_key]} requests."
             )
-            self._audit_log(url, bucket_key, reason)
-            return False, reason
+            return bucket_key, reason
 
         parsed = urlparse(url)
         hostname = parsed.hostname
         if not hostname:
-            reason = "Invalid URL: no hostname"
-            self._audit_log(url, bucket_key, reason)
-            return False, reason
+            return bucket_key, "Invalid URL: no hostname"
 
         # Denylist check (always takes precedence)
         for pattern in self._denylist:
             if fnmatch(hostname.lower(), pattern.lower()):
-                reason = f"Blocked by denylist: {hostname} matches pattern '{pattern}'"
-                self._audit_log(url, bucket_key, reason)
-                return False, reason
+                return bucket_key, f"Blocked by denylist: {hostname} matches pattern '{pattern}'"
 
         # Allowlist check (only when allowlist is configured)
         if self._allowlist:
             matched = any(fnmatch(hostname.lower(), p.lower()) for p in self._allowlist)
             if not matched:
-                reason = f"Blocked by allowlist: {hostname} not in allowed patterns"
-                self._audit_log(url, bucket_key, reason)
-                return False, reason
+                return bucket_key, f"Blocked by allowlist: {hostname} not in allowed patterns"
 
-        # SSRF protection
-        ssrf_reason = self._check_ssrf(url)
-        if ssrf_reason:
-            self._audit_log(url, bucket_key, ssrf_reason)
-            return False, ssrf_reason
-
-        # Record successful request
-        self._agent_counts[bucket_key] += 1
-        return True, ""
+        return bucket_key, None
 
     @staticmethod
     def _check_ssrf(url: str) -> str | None:
         """Check if a URL targets an internal/private IP. Returns error message or None."""
         try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname
-            if not hostname:
-                return "Invalid URL: no hostname"
-
-            if hostname.lower() in _BLOCKED_HOSTNAMES:
-                return f"Blocked: {hostname} is a localhost alias"
-
-            try:
-                addr_infos = socket.getaddrinfo(hostname, parsed.port or 80)
-            except socket.gaierror:
-                return None
-
-            for family, _, _, _, sockaddr in addr_infos:
-                ip = ipaddress.ip_address(sockaddr[0])
-                for blocked in _BLOCKED_IP_RANGES:
-                    if ip in blocked:
-                        return f"Blocked: {hostname} resolves to private/internal IP {ip}"
+            return resolve_url_sync(url).reason
+        except Exception:
             return None
+
+    @staticmethod
+    async def _check_ssrf_async(url: str) -> str | None:
+        """_check_ssrf without blocking the event loop."""
+        try:
+            return (await resolve_url(url)).reason
         except Exception:
             return None
 
     def _audit_log(self, url: str, agent_id: str, reason: str):
-        """Append blocked request to JSONL audit log (non-blocking when event loop is running)."""
+        """Queue a blocked request for the JSONL audit log.
+
+        Inside an event loop entries are written in one batch per
+        AUDIT_FLUSH_INTERVAL, on a worker thread; without one (scripts,
+        tests) the entry is written immediately.
+        """
         entry = {
             "timestamp": time.time(),
             "url": url,
             "agent_id": agent_id,
             "reason": reason,
         }
-        line = json.dumps(entry) + "\n"
-
-        def _write():
-            try:
-                with open(self._audit_path, "a") as f:
-                    f.write(line)
-            except OSError as e:
-                logger.error(f"Failed to write URL audit log: {e}")
+        with self._audit_buffer_lock:
+            self._audit_buffer.append(json.dumps(entry) + "\n")
 
         try:
             loop = asyncio.get_running_loop()
-            loop.run_in_executor(None, _write)
         except RuntimeError:
             # No running event loop (e.g., during tests) — write synchronously
-            _write()
+            self.flush_audit_log()
+        else:
+            if self._audit_flush is None or self._audit_flush.done():
+                self._audit_flush = loop.create_task(self._flush_audit_later())
         logger.warning(f"URL blocked: {url} (agent={agent_id}) — {reason}")
 
+    async def _flush_audit_later(self) -> None:
+        await asyncio.sleep(AUDIT_FLUSH_INTERVAL)
+        await asyncio.to_thread(self.flush_audit_log)
+
+    def flush_audit_log(self) -> None:
+        """Write buffered audit entries now, in order."""
+        with self._audit_write_lock:
+            with self._audit_buffer_lock:
+                lines, self._audit_buffer = self._audit_buffer, []
+            if not lines:
+                return
+            try:
+                with open(self._audit_path, "a") as f:
+                    f.write("".join(lines))
+            except OSError as e:
+                logger.error(f"Failed to write URL audit log: {e}")
+
     def reset_agent_counts(self, agent_id: str | None = None):
         """Reset per-agent request counters."""
         if agent_id:
@@ -206,3 +380,8 @@ def _is_ssrf_target(url: str) -> str | None:
     Backward-compatible wrapper around UrlPolicy._check_ssrf.
     """
     return UrlPolicy._check_ssrf(url)
+
+
+async def is_ssrf_target_async(url: str) -> str | None:
+    """_is_ssrf_target without blocking the event loop."""
+    return await UrlPolicy._check_ssrf_async(url)
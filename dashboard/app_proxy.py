@@ -0,0 +1,279 @@
+"""Reverse proxy for apps managed by AppManager.
+
+- AppProxyPool       — one pooled httpx client per app port, reused across requests
+- proxy_http()       — stream request and response bodies without buffering
+- proxy_websocket()  — relay a WebSocket connection to the app's port
+- serve_static()     — static files with ETag / Last-Modified and single Range support
+
+Bodies are streamed chunk by chunk in both directions, so a slow reader on
+either side applies backpressure instead of growing memory. When the client
+disconnects, the upstream response is closed, which cancels the request on
+the app side.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+from fastapi import HTTPException, Request, WebSocket
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.websockets import WebSocketDisconnect
+
+logger = logging.getLogger("frood.app_proxy")
+
+# RFC 7230 §6.1 hop-by-hop headers — never forwarded by a proxy.
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+STATIC_CHUNK_SIZE = 64 * 1024
+
+
+def _forward_headers(headers, drop: frozenset[str] = frozenset()) -> list[tuple[str, str]]:
+    """Copy headers minus hop-by-hop ones (and any names in drop)."""
+    return [
+        (k, v)
+        for k, v in headers.items()
+        if k.lower() not in HOP_BY_HOP_HEADERS and k.lower() not in drop
+    ]
+
+
+class AppProxyPool:
+    """Pooled keep-alive httpx clients keyed by app port."""
+
+    def __init__(self, max_connections: int = 100):
+        self._clients: dict[int, httpx.AsyncClient] = {}
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max(1, max_connections // 5),
+        )
+        # No read timeout: SSE and long-polling responses may idle indefinitely.
+        self._timeout = httpx.Timeout(connect=5.0, read=None, write=30.0, pool=10.0)
+
+    def client_for(self, port: int) -> httpx.AsyncClient:
+        client = self._clients.get(port)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}",
+                limits=self._limits,
+                timeout=self._timeout,
+                follow_redirects=False,
+            )
+            self._clients[port] = client
+        return client
+
+    async def discard(self, port: int) -> None:
+        """Drop the client for a port (app stopped, restarted or unreachable)."""
+        client = self._clients.pop(port, None)
+        if client is not None:
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        for port in list(self._clients):
+            await self.discard(port)
+
+
+async def proxy_http(
+    pool: AppProxyPool, port: int, path: str, request: Request, slug: str = ""
+) -> Response:
+    """Forward request to the app on port, streaming both bodies."""
+    client = pool.client_for(port)
+    upstream_request = client.build_request(
+        request.method,
+        "/" + path,
+        params=request.query_params.multi_items(),
+        headers=_forward_headers(request.headers, drop=frozenset({"host"})),
+        content=request.stream() if request.method not in ("GET", "HEAD") else None,
+    )
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.ConnectError:
+        await pool.discard(port)
+        raise HTTPException(
+            status_code=502, detail=f"App '{slug}' is not responding on port {port}"
+        )
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail=f"App '{slug}' timed out")
+
+    async def _body():
+        # Closing the upstream response in finally also runs when Starlette
+        # cancels this generator on client disconnect.
+        try:
+            async for chunk in upstream.aiter_raw():
+                yield chunk
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(
+        _body(),
+        status_code=upstream.status_code,
+        # Raw bytes are relayed, so content-encoding/length stay valid.
+        headers=dict(_forward_headers(upstream.headers)),
+    )
+
+
+async def proxy_websocket(ws: WebSocket, port: int, path: str) -> None:
+    """Relay frames between the client WebSocket and the app until either side closes."""
+    import websockets
+
+    query = urlencode([(k, v) for k, v in ws.query_params.multi_items() if k != "token"])
+    url = f"ws://127.0.0.1:{port}/{path}" + (f"?{query}" if query else "")
+    subprotocols = [
+        p.strip() for p in ws.headers.get("sec-websocket-protocol", "").split(",") if p.strip()
+    ]
+
+    try:
+        upstream = await websockets.connect(
+            url, subprotocols=subprotocols or None, open_timeout=5, max_size=None
+        )
+    except Exception as e:
+        logger.warning("App websocket upstream %s unavailable: %s", url, e)
+        await ws.close(code=1011, reason="App not reachable")
+        return
+
+    await ws.accept(subprotocol=upstream.subprotocol)
+
+    async def _client_to_app():
+        while True:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                await upstream.send(message["bytes"])
+            elif message.get("text") is not None:
+                await upstream.send(message["text"])
+
+    async def _app_to_client():
+        async for data in upstream:
+            if isinstance(data, bytes):
+                await ws.send_bytes(data)
+            else:
+                await ws.send_text(data)
+
+    tasks = [asyncio.create_task(_client_to_app()), asyncio.create_task(_app_to_client())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError, WebSocketDisconnect, Exception):
+                await task
+        await upstream.close()
+        with contextlib.suppress(Exception):
+            await ws.close()
+
+
+def _etag(st: os.stat_result) -> str:
+    return '"' + hashlib.md5(f"{st.st_mtime}-{st.st_size}".encode()).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single `bytes=` range into inclusive (start, end). None = unsatisfiable.
+
+    Multi-range requests are answered with the first range only.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+    first = spec.split(",")[0].strip()
+    start_s, _, end_s = first.partition("-")
+    try:
+        if start_s == "":
+            length = int(end_s)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def serve_static(request: Request, file_path: Path) -> Response:
+    """Serve a file with conditional-GET (304) and single-range (206) support."""
+    st = file_path.stat()
+    if not stat.S_ISREG(st.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+    etag = _etag(st)
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(st.st_mtime, usegmt=True),
+        "accept-ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, st.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == etag):
+        byte_range = _parse_range(range_header, st.st_size)
+        if byte_range is None:
+            return Response(
+                status_code=416, headers={**headers, "content-range": f"bytes */{st.st_size}"}
+            )
+        start, end = byte_range
+
+        async def _read_range():
+            import aiofiles
+
+            remaining = end - start + 1
+            async with aiofiles.open(file_path, "rb") as f:
+                await f.seek(start)
+                while remaining > 0:
+                    chunk = await f.read(min(STATIC_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+        import mimetypes
+
+        media_type = mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
+        return StreamingResponse(
+            _read_range(),
+            status_code=206,
+            media_type=media_type,
+            headers={
+                **headers,
+                "content-range": f"bytes {start}-{end}/{st.st_size}",
+                "content-length": str(end - start + 1),
+            },
+        )
+
+    return FileResponse(str(file_path), headers=headers, stat_result=st)
@@ -168,6 +168,20 @@ def get_current_user_optional(request) -> str | None:
         return None
 
 
+def get_user_from_token(token: str) -> str | None:
+    """Return the user for a raw JWT, or None if it is missing or invalid.
+
+    For transports that cannot carry an Authorization header (WebSocket
+    upgrades from browsers pass ?token=<jwt> instead).
+    """
+    if not token:
+        return None
+    try:
+        return _validate_jwt(token).user
+    except HTTPException:
+        return None
+
+
 def require_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> AuthContext:
@@ -0,0 +1,193 @@
+"""
+Intelligence event log — fixed-capacity ring buffer with sequence cursors.
+
+Every event gets a monotonically increasing ``seq``. Readers keep the last
+seq they saw and ask for ``since(seq)`` to get only what they missed, so a
+dashboard reconnecting after a network blip (or a server restart) catches up
+incrementally instead of re-downloading the whole buffer.
+
+When a path is given the log is also appended to a JSONL file. On first use
+the tail of that file is replayed into the buffer and the sequence resumes
+where it left off. Once the file grows past max_file_bytes it is compacted
+down to the events still in the buffer; the next compaction waits until the
+file has doubled again, so a buffer larger than the cap is not rewritten on
+every append. Async callers use append_async() and load(), which do the file
+I/O in a worker thread.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("frood.event_log")
+
+
+class IntelligenceEventLog:
+    """Ring buffer of intelligence events, optionally persisted to JSONL."""
+
+    def __init__(
+        self,
+        capacity: int = 200,
+        path: str | Path | None = None,
+        max_file_bytes: int = 1024 * 1024,
+    ):
+        self.capacity = max(1, capacity)
+        self.max_file_bytes = max_file_bytes
+        self._path = Path(path) if path else None
+        self._events: deque[dict[str, Any]] = deque(maxlen=self.capacity)
+        self._seq = 0
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._file = None
+        self._pending: list[dict[str, Any]] = []
+        self._pending_lock = threading.Lock()  # held briefly, never across I/O
+        self._write_lock = threading.Lock()
+        self._compact_at = max_file_bytes
+
+    # -- Writes ---------------------------------------------------------------
+
+    def append(self, event_type: str, data: dict) -> dict[str, Any]:
+        """Record an event and return it (with its seq and timestamp)."""
+        event = self._record(event_type, data)
+        self.flush()
+        return event
+
+    async def append_async(self, event_type: str, data: dict) -> dict[str, Any]:
+        """append() for the event loop: loading and file writes run in a thread."""
+        await self.load()
+        event = self._record(event_type, data)
+        if self._path is not None:
+            await asyncio.to_thread(self.flush)
+        return event
+
+    def _record(self, event_type: str, data: dict) -> dict[str, Any]:
+        self._ensure_loaded()
+        self._seq += 1
+        event = {"seq": self._seq, "type": event_type, "data": data, "ts": time.time()}
+        self._events.append(event)
+        if self._path is not None:
+            with self._pending_lock:
+                self._pending.append(event)
+        return event
+
+    def flush(self) -> None:
+        """Write queued events to the file, in seq order."""
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                if self._file is None:
+                    self._path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self._path, "a", encoding="utf-8")  # noqa: SIM115
+                self._file.write("".join(json.dumps(e, default=str) + "\n" for e in pending))
+                self._file.flush()
+                if self._file.tell() > self._compact_at:
+                    self._compact()
+            except OSError as e:
+                logger.error(f"Failed to write intelligence event log: {e}")
+
+    def _compact(self) -> None:
+        """Rewrite the file with just the buffered events (atomic replace)."""
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for event in list(self._events):
+                f.write(json.dumps(event, default=str) + "\n")
+            size = f.tell()
+        self._close_file()
+        os.replace(tmp, self._path)
+        self._compact_at = max(self.max_file_bytes, 2 * size)
+
+    # -- Reads ----------------------------------------------------------------
+
+    @property
+    def latest_seq(self) -> int:
+        self._ensure_loaded()
+        return self._seq
+
+    @property
+    def oldest_seq(self) -> int:
+        """Seq of the oldest buffered event (latest_seq + 1 when empty)."""
+        self._ensure_loaded()
+        return self._events[0]["seq"] if self._events else self._seq + 1
+
+    def since(self, seq: int = 0, limit: int | None = None) -> list[dict[str, Any]]:
+        """Events with seq greater than ``seq``, oldest first."""
+        self._ensure_loaded()
+        if not self._events or seq >= self._seq:
+            return []
+        # Walk back from the newest event: cost is proportional to the delta,
+        # not to the buffer size.
+        delta = list(itertools.takewhile(lambda e: e["seq"] > seq, reversed(self._events)))
+        delta.reverse()
+        return delta[:limit] if limit is not None else delta
+
+    def recent(self) -> list[dict[str, Any]]:
+        """All buffered events, newest first."""
+        self._ensure_loaded()
+        return list(reversed(self._events))
+
+    def missed(self, seq: int) -> bool:
+        """True when events after ``seq`` have already been evicted."""
+        return seq + 1 < self.oldest_seq and seq < self.latest_seq
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._events)
+
+    # -- Persistence ----------------------------------------------------------
+
+    async def load(self) -> None:
+        """Replay the file tail in a worker thread; call before reading on the loop."""
+        if not self._loaded:
+            await asyncio.to_thread(self._ensure_loaded)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _load(self) -> None:
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                tail = deque(f, maxlen=self.capacity)
+        except OSError as e:
+            logger.warning(f"Could not read intelligence event log {self._path}: {e}")
+            return
+        for line in tail:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn write from a crash
+            seq = event.get("seq")
+            if not isinstance(seq, int) or seq <= self._seq:
+                continue
+            self._events.append(event)
+            self._seq = seq
+        if self._events:
+            logger.info(f"Restored {len(self._events)} intelligence events (seq {self._seq})")
+
+    def close(self) -> None:
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            finally:
+                self._file = None
@@ -58,6 +58,7 @@ const state = {
   reportsTab: "overview",
   // Activity Feed
   activityEvents: [],
+  activitySeq: 0,
   // Tool/skill search state
   _toolSearch: "",
   _skillSearch: "",
@@ -461,7 +462,9 @@ let wsRetries = 0;
 function connectWS() {
   if (!state.token) return;
   const proto = location.protocol === "https:" ? "wss:" : "ws:";
-  ws = new WebSocket(`${proto}//${location.host}/ws?token=${state.token}`);
+  // since= asks the server to replay activity events missed while disconnected
+  const since = state.activitySeq ? `&since=${state.activitySeq}` : "";
+  ws = new WebSocket(`${proto}//${location.host}/ws?token=${state.token}${since}`);
 
   ws.onopen = () => {
     state.wsConnected = true;
@@ -496,8 +499,13 @@ function handleWSMessage(msg) {
     else state.apps.unshift(msg.data);
     if (state.page === "apps") renderApps();
   } else if (msg.type === "intelligence_event") {
+    if (msg.data.seq && msg.data.seq <= state.activitySeq) return;
+    state.activitySeq = msg.data.seq || state.activitySeq;
     state.activityEvents = [msg.data, ...(state.activityEvents || [])].slice(0, 200);
     if (state.page === "activity") renderActivity();
+  } else if (msg.type === "intelligence_sync" && msg.data.reset) {
+    // Cursor fell outside the server buffer (or the server restarted)
+    loadActivity().then(() => { if (state.page === "activity") renderActivity(); });
   }
 }
 
@@ -1973,6 +1981,7 @@ async function loadActivity() {
   try {
     const data = await api("/activity");
     state.activityEvents = (data && data.events) || [];
+    state.activitySeq = (data && data.latest_seq) || 0;
   } catch { state.activityEvents = []; }
 }
 
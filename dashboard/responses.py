@@ -0,0 +1,24 @@
+"""Response classes shared by the dashboard and sidecar apps."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """StreamingResponse that awaits on_close once the response is over.
+
+    Unlike a cleanup in the body generator, this also runs when the body is
+    never iterated — e.g. the client is gone before the first byte is sent.
+    """
+
+    def __init__(self, content: Any, on_close: Callable[[], Awaitable[None]], **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self._on_close = on_close
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._on_close()
@@ -34,6 +34,14 @@ from pydantic import BaseModel
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from core.config import Settings, settings
+from core.llm_cache import (
+    CachedResponse,
+    LLMResponseCache,
+    cache_key,
+    cached_from_sse,
+    completion_to_sse,
+    is_cacheable,
+)
 from dashboard.auth import (
     AuthContext,
     check_rate_limit,
@@ -43,6 +51,8 @@ from dashboard.auth import (
     require_admin,
     verify_password,
 )
+from dashboard.event_log import IntelligenceEventLog
+from dashboard.responses import ClosingStreamingResponse
 from dashboard.websocket_manager import WebSocketManager
 
 logger = logging.getLogger("frood.server")
@@ -394,6 +404,7 @@ def create_app(
     app_manager=None,
     memory_store=None,
     effectiveness_store=None,
+    channel_manager=None,
 ) -> FastAPI:
     """Build and return the FastAPI application."""
 
@@ -459,21 +470,61 @@ def create_app(
     # Routing tier request counters -- consumed by /api/reports
     _routing_stats = {"L1": 0, "L2": 0, "free": 0}
 
-    # Intelligence event ring buffer (in-memory, last 200 events)
-    _intelligence_events: list[dict] = []
-    _INTELLIGENCE_MAX = 200
+    # Intelligence event ring buffer with seq cursors. Built on first use so
+    # app construction touches no files; persisted when INTELLIGENCE_EVENTS_PATH is set.
+    app.state.intelligence_events = None
+
+    def _intelligence_log() -> IntelligenceEventLog:
+        if app.state.intelligence_events is None:
+            try:
+                app.state.intelligence_events = IntelligenceEventLog(
+                    capacity=int(settings.intelligence_events_max),
+                    path=settings.intelligence_events_path or None,
+                    max_file_bytes=int(settings.intelligence_events_max_kb) * 1024,
+                )
+            except Exception as e:
+                logger.warning(f"Intelligence event log unavailable, keeping in memory: {e}")
+                app.state.intelligence_events = IntelligenceEventLog()
+        return app.state.intelligence_events
 
     async def _record_intelligence_event(event_type: str, data: dict) -> None:
         """Append intelligence event to ring buffer and broadcast via WebSocket."""
-        import time as _ti
-
-        event = {"type": event_type, "data": data, "ts": _ti.time()}
-        _intelligence_events.append(event)
-        if len(_intelligence_events) > _INTELLIGENCE_MAX:
-            _intelligence_events.pop(0)
+        event = await _intelligence_log().append_async(event_type, data)
         if ws_manager:
             await ws_manager.broadcast("intelligence_event", event)
 
+    @app.on_event("shutdown")
+    async def _close_intelligence_log():
+        if app.state.intelligence_events is not None:
+            await asyncio.to_thread(app.state.intelligence_events.close)
+
+    @app.on_event("shutdown")
+    async def _close_mcp_pool():
+        try:
+            from tools.mcp_client import shutdown_mcp_manager
+        except ImportError:  # mcp SDK not installed, so no pool was ever started
+            return
+        await shutdown_mcp_manager()
+
+    # Opt-in response cache for the /llm/v1 proxy routes (LLM_CACHE_ENABLED).
+    # Opened on first cacheable request so app construction touches no files.
+    app.state.llm_cache = None
+
+    def _llm_cache_key(kind: str, body: dict) -> str | None:
+        """Return the cache key for a proxy request, or None when it must go upstream."""
+        if app.state.llm_cache is None:
+            if not settings.llm_cache_enabled:
+                return None
+            app.state.llm_cache = LLMResponseCache(
+                settings.llm_cache_db,
+                ttl=settings.llm_cache_ttl,
+                max_entries=settings.llm_cache_max_entries,
+                max_bytes=settings.llm_cache_max_mb * 1024 * 1024,
+            )
+        if not is_cacheable(kind, body):
+            return None
+        return cache_key(kind, body)
+
     # Apply persisted tool/skill toggle state
     _toggle_state = _load_toggle_state()
     if tool_registry:
@@ -508,6 +559,10 @@ def create_app(
             "tasks_pending": 0,
             "tasks_running": 0,
             "websocket_connections": ws_manager.connection_count if ws_manager else 0,
+            # Per-client send queue depth, lag and drop counters
+            "websocket_clients": ws_manager.client_stats() if ws_manager else [],
+            # Per-conversation channel dispatch backlog and drop counters
+            "channel_dispatch": channel_manager.dispatch_stats() if channel_manager else {},
         }
 
     @app.get("/api/setup/status")
@@ -733,6 +788,8 @@ def create_app(
 
         import aiofiles as _aiofiles_ts
 
+        from tools.web_cache import web_cache_stats
+
         project_root = Path(__file__).parent.parent
         stats_path = project_root / ".claude" / ".jcodemunch-stats.json"
 
@@ -765,6 +822,8 @@ def create_app(
                 "session_start": jcm_stats.get("session_start"),
                 "last_updated": jcm_stats.get("last_updated"),
             },
+            "llm_cache": app.state.llm_cache.stats() if app.state.llm_cache else None,
+            "web_cache": web_cache_stats(),
         }
 
     # -- Reports (admin analytics) -------------------------------------------
@@ -963,6 +1022,10 @@ def create_app(
                 "total_estimated_usd": total_cost,
                 "by_model": llm_usage,  # same list, includes estimated_cost_usd
                 "flat_rate": flat_rates,  # flat-rate provider costs
+                # Estimated upstream cost avoided by LLM proxy cache hits / coalescing
+                "cache_saved_usd": (
+                    app.state.llm_cache.stats()["saved_cost_usd"] if app.state.llm_cache else 0.0
+                ),
             },
             "connectivity": connectivity,
             "model_performance": model_perf,
@@ -1101,9 +1164,31 @@ def create_app(
         }
 
     @app.get("/api/activity")
-    async def get_activity(_: AuthContext = Depends(require_admin)):
-        """Return recent intelligence events (last 200, newest first)."""
-        return {"events": list(reversed(_intelligence_events))}
+    async def get_activity(
+        since: int | None = None,
+        limit: int | None = None,
+        _: AuthContext = Depends(require_admin),
+    ):
+        """Return recent intelligence events, newest first.
+
+        With ``since``, only events whose seq is greater are returned. ``reset``
+        is true when the cursor predates the buffer (or a restart) and the
+        client should replace its list instead of merging.
+        """
+        log = _intelligence_log()
+        await log.load()
+        if since is None:
+            events = log.recent()
+            reset = True
+        else:
+            events = log.since(since)
+            reset = since > log.latest_seq or log.missed(since)
+            if reset:
+                events = log.since(0)
+            events.reverse()
+        if limit is not None and limit > 0:
+            events = events[:limit]
+        return {"events": events, "latest_seq": log.latest_seq, "reset": reset}
 
     # ── Cross-provider capability routing helpers ─────────────────────────
 
@@ -1575,91 +1660,170 @@ def create_app(
                 },
             )
 
+            ckey = _llm_cache_key("chat-tools", forwarded_body)
+            llm_cache = app.state.llm_cache
+
             if wants_stream:
                 # Streaming passthrough: open a streaming request to the upstream and
                 # forward chunks byte-for-byte to the client.
+                from core.llm_streaming import open_chat_stream
+
+                sse_headers = {
+                    "Cache-Control": "no-cache",
+                    "Connection": "keep-alive",
+                    "X-Accel-Buffering": "no",
+                }
+
+                # Cached or coalesced: replay the stored chunks instead of going upstream.
+                leader = False
+                if ckey:
+                    cached = await llm_cache.get(ckey)
+                    cache_source = "hit"
+                    if cached is None:
+                        inflight = llm_cache.join(ckey)
+                        leader = inflight is None
+                        cached = await llm_cache.wait(inflight) if inflight else None
+                        cache_source = "coalesced"
+                    if cached is not None:
+                        await _record_intelligence_event(
+                            "cache", {"model": upstream_model, "source": cache_source}
+                        )
+
+                        async def _replay_cached():
+                            for frame in cached.chunks or completion_to_sse(cached.payload):
+                                yield frame
+
+                        return StreamingResponse(
+                            _replay_cached(),
+                            media_type="text/event-stream",
+                            headers={**sse_headers, "X-Frood-Cache": cache_source},
+                        )
+
+                started = False
+
+                async def _release_if_unstarted() -> None:
+                    # The generator's finally only runs if the body was iterated.
+                    if leader and not started:
+                        llm_cache.release(ckey)
+
                 async def _stream_from_upstream():
-                    timeout = _httpx.Timeout(connect=15.0, read=300.0, write=30.0, pool=10.0)
-                    async with _httpx.AsyncClient(timeout=timeout, http2=True) as client:
-                        async with client.stream(
-                            "POST",
-                            endpoint,
-                            headers={
-                                "Authorization": f"Bearer {upstream_key}",
-                                "Content-Type": "application/json",
-                                "Accept": "text/event-stream",
-                            },
-                            json=forwarded_body,
-                        ) as resp:
-                            if resp.status_code != 200:
-                                err_text = (await resp.aread()).decode("utf-8", errors="replace")[
-                                    :500
-                                ]
-                                err_chunk = _json.dumps(
-                                    {
-                                        "error": {
-                                            "message": f"Upstream {resp.status_code}: {err_text}",
-                                            "type": "upstream_error",
+                    nonlocal started
+                    started = True
+                    recorded: list[bytes] | None = [] if leader else None
+                    stored: CachedResponse | None = None
+                    try:
+                        timeout = _httpx.Timeout(connect=15.0, read=300.0, write=30.0, pool=10.0)
+                        async with _httpx.AsyncClient(timeout=timeout, http2=True) as client:
+                            async with open_chat_stream(
+                                client, endpoint, upstream_key, forwarded_body
+                            ) as resp:
+                                if resp.status_code != 200:
+                                    err_text = (await resp.aread()).decode(
+                                        "utf-8", errors="replace"
+                                    )[:500]
+                                    err_chunk = _json.dumps(
+                                        {
+                                            "error": {
+                                                "message": f"Upstream {resp.status_code}: {err_text}",
+                                                "type": "upstream_error",
+                                            }
                                         }
-                                    }
-                                )
-                                yield f"data: {err_chunk}\n\n".encode()
-                                yield b"data: [DONE]\n\n"
-                                return
-                            async for chunk in resp.aiter_bytes():
-                                if chunk:
-                                    yield chunk
-
-                return StreamingResponse(
+                                    )
+                                    yield f"data: {err_chunk}\n\n".encode()
+                                    yield b"data: [DONE]\n\n"
+                                    return
+                                async for chunk in resp.aiter_bytes():
+                                    if chunk:
+                                        if recorded is not None:
+                                            recorded.append(chunk)
+                                        yield chunk
+                        if recorded:
+                            stored = cached_from_sse(
+                                b"".join(recorded).decode("utf-8", errors="replace")
+                            )
+                    finally:
+                        if leader:
+                            await llm_cache.finish(ckey, stored)
+
+                return ClosingStreamingResponse(
                     _stream_from_upstream(),
+                    on_close=_release_if_unstarted,
                     media_type="text/event-stream",
-                    headers={
-                        "Cache-Control": "no-cache",
-                        "Connection": "keep-alive",
-                        "X-Accel-Buffering": "no",
-                    },
+                    headers=sse_headers,
                 )
             else:
                 # Non-streaming passthrough
                 timeout = _httpx.Timeout(connect=15.0, read=180.0, write=30.0, pool=10.0)
-                try:
-                    async with _httpx.AsyncClient(timeout=timeout, http2=True) as client:
-                        resp = await client.post(
-                            endpoint,
-                            headers={
-                                "Authorization": f"Bearer {upstream_key}",
-                                "Content-Type": "application/json",
-                            },
-                            json=forwarded_body,
+                upstream_errors: list[JSONResponse] = []
+
+                async def _fetch_completion() -> CachedResponse | None:
+                    try:
+                        async with _httpx.AsyncClient(timeout=timeout, http2=True) as client:
+                            resp = await client.post(
+                                endpoint,
+                                headers={
+                                    "Authorization": f"Bearer {upstream_key}",
+                                    "Content-Type": "application/json",
+                                },
+                                json=forwarded_body,
+                            )
+                            if resp.status_code != 200:
+                                upstream_errors.append(
+                                    JSONResponse(
+                                        status_code=resp.status_code,
+                                        content={
+                                            "error": {
+                                                "message": f"Upstream {resp.status_code}: {resp.text[:500]}",
+                                                "type": "upstream_error",
+                                            }
+                                        },
+                                    )
+                                )
+                                return None
+                            data = resp.json()
+                            return CachedResponse(payload=data, usage=data.get("usage") or {})
+                    except _httpx.TimeoutException:
+                        upstream_errors.append(
+                            JSONResponse(
+                                status_code=504,
+                                content={
+                                    "error": {
+                                        "message": "Upstream timed out",
+                                        "type": "upstream_timeout",
+                                    }
+                                },
+                            )
                         )
-                        if resp.status_code != 200:
-                            return JSONResponse(
-                                status_code=resp.status_code,
+                    except Exception as e:
+                        upstream_errors.append(
+                            JSONResponse(
+                                status_code=500,
                                 content={
                                     "error": {
-                                        "message": f"Upstream {resp.status_code}: {resp.text[:500]}",
-                                        "type": "upstream_error",
+                                        "message": f"Passthrough error: {e}",
+                                        "type": "internal_error",
                                     }
                                 },
                             )
-                        return JSONResponse(content=resp.json())
-                except _httpx.TimeoutException:
-                    return JSONResponse(
-                        status_code=504,
-                        content={
-                            "error": {"message": "Upstream timed out", "type": "upstream_timeout"}
-                        },
-                    )
-                except Exception as e:
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "error": {
-                                "message": f"Passthrough error: {e}",
-                                "type": "internal_error",
-                            }
-                        },
+                        )
+                    return None
+
+                if ckey is None:
+                    fetched = await _fetch_completion()
+                    if fetched is None:
+                        return upstream_errors[-1]
+                    return JSONResponse(content=fetched.payload)
+
+                fetched, cache_source = await llm_cache.get_or_fetch(ckey, _fetch_completion)
+                if fetched is None:
+                    return upstream_errors[-1]
+                if cache_source != "miss":
+                    await _record_intelligence_event(
+                        "cache", {"model": upstream_model, "source": cache_source}
                     )
+                return JSONResponse(
+                    content=fetched.payload, headers={"X-Frood-Cache": cache_source}
+                )
         # ──────────────────────────────────────────────────────────────────────
         # End tool-call passthrough. Text-only path below.
         # ──────────────────────────────────────────────────────────────────────
@@ -1679,7 +1843,9 @@ def create_app(
             else:
                 filtered_messages.append(msg)
 
-        try:
+        failures: list[str] = []
+
+        async def _fetch_text() -> CachedResponse | None:
             # Smart routing: best available provider+model, fallback on credit errors
             text, provider_used = await _chat_complete(
                 system_prompt=system_msg,
@@ -1687,11 +1853,44 @@ def create_app(
                 user_query=filtered_messages[-1].get("content", "") if filtered_messages else "",
                 model=chat_model,
             )
+            if not text or text.startswith("All providers failed"):
+                failures.append(text)
+                return None
+            # The routed providers report no token usage: estimate ~4 chars/token.
+            prompt_chars = len(system_msg) + sum(
+                len(str(m.get("content") or "")) for m in filtered_messages
+            )
+            return CachedResponse(
+                payload={"text": text, "provider": provider_used, "model": chat_model},
+                usage={"prompt_tokens": prompt_chars // 4, "completion_tokens": len(text) // 4},
+            )
+
+        ckey = _llm_cache_key("chat", {**body, "model": chat_model})
+        try:
+            if ckey is None:
+                fetched, cache_source = await _fetch_text(), "miss"
+            else:
+                fetched, cache_source = await app.state.llm_cache.get_or_fetch(ckey, _fetch_text)
         except Exception as e:
             return {"error": {"message": str(e), "type": "internal_error"}}
 
-        if not text or text.startswith("All providers failed"):
+        if fetched is None:
+            text = failures[-1] if failures else ""
             return {"error": {"message": text or "No response", "type": "server_error"}}
+        text = fetched.payload["text"]
+        provider_used = fetched.payload["provider"]
+        # Hits and coalesced answers cost no upstream tokens; X-Frood-Cache marks them.
+        prompt_tokens = completion_tokens = 0
+        if cache_source == "miss":
+            prompt_tokens = fetched.usage.get("prompt_tokens", 0) or 0
+            completion_tokens = fetched.usage.get("completion_tokens", 0) or 0
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if cache_source != "miss":
+            await _record_intelligence_event("cache", {"model": chat_model, "source": cache_source})
 
         # Determine routing tier for telemetry. Uses the live classifier buckets
         # (PROVIDER_TIERS) so tier labels stay accurate as catalogs change.
@@ -1790,11 +1989,7 @@ def create_app(
                             "finish_reason": "stop",
                         }
                     ],
-                    "usage": {
-                        "prompt_tokens": 0,
-                        "completion_tokens": len(text),
-                        "total_tokens": len(text),
-                    },
+                    "usage": usage,
                 }
                 yield f"data: {_json.dumps(final_chunk)}\n\n"
 
@@ -1808,30 +2003,30 @@ def create_app(
                     "Cache-Control": "no-cache",
                     "Connection": "keep-alive",
                     "X-Accel-Buffering": "no",
+                    "X-Frood-Cache": cache_source,
                 },
             )
 
-        return {
-            "id": _chatcmpl_id,
-            "object": "chat.completion",
-            "created": _created_ts,
-            "model": chat_model,
-            "choices": [
-                {
-                    "index": 0,
-                    "message": {
-                        "role": "assistant",
-                        "content": text,
-                    },
-                    "finish_reason": "stop",
-                }
-            ],
-            "usage": {
-                "prompt_tokens": 0,
-                "completion_tokens": len(text),
-                "total_tokens": len(text),
+        return JSONResponse(
+            content={
+                "id": _chatcmpl_id,
+                "object": "chat.completion",
+                "created": _created_ts,
+                "model": chat_model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": text,
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
             },
-        }
+            headers={"X-Frood-Cache": cache_source},
+        )
 
     @app.post("/llm/v1/messages")
     async def llm_messages(request: Request):
@@ -2101,37 +2296,66 @@ def create_app(
         )
 
         timeout = _httpx.Timeout(connect=15.0, read=120.0, write=30.0, pool=10.0)
-        try:
-            async with _httpx.AsyncClient(timeout=timeout, http2=True) as client:
-                resp = await client.post(
-                    endpoint,
-                    headers={
-                        "Authorization": f"Bearer {upstream_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json=forwarded_body,
+        upstream_errors: list[JSONResponse] = []
+
+        async def _fetch_embeddings() -> CachedResponse | None:
+            try:
+                async with _httpx.AsyncClient(timeout=timeout, http2=True) as client:
+                    resp = await client.post(
+                        endpoint,
+                        headers={
+                            "Authorization": f"Bearer {upstream_key}",
+                            "Content-Type": "application/json",
+                        },
+                        json=forwarded_body,
+                    )
+                    if resp.status_code != 200:
+                        upstream_errors.append(
+                            JSONResponse(
+                                status_code=resp.status_code,
+                                content={
+                                    "error": {
+                                        "message": f"Upstream {resp.status_code}: {resp.text[:500]}",
+                                        "type": "upstream_error",
+                                    }
+                                },
+                            )
+                        )
+                        return None
+                    data = resp.json()
+                    return CachedResponse(payload=data, usage=data.get("usage") or {})
+            except _httpx.TimeoutException:
+                upstream_errors.append(
+                    JSONResponse(
+                        status_code=504,
+                        content={
+                            "error": {"message": "Upstream timed out", "type": "upstream_timeout"}
+                        },
+                    )
                 )
-                if resp.status_code != 200:
-                    return JSONResponse(
-                        status_code=resp.status_code,
+            except Exception as e:
+                upstream_errors.append(
+                    JSONResponse(
+                        status_code=500,
                         content={
                             "error": {
-                                "message": f"Upstream {resp.status_code}: {resp.text[:500]}",
-                                "type": "upstream_error",
+                                "message": f"Passthrough error: {e}",
+                                "type": "internal_error",
                             }
                         },
                     )
-                return JSONResponse(content=resp.json())
-        except _httpx.TimeoutException:
-            return JSONResponse(
-                status_code=504,
-                content={"error": {"message": "Upstream timed out", "type": "upstream_timeout"}},
-            )
-        except Exception as e:
-            return JSONResponse(
-                status_code=500,
-                content={"error": {"message": f"Passthrough error: {e}", "type": "internal_error"}},
-            )
+                )
+            return None
+
+        ckey = _llm_cache_key("embeddings", forwarded_body)
+        if ckey is None:
+            fetched, cache_source = await _fetch_embeddings(), "miss"
+        else:
+            fetched, cache_source = await app.state.llm_cache.get_or_fetch(ckey, _fetch_embeddings)
+        if fetched is None:
+            return upstream_errors[-1]
+        headers = {"X-Frood-Cache": cache_source} if ckey else None
+        return JSONResponse(content=fetched.payload, headers=headers)
 
     @app.get("/llm/config")
     async def llm_config():
@@ -3258,7 +3482,26 @@ Focus on learnings that would help in future similar sessions."""
             await ws.close(code=1011, reason="Server error")
             return
 
+        since = ws.query_params.get("since")
+        if since is not None and since.isdigit():
+            # Read the persisted log off the loop before connecting.
+            await _intelligence_log().load()
+
         await ws_manager.connect(ws, user=user)
+
+        # ?since=<seq>: replay intelligence events missed while disconnected.
+        # Queued before any await so live broadcasts cannot overtake the replay.
+        if since is not None and since.isdigit():
+            log = _intelligence_log()
+            cursor = int(since)
+            reset = cursor > log.latest_seq or log.missed(cursor)
+            ws_manager.send_to(
+                ws, "intelligence_sync", {"latest_seq": log.latest_seq, "reset": reset}
+            )
+            if not reset:
+                for event in log.since(cursor):
+                    ws_manager.send_to(ws, "intelligence_event", event)
+
         try:
             while True:
                 data = await ws.receive_text()
@@ -3274,6 +3517,19 @@ Focus on learnings that would help in future similar sessions."""
     # -- Apps Platform ---------------------------------------------------------
 
     if app_manager:
+        from dashboard.app_proxy import AppProxyPool, proxy_http, proxy_websocket, serve_static
+
+        # Keep-alive clients per app port, shared by every proxied request
+        app_proxy_pool = AppProxyPool()
+
+        @app.on_event("shutdown")
+        async def _close_app_proxy_pool():
+            await app_proxy_pool.aclose()
+
+        async def _discard_app_connections(app_id: str) -> None:
+            found = await app_manager.get(app_id)
+            if found and found.port:
+                await app_proxy_pool.discard(found.port)
 
         class AppCreateRequest(BaseModel):
             name: str
@@ -3331,6 +3587,7 @@ Focus on learnings that would help in future similar sessions."""
         async def stop_app(app_id: str, _user: str = Depends(get_current_user)):
             """Stop a running app."""
             try:
+                await _discard_app_connections(app_id)
                 await app_manager.stop(app_id)
                 return {"status": "stopped"}
             except ValueError as e:
@@ -3340,6 +3597,7 @@ Focus on learnings that would help in future similar sessions."""
         async def restart_app(app_id: str, _user: str = Depends(get_current_user)):
             """Restart an app."""
             try:
+                await _discard_app_connections(app_id)
                 restarted = await app_manager.restart(app_id)
                 return {"status": "restarted", "url": restarted.url}
             except ValueError as e:
@@ -3412,7 +3670,7 @@ Focus on learnings that would help in future similar sessions."""
 
         @app.api_route(
             "/apps/{slug}/{path:path}",
-            methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+            methods=["GET", "HEAD", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
         )
         async def proxy_app_with_path(slug: str, path: str, request: Request):
             """Reverse proxy requests to running app processes."""
@@ -3430,6 +3688,28 @@ Focus on learnings that would help in future similar sessions."""
 
             return RedirectResponse(url=f"/apps/{slug}/")
 
+        @app.websocket("/apps/{slug}/{path:path}")
+        async def proxy_app_websocket(ws: WebSocket, slug: str, path: str):
+            """Pass WebSocket upgrades through to running app processes."""
+            found = app_manager.get_by_slug(slug)
+            if not found or found.status != "running" or found.runtime == "static":
+                await ws.close(code=4004, reason=f"App '{slug}' is not running")
+                return
+
+            # Browsers cannot set headers on WebSocket upgrades, so also accept
+            # ws://host/apps/<slug>/...?token=<jwt> like the dashboard /ws.
+            if found.require_auth:
+                from dashboard.auth import get_current_user_optional, get_user_from_token
+
+                user = get_current_user_optional(ws) or get_user_from_token(
+                    ws.query_params.get("token", "")
+                )
+                if not user:
+                    await ws.close(code=4001, reason="Authentication required")
+                    return
+
+            await proxy_websocket(ws, found.port, path)
+
         async def _proxy_to_app(slug: str, path: str, request: Request):
             """Internal: forward request to the app's local port."""
             found = app_manager.get_by_slug(slug)
@@ -3454,15 +3734,13 @@ Focus on learnings that would help in future similar sessions."""
 
             # Static apps: serve files directly
             if found.runtime == "static":
-                from starlette.responses import FileResponse
-
                 app_path = Path(found.path)
                 public_dir = app_path / "public"
                 if not public_dir.exists():
                     raise HTTPException(status_code=404, detail="App public directory not found")
 
                 file_path = public_dir / path if path else public_dir / "index.html"
-                if not file_path.exists():
+                if not file_path.is_file():
                     file_path = public_dir / "index.html"  # SPA fallback
                 if not file_path.exists():
                     raise HTTPException(status_code=404, detail="File not found")
@@ -3473,44 +3751,10 @@ Focus on learnings that would help in future similar sessions."""
                 except ValueError:
                     raise HTTPException(status_code=403, detail="Access denied")
 
-                return FileResponse(str(file_path))
-
-            # Dynamic apps: proxy to their port
-            import httpx
-
-            target_url = f"http://127.0.0.1:{found.port}/{path}"
-            try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    # Forward the request
-                    body = await request.body()
-                    headers = dict(request.headers)
-                    headers.pop("host", None)
-
-                    resp = await client.request(
-                        method=request.method,
-                        url=target_url,
-                        headers=headers,
-                        content=body,
-                        params=dict(request.query_params),
-                    )
-
-                    # Filter response headers
-                    resp_headers = dict(resp.headers)
-                    resp_headers.pop("transfer-encoding", None)
-                    resp_headers.pop("content-encoding", None)
+                return serve_static(request, file_path)
 
-                    return Response(
-                        content=resp.content,
-                        status_code=resp.status_code,
-                        headers=resp_headers,
-                    )
-            except httpx.ConnectError:
-                raise HTTPException(
-                    status_code=502,
-                    detail=f"App '{slug}' is not responding on port {found.port}",
-                )
-            except httpx.TimeoutException:
-                raise HTTPException(status_code=504, detail=f"App '{slug}' timed out")
+            # Dynamic apps: stream to/from their port over a pooled connection
+            return await proxy_http(app_proxy_pool, found.port, path, request, slug=slug)
 
     # -- Static files (React frontend) ----------------------------------------
 
@@ -3,6 +3,7 @@
 create_sidecar_app() returns a FastAPI instance with only sidecar routes:
 - GET  /sidecar/health                    — public, no auth (D-05)
 - POST /sidecar/execute                   — Bearer auth required (D-04)
+- POST /sidecar/execute/stream            — Bearer auth required, SSE event stream
 - POST /memory/recall                     — Bearer auth required (MEM-04, D-13)
 - POST /memory/store                      — Bearer auth required (MEM-04, D-14)
 - POST /routing/resolve                   — Bearer auth required (PLUG-04, Phase 28)
@@ -19,18 +20,21 @@ This is a SEPARATE app factory from dashboard/server.py:create_app() per D-01.
 """
 
 import asyncio
+import json
 import logging
 import os
 from typing import Any
 
 from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from core.agent_manager import PROVIDER_MODELS
 from core.config import settings
 from core.memory_bridge import MemoryBridge
 from core.reward_system import TierDeterminator
+from core.sidecar_admission import AdmissionController, AdmissionRejected
+from core.sidecar_idempotency import build_idempotency_store
 from core.sidecar_models import (
     AdapterExecutionContext,
     AgentEffectivenessResponse,
@@ -74,12 +78,15 @@ from core.sidecar_models import (
 )
 from core.sidecar_orchestrator import (
     SidecarOrchestrator,
-    is_duplicate_run,
-    register_run,
-    unregister_run,
+    claim_run,
+    complete_run,
+    get_idempotency_store,
+    release_run,
+    set_idempotency_store,
 )
 from core.tiered_routing_bridge import TieredRoutingBridge
 from dashboard.auth import get_current_user
+from dashboard.responses import ClosingStreamingResponse
 
 logger = logging.getLogger("frood.sidecar")
 
@@ -156,9 +163,72 @@ def create_sidecar_app(
         tool_registry=tool_registry,
     )
 
+    # Run deduplication shared by every worker behind the sidecar port (D-08)
+    set_idempotency_store(
+        build_idempotency_store(
+            settings.sidecar_idempotency_backend,
+            db_path=settings.sidecar_idempotency_db,
+            redis_url=settings.redis_url,
+            redis_password=settings.redis_password,
+        )
+    )
+
+    # Bounded worker slots + priority wait queue in front of the orchestrator
+    admission = AdmissionController(
+        max_workers=settings.sidecar_max_workers,
+        max_queue=settings.sidecar_max_queue,
+        queue_timeout=settings.sidecar_queue_timeout,
+        min_free_memory_mb=settings.sidecar_min_free_memory_mb,
+    )
+    app.state.admission = admission
+
+    def _admission_params(ctx: AdapterExecutionContext) -> tuple[str, float | None]:
+        """Return (tier, deadline) used to order a run in the admission queue.
+
+        Tier comes from the agent's effective reward tier when AgentManager
+        knows the agent. Deadline is an optional epoch timestamp in
+        context.deadline; without one the controller's queue timeout applies.
+        """
+        tier = ""
+        if agent_manager is not None:
+            try:
+                agent = agent_manager.get(ctx.agent_id)
+                if agent is not None:
+                    tier = agent.effective_tier() or ""
+            except Exception:
+                pass
+        deadline = None
+        try:
+            if ctx.context.get("deadline"):
+                deadline = float(ctx.context["deadline"])
+        except (TypeError, ValueError):
+            pass
+        return tier, deadline
+
+    def _shed_response(run_id: str, exc: AdmissionRejected) -> JSONResponse:
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={
+                "status": "rejected",
+                "externalRunId": run_id,
+                "error": exc.reason,
+                "retryAfter": exc.retry_after,
+            },
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.on_event("shutdown")
     async def _shutdown():
         await orchestrator.shutdown()
+        get_idempotency_store().close()
+
+    @app.on_event("shutdown")
+    async def _close_mcp_pool():
+        try:
+            from tools.mcp_client import shutdown_mcp_manager
+        except ImportError:  # mcp SDK not installed, so no pool was ever started
+            return
+        await shutdown_mcp_manager()
 
     # -- Health endpoint (public -- no auth per D-05) --
 
@@ -224,6 +294,8 @@ def create_sidecar_app(
             providers=provider_status,
             providers_detail=providers_detail_list,
             qdrant=qdrant_status,
+            streaming=orchestrator.stream_stats(),
+            admission=admission.stats(),
         )
 
     # -- Models endpoint (public -- no auth, consistent with /sidecar/health) --
@@ -315,21 +387,28 @@ def create_sidecar_app(
     @app.post(
         "/sidecar/execute",
         status_code=200,
+        response_model=None,
     )
     async def sidecar_execute(
         ctx: AdapterExecutionContext,
         _user: str = Depends(get_current_user),
-    ) -> dict:
+    ) -> dict | JSONResponse:
         """Execute a Paperclip heartbeat request synchronously.
 
         Runs the LLM call inline and returns the result directly so the
         adapter can report real output, provider, model, and token usage
         back to Paperclip without needing a callback endpoint.
 
-        Idempotency: if ctx.run_id is already active, returns without re-executing (D-08).
+        Idempotency: if ctx.run_id is already claimed, returns without re-executing
+        (D-08); once the run has completed, retried deliveries get its stored response.
+        Admission: waits for a worker slot; shed runs get 429/503 with Retry-After.
         """
         # Idempotency guard (D-08)
-        if is_duplicate_run(ctx.run_id):
+        claim = await claim_run(ctx.run_id)
+        if not claim.claimed:
+            if claim.result is not None:
+                logger.info("Duplicate run %s — replaying stored result", ctx.run_id)
+                return {**claim.result, "deduplicated": True}
             logger.info("Duplicate run %s — returning cached acceptance", ctx.run_id)
             return {
                 "status": "accepted",
@@ -337,7 +416,16 @@ def create_sidecar_app(
                 "deduplicated": True,
             }
 
-        register_run(ctx.run_id)
+        tier, deadline = _admission_params(ctx)
+        try:
+            await admission.acquire(ctx.run_id, tier=tier, deadline=deadline)
+        except AdmissionRejected as exc:
+            await release_run(ctx.run_id)
+            return _shed_response(ctx.run_id, exc)
+        except BaseException:
+            # Cancelled (client gone) while queued: free the key for a retry.
+            await release_run(ctx.run_id)
+            raise
 
         logger.info(
             "Executing run %s for agent %s (wake_reason=%s)",
@@ -346,9 +434,10 @@ def create_sidecar_app(
             ctx.wake_reason,
         )
 
+        completed = False
         try:
             result = await orchestrator.execute_sync(ctx.run_id, ctx)
-            return {
+            response = {
                 "status": "completed",
                 "externalRunId": ctx.run_id,
                 "deduplicated": False,
@@ -361,6 +450,9 @@ def create_sidecar_app(
                 "input_tokens": result.get("input_tokens", 0),
                 "output_tokens": result.get("output_tokens", 0),
             }
+            await complete_run(ctx.run_id, response)
+            completed = True
+            return response
         except Exception as exc:
             logger.error("Run %s failed: %s", ctx.run_id, exc, exc_info=True)
             return {
@@ -369,7 +461,109 @@ def create_sidecar_app(
                 "error": str(exc),
             }
         finally:
-            unregister_run(ctx.run_id)
+            admission.release(ctx.run_id)
+            # Failed or cancelled runs free the key so Paperclip can retry them.
+            if not completed:
+                await release_run(ctx.run_id)
+
+    @app.post("/sidecar/execute/stream", response_model=None)
+    async def sidecar_execute_stream(
+        ctx: AdapterExecutionContext,
+        _user: str = Depends(get_current_user),
+    ) -> StreamingResponse | JSONResponse:
+        """Execute a Paperclip heartbeat request, streaming progress as SSE.
+
+        Same lifecycle as /sidecar/execute, but emits ``token``,
+        ``tool_call_start``, ``tool_call_finish`` and a final ``result`` (or
+        ``error``) event while the run is in progress. The ``result`` event
+        carries the same fields as the /sidecar/execute response plus ttft_ms.
+        Disconnecting cancels the run.
+        """
+
+        def _frame(event: dict[str, Any]) -> str:
+            return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+        claim = await claim_run(ctx.run_id)
+        if not claim.claimed:
+            stored = claim.result or {"status": "accepted", "externalRunId": ctx.run_id}
+            logger.info("Duplicate run %s — returning %s", ctx.run_id, stored["status"])
+
+            async def _deduplicated():
+                yield _frame({"type": "result", **stored, "deduplicated": True})
+
+            return StreamingResponse(_deduplicated(), media_type="text/event-stream")
+
+        # Admit before the response starts so shed runs still get a real
+        # 429/503 status instead of an error event inside a 200 stream.
+        tier, deadline = _admission_params(ctx)
+        try:
+            await admission.acquire(ctx.run_id, tier=tier, deadline=deadline)
+        except AdmissionRejected as exc:
+            await release_run(ctx.run_id)
+            return _shed_response(ctx.run_id, exc)
+        except BaseException:
+            await release_run(ctx.run_id)
+            raise
+
+        run_state = {"completed": False, "finished": False}
+
+        async def _finish() -> None:
+            # Called when the event stream ends and again when the response is
+            # done — the body may never be iterated if the client is gone first.
+            if run_state["finished"]:
+                return
+            run_state["finished"] = True
+            admission.release(ctx.run_id)
+            if not run_state["completed"]:
+                await release_run(ctx.run_id)
+
+        async def _events():
+            logger.info(
+                "Streaming run %s for agent %s (wake_reason=%s)",
+                ctx.run_id,
+                ctx.agent_id,
+                ctx.wake_reason,
+            )
+            try:
+                async for event in orchestrator.execute_stream(ctx.run_id, ctx):
+                    if event["type"] == "result":
+                        summary = event.get("summary", "")
+                        event = {
+                            "type": "result",
+                            "status": "completed",
+                            "externalRunId": ctx.run_id,
+                            "deduplicated": False,
+                            "output": summary,
+                            "result": summary,
+                            "summary": summary,
+                            "provider": event.get("provider", ""),
+                            "model": event.get("model", ""),
+                            "cost_usd": event.get("cost_usd", 0.0),
+                            "input_tokens": event.get("input_tokens", 0),
+                            "output_tokens": event.get("output_tokens", 0),
+                            "ttft_ms": event.get("ttft_ms"),
+                        }
+                        await complete_run(
+                            ctx.run_id,
+                            {k: v for k, v in event.items() if k not in ("type", "ttft_ms")},
+                        )
+                        run_state["completed"] = True
+                    elif event["type"] == "error":
+                        event = {**event, "status": "failed", "externalRunId": ctx.run_id}
+                    yield _frame(event)
+            finally:
+                await _finish()
+
+        return ClosingStreamingResponse(
+            _events(),
+            on_close=_finish,
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+            },
+        )
 
     # -- Memory recall endpoint (Bearer auth required per D-15) --
 
@@ -1,32 +1,113 @@
 """
 WebSocket connection manager for real-time dashboard updates.
+
+Each connection owns a bounded send queue drained by its own writer task, so
+broadcast() only serializes once and enqueues — a slow browser tab delays
+nobody but itself. What happens when a client's queue is full depends on the
+message type:
+
+- coalesce     — status-style updates; a newer message replaces the queued
+                 one with the same key, so only the latest state is sent
+- drop_oldest  — telemetry; the oldest droppable queued message is discarded
+- never_drop   — chat and prompts to the user; a client that cannot keep up
+                 with these is disconnected instead
+
+A client whose oldest queued message is older than max_lag_seconds is
+disconnected (it reconnects and re-syncs rather than falling further behind).
 """
 
+import asyncio
 import json
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass, field
+from typing import Any
 
 from fastapi import WebSocket
 
 logger = logging.getLogger("frood.websocket")
 
+POLICY_COALESCE = "coalesce"
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_NEVER_DROP = "never_drop"
+
+# Per-event-type drop policy. Types not listed use POLICY_DROP_OLDEST, except
+# chat* types which are never dropped.
+MESSAGE_POLICIES: dict[str, str] = {
+    "agent_progress": POLICY_COALESCE,
+    "agent_notification": POLICY_NEVER_DROP,
+    "agent_input_request": POLICY_NEVER_DROP,
+    "intelligence_event": POLICY_DROP_OLDEST,
+    "intelligence_sync": POLICY_NEVER_DROP,
+}
+
+# Data fields used to tell coalesced updates apart (first one present wins).
+_COALESCE_KEY_FIELDS = ("agent_id", "task_id", "id")
+
+# WebSocket close code 1013 = "Try Again Later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# 1011 = "Internal Error": a send failed or timed out
+SEND_FAILED_CLOSE_CODE = 1011
+
+
+def message_policy(event_type: str) -> str:
+    """Return the drop policy for an event type."""
+    if event_type in MESSAGE_POLICIES:
+        return MESSAGE_POLICIES[event_type]
+    if event_type.startswith("chat"):
+        return POLICY_NEVER_DROP
+    return POLICY_DROP_OLDEST
+
+
+@dataclass
+class _Outgoing:
+    """A queued message. text is replaced in place when coalesced."""
+
+    text: str
+    policy: str
+    coalesce_key: str | None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
 
 @dataclass
 class WSConnection:
-    """A WebSocket connection with identity metadata."""
+    """A WebSocket connection with identity metadata and its send queue."""
 
     ws: WebSocket
     user: str = ""  # authenticated username
     connected_at: float = field(default_factory=time.time)
+    queue: deque = field(default_factory=deque)
+    coalesce_index: dict[str, _Outgoing] = field(default_factory=dict)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    writer: asyncio.Task | None = None
+    sent: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    closing: bool = False
+
+    def lag_seconds(self) -> float:
+        """Age of the oldest unsent message."""
+        if not self.queue:
+            return 0.0
+        return time.monotonic() - self.queue[0].enqueued_at
 
 
 class WebSocketManager:
     """Manages active WebSocket connections and broadcasts events."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_queue: int = 256,
+        max_lag_seconds: float = 15.0,
+        send_timeout: float = 10.0,
+    ):
         self._connections: list[WSConnection] = []
         self.chat_messages: list[dict] = []  # Shared chat history
+        self.max_queue = max_queue
+        self.max_lag_seconds = max_lag_seconds
+        self.send_timeout = send_timeout
+        self.slow_disconnects = 0
 
     @property
     def connection_count(self) -> int:
@@ -39,26 +120,144 @@ class WebSocketManager:
     ):
         await ws.accept()
         conn = WSConnection(ws=ws, user=user)
+        conn.writer = asyncio.create_task(self._writer(conn))
         self._connections.append(conn)
         logger.info(f"WebSocket connected: user={user} ({self.connection_count} total)")
 
     def disconnect(self, ws: WebSocket):
         before = len(self._connections)
+        for conn in self._connections:
+            if conn.ws is ws:
+                self._stop(conn)
         self._connections = [c for c in self._connections if c.ws is not ws]
         if len(self._connections) < before:
             logger.info(f"WebSocket disconnected ({self.connection_count} total)")
 
     async def broadcast(self, event_type: str, data: dict):
-        """Send an event to all connected clients."""
+        """Queue an event for every connected client. Never waits on a socket."""
         message = json.dumps({"type": event_type, "data": data})
-        dead: list[WSConnection] = []
+        policy = message_policy(event_type)
+        coalesce_key = None
+        if policy == POLICY_COALESCE:
+            ident = next((data[f] for f in _COALESCE_KEY_FIELDS if data.get(f)), "")
+            coalesce_key = f"{event_type}:{ident}"
 
-        for conn in self._connections:
+        for conn in list(self._connections):
+            self._enqueue(conn, message, policy, coalesce_key)
+
+    def send_to(self, ws: WebSocket, event_type: str, data: dict) -> None:
+        """Queue an event for a single client (e.g. catch-up after reconnect)."""
+        conn = next((c for c in self._connections if c.ws is ws), None)
+        if conn is None:
+            return
+        message = json.dumps({"type": event_type, "data": data})
+        self._enqueue(conn, message, message_policy(event_type), None)
+
+    # -- Per-connection queue ---------------------------------------------------
+
+    def _enqueue(
+        self, conn: WSConnection, message: str, policy: str, coalesce_key: str | None
+    ) -> None:
+        if conn.closing:
+            return
+        if conn.lag_seconds() > self.max_lag_seconds:
+            self._drop_slow(conn, f"lagging {conn.lag_seconds():.1f}s")
+            return
+
+        if coalesce_key is not None:
+            pending = conn.coalesce_index.get(coalesce_key)
+            if pending is not None:
+                pending.text = message
+                conn.coalesced += 1
+                return
+
+        if len(conn.queue) >= self.max_queue and not self._evict_one(conn):
+            # Everything queued is never-drop: the client cannot keep up.
+            self._drop_slow(conn, f"queue full ({self.max_queue})")
+            return
+
+        item = _Outgoing(text=message, policy=policy, coalesce_key=coalesce_key)
+        conn.queue.append(item)
+        if coalesce_key is not None:
+            conn.coalesce_index[coalesce_key] = item
+        conn.wakeup.set()
+
+    def _evict_one(self, conn: WSConnection) -> bool:
+        """Discard the oldest droppable queued message. False if none can go."""
+        for item in conn.queue:
+            if item.policy != POLICY_NEVER_DROP:
+                conn.queue.remove(item)
+                if item.coalesce_key is not None:
+                    conn.coalesce_index.pop(item.coalesce_key, None)
+                conn.dropped += 1
+                return True
+        return False
+
+    async def _writer(self, conn: WSConnection) -> None:
+        """Drain one connection's queue; the only task that sends on its socket."""
+        try:
+            while True:
+                if not conn.queue:
+                    conn.wakeup.clear()
+                    await conn.wakeup.wait()
+                    continue
+                item = conn.queue.popleft()
+                if item.coalesce_key is not None:
+                    conn.coalesce_index.pop(item.coalesce_key, None)
+                await asyncio.wait_for(conn.ws.send_text(item.text), timeout=self.send_timeout)
+                conn.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"WebSocket send failed (connection will be removed): {e}")
+            # Close so the browser notices and reconnects instead of idling.
+            try:
+                await asyncio.wait_for(
+                    conn.ws.close(code=SEND_FAILED_CLOSE_CODE), timeout=self.send_timeout
+                )
+            except Exception:
+                pass
+            self._remove(conn)
+
+    def _drop_slow(self, conn: WSConnection, reason: str) -> None:
+        self.slow_disconnects += 1
+        logger.warning(f"Disconnecting slow WebSocket client user={conn.user}: {reason}")
+        self._remove(conn)
+
+        async def _close():
             try:
-                await conn.ws.send_text(message)
-            except Exception as e:
-                logger.debug(f"WebSocket send failed (connection will be removed): {e}")
-                dead.append(conn)
+                await conn.ws.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Client too slow")
+            except Exception:
+                pass
 
-        for conn in dead:
+        asyncio.get_running_loop().create_task(_close())
+
+    def _remove(self, conn: WSConnection) -> None:
+        self._stop(conn)
+        if conn in self._connections:
             self._connections.remove(conn)
+
+    @staticmethod
+    def _stop(conn: WSConnection) -> None:
+        conn.closing = True
+        conn.queue.clear()
+        conn.coalesce_index.clear()
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+
+    # -- Observability ------------------------------------------------------------
+
+    def client_stats(self) -> list[dict[str, Any]]:
+        """Per-client queue depth, lag and drop counters for the dashboard."""
+        return [
+            {
+                "user": conn.user,
+                "connected_at": conn.connected_at,
+                "queued": len(conn.queue),
+                "lag_seconds": round(conn.lag_seconds(), 3),
+                "sent": conn.sent,
+                "dropped": conn.dropped,
+                "coalesced": conn.coalesced,
+            }
+            for conn in self._connections
+        ]
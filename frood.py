@@ -37,6 +37,7 @@ from commands import (
     CliSetupCommandHandler,
     CloneCommandHandler,
     RestoreCommandHandler,
+    RotateSecretCommandHandler,
 )
 from core.agent_manager import AgentManager
 from core.app_manager import AppManager
@@ -126,14 +127,19 @@ class Frood:
         workspace = Path(settings.default_repo_path or ".").resolve()
         data_dir = Path(__file__).parent / ".frood"
 
-        self.ws_manager = WebSocketManager()
+        self.ws_manager = WebSocketManager(
+            max_queue=settings.ws_max_queue,
+            max_lag_seconds=settings.ws_max_lag_seconds,
+        )
 
         _cpu_count = os.cpu_count() or 4
         _max_agents = (
             settings.max_concurrent_agents if settings.max_concurrent_agents > 0 else _cpu_count * 4
         )
         self.heartbeat = HeartbeatService(configured_max_agents=_max_agents)
-        self.cron_scheduler = CronScheduler()
+        self.cron_scheduler = CronScheduler(
+            settings.cron_jobs_path, max_concurrent=settings.cron_max_concurrent
+        )
 
         # ── Key store for API key management ──────────────────────────────
         self.key_store = KeyStore(data_dir / "settings.json")
@@ -357,6 +363,7 @@ class Frood:
         if self.tier_recalc:
             self.tier_recalc.stop()
         self.cron_scheduler.stop()
+        await self._close_mcp_pool()
 
         # Cancel remaining tasks so asyncio.gather in start() unblocks.
         # Explicitly skip the current task (this shutdown coroutine) so
@@ -367,6 +374,15 @@ class Frood:
             task.cancel()
         logger.info("Frood stopped (cancelled %d pending tasks)", len(pending))
 
+    @staticmethod
+    async def _close_mcp_pool():
+        """Stop pooled MCP servers before their runner tasks get cancelled."""
+        try:
+            from tools.mcp_client import shutdown_mcp_manager
+        except ImportError:  # mcp SDK not installed, so no pool was ever started
+            return
+        await shutdown_mcp_manager()
+
 
 def main():
     parser = argparse.ArgumentParser(description="Frood — The answer to all your tasks")
@@ -452,6 +468,22 @@ def main():
         help="Which CLI to unwire (claude-code | opencode)",
     )
 
+    # rotate-secret subcommand
+    rotate_parser = subparsers.add_parser(
+        "rotate-secret", help="Re-encrypt stored secrets under a new JWT_SECRET"
+    )
+    rotate_parser.add_argument(
+        "--new-secret-env",
+        default="NEW_JWT_SECRET",
+        help="Env var holding the new secret (default: NEW_JWT_SECRET; prompts if unset)",
+    )
+    rotate_parser.add_argument(
+        "--data-dir", default=str(Path(__file__).parent / ".frood"), help="Frood data directory"
+    )
+    rotate_parser.add_argument(
+        "--dry-run", action="store_true", help="Only check that every value can be rotated"
+    )
+
     args = parser.parse_args()
 
     command_handlers = {
@@ -459,6 +491,7 @@ def main():
         "restore": RestoreCommandHandler(),
         "clone": CloneCommandHandler(),
         "cli-setup": CliSetupCommandHandler(),
+        "rotate-secret": RotateSecretCommandHandler(),
     }
 
     handler = command_handlers.get(args.command)
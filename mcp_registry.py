@@ -31,9 +31,21 @@ class MCPRegistryAdapter:
     def __init__(self, registry: ToolRegistry, prefix: str = TOOL_PREFIX):
         self._registry = registry
         self._prefix = prefix
+        self._tools_cache: tuple[int, list[types.Tool]] | None = None
+
+    @property
+    def registry(self) -> ToolRegistry:
+        return self._registry
 
     def list_tools(self) -> list[types.Tool]:
-        """Return MCP tool definitions for all enabled tools."""
+        """Return MCP tool definitions for all enabled tools.
+
+        Built once per registry version and reused until a tool is registered,
+        removed, toggled, or has its schema refreshed.
+        """
+        version = self._registry.version
+        if self._tools_cache is not None and self._tools_cache[0] == version:
+            return list(self._tools_cache[1])
         tools = []
         for tool_info in self._registry.list_tools():
             if not tool_info["enabled"]:
@@ -49,7 +61,8 @@ class MCPRegistryAdapter:
                     inputSchema=schema["inputSchema"],
                 )
             )
-        return tools
+        self._tools_cache = (version, tools)
+        return list(tools)
 
     def _strip_prefix(self, mcp_name: str) -> str:
         """Strip the prefix from an MCP tool name to get the internal name."""
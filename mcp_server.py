@@ -27,6 +27,7 @@ import asyncio
 import logging
 import os
 import sys
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -40,11 +41,11 @@ _FROOD_ROOT = Path(__file__).resolve().parent
 if str(_FROOD_ROOT) not in sys.path:
     sys.path.insert(0, str(_FROOD_ROOT))
 
-from core.command_filter import CommandFilter
 from core.rate_limiter import ToolRateLimiter
 from core.sandbox import WorkspaceSandbox
 from mcp_registry import MCPRegistryAdapter
-from memory.qdrant_store import QdrantConfig
+from tools.lazy_tool import LazyTool, ToolSchemaCache, ToolSpec, lazy_tools, warm_up
+from tools.mcp_client import shutdown_mcp_manager
 from tools.registry import ToolRegistry
 
 logger = logging.getLogger("frood.mcp.server")
@@ -69,45 +70,140 @@ def _resolve_workspace() -> Path:
     return Path.cwd().resolve()
 
 
-def _safe_import(module_path: str, class_name: str):
-    """Import a tool class, returning None if the import fails.
+class _Backends:
+    """Memory backends shared by the memory-aware tools.
 
-    Allows the MCP server to start even if optional dependencies are missing.
+    Qdrant, Redis and the memory store are only connected when the first
+    tool that needs them is built, so a session that never touches memory
+    never pays for them. Tools may be built from worker threads, hence the
+    lock.
     """
-    try:
-        import importlib
 
-        mod = importlib.import_module(module_path)
-        return getattr(mod, class_name)
-    except Exception as e:
-        logger.warning(f"Skipping {class_name} from {module_path}: {e}")
-        return None
+    def __init__(self, workspace: Path):
+        self._workspace = workspace
+        self._lock = threading.RLock()
+        self._memory_ready = False
+        self._effectiveness_ready = False
+        self.memory_store = None
+        self.qdrant_store = None
+        self.redis_backend = None
+        self.effectiveness_store = None
+        self._project_store_cache: dict = {}
+
+    def memory(self):
+        with self._lock:
+            if not self._memory_ready:
+                self._connect_memory()
+                self._memory_ready = True
+            return self.memory_store
+
+    def _connect_memory(self):
+        workspace = self._workspace
+        memory_dir = workspace / ".frood" / "memory"
+
+        # Detect embedding vector dimension (probe without Qdrant to avoid lock)
+        vector_dim = 384  # Default for local sentence-transformers
+        try:
+            from memory.embeddings import LOCAL_EMBEDDINGS_AVAILABLE, LOCAL_VECTOR_DIM
+
+            if LOCAL_EMBEDDINGS_AVAILABLE:
+                vector_dim = LOCAL_VECTOR_DIM
+                logger.info(f"Local embeddings available ({vector_dim} dims)")
+            else:
+                # Check for OpenAI API key (1536 dims)
+                if os.environ.get("OPENAI_API_KEY"):
+                    vector_dim = 1536
+        except Exception:
+            pass
 
+        qdrant_url = os.environ.get("QDRANT_URL", "")
+        try:
+            from memory.qdrant_store import QdrantConfig, QdrantStore
+
+            if qdrant_url:
+                self.qdrant_store = QdrantStore(QdrantConfig(url=qdrant_url, vector_dim=vector_dim))
+            else:
+                qdrant_path = str(workspace / ".frood" / "qdrant")
+                self.qdrant_store = QdrantStore(
+                    QdrantConfig(local_path=qdrant_path, vector_dim=vector_dim)
+                )
 
-def _build_registry() -> ToolRegistry:
-    """Create a ToolRegistry with all Phase 2 MCP tools.
+            if not self.qdrant_store.is_available:
+                logger.info("Qdrant not reachable — using file backend")
+                self.qdrant_store = None
+        except Exception as e:
+            self.qdrant_store = None
+            logger.info(f"Qdrant not available: {e}")
 
-    Tools are registered in groups by dependency complexity.
-    Tools that fail to import are skipped gracefully.
-    """
-    workspace = _resolve_workspace()
-    workspace_str = str(workspace)
-    logger.info(f"Workspace: {workspace}")
+        redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+        if redis_url:
+            try:
+                from memory.redis_session import RedisConfig, RedisSessionBackend
 
-    sandbox = WorkspaceSandbox(workspace, enabled=True)
-    command_filter = CommandFilter()
-    rate_limiter = ToolRateLimiter()
+                self.redis_backend = RedisSessionBackend(RedisConfig(url=redis_url))
+            except Exception as e:
+                logger.info(f"Redis not available: {e}")
 
-    registry = ToolRegistry(rate_limiter=rate_limiter)
+        try:
+            from memory.store import MemoryStore
 
-    def _register(tool_or_none):
-        """Register a tool, skipping None (failed imports)."""
-        if tool_or_none is not None:
-            try:
-                registry.register(tool_or_none)
-            except Exception as e:
-                name = getattr(tool_or_none, "name", "unknown")
-                logger.warning(f"Failed to register {name}: {e}")
+            self.memory_store = MemoryStore(
+                memory_dir, qdrant_store=self.qdrant_store, redis_backend=self.redis_backend
+            )
+            semantic = "semantic" if self.memory_store.semantic_available else "keyword"
+            logger.info(f"Memory backend: {semantic} search, dir={memory_dir}")
+        except Exception as e:
+            logger.warning(f"Memory backend failed to initialize: {e}")
+
+    def project_memory(self, project_id: str):
+        """Project memory factory for MemoryTool project namespace routing (MEM-03)."""
+        memory_store = self.memory()
+        with self._lock:
+            if project_id not in self._project_store_cache:
+                try:
+                    from memory.project_memory import ProjectMemoryStore
+
+                    self._project_store_cache[project_id] = ProjectMemoryStore(
+                        project_id=project_id,
+                        base_dir=self._workspace / ".frood",
+                        global_store=memory_store,
+                        qdrant_store=self.qdrant_store,
+                        redis_backend=self.redis_backend,
+                    )
+                except Exception as e:
+                    logger.warning("Failed to create project store for '%s': %s", project_id, e)
+                    return memory_store  # Fallback to global
+            return self._project_store_cache[project_id]
+
+    def effectiveness(self):
+        with self._lock:
+            if not self._effectiveness_ready:
+                self._effectiveness_ready = True
+                try:
+                    from memory.effectiveness import EffectivenessStore
+
+                    _eff_db = self._workspace / ".frood" / "effectiveness.db"
+                    self.effectiveness_store = EffectivenessStore(_eff_db)
+                except Exception as e:
+                    logger.info(f"EffectivenessStore not available: {e}")
+            return self.effectiveness_store
+
+
+def _lazy_tools_enabled() -> bool:
+    """FROOD_MCP_LAZY_TOOLS=0 builds every tool at startup (the old behaviour)."""
+    return os.environ.get("FROOD_MCP_LAZY_TOOLS", "1").lower() not in ("0", "false", "no")
+
+
+def _tool_specs(workspace: Path, registry: ToolRegistry) -> list[ToolSpec]:
+    """Every MCP tool as a ToolSpec: module, class and how to construct it.
+
+    Tools are listed in groups by dependency complexity. Nothing is imported
+    here; see tools.lazy_tool for when the modules are loaded.
+    """
+    workspace_str = str(workspace)
+    sandbox = WorkspaceSandbox(workspace, enabled=True)
+    backends = _Backends(workspace)
+    specs: list[ToolSpec] = []
 
     # ── Redundant tools NOT registered (Claude Code provides natively):
     # ReadFileTool, WriteFileTool, EditFileTool, ListDirTool → CC Read/Write/Edit/Glob
@@ -133,8 +229,7 @@ def _build_registry() -> ToolRegistry:
         ("tools.n8n_create_workflow", "N8nCreateWorkflowTool"),
         ("tools.email_send_tool", "EmailSendTool"),
     ]:
-        ToolClass = _safe_import(mod, cls)
-        _register(ToolClass() if ToolClass else None)
+        specs.append(ToolSpec(mod, cls, lambda tool_cls: tool_cls()))
 
     # ── Group B: workspace_path only ──────────────────────────────────────
     for mod, cls in [
@@ -153,149 +248,73 @@ def _build_registry() -> ToolRegistry:
         ("tools.file_watcher", "FileWatcherTool"),
         ("tools.browser_tool", "BrowserTool"),
     ]:
-        ToolClass = _safe_import(mod, cls)
-        _register(ToolClass(workspace_str) if ToolClass else None)
+        specs.append(ToolSpec(mod, cls, lambda tool_cls: tool_cls(workspace_str)))
 
     # ── Group C: sandbox-based ────────────────────────────────────────────
-    VisionTool = _safe_import("tools.vision_tool", "VisionTool")
-    KnowledgeTool = _safe_import("tools.knowledge_tool", "KnowledgeTool")
-
-    _register(VisionTool(sandbox) if VisionTool else None)
-    _register(KnowledgeTool(sandbox) if KnowledgeTool else None)
-
-    # ── Memory Backend (Phase 3A) ────────────────────────────────────────
-    memory_dir = workspace / ".frood" / "memory"
-    memory_dir.mkdir(parents=True, exist_ok=True)
-
-    # Detect embedding vector dimension (probe without Qdrant to avoid lock)
-    vector_dim = 384  # Default for local sentence-transformers
-    try:
-        from memory.embeddings import LOCAL_EMBEDDINGS_AVAILABLE, LOCAL_VECTOR_DIM
-
-        if LOCAL_EMBEDDINGS_AVAILABLE:
-            vector_dim = LOCAL_VECTOR_DIM
-            logger.info(f"Local embeddings available ({vector_dim} dims)")
-        else:
-            # Check for OpenAI API key (1536 dims)
-            if os.environ.get("OPENAI_API_KEY"):
-                vector_dim = 1536
-    except Exception:
-        pass
-
-    qdrant_store = None
-    qdrant_url = os.environ.get("QDRANT_URL", "")
-    try:
-        from memory.qdrant_store import QdrantConfig, QdrantStore
-
-        if qdrant_url:
-            qdrant_store = QdrantStore(QdrantConfig(url=qdrant_url, vector_dim=vector_dim))
-        else:
-            qdrant_path = str(workspace / ".frood" / "qdrant")
-            qdrant_store = QdrantStore(QdrantConfig(local_path=qdrant_path, vector_dim=vector_dim))
-
-        if not qdrant_store.is_available:
-            logger.info("Qdrant not reachable — using file backend")
-            qdrant_store = None
-    except Exception as e:
-        logger.info(f"Qdrant not available: {e}")
-
-    redis_backend = None
-    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
-    if redis_url:
-        try:
-            from memory.redis_session import RedisConfig, RedisSessionBackend
-
-            redis_backend = RedisSessionBackend(RedisConfig(url=redis_url))
-        except Exception as e:
-            logger.info(f"Redis not available: {e}")
-
-    memory_store = None
-    try:
-        from memory.store import MemoryStore
+    specs.append(ToolSpec("tools.vision_tool", "VisionTool", lambda tool_cls: tool_cls(sandbox)))
+    specs.append(
+        ToolSpec("tools.knowledge_tool", "KnowledgeTool", lambda tool_cls: tool_cls(sandbox))
+    )
 
-        memory_store = MemoryStore(
-            memory_dir, qdrant_store=qdrant_store, redis_backend=redis_backend
+    # ── Group E: lightweight deps (memory backend, Phase 3A) ─────────────
+    specs.append(
+        ToolSpec(
+            "tools.behaviour_tool",
+            "BehaviourTool",
+            lambda tool_cls: tool_cls(memory_dir=workspace / ".frood" / "memory"),
         )
-        semantic = "semantic" if memory_store.semantic_available else "keyword"
-        logger.info(f"Memory backend: {semantic} search, dir={memory_dir}")
-    except Exception as e:
-        logger.warning(f"Memory backend failed to initialize: {e}")
-
-    # ── Group E: lightweight deps ─────────────────────────────────────────
-    BehaviourTool = _safe_import("tools.behaviour_tool", "BehaviourTool")
-    MemoryTool = _safe_import("tools.memory_tool", "MemoryTool")
-    WorkflowTool = _safe_import("tools.workflow_tool", "WorkflowTool")
-
-    # Project memory factory for MemoryTool project namespace routing (MEM-03)
-    _project_store_cache: dict = {}
-
-    def _project_memory_factory(project_id: str):
-        if project_id not in _project_store_cache:
-            try:
-                from memory.project_memory import ProjectMemoryStore
-
-                _project_store_cache[project_id] = ProjectMemoryStore(
-                    project_id=project_id,
-                    base_dir=workspace / ".frood",
-                    global_store=memory_store,
-                    qdrant_store=qdrant_store,
-                    redis_backend=redis_backend,
-                )
-            except Exception as e:
-                logger.warning("Failed to create project store for '%s': %s", project_id, e)
-                return memory_store  # Fallback to global
-        return _project_store_cache[project_id]
+    )
 
-    _register(BehaviourTool(memory_dir=workspace / ".frood" / "memory") if BehaviourTool else None)
-    _register(
-        MemoryTool(
+    def _memory_tool(tool_cls):
+        memory_store = backends.memory()
+        return tool_cls(
             memory_store=memory_store,
-            project_memory_factory=_project_memory_factory if memory_store else None,
+            project_memory_factory=backends.project_memory if memory_store else None,
+        )
+
+    specs.append(ToolSpec("tools.memory_tool", "MemoryTool", _memory_tool))
+    specs.append(
+        ToolSpec(
+            "tools.workflow_tool",
+            "WorkflowTool",
+            lambda tool_cls: tool_cls(workspace_str, registry),
         )
-        if MemoryTool
-        else None
     )
-    _register(WorkflowTool(workspace_str, registry) if WorkflowTool else None)
 
     # ── Context Assembler (Phase 7 — smart project context retrieval) ────
     # Note: skill_loader is created later in _create_server(); pass None here.
     # The tool handles None gracefully (skips skill search).
-    ContextAssemblerTool = _safe_import("tools.context_assembler", "ContextAssemblerTool")
-    _register(
-        ContextAssemblerTool(
-            memory_store=memory_store,
-            skill_loader=None,
-            workspace=workspace_str,
+    specs.append(
+        ToolSpec(
+            "tools.context_assembler",
+            "ContextAssemblerTool",
+            lambda tool_cls: tool_cls(
+                memory_store=backends.memory(), skill_loader=None, workspace=workspace_str
+            ),
         )
-        if ContextAssemblerTool
-        else None
     )
 
     # ── Unified Context (Phase 4 — context engine with code symbols + GSD + effectiveness) ──
-    UnifiedContextTool = _safe_import("tools.unified_context", "UnifiedContextTool")
-    effectiveness_store = None
-    try:
-        from memory.effectiveness import EffectivenessStore
-
-        _eff_db = workspace / ".frood" / "effectiveness.db"
-        effectiveness_store = EffectivenessStore(_eff_db)
-    except Exception as e:
-        logger.info(f"EffectivenessStore not available: {e}")
-    _register(
-        UnifiedContextTool(
-            memory_store=memory_store,
-            skill_loader=None,
-            workspace=workspace_str,
-            effectiveness_store=effectiveness_store,
+    specs.append(
+        ToolSpec(
+            "tools.unified_context",
+            "UnifiedContextTool",
+            lambda tool_cls: tool_cls(
+                memory_store=backends.memory(),
+                skill_loader=None,
+                workspace=workspace_str,
+                effectiveness_store=backends.effectiveness(),
+            ),
         )
-        if UnifiedContextTool
-        else None
     )
 
     # ── Node Sync (Phase 9 — memory sync between nodes) ────────────────
-    NodeSyncTool = _safe_import("tools.node_sync", "NodeSyncTool")
-    _register(
-        NodeSyncTool(memory_store=memory_store, workspace=workspace_str) if NodeSyncTool else None
+    specs.append(
+        ToolSpec(
+            "tools.node_sync",
+            "NodeSyncTool",
+            lambda tool_cls: tool_cls(memory_store=backends.memory(), workspace=workspace_str),
+        )
     )
 
     # ── Skipped tools (require LLM layer or agent orchestration) ──────────
@@ -313,11 +332,56 @@ def _build_registry() -> ToolRegistry:
     # AppTestTool     — needs AppManager (Phase 6 dashboard)
     # MCPToolProxy    — we ARE the MCP server
 
-    count = len(registry.list_tools())
-    logger.info(f"Registered {count} tools for MCP")
+    return specs
+
+
+def _build_registry() -> ToolRegistry:
+    """Create a ToolRegistry with all Phase 2 MCP tools.
+
+    Tools are registered as LazyTools described by the on-disk schema cache,
+    so the registry (and tools/list) is ready without importing tool modules
+    or connecting memory backends; each tool is built on its first call.
+    Tools that fail to import are skipped gracefully.
+    """
+    workspace = _resolve_workspace()
+    logger.info(f"Workspace: {workspace}")
+    (workspace / ".frood" / "memory").mkdir(parents=True, exist_ok=True)
+
+    rate_limiter = ToolRateLimiter()
+    registry = ToolRegistry(rate_limiter=rate_limiter)
+    specs = _tool_specs(workspace, registry)
+
+    if _lazy_tools_enabled():
+        cache = ToolSchemaCache(workspace / ".frood" / "mcp_tool_schemas.json")
+        tools = lazy_tools(specs, cache)
+    else:
+        tools = []
+        for spec in specs:
+            try:
+                tools.append(spec.load())
+            except Exception as e:
+                logger.warning(f"Skipping {spec.class_name} from {spec.module}: {e}")
+
+    for tool in tools:
+        try:
+            registry.register(tool)
+        except Exception as e:
+            name = getattr(tool, "name", "unknown")
+            logger.warning(f"Failed to register {name}: {e}")
+
+    deferred = sum(1 for t in tools if isinstance(t, LazyTool))
+    logger.info(f"Registered {len(tools)} tools for MCP ({deferred} deferred until first use)")
     return registry
 
 
+def _start_warm_up(registry: ToolRegistry) -> asyncio.Task | None:
+    """Build deferred tools in the background when FROOD_MCP_WARMUP=1."""
+    if os.environ.get("FROOD_MCP_WARMUP", "0").lower() not in ("1", "true", "yes"):
+        return None
+    tools = [registry.get(info["name"]) for info in registry.list_tools()]
+    return asyncio.create_task(warm_up([t for t in tools if t is not None]))
+
+
 def _load_skills() -> "SkillLoader":
     """Load all skills from builtin and workspace directories.
 
@@ -468,21 +532,25 @@ def _create_server() -> tuple[Server, MCPRegistryAdapter]:
 
 async def run_stdio():
     """Run the MCP server with stdio transport (for Claude Code)."""
-    server, _adapter = _create_server()
-
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name=SERVER_NAME,
-                server_version=SERVER_VERSION,
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    server, adapter = _create_server()
+
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            _warm = _start_warm_up(adapter.registry)
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name=SERVER_NAME,
+                    server_version=SERVER_VERSION,
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        await shutdown_mcp_manager()
 
 
 async def run_sse(port: int = 8100):
@@ -500,7 +568,7 @@ async def run_sse(port: int = 8100):
     from starlette.applications import Starlette
     from starlette.routing import Mount, Route
 
-    server, _adapter = _create_server()
+    server, adapter = _create_server()
     sse = SseServerTransport("/messages/")
 
     async def handle_sse(request):
@@ -534,7 +602,11 @@ async def run_sse(port: int = 8100):
 
     config = uvicorn.Config(app, host=host, port=port, log_level="warning")
     uvi_server = uvicorn.Server(config)
-    await uvi_server.serve()
+    _warm = _start_warm_up(adapter.registry)
+    try:
+        await uvi_server.serve()
+    finally:
+        await shutdown_mcp_manager()
 
 
 def main():
@@ -566,6 +638,8 @@ def main():
             sys.exit(1)
 
         # -- Memory Pipeline: Qdrant connectivity --
+        from memory.qdrant_store import QdrantConfig
+
         qdrant_url = os.environ.get("QDRANT_URL", "http://localhost:6333")
         try:
             req = urllib.request.Request(f"{qdrant_url}/collections", method="GET")
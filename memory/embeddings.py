@@ -401,11 +401,14 @@ class EmbeddingStore:
         self._save()
         return entry
 
-    async def add_entries(self, items: list[dict]):
-        """Batch-add multiple entries. Each dict has: text, source, section, metadata."""
+    async def add_entries(self, items: list[dict], vectors: list[list[float]] | None = None):
+        """Batch-add multiple entries. Each dict has: text, source, section, metadata.
+
+        Pass vectors to store entries already embedded with embed_texts().
+        """
         self._load()
-        texts = [item["text"] for item in items]
-        vectors = await self.embed_texts(texts)
+        if vectors is None:
+            vectors = await self.embed_texts([item["text"] for item in items])
 
         for item, vector in zip(items, vectors):
             entry = EmbeddingEntry(
@@ -421,6 +424,20 @@ class EmbeddingStore:
         self._save()
         return len(items)
 
+    def remove_entries(self, source: str, file_path: str) -> int:
+        """Remove the entries of one document (metadata file_path) from a source."""
+        self._load()
+        kept = [
+            e
+            for e in self._entries
+            if not (e.source == source and e.metadata.get("file_path") == file_path)
+        ]
+        removed = len(self._entries) - len(kept)
+        if removed:
+            self._entries = kept
+            self._save()
+        return removed
+
     async def search(
         self,
         query: str,
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark MCP server startup: time until tools/list can be answered, and peak RSS.
+
+Each measurement runs in a fresh interpreter, so imports are cold:
+
+    eager       FROOD_MCP_LAZY_TOOLS=0 — every tool and backend built up front
+    lazy-cold   lazy tools, empty schema cache (first launch in a workspace)
+    lazy-warm   lazy tools, schema cache populated (every later launch)
+
+Usage:
+    python scripts/bench_mcp_startup.py [--runs 5] [--workspace DIR]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD = """
+import json, resource, time
+start = time.perf_counter()
+import mcp_server
+from mcp_registry import MCPRegistryAdapter
+adapter = MCPRegistryAdapter(mcp_server._build_registry())
+count = len(adapter.list_tools())
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_mb": rss_kb / 1024, "tools": count}))
+"""
+
+
+def _measure(workspace: Path, lazy: bool) -> dict:
+    env = {
+        **os.environ,
+        "FROOD_WORKSPACE": str(workspace),
+        "FROOD_MCP_LAZY_TOOLS": "1" if lazy else "0",
+        "FROOD_MCP_WARMUP": "0",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workspace", help="Workspace to start in (default: a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Path(args.workspace or tmp).resolve()
+        cache = workspace / ".frood" / "mcp_tool_schemas.json"
+        results: dict[str, list[dict]] = {"eager": [], "lazy-cold": [], "lazy-warm": []}
+        for _ in range(args.runs):
+            results["eager"].append(_measure(workspace, lazy=False))
+            cache.unlink(missing_ok=True)
+            results["lazy-cold"].append(_measure(workspace, lazy=True))
+            results["lazy-warm"].append(_measure(workspace, lazy=True))
+
+    print(f"{'mode':<10} {'tools':>5} {'median s':>9} {'min s':>7} {'peak RSS MB':>12}")
+    for mode, runs in results.items():
+        seconds = [r["seconds"] for r in runs]
+        rss = statistics.median(r["rss_mb"] for r in runs)
+        print(
+            f"{mode:<10} {runs[0]['tools']:>5} {statistics.median(seconds):>9.3f} "
+            f"{min(seconds):>7.3f} {rss:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
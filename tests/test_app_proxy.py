@@ -0,0 +1,161 @@
+"""Tests for the managed-app reverse proxy (streaming, pooling, static ranges)."""
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from core.app_manager import App
+from dashboard.app_proxy import AppProxyPool, _parse_range
+from dashboard.server import create_app
+
+
+def _client_for(app_obj: App) -> tuple[TestClient, MagicMock]:
+    manager = MagicMock()
+    manager.get_by_slug.return_value = app_obj
+    app = create_app(app_manager=manager)
+    return TestClient(app), manager
+
+
+@pytest.fixture
+def static_app(tmp_path):
+    public = tmp_path / "public"
+    public.mkdir()
+    (public / "index.html").write_text("<h1>home</h1>")
+    (public / "data.bin").write_bytes(bytes(range(256)) * 4)
+    return App(name="Static", slug="static", runtime="static", status="running", path=str(tmp_path))
+
+
+class _ChunkStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class TestParseRange:
+    def test_closed_open_and_suffix_ranges(self):
+        assert _parse_range("bytes=0-9", 100) == (0, 9)
+        assert _parse_range("bytes=90-", 100) == (90, 99)
+        assert _parse_range("bytes=-10", 100) == (90, 99)
+        assert _parse_range("bytes=50-500", 100) == (50, 99)
+
+    def test_unsatisfiable(self):
+        assert _parse_range("bytes=100-", 100) is None
+        assert _parse_range("bytes=9-1", 100) is None
+        assert _parse_range("items=0-1", 100) is None
+
+
+class TestStaticServing:
+    def test_range_request_returns_206(self, static_app):
+        client, _ = _client_for(static_app)
+        resp = client.get("/apps/static/data.bin", headers={"Range": "bytes=10-19"})
+        assert resp.status_code == 206
+        assert resp.content == bytes(range(10, 20))
+        assert resp.headers["content-range"] == "bytes 10-19/1024"
+
+    def test_unsatisfiable_range_returns_416(self, static_app):
+        client, _ = _client_for(static_app)
+        resp = client.get("/apps/static/data.bin", headers={"Range": "bytes=5000-"})
+        assert resp.status_code == 416
+        assert resp.headers["content-range"] == "bytes */1024"
+
+    def test_conditional_get_returns_304(self, static_app):
+        client, _ = _client_for(static_app)
+        first = client.get("/apps/static/data.bin")
+        assert first.status_code == 200
+        assert first.headers["accept-ranges"] == "bytes"
+        etag = first.headers["etag"]
+        again = client.get("/apps/static/data.bin", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+
+    def test_spa_fallback_still_served(self, static_app):
+        client, _ = _client_for(static_app)
+        resp = client.get("/apps/static/some/route")
+        assert resp.status_code == 200
+        assert "home" in resp.text
+
+
+class TestDynamicProxy:
+    def test_streams_body_and_strips_hop_by_hop(self, monkeypatch):
+        seen = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen["path"] = request.url.path
+            seen["query"] = request.url.query
+            seen["body"] = await request.aread()
+            seen["host"] = request.headers.get("host")
+            return httpx.Response(
+                201,
+                headers={"x-app": "yes", "connection": "close"},
+                stream=_ChunkStream([b"streamed-", b"reply"]),
+            )
+
+        def fake_client_for(self, port):
+            return httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", transport=httpx.MockTransport(handler)
+            )
+
+        monkeypatch.setattr(AppProxyPool, "client_for", fake_client_for)
+        dyn = App(name="Dyn", slug="dyn", runtime="python", status="running", port=9555)
+        client, _ = _client_for(dyn)
+
+        resp = client.post("/apps/dyn/api/items?a=1&a=2", content=b"payload")
+
+        assert resp.status_code == 201
+        assert resp.content == b"streamed-reply"
+        assert resp.headers["x-app"] == "yes"
+        assert "connection" not in resp.headers or resp.headers["connection"] != "close"
+        assert seen["path"] == "/api/items"
+        assert seen["query"] == b"a=1&a=2"
+        assert seen["body"] == b"payload"
+        assert seen["host"] == "127.0.0.1:9555"
+
+    def test_unreachable_app_returns_502(self):
+        dyn = App(name="Dyn", slug="dyn", runtime="python", status="running", port=1)
+        client, _ = _client_for(dyn)
+        resp = client.get("/apps/dyn/")
+        assert resp.status_code == 502
+
+
+class TestAppProxyPool:
+    @pytest.mark.asyncio
+    async def test_reuses_client_per_port(self):
+        pool = AppProxyPool()
+        a = pool.client_for(9001)
+        assert pool.client_for(9001) is a
+        assert pool.client_for(9002) is not a
+        await pool.discard(9001)
+        assert a.is_closed
+        assert pool.client_for(9001) is not a
+        await pool.aclose()
+
+
+class TestWebSocketPassthrough:
+    def test_rejects_when_app_not_running(self):
+        stopped = App(name="Dyn", slug="dyn", runtime="python", status="stopped", port=9555)
+        client, _ = _client_for(stopped)
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/apps/dyn/ws") as ws:
+                ws.receive_text()
+        assert exc_info.value.code == 4004
+
+    def test_upstream_query_is_re_encoded(self):
+        running = App(name="Dyn", slug="dyn", runtime="python", status="running", port=9555)
+        client, _ = _client_for(running)
+        urls = []
+
+        async def refuse(url, **kwargs):
+            urls.append(url)
+            raise OSError("refused")
+
+        with patch("websockets.connect", refuse), pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/apps/dyn/ws?q=a%26b&x=1%202&token=t&x=3") as ws:
+                ws.receive_text()
+        assert exc_info.value.code == 1011
+        assert urls == ["ws://127.0.0.1:9555/ws?q=a%26b&x=1+2&x=3"]
@@ -1,11 +1,12 @@
 """Tests for Phase 2: Channel abstraction and manager."""
 
 import asyncio
+from unittest.mock import MagicMock
 
 import pytest
 
 from channels.base import BaseChannel, InboundMessage, OutboundMessage
-from channels.manager import ChannelManager
+from channels.manager import ChannelManager, conversation_key
 
 
 class MockChannel(BaseChannel):
@@ -122,3 +123,155 @@ class TestChannelManager:
         channels = mgr.list_channels()
         assert len(channels) == 1
         assert channels[0]["type"] == "mock"
+
+
+def _inbound(channel_id: str, content: str, thread: str = "") -> InboundMessage:
+    return InboundMessage(
+        channel_type="mock",
+        channel_id=channel_id,
+        sender_id="user1",
+        sender_name="Test User",
+        content=content,
+        metadata={"thread_ts": thread} if thread else {},
+    )
+
+
+class TestConversationDispatch:
+    def test_conversation_key_includes_thread(self):
+        assert conversation_key(_inbound("c1", "x")) == "mock:c1:"
+        assert conversation_key(_inbound("c1", "x", thread="t9")) == "mock:c1:t9"
+
+    @pytest.mark.asyncio
+    async def test_slow_conversation_does_not_block_others(self):
+        mgr = ChannelManager(max_concurrent=4)
+        ch = MockChannel()
+        release = asyncio.Event()
+        handled: list[str] = []
+
+        async def handler(msg):
+            if msg.channel_id == "slow":
+                await release.wait()
+            handled.append(msg.content)
+            return None
+
+        mgr.on_message(handler)
+        await mgr._dispatch(ch, _inbound("slow", "long reply"))
+        await mgr._dispatch(ch, _inbound("fast", "quick"))
+        await asyncio.sleep(0.01)
+
+        assert handled == ["quick"]
+        release.set()
+        await asyncio.sleep(0.01)
+        assert handled == ["quick", "long reply"]
+        await mgr.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_stuck_conversation_with_full_queue_does_not_stall_router(self):
+        mgr = ChannelManager(max_concurrent=4, conversation_queue_size=2)
+        ch = MockChannel()
+        release = asyncio.Event()
+        handled: list[str] = []
+
+        async def handler(msg):
+            if msg.channel_id == "stuck":
+                await release.wait()
+            handled.append(msg.content)
+            return None
+
+        mgr.on_message(handler)
+        mgr._running = True
+        router = asyncio.create_task(mgr._route_messages(ch))
+        # One in the handler, two queued, two more overflow the queue.
+        for i in range(5):
+            await ch._enqueue(_inbound("stuck", f"s{i}"))
+        await ch._enqueue(_inbound("other", "quick"))
+        await asyncio.sleep(0.05)
+
+        assert handled == ["quick"]
+        stats = mgr.dispatch_stats()
+        assert stats["dropped"] == 2
+        assert stats["queued"] == 2
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert handled == ["quick", "s0", "s1", "s2"]
+        mgr._running = False
+        router.cancel()
+        await asyncio.gather(router, return_exceptions=True)
+        await mgr.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_messages_in_one_conversation_stay_ordered(self):
+        mgr = ChannelManager(max_concurrent=4)
+        ch = MockChannel()
+        handled: list[str] = []
+
+        async def handler(msg):
+            await asyncio.sleep(0.001 * (5 - int(msg.content)))
+            handled.append(msg.content)
+            return OutboundMessage(channel_type="mock", channel_id="c1", content=msg.content)
+
+        mgr.on_message(handler)
+        for i in range(5):
+            await mgr._dispatch(ch, _inbound("c1", str(i)))
+        await asyncio.sleep(0.05)
+
+        assert handled == ["0", "1", "2", "3", "4"]
+        assert [m.content for m in ch.sent_messages] == handled
+        assert mgr.dispatch_stats()["dispatched"] == 5
+        await mgr.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_global_cap_limits_concurrent_handlers(self):
+        mgr = ChannelManager(max_concurrent=2)
+        ch = MockChannel()
+        running = 0
+        peak = 0
+
+        async def handler(msg):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        mgr.on_message(handler)
+        for i in range(6):
+            await mgr._dispatch(ch, _inbound(f"c{i}", "hi"))
+        await asyncio.sleep(0.05)
+
+        assert peak == 2
+        await mgr.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_idle_conversation_is_cleaned_up(self):
+        mgr = ChannelManager(idle_timeout=0.01)
+        ch = MockChannel()
+
+        async def handler(msg):
+            return None
+
+        mgr.on_message(handler)
+        await mgr._dispatch(ch, _inbound("c1", "hi"))
+        assert mgr.dispatch_stats()["conversations"] == 1
+        await asyncio.sleep(0.05)
+        assert mgr.dispatch_stats()["conversations"] == 0
+
+
+class TestHealthRoute:
+    def test_health_reports_channel_dispatch_stats(self):
+        from fastapi.testclient import TestClient
+
+        from dashboard.auth import get_current_user
+        from dashboard.server import create_app
+
+        mgr = ChannelManager(max_concurrent=3)
+        app = create_app(app_manager=MagicMock(), channel_manager=mgr)
+        app.dependency_overrides[get_current_user] = lambda: "test-user"
+
+        resp = TestClient(app).get("/api/health")
+
+        assert resp.status_code == 200
+        dispatch = resp.json()["channel_dispatch"]
+        assert dispatch["max_concurrent"] == 3
+        assert dispatch["dropped"] == 0
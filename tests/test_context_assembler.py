@@ -0,0 +1,133 @@
+"""Tests for ContextAssemblerTool's concurrent sources, caches and budget split."""
+
+import asyncio
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+import tools.context_assembler as context_assembler
+from tools.context_assembler import ContextAssemblerTool, _doc_sections, clear_context_caches
+
+
+class FakeMemory:
+    def __init__(self, score=0.9, delay=0.0):
+        self.score = score
+        self.delay = delay
+
+    async def semantic_search(self, query="", top_k=5):
+        await asyncio.sleep(self.delay)
+        return [
+            {"text": f"sandbox note {i} " + "detail " * 50, "section": "Ops", "score": self.score}
+            for i in range(top_k)
+        ]
+
+
+DOC = (
+    """# Project
+
+## Sandbox security
+The sandbox security layer blocks escapes. """
+    + "More sandbox security detail. " * 40
+    + """
+
+## Unrelated
+Nothing to see here.
+"""
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_context_caches()
+    yield
+    clear_context_caches()
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.mark.asyncio
+class TestContextAssembler:
+    async def test_slow_source_is_left_out(self, tmp_path):
+        (tmp_path / "CLAUDE.md").write_text(DOC)
+        tool = ContextAssemblerTool(memory_store=FakeMemory(delay=5), workspace=str(tmp_path))
+        with patch.object(context_assembler, "_TIMEOUT_MEMORY", 0.05):
+            result = await asyncio.wait_for(
+                tool.execute(topic="sandbox security", scope="global"), timeout=2
+            )
+        assert result.success
+        assert "## CLAUDE.md: Sandbox security" in result.output
+        assert "Relevant Memories" not in result.output
+
+    async def test_budget_follows_relevance(self, tmp_path):
+        (tmp_path / "CLAUDE.md").write_text(DOC)
+
+        async def memory_chars(score):
+            tool = ContextAssemblerTool(memory_store=FakeMemory(score), workspace=str(tmp_path))
+            result = await tool.execute(topic="sandbox security", scope="global", max_tokens=400)
+            memories = result.output.split("## Relevant Memories\n\n")[1]
+            return len(memories.split("\n\n## ")[0])
+
+        assert await memory_chars(0.95) > await memory_chars(0.25)
+
+
+class TestCaches:
+    def test_doc_sections_reparsed_only_on_change(self, tmp_path):
+        doc = tmp_path / "CLAUDE.md"
+        doc.write_text(DOC)
+        first = _doc_sections(doc)
+        assert _doc_sections(doc) is first
+        assert [name for name, _, _ in first] == ["", "Sandbox security", "Unrelated"]
+
+        doc.write_text(DOC + "\n## Added\nNew section.\n")
+        assert [name for name, _, _ in _doc_sections(doc)][-1] == "Added"
+
+    @pytest.mark.asyncio
+    async def test_git_log_cached_until_head_moves(self, tmp_path):
+        _git(tmp_path, "init", "-q")
+        (tmp_path / "auth.py").write_text("x = 1\n")
+        _git(tmp_path, "add", ".")
+        _git(tmp_path, "commit", "-q", "-m", "Add auth module")
+        tool = ContextAssemblerTool(workspace=str(tmp_path))
+
+        spawn = asyncio.create_subprocess_exec
+        with patch("asyncio.create_subprocess_exec", side_effect=spawn) as spawned:
+            assert "Add auth module" in await tool._git_log()
+            assert "Add auth module" in await tool._git_log()
+            assert spawned.call_count == 1
+
+            (tmp_path / "auth.py").write_text("x = 2\n")
+            _git(tmp_path, "commit", "-q", "-am", "Fix auth token expiry")
+            assert "Fix auth token expiry" in await tool._git_log()
+            assert spawned.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_git_log_reaps_process_when_cancelled(self, tmp_path):
+        class HangingProcess:
+            returncode = None
+            waited = False
+
+            async def communicate(self):
+                await asyncio.Event().wait()
+
+            def kill(self):
+                self.returncode = -9
+
+            async def wait(self):
+                self.waited = True
+                return self.returncode
+
+        proc = HangingProcess()
+        tool = ContextAssemblerTool(workspace=str(tmp_path))
+        with patch("asyncio.create_subprocess_exec", return_value=proc):
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(tool._git_log(), timeout=0.05)
+        assert proc.returncode == -9
+        assert proc.waited
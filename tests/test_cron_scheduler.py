@@ -0,0 +1,181 @@
+"""Tests for CronScheduler's heap-driven loop, concurrency limits and persistence."""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from tools.cron import CronJob, CronScheduler, JobState, JobType
+
+
+class Recorder:
+    """on_trigger callback that logs (title, start, end) and can be made slow."""
+
+    def __init__(self, durations: dict[str, float] | None = None):
+        self.durations = durations or {}
+        self.runs: list[tuple[str, float, float]] = []
+        self.starts = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, title: str, description: str, task_type: str):
+        self.starts += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        started = time.monotonic()
+        try:
+            await asyncio.sleep(self.durations.get(title, 0.0))
+        finally:
+            self.in_flight -= 1
+        self.runs.append((title, started, time.monotonic()))
+
+    def titles(self) -> list[str]:
+        return [title for title, _, _ in self.runs]
+
+
+@pytest.fixture
+def make_scheduler(tmp_path):
+    def make(recorder: Recorder, **kwargs) -> CronScheduler:
+        scheduler = CronScheduler(str(tmp_path / "cron.json"), **kwargs)
+        scheduler.on_trigger(recorder)
+        return scheduler
+
+    return make
+
+
+async def run_for(scheduler: CronScheduler, seconds: float):
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(seconds)
+    scheduler.stop()
+    await task
+
+
+def job(name: str, **kwargs) -> CronJob:
+    kwargs.setdefault("next_run", time.time())
+    return CronJob(name=name, task_title=name, **kwargs)
+
+
+@pytest.mark.asyncio
+class TestCronScheduler:
+    async def test_sleeps_until_exact_fire_time(self, make_scheduler):
+        recorder = Recorder()
+        scheduler = make_scheduler(recorder)
+        due = time.time() + 0.1
+        scheduler.add_job(job("soon", schedule="once", job_type=JobType.ONCE, next_run=due))
+
+        await run_for(scheduler, 0.3)
+        assert recorder.titles() == ["soon"]
+        assert scheduler.list_jobs() == []  # one-shot jobs are removed after running
+
+    async def test_slow_job_does_not_hold_up_others(self, make_scheduler):
+        recorder = Recorder({"slow": 1.0})
+        scheduler = make_scheduler(recorder)
+        scheduler.add_job(job("slow", schedule="every 1h"))
+        scheduler.add_job(job("fast", schedule="every 2h"))
+
+        await run_for(scheduler, 0.2)
+        assert recorder.titles() == ["fast"]
+
+    async def test_added_job_wakes_a_sleeping_loop(self, make_scheduler):
+        recorder = Recorder()
+        scheduler = make_scheduler(recorder)
+        scheduler.add_job(job("later", schedule="every 1h", next_run=time.time() + 3600))
+        task = asyncio.create_task(scheduler.start())
+        await asyncio.sleep(0.05)
+        scheduler.add_job(job("now", schedule="every 2h"))
+        await asyncio.sleep(0.05)
+        scheduler.stop()
+        await task
+        assert recorder.titles() == ["now"]
+
+    async def test_global_limit(self, make_scheduler):
+        recorder = Recorder({f"j{i}": 0.05 for i in range(5)})
+        scheduler = make_scheduler(recorder, max_concurrent=2)
+        for i in range(5):
+            scheduler.add_job(job(f"j{i}", schedule=f"every {i + 1}h"))
+
+        await run_for(scheduler, 0.4)
+        assert len(recorder.runs) == 5
+        assert recorder.peak == 2
+
+    @pytest.mark.parametrize(
+        ("policy", "max_concurrency", "starts", "peak"),
+        [("skip", 1, 1, 1), ("queue", 1, 2, 1), ("allow", 2, 2, 2)],
+    )
+    async def test_overlap_policies(self, make_scheduler, policy, max_concurrency, starts, peak):
+        # Due at 0.0, 0.2 and 0.4 while each run takes 0.45.
+        recorder = Recorder({"tick": 0.45})
+        scheduler = make_scheduler(recorder)
+        scheduler.add_job(
+            job(
+                "tick",
+                schedule="every 0.2s",
+                overlap_policy=policy,
+                max_concurrency=max_concurrency,
+            )
+        )
+        await run_for(scheduler, 0.52)
+        assert recorder.starts == starts
+        assert recorder.peak == peak
+
+    async def test_misfire_policies_after_downtime(self, make_scheduler, tmp_path):
+        hours_ago = time.time() - 5 * 3600
+        saved = [
+            job("catch_up", schedule="every 1h", next_run=hours_ago).to_dict(),
+            job("drop", schedule="every 2h", next_run=hours_ago, misfire_policy="skip").to_dict(),
+            job("missed_once", schedule="once", job_type="once", next_run=hours_ago).to_dict(),
+        ]
+        saved[2]["misfire_policy"] = "skip"
+        (tmp_path / "cron.json").write_text(json.dumps(saved))
+        recorder = Recorder()
+        scheduler = make_scheduler(recorder)
+
+        await run_for(scheduler, 0.1)
+        # One catch-up run, not five.
+        assert recorder.titles() == ["catch_up"]
+        jobs = {j.name: j for j in scheduler.list_jobs()}
+        assert set(jobs) == {"catch_up", "drop"}
+        now = time.time()
+        assert all(now < j.next_run <= now + 2 * 3600 for j in jobs.values())
+
+    async def test_planned_steps_run_in_order(self, make_scheduler):
+        recorder = Recorder({"first": 0.05})
+        scheduler = make_scheduler(recorder)
+        first = scheduler.add_job(job("first", schedule="planned", job_type=JobType.PLANNED))
+        scheduler.add_job(
+            job(
+                "second",
+                schedule="planned",
+                job_type=JobType.PLANNED,
+                depends_on=first.id,
+                next_run=0,
+            )
+        )
+
+        await run_for(scheduler, 0.3)
+        assert recorder.titles() == ["first", "second"]
+        assert recorder.runs[1][1] >= recorder.runs[0][2]
+        assert {j.state for j in scheduler.list_jobs()} == {JobState.COMPLETED}
+
+    async def test_state_written_only_when_changed(self, make_scheduler):
+        recorder = Recorder()
+        scheduler = make_scheduler(recorder)
+        scheduler.add_job(job("idle", schedule="every 1h", next_run=time.time() + 3600))
+        with patch("tools.cron.os.replace") as replace:
+            await run_for(scheduler, 0.1)
+            scheduler.set_enabled(scheduler.list_jobs()[0].id, True)
+            replace.assert_not_called()
+            scheduler.set_enabled(scheduler.list_jobs()[0].id, False)
+            replace.assert_called_once()
+
+
+class TestStagger:
+    def test_shared_schedule_is_spread_over_a_minute(self, tmp_path):
+        scheduler = CronScheduler(str(tmp_path / "cron.json"))
+        ids = [scheduler.add_job(job(f"j{i}", schedule="0 * * * *")).id for i in range(4)]
+        scheduler.add_job(job("alone", schedule="every 1h", stagger_seconds=30))
+        offsets = scheduler._compute_stagger()
+        assert [offsets[jid] for jid in ids] == [0.0, 15.0, 30.0, 45.0]
+        assert offsets[scheduler.list_jobs()[-1].id] == 0.0
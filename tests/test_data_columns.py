@@ -0,0 +1,223 @@
+"""Tests for DataTool's columnar tables."""
+
+import csv
+import io
+import json
+from collections import Counter, defaultdict
+
+import pytest
+
+from tools.data_columns import MISSING, Table, compile_filter, group_rows, sort_rows
+from tools.data_tool import DataTool
+
+CSV = "name,qty,price,code,note\nA,3,1.5,007,x\nB,10,2,12,\nC,,0.25,5,N/A\nD,7,1.50,-3,y\n"
+
+
+def _select(table, expr):
+    return compile_filter(expr)(table)
+
+
+class TestInference:
+    def test_types(self):
+        table = Table.from_csv(CSV)
+        kinds = {c.name: c.type_name for c in table.columns}
+        assert kinds == {
+            "name": "str",
+            "qty": "int",
+            "price": "float",
+            "code": "int",
+            "note": "str",
+        }
+
+    def test_cells_round_trip_exactly(self):
+        table = Table.from_csv(CSV)
+        assert [table.column("price").text(i) for i in range(4)] == ["1.5", "2", "0.25", "1.50"]
+        assert [table.column("code").text(i) for i in range(4)] == ["007", "12", "5", "-3"]
+        assert table.column("qty").text(2) == ""
+
+    def test_numeric_view_marks_non_numbers(self):
+        nums = Table.from_csv(CSV).column("qty").numbers()
+        assert nums[0] == 3.0 and nums[2] != nums[2]
+
+    def test_mostly_text_numeric_column_becomes_dictionary(self):
+        rows = "v\n" + "\n".join(["1"] * 10 + ["n/a"] * 90) + "\n"
+        col = Table.from_csv(rows).column("v")
+        assert col.kind == "dict"
+        assert sum(1 for x in col.numbers() if x == x) == 10
+
+    def test_upgrades_while_appending(self):
+        records = [{"v": 1}, {"v": 2.5}, {"v": "text"}, {}, {"v": [1]}]
+        table = Table.from_records(records)
+        col = table.column("v")
+        assert col.kind == "object"
+        assert [table.record(i) for i in range(5)] == records
+
+    def test_json_records_keep_types_and_missing_keys(self):
+        records = [{"a": 1, "b": "x"}, {"a": 2.0}, {"b": True, "c": None}]
+        table = Table.from_records(records)
+        assert table.names == ["a", "b", "c"]
+        assert [table.record(i) for i in range(3)] == records
+        assert table.column("a").raw(2) is MISSING
+
+
+class TestCompiledOps:
+    def test_equality_is_textual(self):
+        table = Table.from_csv(CSV)
+        assert _select(table, "price=1.5") == [0]
+        assert _select(table, "price=1.50") == [3]
+        assert _select(table, "code=7") == []
+        assert _select(table, "note=") == [1]
+        assert _select(table, "note!=") == [0, 2, 3]
+        assert _select(table, "missing=") == [0, 1, 2, 3]
+
+    def test_ordering_only_matches_numbers(self):
+        table = Table.from_csv(CSV)
+        assert _select(table, "qty>3") == [1, 3]
+        assert _select(table, "qty<=3") == [0]
+        assert _select(table, "price>=1.5") == [0, 1, 3]
+        assert _select(table, "name>1") == []
+        assert compile_filter("no operator") is None
+
+    def test_sort_numbers_before_text(self):
+        table = Table.from_csv("v\n3\nb\n1\na\n2\n")
+        rows = sort_rows(table.column("v"), list(range(5)), descending=False)
+        assert [table.column("v").text(i) for i in rows] == ["1", "2", "3", "a", "b"]
+
+    def test_group_rows_hash_missing_as_empty(self):
+        table = Table.from_records([{"k": "x"}, {}, {"k": "x"}, {"k": ""}])
+        codes, keys = group_rows(table.column("k"), table.length)
+        assert keys == ["x", "(empty)", ""]
+        assert list(codes) == [0, 1, 0, 2]
+
+
+@pytest.mark.asyncio
+class TestDataToolOnColumns:
+    async def test_transform_aggregates(self):
+        tool = DataTool()
+        await tool.execute(
+            action="load", dataset="s", data="g,v\nb,1\na,2\nb,x\na,4\nc,\n", format="csv"
+        )
+
+        async def agg(name):
+            result = await tool.execute(
+                action="transform", dataset="s", group_by="g", agg=name, value_column="v"
+            )
+            return [line.split(" | ")[1].rstrip(" |") for line in result.output.splitlines()[4:]]
+
+        assert await agg("sum") == ["6", "1", "0"]
+        assert await agg("avg") == ["3", "1", "0"]
+        assert await agg("min") == ["2", "1", "0"]
+        assert await agg("count") == ["2", "1", "0"]
+
+    async def test_export_matches_input(self):
+        tool = DataTool()
+        await tool.execute(action="load", dataset="c", data=CSV)
+        exported = await tool.execute(action="export", dataset="c", format="csv")
+        assert exported.output.replace("\r\n", "\n") == CSV
+
+        records = [{"a": 1, "b": [1, 2]}, {"a": "x"}]
+        await tool.execute(action="load", dataset="j", data=json.dumps(records), format="json")
+        exported = await tool.execute(action="export", dataset="j", format="json")
+        assert json.loads(exported.output) == records
+
+    async def test_stats_and_list(self):
+        tool = DataTool()
+        await tool.execute(action="load", dataset="c", data=CSV)
+        stats = (await tool.execute(action="stats", dataset="c", column="qty")).output
+        assert "| Non-empty | 3 |" in stats
+        assert "| Numeric values | 3 |" in stats
+        assert "| Sum | 20 |" in stats
+        assert "KB" in (await tool.execute(action="list")).output
+
+    async def test_missing_column_on_empty_dataset_has_no_values(self):
+        tool = DataTool()
+        await tool.execute(action="load", dataset="e", data="[]", format="json")
+        stats = (await tool.execute(action="stats", dataset="e", column="x")).output
+        assert "| Unique values | 0 |" in stats
+        assert "|  | 0 |" not in stats
+        chart = await tool.execute(action="chart", dataset="e", column="x")
+        assert chart.output == "(no data)"
+
+
+# Reference behaviour of the row-dict DataTool the columnar engine replaced.
+MIXED = [
+    {"g": "a", "v": 1, "n": "x"},
+    {"v": "2", "g": "b"},
+    {"g": "a", "n": None},
+    {"g": "b", "v": None, "n": "y"},
+    {"n": "x", "g": "c", "v": 3.5},
+]
+
+
+def _reference_rows(data: str, fmt: str) -> list[dict]:
+    return json.loads(data) if fmt == "json" else list(csv.DictReader(io.StringIO(data)))
+
+
+def _reference_csv(rows: list[dict]) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=rows[0].keys())
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def _reference_groups(rows: list[dict], group_by: str, value_column: str) -> dict:
+    groups: dict = defaultdict(list)
+    for row in rows:
+        try:
+            groups[row.get(group_by, "(empty)")].append(float(row.get(value_column, 0)))
+        except (ValueError, TypeError):
+            pass
+    return {k: (len(v), sum(v)) for k, v in sorted(groups.items())}
+
+
+@pytest.mark.asyncio
+class TestMatchesRowDictBaseline:
+    async def _load(self, data: str, fmt: str) -> DataTool:
+        tool = DataTool()
+        await tool.execute(action="load", dataset="d", data=data, format=fmt)
+        return tool
+
+    @pytest.mark.parametrize(
+        ("data", "fmt"),
+        [(json.dumps(MIXED), "json"), ("a,b,c\n1,2,3\n4\n5,,6\n", "csv")],
+    )
+    async def test_exports(self, data, fmt):
+        tool = await self._load(data, fmt)
+        rows = _reference_rows(data, fmt)
+        as_csv = await tool.execute(action="export", dataset="d", format="csv")
+        as_json = await tool.execute(action="export", dataset="d", format="json")
+        assert as_csv.output == _reference_csv(rows)
+        assert as_json.output == json.dumps(rows, indent=2)
+
+    async def test_aggregates_count_rows_missing_the_key(self):
+        tool = await self._load(json.dumps(MIXED), "json")
+        expected = _reference_groups(MIXED, "g", "v")
+        assert expected == {"a": (2, 1.0), "b": (1, 2.0), "c": (1, 3.5)}
+        for agg, pick in (("count", 0), ("sum", 1)):
+            result = await tool.execute(
+                action="transform", dataset="d", group_by="g", agg=agg, value_column="v"
+            )
+            got = [line.split(" | ")[1].rstrip(" |") for line in result.output.splitlines()[4:]]
+            assert got == [f"{v[pick]:.4g}" if pick else str(v[0]) for v in expected.values()]
+
+        absent = await tool.execute(
+            action="transform", dataset="d", group_by="g", agg="count", value_column="nope"
+        )
+        assert "| a | 2 |" in absent.output
+
+    @pytest.mark.parametrize(
+        ("data", "fmt", "column"),
+        [
+            (json.dumps(MIXED), "json", "n"),
+            ("k,v\na,\nb,1\nc,x\nd,\ne,2\nf,\ng,1\nh,\n", "csv", "v"),
+        ],
+    )
+    async def test_value_count_ties_keep_first_seen_order(self, data, fmt, column):
+        tool = await self._load(data, fmt)
+        values = [r.get(column, "") for r in _reference_rows(data, fmt)]
+        expected = Counter(values).most_common(20)
+        chart = (await tool.execute(action="chart", dataset="d", column=column)).output
+        assert [line.split(" | ")[0].strip() for line in chart.splitlines()[2:]] == [
+            str(v)[:20] for v, _ in expected
+        ]
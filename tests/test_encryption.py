@@ -1,5 +1,7 @@
 """Tests for core.encryption — Fernet symmetric encryption utility."""
 
+import threading
+
 
 class TestEncryption:
     """Test encrypt/decrypt roundtrip, legacy passthrough, and error cases."""
@@ -63,10 +65,10 @@ class TestEncryptionMissingCryptography:
 
     def test_encrypt_without_cryptography(self, monkeypatch):
         """Simulate missing cryptography by clearing the Fernet cache."""
-        from core.encryption import _get_fernet
+        from core.encryption import clear_key_cache
 
         # Clear cache so we can monkeypatch
-        _get_fernet.cache_clear()
+        clear_key_cache()
 
         import core.encryption as enc_mod
 
@@ -81,4 +83,115 @@ class TestEncryptionMissingCryptography:
 
         # Restore
         monkeypatch.setattr(enc_mod, "_get_fernet", original_get_fernet)
-        _get_fernet.cache_clear()
+        clear_key_cache()
+
+
+class TestKeyCacheAndBatch:
+    """Derived-key caching, batch helpers and secret rotation."""
+
+    def test_derived_key_cached_until_cleared(self):
+        from core.encryption import _get_fernet, clear_key_cache
+
+        first = _get_fernet("cache-secret")
+        assert _get_fernet("cache-secret") is first
+        assert _get_fernet("cache-secret", iterations=1000) is not first
+
+        clear_key_cache("other-secret")
+        assert _get_fernet("cache-secret") is first
+        clear_key_cache("cache-secret")
+        assert _get_fernet("cache-secret") is not first
+
+    def test_key_cache_is_bounded(self):
+        from core import encryption as enc_mod
+
+        enc_mod.clear_key_cache()
+        for i in range(enc_mod._KEY_CACHE_SIZE + 2):
+            enc_mod._get_fernet(f"secret-{i}", iterations=1000)
+        assert len(enc_mod._fernets) == enc_mod._KEY_CACHE_SIZE
+        assert ("secret-0", enc_mod._SALT, 1000) not in enc_mod._fernets
+
+    def test_derivation_runs_once_per_key_outside_the_cache_lock(self, monkeypatch):
+        from core import encryption as enc_mod
+
+        enc_mod.clear_key_cache()
+        slow_started, release = threading.Event(), threading.Event()
+        derived: list[str] = []
+
+        def fake_derive(secret, salt, iterations):
+            derived.append(secret)
+            if secret == "slow":
+                slow_started.set()
+                release.wait(5)
+            return object()
+
+        monkeypatch.setattr(enc_mod, "_derive_fernet", fake_derive)
+        results: list[object] = []
+        slow_callers = [
+            threading.Thread(target=lambda: results.append(enc_mod._get_fernet("slow")))
+            for _ in range(3)
+        ]
+        for t in slow_callers:
+            t.start()
+        assert slow_started.wait(5)
+
+        # Another key derives while "slow" is still in progress.
+        assert enc_mod._get_fernet("fast") is not None
+        release.set()
+        for t in slow_callers:
+            t.join(5)
+
+        assert sorted(derived) == ["fast", "slow"]
+        assert len(results) == 3 and all(r is results[0] for r in results)
+        enc_mod.clear_key_cache()
+
+    def test_batch_roundtrip(self):
+        from core.encryption import decrypt_values, encrypt_values, is_encrypted
+
+        values = {"A": "alpha", "B": "beta"}
+        encrypted = encrypt_values(values, "batch-secret")
+        assert all(is_encrypted(v) for v in encrypted.values())
+        # Already-encrypted values are not wrapped twice.
+        assert encrypt_values(encrypted, "batch-secret") == encrypted
+        assert decrypt_values({**encrypted, "C": "legacy"}, "batch-secret") == {
+            **values,
+            "C": "legacy",
+        }
+        assert encrypt_values(values, "") == values
+
+    def test_rotate_values(self):
+        import pytest
+
+        from core.encryption import decrypt_values, encrypt_values, rotate_values
+
+        stored = {**encrypt_values({"A": "alpha"}, "old-secret"), "B": "legacy"}
+        rotated = rotate_values(stored, "old-secret", "new-secret")
+        assert decrypt_values(rotated, "new-secret") == {"A": "alpha", "B": "legacy"}
+        # Re-running an interrupted rotation is harmless.
+        again = rotate_values(rotated, "old-secret", "new-secret")
+        assert decrypt_values(again, "new-secret") == {"A": "alpha", "B": "legacy"}
+
+        foreign = encrypt_values({"C": "gamma"}, "unrelated-secret")
+        with pytest.raises(ValueError, match="C"):
+            rotate_values({**stored, **foreign}, "old-secret", "new-secret")
+
+    def test_key_store_rotation(self, tmp_path, monkeypatch):
+        import json
+
+        from core.encryption import decrypt_values
+        from core.key_store import KeyStore
+
+        monkeypatch.setenv("JWT_SECRET", "old-secret")
+        monkeypatch.setenv("OPENAI_API_KEY", "")  # restored after set_key injects it
+        path = tmp_path / "settings.json"
+        store = KeyStore(path)
+        store.set_key("OPENAI_API_KEY", "sk-test-1234567890")
+
+        before = path.read_text()
+        assert store.rotate_secret("old-secret", "new-secret", dry_run=True) == 1
+        assert path.read_text() == before
+
+        assert store.rotate_secret("old-secret", "new-secret") == 1
+        stored = json.loads(path.read_text())["api_keys"]
+        assert decrypt_values(stored, "new-secret") == {"OPENAI_API_KEY": "sk-test-1234567890"}
+        monkeypatch.setenv("JWT_SECRET", "new-secret")
+        assert KeyStore(path)._keys == {"OPENAI_API_KEY": "sk-test-1234567890"}
@@ -0,0 +1,219 @@
+"""Tests for the intelligence event ring buffer and its since= cursor."""
+
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from dashboard.auth import AuthContext, require_admin
+from dashboard.event_log import IntelligenceEventLog
+
+
+class TestRingBuffer:
+    def test_seq_is_monotonic_and_capacity_bounded(self):
+        log = IntelligenceEventLog(capacity=3)
+        for i in range(5):
+            log.append("routing", {"i": i})
+
+        assert len(log) == 3
+        assert log.latest_seq == 5
+        assert log.oldest_seq == 3
+        assert [e["seq"] for e in log.recent()] == [5, 4, 3]
+
+    def test_since_returns_only_newer_events(self):
+        log = IntelligenceEventLog(capacity=10)
+        for i in range(4):
+            log.append("memory", {"i": i})
+
+        assert [e["seq"] for e in log.since(2)] == [3, 4]
+        assert log.since(4) == []
+        assert [e["seq"] for e in log.since(0, limit=2)] == [1, 2]
+
+    def test_missed_when_cursor_predates_buffer(self):
+        log = IntelligenceEventLog(capacity=2)
+        for i in range(5):
+            log.append("memory", {"i": i})
+
+        assert log.missed(1)
+        assert not log.missed(3)
+        assert not log.missed(5)
+
+
+class TestPersistence:
+    def test_restart_resumes_sequence_from_file(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        log = IntelligenceEventLog(capacity=10, path=path)
+        for i in range(3):
+            log.append("routing", {"i": i})
+        log.close()
+
+        restored = IntelligenceEventLog(capacity=10, path=path)
+        assert restored.latest_seq == 3
+        assert [e["data"]["i"] for e in restored.since(1)] == [1, 2]
+        assert restored.append("routing", {"i": 3})["seq"] == 4
+        restored.close()
+
+    def test_torn_trailing_line_is_skipped(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text(
+            json.dumps({"seq": 1, "type": "a", "data": {}, "ts": 0}) + "\n" + '{"seq": 2, "ty'
+        )
+        log = IntelligenceEventLog(path=path)
+        assert log.latest_seq == 1
+
+    def test_file_compacted_past_size_cap(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        log = IntelligenceEventLog(capacity=5, path=path, max_file_bytes=2000)
+        for i in range(100):
+            log.append("routing", {"payload": "x" * 50, "i": i})
+        log.close()
+
+        assert path.stat().st_size <= 2000
+        restored = IntelligenceEventLog(capacity=5, path=path)
+        assert restored.latest_seq == 100
+
+    def test_oversized_buffer_is_not_rewritten_on_every_append(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        log = IntelligenceEventLog(capacity=50, path=path, max_file_bytes=500)
+        with patch("dashboard.event_log.os.replace", wraps=os.replace) as replace:
+            for i in range(200):
+                log.append("routing", {"payload": "x" * 50, "i": i})
+        log.close()
+
+        assert 0 < replace.call_count < 10
+        restored = IntelligenceEventLog(capacity=50, path=path)
+        assert restored.latest_seq == 200
+
+    @pytest.mark.asyncio
+    async def test_append_async_writes_from_a_worker_thread(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text(json.dumps({"seq": 7, "type": "a", "data": {}, "ts": 0}) + "\n")
+        log = IntelligenceEventLog(path=path)
+        threads = []
+        real_flush = log.flush
+
+        def flush():
+            threads.append(threading.get_ident())
+            real_flush()
+
+        log.flush = flush
+        event = await log.append_async("routing", {"i": 1})
+        log.close()
+
+        assert event["seq"] == 8
+        assert threads[0] != threading.get_ident()
+        assert [json.loads(line)["seq"] for line in path.read_text().splitlines()] == [7, 8]
+
+    def test_events_recorded_during_flushes_are_not_lost(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        log = IntelligenceEventLog(capacity=5000, path=path)
+        stop = threading.Event()
+
+        def flusher():
+            while not stop.is_set():
+                log.flush()
+
+        thread = threading.Thread(target=flusher)
+        thread.start()
+        for i in range(2000):
+            log._record("routing", {"i": i})
+        stop.set()
+        thread.join()
+        log.close()
+
+        seqs = [json.loads(line)["seq"] for line in path.read_text().splitlines()]
+        assert seqs == list(range(1, 2001))
+
+
+class TestActivityRoute:
+    def _client(self):
+        from dashboard.server import create_app
+
+        app = create_app(app_manager=MagicMock())
+        app.dependency_overrides[require_admin] = lambda: AuthContext(user="test-admin")
+        app.state.intelligence_events = IntelligenceEventLog(capacity=3)
+        return app, TestClient(app)
+
+    def test_since_cursor_returns_delta(self):
+        app, client = self._client()
+        for i in range(3):
+            app.state.intelligence_events.append("routing", {"i": i})
+
+        body = client.get("/api/activity", params={"since": 1}).json()
+
+        assert [e["seq"] for e in body["events"]] == [3, 2]
+        assert body["latest_seq"] == 3
+        assert body["reset"] is False
+
+    def test_stale_cursor_requests_reset(self):
+        app, client = self._client()
+        for i in range(6):
+            app.state.intelligence_events.append("routing", {"i": i})
+
+        evicted = client.get("/api/activity", params={"since": 1}).json()
+        ahead = client.get("/api/activity", params={"since": 50}).json()
+
+        assert evicted["reset"] is True
+        assert [e["seq"] for e in evicted["events"]] == [6, 5, 4]
+        assert ahead["reset"] is True
+
+    def test_websocket_since_replays_missed_events(self):
+        from dashboard.auth import create_token
+        from dashboard.server import create_app
+        from dashboard.websocket_manager import WebSocketManager
+
+        app = create_app(ws_manager=WebSocketManager(), app_manager=MagicMock())
+        app.state.intelligence_events = IntelligenceEventLog(capacity=10)
+        for i in range(3):
+            app.state.intelligence_events.append("routing", {"i": i})
+
+        with TestClient(app).websocket_connect(f"/ws?token={create_token('admin')}&since=1") as ws:
+            sync = ws.receive_json()
+            replayed = [ws.receive_json(), ws.receive_json()]
+
+        assert sync == {"type": "intelligence_sync", "data": {"latest_seq": 3, "reset": False}}
+        assert [m["data"]["seq"] for m in replayed] == [2, 3]
+
+    def test_persisted_log_is_read_and_closed_off_the_loop(self, tmp_path):
+        from dashboard.auth import create_token
+        from dashboard.server import create_app
+        from dashboard.websocket_manager import WebSocketManager
+
+        path = tmp_path / "events.jsonl"
+        writer = IntelligenceEventLog(path=path)
+        for i in range(3):
+            writer.append("routing", {"i": i})
+        writer.close()
+
+        on_loop = []
+        log = IntelligenceEventLog(path=path)
+        real_load, real_close = log._load, log.close
+
+        def _load():
+            on_loop.append(("load", _running_loop()))
+            real_load()
+
+        def close():
+            on_loop.append(("close", _running_loop()))
+            real_close()
+
+        log._load, log.close = _load, close
+        app = create_app(ws_manager=WebSocketManager(), app_manager=MagicMock())
+        app.state.intelligence_events = log
+        with TestClient(app) as client:
+            with client.websocket_connect(f"/ws?token={create_token('admin')}&since=1") as ws:
+                assert ws.receive_json()["data"] == {"latest_seq": 3, "reset": False}
+
+        assert on_loop == [("load", False), ("close", False)]
+
+
+def _running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
@@ -0,0 +1,116 @@
+"""Tests for the inotify-backed file watcher and its stat-index fallback."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+import tools.file_watcher as file_watcher
+from tools.file_watcher import FileWatcherTool
+
+
+def _write(root, rel, text):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+def _age(path):
+    """Push mtime into the past so the stat is trusted without re-hashing."""
+    os.utime(path, (1_000_000, 1_000_000))
+
+
+@pytest.fixture(params=["inotify", "stat"])
+def tool(request, tmp_path, monkeypatch):
+    if request.param == "inotify" and not file_watcher.inotify_available():
+        pytest.skip("inotify not available")
+    if request.param == "stat":
+        monkeypatch.setattr(file_watcher, "inotify_available", lambda: False)
+    monkeypatch.setattr(file_watcher, "DEBOUNCE_SECONDS", 0.02)
+    for i in range(5):
+        _age(_write(tmp_path, f"src/m{i}.py", f"x = {i}\n"))
+    return FileWatcherTool(str(tmp_path))
+
+
+class TestChangeDetection:
+    @pytest.mark.asyncio
+    async def test_only_changed_files_are_hashed(self, tool, tmp_path):
+        await tool.execute(action="snapshot")
+        _write(tmp_path, "src/m0.py", "x = 'changed'\n")
+
+        with patch.object(FileWatcherTool, "_file_hash", wraps=FileWatcherTool._file_hash) as h:
+            result = await tool.execute(action="check")
+
+        assert "~ src/m0.py" in result.output
+        assert h.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_same_size_rewrite_is_detected(self, tool, tmp_path):
+        _write(tmp_path, "src/m1.py", "x = 1\n")
+        await tool.execute(action="snapshot")
+        _write(tmp_path, "src/m1.py", "x = 9\n")
+
+        result = await tool.execute(action="check")
+        assert "~ src/m1.py" in result.output
+
+    @pytest.mark.asyncio
+    async def test_rename_is_collapsed(self, tool, tmp_path):
+        await tool.execute(action="snapshot")
+        os.rename(tmp_path / "src" / "m2.py", tmp_path / "src" / "moved.py")
+
+        result = await tool.execute(action="check")
+
+        assert "> src/m2.py -> src/moved.py" in result.output
+        assert "Added" not in result.output
+        assert "Deleted" not in result.output
+
+    @pytest.mark.asyncio
+    async def test_new_and_removed_directories(self, tool, tmp_path):
+        await tool.execute(action="snapshot")
+        _write(tmp_path, "pkg/sub/new.py", "y = 1\n")
+        for i in range(5):
+            os.remove(tmp_path / "src" / f"m{i}.py")
+        os.rmdir(tmp_path / "src")
+
+        result = await tool.execute(action="check")
+
+        assert "+ pkg/sub/new.py" in result.output
+        assert "### Deleted (5)" in result.output
+
+    @pytest.mark.asyncio
+    async def test_ignore_globs(self, tool, tmp_path):
+        await tool.execute(action="snapshot", ignore="*.log,build")
+        _write(tmp_path, "debug.log", "noise\n")
+        _write(tmp_path, "build/out.py", "z = 1\n")
+
+        result = await tool.execute(action="check")
+        assert "No changes" in result.output
+
+    @pytest.mark.asyncio
+    async def test_burst_of_writes_reports_final_state(self, tool, tmp_path):
+        await tool.execute(action="snapshot")
+        for i in range(50):
+            _write(tmp_path, "src/m3.py", f"x = {i} # burst\n")
+
+        result = await tool.execute(action="check")
+        assert "### Modified (1)" in result.output
+
+    @pytest.mark.asyncio
+    async def test_watched_root_moved_away(self, tool, tmp_path):
+        await tool.execute(action="snapshot", path="src")
+        os.rename(tmp_path / "src", tmp_path / "gone")
+
+        result = await tool.execute(action="check")
+        assert "### Deleted (5)" in result.output
+
+
+class TestWatchLifecycle:
+    @pytest.mark.asyncio
+    async def test_stop_releases_watch(self, tmp_path):
+        tool = FileWatcherTool(str(tmp_path))
+        await tool.execute(action="snapshot", watch_id="w")
+
+        assert (await tool.execute(action="stop", watch_id="w")).success is True
+        assert (await tool.execute(action="check", watch_id="w")).success is False
@@ -0,0 +1,200 @@
+"""Tests for the knowledge-base BM25 index and its use by KnowledgeTool."""
+
+import math
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.sandbox import WorkspaceSandbox
+from tools.knowledge_index import (
+    K1,
+    B,
+    BM25Index,
+    _decode,
+    _encode,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from tools.knowledge_tool import KnowledgeTool
+
+
+def _brute_force(corpus: dict[str, list[str]], query: str) -> list[tuple[float, str, int]]:
+    """Reference BM25 over every chunk, for checking WAND's pruning."""
+    chunks = [
+        (doc, i, tokenize(text)) for doc, texts in corpus.items() for i, text in enumerate(texts)
+    ]
+    n = len(chunks)
+    avgdl = sum(len(t) for _, _, t in chunks) / n
+    df = Counter(term for _, _, t in chunks for term in set(t))
+    scored = []
+    for doc, i, tokens in chunks:
+        tf = Counter(tokens)
+        score = 0.0
+        for term in set(tokenize(query)):
+            if tf[term]:
+                idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                score += (
+                    idf * tf[term] * (K1 + 1) / (tf[term] + K1 * (1 - B + B * len(tokens) / avgdl))
+                )
+        if score > 0:
+            scored.append((score, doc, i))
+    return sorted(scored, reverse=True)
+
+
+class TestEncoding:
+    def test_round_trip_and_append(self):
+        pairs = [(1, 3), (2, 1), (300, 7), (70000, 1)]
+        ids, tfs = _decode(_encode(pairs[:2]) + _encode(pairs[2:], prev=2))
+        assert list(zip(ids, tfs)) == pairs
+
+    def test_tokenize_strips_edge_punctuation(self):
+        assert tokenize("Hello, World! (it's) --") == ["hello", "world", "it's"]
+
+
+class TestBM25Index:
+    CORPUS = {
+        "a.md": [
+            "the quick brown fox jumps over the lazy dog",
+            "foxes are quick and clever animals",
+        ],
+        "b.md": [
+            "a lazy afternoon with a dog and a cat",
+            "python asyncio event loop internals",
+            "the brown dog sleeps",
+        ],
+        "c.md": ["quick quick quick sort algorithm in python"],
+    }
+
+    def _index(self, tmp_path):
+        index = BM25Index(tmp_path / "bm25.db")
+        for doc, chunks in self.CORPUS.items():
+            index.replace_document(doc, doc, chunks)
+        return index
+
+    @pytest.mark.parametrize("query", ["quick dog", "lazy brown dog", "python", "the fox", "zebra"])
+    @pytest.mark.parametrize("top_k", [1, 2, 10])
+    def test_matches_exhaustive_scoring(self, tmp_path, query, top_k):
+        hits = self._index(tmp_path).search(query, top_k)
+        expected = _brute_force(self.CORPUS, query)[:top_k]
+        assert [(h.doc, h.chunk_index) for h in hits] == [(d, i) for _, d, i in expected]
+        for hit, (score, _, _) in zip(hits, expected):
+            assert hit.score == pytest.approx(score)
+
+    def test_replace_and_remove_are_incremental(self, tmp_path):
+        index = self._index(tmp_path)
+        assert len(index) == 6
+
+        index.replace_document("c.md", "c.md", ["zebra crossing"])
+        assert len(index) == 6
+        assert [h.doc for h in index.search("zebra")] == ["c.md"]
+        assert all(h.doc != "c.md" for h in index.search("quick"))
+
+        assert index.remove_document("a.md") == 2
+        assert index.remove_document("a.md") == 0
+        assert index.documents() == {"b.md", "c.md"}
+        assert index.search("fox") == []
+
+    def test_persists_across_instances(self, tmp_path):
+        self._index(tmp_path).close()
+        assert BM25Index(tmp_path / "bm25.db").search("asyncio")[0].doc == "b.md"
+
+
+class TestFusion:
+    def test_items_ranked_by_both_lists_win(self):
+        fused = reciprocal_rank_fusion([[("a",), ("b",), ("c",)], [("b",), ("d",), ("c",)]])
+        assert fused[0][0] == ("b",)
+        assert {key for key, _ in fused} == {("a",), ("b",), ("c",), ("d",)}
+
+
+@pytest.fixture
+def make_tool(tmp_path):
+    sandbox = WorkspaceSandbox(tmp_path, enabled=True)
+
+    def make(embedding_store=None):
+        with patch("tools.knowledge_tool.settings") as mock_settings:
+            mock_settings.knowledge_dir = str(tmp_path / "knowledge")
+            mock_settings.knowledge_chunk_size = 30
+            mock_settings.knowledge_chunk_overlap = 0
+            mock_settings.knowledge_max_results = 10
+            return KnowledgeTool(sandbox, embedding_store=embedding_store)
+
+    return make
+
+
+class TestKnowledgeToolKeywordSearch:
+    @pytest.mark.asyncio
+    async def test_import_query_delete(self, make_tool, tmp_path):
+        (tmp_path / "notes.md").write_text("Kubernetes pods restart when probes fail.")
+        (tmp_path / "other.md").write_text("Unrelated text about gardening and tomatoes.")
+        tool = make_tool()
+        await tool.execute(action="import_file", path=str(tmp_path / "notes.md"))
+        await tool.execute(action="import_file", path=str(tmp_path / "other.md"))
+
+        result = await tool.execute(action="query", query="why do pods restart?")
+        assert "Found 1 results (keyword search)" in result.output
+        assert "notes.md" in result.output
+
+        await tool.execute(action="delete", path="notes.md")
+        result = await tool.execute(action="query", query="pods")
+        assert "No results" in result.output
+
+    @pytest.mark.asyncio
+    async def test_legacy_chunk_files_are_backfilled(self, make_tool, tmp_path):
+        tool = make_tool()
+        (tmp_path / "old.md").write_text("placeholder")
+        await tool.execute(action="import_file", path=str(tmp_path / "old.md"))
+        (await tool._keyword_index()).remove_document(str(tmp_path / "old.md"))
+        legacy = tmp_path / "knowledge" / "old"
+        legacy.mkdir()
+        (legacy / "chunk_0000.txt").write_text("legacy walrus content")
+
+        result = await make_tool().execute(action="query", query="walrus")
+        assert "old.md" in result.output
+        assert not legacy.exists()
+        assert (legacy.parent / "old.migrated" / "chunk_0000.txt").exists()
+
+    @pytest.mark.asyncio
+    async def test_documents_sharing_a_legacy_dir_are_both_backfilled(self, make_tool, tmp_path):
+        tool = make_tool()
+        for name in ("notes.md", "notes.txt"):
+            (tmp_path / name).write_text("placeholder")
+            await tool.execute(action="import_file", path=str(tmp_path / name))
+            (await tool._keyword_index()).remove_document(str(tmp_path / name))
+        legacy = tmp_path / "knowledge" / "notes"
+        legacy.mkdir()
+        (legacy / "chunk_0000.txt").write_text("legacy walrus content")
+
+        index = await make_tool()._keyword_index()
+        assert {str(tmp_path / "notes.md"), str(tmp_path / "notes.txt")} <= index.documents()
+        assert not legacy.exists()
+
+    @pytest.mark.asyncio
+    async def test_hybrid_fuses_vector_and_keyword_hits(self, make_tool, tmp_path):
+        store = MagicMock(is_available=True)
+        store.add_entries = AsyncMock()
+        store.embed_texts = AsyncMock(side_effect=lambda texts: [[0.0]] * len(texts))
+        tool = make_tool(store)
+        (tmp_path / "a.md").write_text("vector only semantic match")
+        (tmp_path / "b.md").write_text("exact keyword zanzibar")
+        await tool.execute(action="import_file", path=str(tmp_path / "a.md"))
+        await tool.execute(action="import_file", path=str(tmp_path / "b.md"))
+
+        store.search = AsyncMock(
+            return_value=[
+                {
+                    "text": "vector only semantic match",
+                    "score": 0.9,
+                    "metadata": {
+                        "file_path": str(tmp_path / "a.md"),
+                        "file_name": "a.md",
+                        "chunk_index": 0,
+                    },
+                }
+            ]
+        )
+        with patch.object(tool, "_try_rlm_synthesis", AsyncMock(return_value=None)):
+            result = await tool.execute(action="query", query="zanzibar")
+        assert "Found 2 results" in result.output
+        assert "(0.900) a.md" in result.output
+        assert "(keyword) b.md" in result.output
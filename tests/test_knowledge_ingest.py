@@ -0,0 +1,253 @@
+"""Tests for the streaming knowledge ingestion pipeline."""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.sandbox import WorkspaceSandbox
+from tools.knowledge_index import BM25Index
+from tools.knowledge_ingest import (
+    ImportProgress,
+    IngestFile,
+    IngestPipeline,
+    StreamingChunker,
+)
+from tools.knowledge_tool import KnowledgeTool, _checksum, _chunk_text
+
+
+class FakeStore:
+    """Embedding store stand-in that can fail after a number of batches."""
+
+    is_available = True
+
+    def __init__(self, fail_after: int | None = None):
+        self.fail_after = fail_after
+        self.embedded: list[list[str]] = []
+        self.entries: list[dict] = []
+
+    async def embed_texts(self, texts):
+        if self.fail_after is not None and len(self.embedded) >= self.fail_after:
+            raise RuntimeError("embedding API unavailable")
+        self.embedded.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    async def add_entries(self, items, vectors=None):
+        assert vectors is not None and len(vectors) == len(items)
+        self.entries.extend(items)
+
+    def remove_entries(self, source, file_path):
+        before = len(self.entries)
+        self.entries = [e for e in self.entries if e["metadata"]["file_path"] != file_path]
+        return before - len(self.entries)
+
+
+def _paged_reader(pages_by_file):
+    def reader(path, first_page=0, max_pages=None):
+        pages = pages_by_file[os.path.basename(path)]
+        stop = len(pages) if max_pages is None else first_page + max_pages
+        return pages[first_page:stop], stop < len(pages)
+
+    return reader
+
+
+class TestStreamingChunker:
+    @pytest.mark.parametrize("size,overlap", [(30, 0), (30, 6), (100, 10), (7, 6), (1, 0)])
+    @pytest.mark.parametrize("split_every", [1, 7, 1000])
+    def test_matches_chunk_text(self, size, overlap, split_every):
+        words = [f"w{i}" for i in range(157)]
+        chunker = StreamingChunker(size, overlap)
+        chunks = []
+        for i in range(0, len(words), split_every):
+            chunks += chunker.feed(" ".join(words[i : i + split_every]))
+        chunks += chunker.flush()
+        assert chunks == _chunk_text(" ".join(words), size, overlap)
+
+
+class TestIngestPipeline:
+    def _files(self, tmp_path, pages_by_file):
+        return [IngestFile(key=p, path=tmp_path / p, source_hash=f"h-{p}") for p in pages_by_file]
+
+    @pytest.mark.asyncio
+    async def test_streams_pages_in_fixed_batches(self, tmp_path):
+        pages = {
+            "a.pdf": [f"page {i} " + "alpha " * 20 for i in range(20)],
+            "b.txt": ["beta " * 30],
+        }
+        store = FakeStore()
+        index = BM25Index(tmp_path / "bm25.db")
+        files = self._files(tmp_path, pages)
+        with patch("tools.knowledge_ingest.PDF_PAGES_PER_TASK", 3):
+            report = await IngestPipeline(
+                _paged_reader(pages),
+                index,
+                ImportProgress(tmp_path / "progress.json"),
+                embedding_store=store,
+                chunk_size=15,
+                overlap=0,
+                batch_size=4,
+            ).run(files)
+
+        for f in files:
+            text = "\n\n".join(pages[f.key])
+            assert f.checksum == _checksum(text)
+            assert f.chunk_count == f.stored == len(_chunk_text(text, 15, 0))
+        assert report.chunks == sum(f.chunk_count for f in files) == len(store.entries)
+        assert all(len(batch) == 4 for batch in store.embedded[:-1])
+        assert len(index) == report.chunks
+        progress = ImportProgress(tmp_path / "progress.json")
+        assert all(progress.resume_point(f.key, f.source_hash) == f.chunk_count for f in files)
+
+    @pytest.mark.asyncio
+    async def test_interrupted_run_resumes_after_stored_chunks(self, tmp_path):
+        pages = {"a.txt": ["word " * 200]}
+        index = BM25Index(tmp_path / "bm25.db")
+        progress_path = tmp_path / "progress.json"
+
+        def pipeline(store):
+            return IngestPipeline(
+                _paged_reader(pages),
+                index,
+                ImportProgress(progress_path),
+                embedding_store=store,
+                chunk_size=15,
+                overlap=0,
+                batch_size=2,
+            )
+
+        with pytest.raises(RuntimeError):
+            await pipeline(FakeStore(fail_after=3)).run(self._files(tmp_path, pages))
+        saved = json.loads(progress_path.read_text())
+        assert saved["a.txt"] == {"source_hash": "h-a.txt", "stored": 6}
+
+        store = FakeStore()
+        files = self._files(tmp_path, pages)
+        files[0].resume_from = ImportProgress(progress_path).resume_point("a.txt", "h-a.txt")
+        report = await pipeline(store).run(files)
+
+        total = len(_chunk_text(pages["a.txt"][0], 15, 0))
+        assert report.chunks == len(store.entries) == total - 6
+        assert store.entries[0]["metadata"]["chunk_index"] == 6
+        assert files[0].stored == total
+        assert len(index) == total
+
+    @pytest.mark.asyncio
+    async def test_parse_error_is_per_file(self, tmp_path):
+        def reader(path, first_page=0, max_pages=None):
+            if path.endswith("bad.txt"):
+                raise ValueError("corrupt")
+            return ["fine text"], False
+
+        files = [
+            IngestFile(key="bad.txt", path=tmp_path / "bad.txt", source_hash="x"),
+            IngestFile(key="ok.txt", path=tmp_path / "ok.txt", source_hash="y"),
+        ]
+        await IngestPipeline(
+            reader, BM25Index(tmp_path / "bm25.db"), ImportProgress(tmp_path / "p.json")
+        ).run(files)
+        assert "corrupt" in files[0].error
+        assert files[1].error == "" and files[1].stored == 1
+
+    @pytest.mark.asyncio
+    async def test_parse_error_part_way_removes_stored_chunks(self, tmp_path):
+        def reader(path, first_page=0, max_pages=None):
+            if first_page >= 2:
+                raise ValueError("corrupt page")
+            return [f"page {first_page} " + "word " * 40], True
+
+        store = FakeStore()
+        index = BM25Index(tmp_path / "bm25.db")
+        files = [IngestFile(key="bad.pdf", path=tmp_path / "bad.pdf", source_hash="x")]
+        with patch("tools.knowledge_ingest.PDF_PAGES_PER_TASK", 1):
+            report = await IngestPipeline(
+                reader,
+                index,
+                ImportProgress(tmp_path / "p.json"),
+                embedding_store=store,
+                chunk_size=15,
+                overlap=0,
+                batch_size=2,
+            ).run(files)
+
+        assert "corrupt page" in files[0].error
+        assert files[0].discarded > 0 and files[0].stored == 0
+        assert report.chunks == 0
+        assert len(index) == 0 and store.entries == []
+        assert ImportProgress(tmp_path / "p.json").resume_point("bad.pdf", "x") == 0
+
+
+class TestKnowledgeToolImports:
+    def _tool(self, tmp_path, store=None):
+        with patch("tools.knowledge_tool.settings") as mock_settings:
+            mock_settings.knowledge_dir = str(tmp_path / "knowledge")
+            return KnowledgeTool(WorkspaceSandbox(tmp_path, enabled=True), embedding_store=store)
+
+    def _settings(self, tmp_path):
+        mock_settings = MagicMock()
+        mock_settings.knowledge_chunk_size = 15
+        mock_settings.knowledge_chunk_overlap = 0
+        mock_settings.knowledge_max_results = 10
+        mock_settings.knowledge_import_workers = 1
+        mock_settings.knowledge_embed_batch_size = 2
+        return patch("tools.knowledge_tool.settings", mock_settings)
+
+    @pytest.mark.asyncio
+    async def test_import_dir_reports_throughput_and_skips_unchanged(self, tmp_path):
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "a.md").write_text("alpha " * 50)
+        (docs / "b.txt").write_text("beta " * 50)
+        tool = self._tool(tmp_path)
+        with self._settings(tmp_path):
+            first = await tool.execute(action="import_dir", path=str(docs))
+            second = await tool.execute(action="import_dir", path=str(docs))
+
+        assert "Throughput:" in first.output and "chunks/s" in first.output
+        assert second.output.count("Already imported (unchanged)") == 2
+        assert "Throughput:" not in second.output
+
+    @pytest.mark.asyncio
+    async def test_failed_import_resumes_on_rerun(self, tmp_path):
+        doc = tmp_path / "big.txt"
+        doc.write_text("gamma " * 200)
+        failing = FakeStore(fail_after=2)
+        with self._settings(tmp_path):
+            result = await self._tool(tmp_path, failing).execute(
+                action="import_file", path=str(doc)
+            )
+            assert not result.success
+            assert "resume" in result.error
+
+            store = FakeStore()
+            tool = self._tool(tmp_path, store)
+            result = await tool.execute(action="import_file", path=str(doc))
+
+        total = len(_chunk_text(doc.read_text(), 15, 0))
+        assert result.success
+        assert f"{total} chunks" in result.output
+        assert len(failing.entries) + len(store.entries) == total
+        assert not (tmp_path / "knowledge" / "import_progress.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_legacy_entry_with_same_content_is_unchanged(self, tmp_path):
+        doc = tmp_path / "old.txt"
+        doc.write_text("legacy content")
+        knowledge = tmp_path / "knowledge"
+        knowledge.mkdir()
+        (knowledge / "index.json").write_text(
+            json.dumps(
+                [
+                    {
+                        "file_path": str(doc),
+                        "file_name": "old.txt",
+                        "file_type": ".txt",
+                        "checksum": _checksum("legacy content"),
+                        "chunk_count": 1,
+                    }
+                ]
+            )
+        )
+        with self._settings(tmp_path):
+            result = await self._tool(tmp_path).execute(action="import_file", path=str(doc))
+        assert "unchanged" in result.output
@@ -0,0 +1,128 @@
+"""Tests for LazyTool, ToolSchemaCache and the lazy_tools/warm_up helpers."""
+
+import os
+import sys
+import textwrap
+
+import pytest
+
+from tools.lazy_tool import LazyTool, ToolSchemaCache, ToolSpec, lazy_tools, warm_up
+
+TOOL_SOURCE = """
+from tools.base import Tool, ToolResult
+
+
+class EchoTool(Tool):
+    def __init__(self, prefix=""):
+        self._prefix = prefix
+
+    @property
+    def name(self):
+        return "echo"
+
+    @property
+    def description(self):
+        return "{description}"
+
+    @property
+    def parameters(self):
+        return {{"type": "object", "properties": {{"text": {{"type": "string"}}}}}}
+
+    async def execute(self, text="", **kwargs):
+        return ToolResult(output=self._prefix + text)
+"""
+
+
+@pytest.fixture
+def echo_module(tmp_path, monkeypatch):
+    """A throwaway tool module on sys.path, unloaded again after each build."""
+    path = tmp_path / "echo_tool_mod.py"
+
+    def write(description="Echo text back"):
+        path.write_text(textwrap.dedent(TOOL_SOURCE.format(description=description)))
+        sys.modules.pop("echo_tool_mod", None)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    write()
+    yield write
+    sys.modules.pop("echo_tool_mod", None)
+
+
+def _spec(built):
+    def build(cls):
+        built.append(cls)
+        return cls(prefix="> ")
+
+    return ToolSpec("echo_tool_mod", "EchoTool", build)
+
+
+class TestLazyTools:
+    def test_cached_schema_skips_import(self, echo_module, tmp_path):
+        built = []
+        cache_path = tmp_path / "schemas.json"
+
+        first = lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+        assert not isinstance(first[0], LazyTool) and len(built) == 1
+
+        sys.modules.pop("echo_tool_mod", None)
+        second = lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+        tool = second[0]
+        assert isinstance(tool, LazyTool) and not tool.loaded
+        assert "echo_tool_mod" not in sys.modules
+        assert tool.to_mcp_schema() == first[0].to_mcp_schema()
+        assert len(built) == 1
+
+    def test_changed_module_is_rebuilt(self, echo_module, tmp_path):
+        built = []
+        cache_path = tmp_path / "schemas.json"
+        lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+
+        echo_module("Echo text back, loudly")
+        tools = lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+        assert len(built) == 2
+        assert tools[0].description == "Echo text back, loudly"
+
+    def test_changed_sibling_module_is_rebuilt(self, echo_module, tmp_path):
+        built = []
+        cache_path = tmp_path / "schemas.json"
+        lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+
+        helper = tmp_path / "echo_helpers.py"
+        helper.write_text("PREFIX = '> '\n")
+        newer = (tmp_path / "echo_tool_mod.py").stat().st_mtime + 10
+        os.utime(helper, (newer, newer))
+        lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+        assert len(built) == 2
+
+    def test_missing_module_is_skipped(self, tmp_path):
+        spec = ToolSpec("no_such_tool_module", "Nope", lambda cls: cls())
+        assert lazy_tools([spec], ToolSchemaCache(tmp_path / "schemas.json")) == []
+
+
+@pytest.mark.asyncio
+class TestLazyToolExecution:
+    async def test_first_call_builds_once(self, echo_module, tmp_path):
+        built = []
+        cache_path = tmp_path / "schemas.json"
+        lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+        sys.modules.pop("echo_tool_mod", None)
+        tool = lazy_tools([_spec(built)], ToolSchemaCache(cache_path))[0]
+
+        assert (await tool.execute(text="hi")).output == "> hi"
+        assert (await tool.execute(text="again")).output == "> again"
+        assert tool.loaded and len(built) == 2  # once for the cache, once on demand
+
+    async def test_load_failure_is_a_tool_error(self, tmp_path):
+        spec = ToolSpec("no_such_tool_module", "Nope", lambda cls: cls())
+        schema = {"name": "nope", "description": "", "parameters": {"type": "object"}}
+        result = await LazyTool(spec, schema).execute()
+        assert not result.success and "nope is unavailable" in result.error
+
+    async def test_warm_up_builds_deferred_tools(self, echo_module, tmp_path):
+        built = []
+        cache_path = tmp_path / "schemas.json"
+        lazy_tools([_spec(built)], ToolSchemaCache(cache_path))
+        tool = lazy_tools([_spec(built)], ToolSchemaCache(cache_path))[0]
+
+        await warm_up([tool])
+        assert tool.loaded
@@ -0,0 +1,116 @@
+"""Tests for the per-file lint result cache."""
+
+import os
+import shutil
+
+import pytest
+
+from tools.lint_cache import LintCache
+from tools.linter_tool import LinterTool
+
+
+def _write(root, rel, text):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+    return os.path.realpath(path)
+
+
+class TestKeys:
+    def test_key_tracks_content_config_and_version(self, tmp_path):
+        cache = LintCache(str(tmp_path))
+        path = _write(tmp_path, "pkg/a.py", "x = 1\n")
+        base = cache.keys_for("ruff", "ruff 1.0", [path])[path]
+
+        assert cache.keys_for("ruff", "ruff 1.0", [path])[path] == base
+        assert cache.keys_for("ruff", "ruff 1.1", [path])[path] != base
+
+        _write(tmp_path, "pkg/ruff.toml", "line-length = 80\n")
+        nested = cache.keys_for("ruff", "ruff 1.0", [path])[path]
+        assert nested != base
+
+        _write(tmp_path, "pkg/a.py", "x = 2\n")
+        assert cache.keys_for("ruff", "ruff 1.0", [path])[path] != nested
+
+    def test_same_content_at_different_paths_has_different_keys(self, tmp_path):
+        cache = LintCache(str(tmp_path))
+        a = _write(tmp_path, "a.py", "x = 1\n")
+        b = _write(tmp_path, "tests/a.py", "x = 1\n")
+        keys = cache.keys_for("ruff", "v", [a, b])
+        assert keys[a] != keys[b]
+
+
+class TestStorage:
+    def test_round_trip(self, tmp_path):
+        cache = LintCache(str(tmp_path))
+        cache.put_many([("k1", "a.py", [{"code": "F401"}]), ("k2", "b.py", [])])
+        assert cache.get_many(["k1", "k2", "k3"]) == {"k1": [{"code": "F401"}], "k2": []}
+
+    def test_lru_eviction(self, tmp_path):
+        cache = LintCache(str(tmp_path), max_entries=2)
+        cache.put_many([("old", "a.py", [])])
+        cache.put_many([("used", "b.py", [])])
+        cache.get_many(["old"])  # refresh: "used" is now least recent
+        cache.put_many([("new", "c.py", [])])
+
+        assert len(cache) == 2
+        assert set(cache.get_many(["old", "used", "new"])) == {"old", "new"}
+
+
+class TestLinterVersion:
+    @pytest.mark.asyncio
+    async def test_version_is_resolved_per_workspace(self, tmp_path):
+        versions = {"a": "eslint 8.57.0", "b": "eslint 9.1.0"}
+        tools = {}
+        for name in versions:
+            tool = LinterTool(str(tmp_path / name))
+
+            async def capture(cmd, timeout=120.0, name=name):
+                return 0, versions[name]
+
+            tool._capture = capture
+            tools[name] = tool
+
+        assert await tools["a"]._linter_version("eslint") == "eslint 8.57.0"
+        assert await tools["b"]._linter_version("eslint") == "eslint 9.1.0"
+
+
+@pytest.mark.skipif(not shutil.which("ruff"), reason="ruff not installed")
+class TestCachedRuff:
+    @pytest.mark.asyncio
+    async def test_only_changed_files_are_relinted(self, tmp_path):
+        _write(tmp_path, "pyproject.toml", "[tool.ruff]\n")
+        for i in range(5):
+            _write(tmp_path, f"m{i}.py", "import os\n" if i == 0 else "x = 1\n")
+        tool = LinterTool(str(tmp_path))
+        first = await tool.execute(linter="ruff")
+
+        calls = []
+        capture = tool._capture
+
+        async def spy(cmd, timeout=120.0):
+            calls.append(cmd)
+            return await capture(cmd, timeout)
+
+        tool._capture = spy
+        second = await tool.execute(linter="ruff")
+        assert second.output == first.output
+        assert not any("--output-format=json" in c for c in calls)
+
+        _write(tmp_path, "m3.py", "import sys\n")
+        third = await tool.execute(linter="ruff")
+        linted = [c for c in calls if "--output-format=json" in c]
+        assert len(linted) == 1
+        assert [os.path.basename(a) for a in linted[0] if a.endswith(".py")] == ["m3.py"]
+        assert "2 issue(s)" in third.output
+
+    @pytest.mark.asyncio
+    async def test_config_change_invalidates(self, tmp_path):
+        _write(tmp_path, "pyproject.toml", "[tool.ruff]\n")
+        _write(tmp_path, "m.py", "import os\n")
+        tool = LinterTool(str(tmp_path))
+        assert (await tool.execute(linter="ruff")).success is False
+
+        _write(tmp_path, "pyproject.toml", "[tool.ruff]\nlint.ignore = ['F401']\n")
+        assert (await tool.execute(linter="ruff")).success is True
@@ -0,0 +1,223 @@
+"""Tests for the LLM proxy response cache and request coalescing."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from core.llm_cache import (
+    CachedResponse,
+    LLMResponseCache,
+    cache_key,
+    cached_from_sse,
+    completion_to_sse,
+    is_cacheable,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = LLMResponseCache(tmp_path / "llm_cache.db", ttl=60)
+    yield c
+    c.close()
+
+
+def _completion(text: str = "hello") -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "model": "m",
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+    }
+
+
+class TestCacheKey:
+    def test_ignores_stream_and_key_order(self):
+        a = {"model": "m", "messages": [{"role": "user", "content": "x"}], "temperature": 0}
+        b = {
+            "temperature": 0,
+            "stream": True,
+            "messages": [{"content": "x", "role": "user"}],
+            "model": "m",
+        }
+        assert cache_key("chat", a) == cache_key("chat", b)
+
+    def test_sampling_params_and_kind_change_key(self):
+        body = {"model": "m", "messages": [], "temperature": 0}
+        assert cache_key("chat", body) != cache_key("chat", {**body, "max_tokens": 10})
+        assert cache_key("chat", body) != cache_key("chat-tools", body)
+
+    def test_only_deterministic_chat_is_cacheable(self):
+        assert is_cacheable("chat", {"temperature": 0})
+        assert not is_cacheable("chat", {})
+        assert not is_cacheable("chat", {"temperature": 0.7})
+        assert not is_cacheable("chat", {"temperature": 0, "n": 3})
+        assert not is_cacheable("chat", {"temperature": 0, "n": "two"})
+        assert not is_cacheable("chat", {"temperature": 0, "n": [1]})
+        assert is_cacheable("embeddings", {"input": "x"})
+
+
+class TestLLMResponseCache:
+    @pytest.mark.asyncio
+    async def test_put_then_hit_counts_saving(self, cache):
+        await cache.put(
+            "k",
+            CachedResponse(
+                payload=_completion(), usage={"prompt_tokens": 10, "completion_tokens": 5}
+            ),
+        )
+        entry = await cache.get("k")
+        assert entry.payload["choices"][0]["message"]["content"] == "hello"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["tokens_saved"] == 15
+        assert stats["saved_cost_usd"] > 0
+
+    @pytest.mark.asyncio
+    async def test_saving_is_priced_by_the_model(self, cache):
+        usage = {"prompt_tokens": 1_000_000, "completion_tokens": 1_000_000}
+        await cache.put("paid", CachedResponse(payload={"model": "gpt-4o"}, usage=usage))
+        await cache.put("free", CachedResponse(payload={"model": "big-pickle"}, usage=usage))
+        await cache.get("paid")
+        await cache.get("free")
+        assert cache.stats()["saved_cost_usd"] == pytest.approx(12.5)
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self, tmp_path):
+        c = LLMResponseCache(tmp_path / "c.db", ttl=0.01)
+        await c.put("k", CachedResponse(payload={"x": 1}))
+        time.sleep(0.02)
+        assert await c.get("k") is None
+        assert c.stats()["misses"] == 1
+        c.close()
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_hit_over_entry_cap(self, tmp_path):
+        c = LLMResponseCache(tmp_path / "c.db", ttl=60, max_entries=2)
+        await c.put("a", CachedResponse(payload={"v": "a"}))
+        await c.put("b", CachedResponse(payload={"v": "b"}))
+        await c.get("a")  # refresh a so b is the eviction candidate
+        await c.put("c", CachedResponse(payload={"v": "c"}))
+        assert await c.get("b") is None
+        assert await c.get("a") is not None
+        assert c.stats()["evictions"] == 1
+        c.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_fetch(self, cache):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return CachedResponse(payload={"n": calls})
+
+        results = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+        assert calls == 1
+        sources = sorted(src for _, src in results)
+        assert sources == ["coalesced"] * 4 + ["miss"]
+        assert all(r.payload == {"n": 1} for r, _ in results)
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_cached(self, cache):
+        async def fetch():
+            return None
+
+        result, source = await cache.get_or_fetch("k", fetch)
+        assert result is None and source == "miss"
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_release_frees_followers_without_a_response(self, cache):
+        assert cache.join("k") is None  # leader
+        follower = asyncio.ensure_future(cache.wait(cache.join("k"), timeout=5))
+        await asyncio.sleep(0)
+        cache.release("k")
+        assert await asyncio.wait_for(follower, timeout=1) is None
+        assert cache.stats()["inflight"] == 0
+        assert cache.join("k") is None  # the next request leads again
+
+
+class TestStreamReplay:
+    def test_recorded_stream_round_trips(self):
+        frames = [
+            {"id": "c1", "model": "m", "choices": [{"index": 0, "delta": {"content": "Hi "}}]},
+            {
+                "choices": [{"index": 0, "delta": {"content": "there"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 2},
+            },
+        ]
+        text = "".join(f"data: {json.dumps(f)}\n\n" for f in frames) + "data: [DONE]\n\n"
+        entry = cached_from_sse(text)
+        assert entry.chunks == [text]
+        assert entry.payload["choices"][0]["message"]["content"] == "Hi there"
+        assert entry.usage == {"prompt_tokens": 3, "completion_tokens": 2}
+
+    def test_truncated_stream_not_cached(self):
+        text = 'data: {"choices": [{"index": 0, "delta": {"content": "Hi"}}]}\n\n'
+        assert cached_from_sse(text) is None
+
+    def test_completion_synthesized_as_chunks(self):
+        frames = completion_to_sse(_completion("cached text"))
+        assert frames[-1] == "data: [DONE]\n\n"
+        entry = cached_from_sse("".join(frames))
+        assert entry.payload["choices"][0]["message"]["content"] == "cached text"
+
+
+class TestEmbeddingsRouteCache:
+    def test_second_identical_request_served_from_cache(self, tmp_path, monkeypatch):
+        from dashboard.server import create_app
+
+        monkeypatch.setenv("NVIDIA_API_KEY", "test-key")
+        app = create_app(app_manager=MagicMock())
+        app.state.llm_cache = LLMResponseCache(tmp_path / "c.db", ttl=60)
+        client = TestClient(app)
+
+        upstream = httpx.Response(
+            200,
+            json={"data": [{"embedding": [0.1, 0.2]}], "usage": {"prompt_tokens": 4}},
+            request=httpx.Request("POST", "https://integrate.api.nvidia.com/v1/embeddings"),
+        )
+        body = {"model": "nvidia/nv-embed", "input": "hello"}
+        with patch.object(httpx.AsyncClient, "post", AsyncMock(return_value=upstream)) as post:
+            first = client.post("/llm/v1/embeddings", json=body)
+            second = client.post("/llm/v1/embeddings", json=body)
+
+        assert post.await_count == 1
+        assert first.headers["X-Frood-Cache"] == "miss"
+        assert second.headers["X-Frood-Cache"] == "hit"
+        assert second.json() == first.json()
+        app.state.llm_cache.close()
+
+
+class TestChatRouteCache:
+    def test_text_path_hit_keeps_a_zeroed_usage_block(self, tmp_path):
+        from dashboard.server import create_app
+
+        app = create_app(app_manager=MagicMock())
+        app.state.llm_cache = LLMResponseCache(tmp_path / "c.db", ttl=60)
+        body = {
+            "model": "big-pickle",
+            "temperature": 0,
+            "messages": [{"role": "user", "content": "hi"}],
+        }
+        stored = CachedResponse(
+            payload={"text": "cached answer", "provider": "zen:big-pickle", "model": "big-pickle"},
+            usage={"prompt_tokens": 1, "completion_tokens": 3},
+        )
+        asyncio.run(app.state.llm_cache.put(cache_key("chat", body), stored))
+
+        response = TestClient(app).post("/llm/v1/chat/completions", json=body)
+
+        assert response.headers["X-Frood-Cache"] == "hit"
+        data = response.json()
+        assert data["choices"][0]["message"]["content"] == "cached answer"
+        assert data["usage"] == {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        app.state.llm_cache.close()
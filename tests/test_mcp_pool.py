@@ -0,0 +1,229 @@
+"""Tests for MCPManager's pooled, lazily started MCP server connections."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import tools.mcp_client as mcp_client
+from tools.mcp_client import MCPManager
+
+CONFIG = {"command": "uvx", "args": ["some-mcp"]}
+
+
+class FakeConnections:
+    """connection_factory recording every connection the pool creates."""
+
+    def __init__(self, connect_delay: float = 0.0, result: str = "ok"):
+        self.connect_delay = connect_delay
+        self.result = result
+        self.created: list[MagicMock] = []
+
+    def __call__(self, name: str, config: dict) -> MagicMock:
+        async def connect():
+            await asyncio.sleep(self.connect_delay)
+
+        conn = MagicMock()
+        conn.connect = AsyncMock(side_effect=connect)
+        conn.call_tool = AsyncMock(return_value=self.result)
+        conn.list_tools = AsyncMock(return_value=[{"name": "search", "description": "Find"}])
+        conn.ping = AsyncMock()
+        conn.disconnect = AsyncMock()
+        self.created.append(conn)
+        return conn
+
+
+@pytest.fixture
+async def pool():
+    manager = MCPManager(idle_timeout=300.0, max_concurrency=2)
+    yield manager
+    await manager.disconnect_all()
+
+
+@pytest.mark.asyncio
+class TestMCPManager:
+    async def test_nothing_starts_until_first_call(self, pool):
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        assert factory.created == []
+
+        for _ in range(3):
+            assert await pool.call_tool("code", "search", {"q": "x"}) == "ok"
+        assert len(factory.created) == 1
+        assert factory.created[0].call_tool.await_count == 3
+        assert pool.stats()["code"]["starts"] == 1
+
+    async def test_concurrent_callers_share_one_start(self, pool):
+        factory = FakeConnections(connect_delay=0.05)
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        results = await asyncio.gather(*(pool.call_tool("code", "search", {}) for _ in range(5)))
+        assert results == ["ok"] * 5
+        assert len(factory.created) == 1
+
+    async def test_concurrency_is_capped_per_server(self, pool):
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        in_flight = peak = 0
+
+        async def slow_call(tool_name, arguments):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "ok"
+
+        await pool.start("code")
+        factory.created[0].call_tool.side_effect = slow_call
+        await asyncio.gather(*(pool.call_tool("code", "search", {}) for _ in range(6)))
+        assert peak == 2
+
+    async def test_slow_cold_start_finishes_in_background(self, pool):
+        factory = FakeConnections(connect_delay=0.1)
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        with pytest.raises(TimeoutError):
+            await pool.call_tool("code", "search", {}, timeout=0.01)
+        await asyncio.sleep(0.15)
+        assert await pool.call_tool("code", "search", {}, timeout=0.01) == "ok"
+        assert len(factory.created) == 1
+
+    async def test_dead_server_is_restarted_on_next_call(self, pool):
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        await pool.start("code")
+        dead = factory.created[0]
+        dead.call_tool.side_effect = BrokenPipeError("gone")
+        dead.ping.side_effect = BrokenPipeError("gone")
+
+        with pytest.raises(BrokenPipeError):
+            await pool.call_tool("code", "search", {})
+        assert await pool.call_tool("code", "search", {}) == "ok"
+        assert len(factory.created) == 2
+        await asyncio.sleep(0)
+        dead.disconnect.assert_awaited_once()
+
+    async def test_failed_ping_does_not_retire_a_newer_connection(self, pool):
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        await pool.start("code")
+        old = factory.created[0]
+        old.call_tool.side_effect = BrokenPipeError("gone")
+
+        async def ping_after_restart():
+            pool.register_server("code", {**CONFIG, "args": ["other"]}, connection_factory=factory)
+            await pool.start("code")
+            raise BrokenPipeError("gone")
+
+        old.ping.side_effect = ping_after_restart
+        with pytest.raises(BrokenPipeError):
+            await pool.call_tool("code", "search", {})
+        assert len(factory.created) == 2
+        assert pool.stats()["code"]["running"] is True
+        assert await pool.call_tool("code", "search", {}) == "ok"
+        assert len(factory.created) == 2
+
+    async def test_list_tools_counts_as_active(self, pool):
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        await pool.start("code")
+        seen = []
+
+        async def list_tools():
+            seen.append(pool.stats()["code"]["active"])
+            return []
+
+        factory.created[0].list_tools.side_effect = list_tools
+        assert await pool.list_tools("code") == []
+        assert seen == [1]
+        assert pool.stats()["code"]["active"] == 0
+
+    async def test_tool_error_keeps_healthy_connection(self, pool):
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        await pool.start("code")
+        factory.created[0].call_tool.side_effect = [ValueError("bad arguments"), "ok"]
+
+        with pytest.raises(ValueError):
+            await pool.call_tool("code", "search", {})
+        assert await pool.call_tool("code", "search", {}) == "ok"
+        assert len(factory.created) == 1
+
+    async def test_failed_start_backs_off(self, pool):
+        factory = FakeConnections()
+        failing = MagicMock(side_effect=lambda name, config: _failing(factory(name, config)))
+        pool.register_server("code", CONFIG, connection_factory=failing)
+
+        with pytest.raises(FileNotFoundError):
+            await pool.call_tool("code", "search", {})
+        with pytest.raises(ConnectionError, match="uvx not found"):
+            await pool.call_tool("code", "search", {})
+        assert failing.call_count == 1
+
+    async def test_idle_server_is_shut_down(self):
+        pool = MCPManager(idle_timeout=0.05)
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        with patch.object(mcp_client, "HEALTH_INTERVAL", 0.02):
+            await pool.call_tool("code", "search", {})
+            reaper = pool._reaper
+            # The reaper polls at least once a second.
+            await asyncio.wait_for(reaper, timeout=3)
+        await asyncio.sleep(0.01)
+        factory.created[0].disconnect.assert_awaited_once()
+        assert pool.stats()["code"]["running"] is False
+
+        await pool.call_tool("code", "search", {})
+        assert len(factory.created) == 2
+        await pool.disconnect_all()
+
+    async def test_proxy_tools_call_through_pool(self, pool):
+        factory = FakeConnections(result="found it")
+        with patch.object(mcp_client, "MCPConnection", factory):
+            tools = await pool.connect_server("code", CONFIG)
+        assert [t.name for t in tools] == ["mcp_code_search"]
+        result = await tools[0].execute(q="x")
+        assert result.success and result.output == "found it"
+        assert len(factory.created) == 1
+
+    async def test_shutdown_stops_the_process_wide_pool(self, pool):
+        factory = FakeConnections()
+        pool.register_server("code", CONFIG, connection_factory=factory)
+        await pool.start("code")
+        with patch.object(mcp_client, "_manager", pool):
+            await mcp_client.shutdown_mcp_manager()
+        await asyncio.sleep(0)
+        factory.created[0].disconnect.assert_awaited_once()
+        assert pool.stats()["code"]["running"] is False
+
+    async def test_shutdown_without_a_pool_is_a_no_op(self):
+        with patch.object(mcp_client, "_manager", None):
+            await mcp_client.shutdown_mcp_manager()
+        assert mcp_client._manager is None
+
+
+class TestShutdownHooks:
+    """Each app's shutdown stops the pooled MCP servers."""
+
+    def _assert_pool_closed_on_shutdown(self, app):
+        from fastapi.testclient import TestClient
+
+        manager = MagicMock(disconnect_all=AsyncMock())
+        with patch.object(mcp_client, "_manager", manager):
+            with TestClient(app):
+                manager.disconnect_all.assert_not_awaited()
+            manager.disconnect_all.assert_awaited_once()
+
+    def test_dashboard(self):
+        from dashboard.server import create_app
+
+        self._assert_pool_closed_on_shutdown(create_app(app_manager=MagicMock()))
+
+    def test_sidecar(self):
+        from dashboard.sidecar import create_sidecar_app
+
+        self._assert_pool_closed_on_shutdown(create_sidecar_app())
+
+
+def _failing(conn):
+    conn.connect.side_effect = FileNotFoundError("uvx not found")
+    return conn
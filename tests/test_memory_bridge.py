@@ -16,10 +16,11 @@ import pytest
 from fastapi.testclient import TestClient
 
 from core.memory_bridge import MemoryBridge
+from core.sidecar_idempotency import MemoryIdempotencyStore
 from core.sidecar_models import (
     AdapterExecutionContext,
 )
-from core.sidecar_orchestrator import SidecarOrchestrator, _active_runs
+from core.sidecar_orchestrator import SidecarOrchestrator, set_idempotency_store
 from dashboard.auth import create_token
 from dashboard.sidecar import create_sidecar_app
 
@@ -89,10 +90,10 @@ def sidecar_client(mock_memory_store):
 
 @pytest.fixture(autouse=True)
 def cleanup_active_runs():
-    """Clear the idempotency dict between tests."""
-    _active_runs.clear()
+    """Reset the idempotency store between tests."""
+    set_idempotency_store(MemoryIdempotencyStore())
     yield
-    _active_runs.clear()
+    set_idempotency_store(MemoryIdempotencyStore())
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,91 @@
+"""Tests for the warm PythonExecTool worker pool."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import tools.python_exec as python_exec
+from tools.python_exec import PythonExecTool, PythonWorkerPool, WorkerError
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="worker pool needs fork()")
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = PythonWorkerPool(str(tmp_path), size=1, preload="json", max_runs=50, memory_mb=512)
+    yield pool
+    pool.close()
+
+
+class TestWorkerPool:
+    def test_runs_snippet_in_workspace(self, pool, tmp_path):
+        result = pool.run("import os\nprint(os.getcwd())", timeout=10)
+        assert result["returncode"] == 0
+        assert result["stdout"].strip() == os.path.realpath(tmp_path)
+
+    def test_no_state_leaks_between_runs(self, pool):
+        pool.run("import json\njson.dumps = None\nLEAK = 1", timeout=10)
+        result = pool.run("import json\nprint(json.dumps({}), 'LEAK' in globals())", timeout=10)
+        assert result["stdout"].strip() == "{} False"
+
+    def test_timeout_kills_child_and_keeps_worker(self, pool):
+        result = pool.run("while True:\n    pass", timeout=0.5)
+        assert result["timed_out"] is True
+        assert pool.run("print('still warm')", timeout=10)["stdout"] == "still warm\n"
+        assert pool.recycled == 0
+
+    def test_memory_limit(self, pool):
+        result = pool.run("x = bytearray(2 * 1024 ** 3)", timeout=10)
+        assert result["returncode"] == 1
+        assert "MemoryError" in result["stderr"]
+
+    def test_recycled_after_max_runs(self, tmp_path):
+        pool = PythonWorkerPool(str(tmp_path), size=1, max_runs=2)
+        try:
+            for _ in range(3):
+                assert pool.run("print(1)", timeout=10)["returncode"] == 0
+            assert pool.recycled == 1
+        finally:
+            pool.close()
+
+    def test_dead_worker_raises_and_is_replaced(self, pool):
+        pool._idle[0].kill()
+        with pytest.raises(WorkerError) as exc_info:
+            pool.run("print(1)", timeout=10)
+        assert exc_info.value.started is False
+        assert pool.run("print(1)", timeout=10)["stdout"] == "1\n"
+
+    def test_worker_dying_mid_job_is_marked_started(self, pool):
+        with pytest.raises(WorkerError) as exc_info:
+            pool.run("import os, signal\nos.kill(os.getppid(), signal.SIGKILL)", timeout=10)
+        assert exc_info.value.started is True
+
+
+class TestToolIntegration:
+    @pytest.mark.asyncio
+    async def test_falls_back_to_subprocess_on_worker_error(self, tmp_path):
+        broken = MagicMock()
+        broken.run.side_effect = WorkerError("gone")
+        with patch.object(python_exec, "get_worker_pool", return_value=broken):
+            result = await PythonExecTool(str(tmp_path)).execute(code="print('cold')")
+        assert result.success is True
+        assert "cold" in result.output
+
+    @pytest.mark.asyncio
+    async def test_no_cold_rerun_once_the_job_started(self, tmp_path):
+        broken = MagicMock()
+        broken.run.side_effect = WorkerError("worker exited", started=True)
+        with (
+            patch.object(python_exec, "get_worker_pool", return_value=broken),
+            patch.object(PythonExecTool, "_run_subprocess") as cold,
+        ):
+            result = await PythonExecTool(str(tmp_path)).execute(code="print('once')")
+        assert result.success is False
+        assert "died while running" in result.error
+        cold.assert_not_called()
+
+    def test_pool_disabled_by_setting(self, tmp_path):
+        with patch("core.config.settings") as settings:
+            settings.python_exec_pool_size = 0
+            assert python_exec.get_worker_pool(str(tmp_path)) is None
@@ -0,0 +1,108 @@
+"""Tests for ToolRegistry's versioned schema cache and its sidecar consumer."""
+
+import json
+
+import httpx
+import pytest
+
+from core.sidecar_orchestrator import SidecarOrchestrator
+from tools.lazy_tool import LazyTool, ToolSpec
+
+
+@pytest.fixture
+def registry(tool_registry, mock_tool_factory):
+    for name in ("read_file", "web_search", "shell"):
+        tool_registry.register(mock_tool_factory(name, f"{name} tool"))
+    return tool_registry
+
+
+def _names(schema_set):
+    return [s["function"]["name"] for s in schema_set.schemas]
+
+
+class TestSchemaCache:
+    def test_reused_until_tools_change(self, registry, mock_tool_factory):
+        first = registry.schema_set("email")
+        assert registry.schema_set("email") is first
+        assert registry.schema_set("content") is first  # same filter, same entry
+        assert json.loads(first.encoded) == list(first.schemas)
+
+        registry.set_enabled("read_file", True)  # already enabled: no change
+        assert registry.schema_set("email") is first
+
+        registry.register(mock_tool_factory("calendar"))
+        second = registry.schema_set("email")
+        assert second.version > first.version
+        assert _names(second) == ["read_file", "web_search", "calendar"]
+
+        registry.set_enabled("calendar", False)
+        registry.unregister("web_search")
+        assert _names(registry.schema_set("email")) == ["read_file"]
+
+    def test_mutating_returned_schemas_leaves_the_cache_intact(self, registry):
+        mutated = registry.schema_set("coding").schemas
+        mutated[0]["function"]["description"] = "tampered"
+        mutated.pop()
+        registry.all_schemas()[0]["function"]["parameters"]["injected"] = True
+        registry.schemas_for_task_type("coding")[0]["function"].clear()
+
+        for schemas in (
+            registry.schema_set("coding").schemas,
+            registry.all_schemas(),
+            registry.schemas_for_task_type("coding"),
+        ):
+            assert len(schemas) == 3
+            assert schemas[0]["function"]["description"] == "read_file tool"
+            assert "injected" not in schemas[0]["function"]["parameters"]
+
+    def test_filters(self, registry):
+        assert _names(registry.schema_set("email")) == ["read_file", "web_search"]
+        assert _names(registry.schema_set("coding")) == ["read_file", "web_search", "shell"]
+        assert _names(registry.schema_set(names={"shell", "missing"})) == ["shell"]
+        assert registry.schemas_for_task_type("email") == list(registry.schema_set("email").schemas)
+        assert len(registry.all_schemas()) == 3
+
+    def test_returned_lists_are_copies(self, registry):
+        registry.all_schemas().clear()
+        assert len(registry.all_schemas()) == 3
+
+    def test_lazy_schema_refresh_invalidates(self, tool_registry, mock_tool_factory):
+        spec = ToolSpec("json", "JSONDecoder", lambda cls: mock_tool_factory("echo", "Fresh"))
+        stale = {"name": "echo", "description": "Stale", "parameters": {}}
+        tool = LazyTool(spec, stale)
+        tool_registry.register(tool)
+        before = tool_registry.schema_set()
+        assert before.schemas[0]["function"]["description"] == "Stale"
+
+        tool.resolve()
+        after = tool_registry.schema_set()
+        assert after.version > before.version
+        assert after.schemas[0]["function"]["description"] == "Fresh"
+
+
+class TestSidecarToolSchemas:
+    def test_phase_whitelist_uses_cache(self, registry):
+        orch = SidecarOrchestrator(tool_registry=registry)
+        search = orch._get_tool_schema_set("research", phase="search")
+        assert _names(search) == ["web_search"]
+        assert orch._get_tool_schema_set("research", phase="search") is search
+        assert orch._get_tool_schemas("research", phase="import") == []
+        assert len(orch._get_tool_schemas("unknown")) == 3
+
+    async def test_request_body_reuses_encoded_tools(self, registry):
+        seen = []
+
+        def handler(request):
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, json={"choices": []})
+
+        schema_set = registry.schema_set()
+        payload = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+        payload["tools"] = schema_set.schemas
+        orch = SidecarOrchestrator(tool_registry=registry)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            status, _, _ = await orch._request_completion(
+                client, "https://llm.test/v1/chat", "k", {}, payload, tools_json=schema_set.encoded
+            )
+        assert status == 200
+        assert seen == [{**payload, "tools": list(schema_set.schemas)}]
@@ -1,5 +1,6 @@
 """Tests for Frood sidecar mode (Phase 24, SIDE-01 through SIDE-09; Phase 29 UI endpoints)."""
 
+import asyncio
 import json
 import logging
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -8,6 +9,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from core.config import Settings
+from core.sidecar_idempotency import MemoryIdempotencyStore
 from core.sidecar_logging import SidecarJsonFormatter
 from core.sidecar_models import (
     AdapterConfig,
@@ -17,9 +19,10 @@ from core.sidecar_models import (
 )
 from core.sidecar_orchestrator import (
     SidecarOrchestrator,
-    _active_runs,
+    get_idempotency_store,
     is_duplicate_run,
     register_run,
+    set_idempotency_store,
     unregister_run,
 )
 from dashboard.auth import create_token
@@ -42,10 +45,10 @@ def auth_headers():
 
 @pytest.fixture(autouse=True)
 def cleanup_active_runs():
-    """Clear the idempotency dict between tests."""
-    _active_runs.clear()
+    """Reset the idempotency store between tests."""
+    set_idempotency_store(MemoryIdempotencyStore())
     yield
-    _active_runs.clear()
+    set_idempotency_store(MemoryIdempotencyStore())
 
 
 class TestSidecarConfig:
@@ -1039,3 +1042,210 @@ class TestParseJsonArray:
         assert result[0]["name"] == "SunState Solar"
         assert result[0]["state_code"] == "NM"
         assert result[0]["phone"] == "505-225-8502"
+
+
+class TestChatStreamAccumulator:
+    """ChatStreamAccumulator folds SSE chunk deltas back into a completion."""
+
+    def test_content_deltas_concatenate(self):
+        from core.llm_streaming import ChatStreamAccumulator
+
+        acc = ChatStreamAccumulator()
+        assert acc.feed({"choices": [{"delta": {"role": "assistant", "content": ""}}]}) == ""
+        assert acc.feed({"choices": [{"delta": {"content": "Hel"}}]}) == "Hel"
+        assert (
+            acc.feed({"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]}) == "lo"
+        )
+        acc.feed({"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 2}})
+
+        completion = acc.as_completion()
+        assert completion["choices"][0]["message"]["content"] == "Hello"
+        assert completion["choices"][0]["finish_reason"] == "stop"
+        assert completion["usage"]["completion_tokens"] == 2
+
+    def test_tool_call_fragments_merge_by_index(self):
+        from core.llm_streaming import ChatStreamAccumulator
+
+        acc = ChatStreamAccumulator()
+        acc.feed(
+            {
+                "choices": [
+                    {
+                        "delta": {
+                            "tool_calls": [
+                                {
+                                    "index": 0,
+                                    "id": "call_1",
+                                    "function": {"name": "web_search", "arguments": '{"q'},
+                                },
+                            ]
+                        }
+                    }
+                ]
+            }
+        )
+        acc.feed(
+            {
+                "choices": [
+                    {
+                        "delta": {
+                            "tool_calls": [
+                                {"index": 0, "function": {"arguments": '": "solar"}'}},
+                            ]
+                        },
+                        "finish_reason": "tool_calls",
+                    }
+                ]
+            }
+        )
+
+        msg = acc.as_completion()["choices"][0]["message"]
+        assert msg["content"] is None
+        assert msg["tool_calls"][0]["id"] == "call_1"
+        assert msg["tool_calls"][0]["function"]["name"] == "web_search"
+        assert json.loads(msg["tool_calls"][0]["function"]["arguments"]) == {"q": "solar"}
+
+    def test_reasoning_deltas_kept_for_reasoning_models(self):
+        from core.llm_streaming import ChatStreamAccumulator
+
+        acc = ChatStreamAccumulator()
+        assert acc.feed({"choices": [{"delta": {"reasoning_content": "thinking"}}]}) == ""
+        msg = acc.as_completion()["choices"][0]["message"]
+        assert SidecarOrchestrator._extract_message_content(msg) == "thinking"
+
+    @pytest.mark.asyncio
+    async def test_iter_sse_json_stops_at_done(self):
+        import httpx
+
+        from core.llm_streaming import iter_sse_json
+
+        body = (
+            b": keep-alive\n\n"
+            b'data: {"choices": [{"delta": {"content": "a"}}]}\n\n'
+            b"data: not-json\n\n"
+            b'data: {"choices": [{"delta": {"content": "b"}}]}\n\n'
+            b"data: [DONE]\n\n"
+            b'data: {"choices": [{"delta": {"content": "ignored"}}]}\n\n'
+        )
+        resp = httpx.Response(200, content=body)
+        chunks = [c async for c in iter_sse_json(resp)]
+        assert [c["choices"][0]["delta"]["content"] for c in chunks] == ["a", "b"]
+
+
+class TestExecuteStream:
+    """execute_stream() forwards run events and tracks time-to-first-token."""
+
+    @pytest.mark.asyncio
+    async def test_events_then_result_with_ttft(self):
+        from core.sidecar_orchestrator import _emit_run_event
+
+        orch = SidecarOrchestrator()
+        ctx = AdapterExecutionContext(run_id="run-stream-1", agent_id="agent-1")
+
+        async def fake_execute_sync(run_id, ctx):
+            await _emit_run_event({"type": "tool_call_start", "name": "web_search", "id": "c1"})
+            await _emit_run_event({"type": "tool_call_finish", "name": "web_search", "id": "c1"})
+            await _emit_run_event({"type": "token", "delta": "Hi"})
+            return {
+                "summary": "Hi",
+                "provider": "zen",
+                "model": "m",
+                "input_tokens": 1,
+                "output_tokens": 1,
+                "cost_usd": 0.0,
+            }
+
+        with patch.object(orch, "execute_sync", side_effect=fake_execute_sync):
+            events = [e async for e in orch.execute_stream("run-stream-1", ctx)]
+
+        assert [e["type"] for e in events] == [
+            "tool_call_start",
+            "tool_call_finish",
+            "token",
+            "result",
+        ]
+        assert all(e["runId"] == "run-stream-1" for e in events)
+        assert events[-1]["summary"] == "Hi"
+        assert events[-1]["ttft_ms"] is not None
+        stats = orch.stream_stats()
+        assert stats["streams"] == 1
+        assert stats["ttft_samples"] == 1
+
+    @pytest.mark.asyncio
+    async def test_error_event_when_run_raises(self):
+        orch = SidecarOrchestrator()
+        ctx = AdapterExecutionContext(run_id="run-stream-2", agent_id="agent-1")
+
+        with patch.object(orch, "execute_sync", AsyncMock(side_effect=RuntimeError("boom"))):
+            events = [e async for e in orch.execute_stream("run-stream-2", ctx)]
+
+        assert events == [{"type": "error", "runId": "run-stream-2", "error": "boom"}]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_with_full_queue_ends_run(self):
+        """Closing the stream while the event queue is full must not hang the run."""
+        from core.sidecar_orchestrator import _emit_run_event
+
+        orch = SidecarOrchestrator()
+        ctx = AdapterExecutionContext(run_id="run-stream-3", agent_id="agent-1")
+
+        async def fake_execute_sync(run_id, ctx):
+            await _emit_run_event({"type": "token", "delta": "a"})
+            await _emit_run_event({"type": "token", "delta": "b"})
+            return {"summary": "ab"}
+
+        with (
+            patch("core.sidecar_orchestrator.STREAM_QUEUE_MAX", 1),
+            patch.object(orch, "execute_sync", side_effect=fake_execute_sync),
+        ):
+            stream = orch.execute_stream("run-stream-3", ctx)
+            assert (await stream.__anext__())["delta"] == "a"
+            await asyncio.sleep(0.05)  # runner fills the queue, then blocks on the result
+            closing = asyncio.ensure_future(stream.aclose())
+            done, _ = await asyncio.wait({closing}, timeout=2)
+            closing.cancel()
+        assert closing in done
+
+    @pytest.mark.asyncio
+    async def test_no_sink_outside_stream(self):
+        """Events emitted outside execute_stream are dropped, not raised."""
+        from core.sidecar_orchestrator import _emit_run_event, _run_event_sink
+
+        assert _run_event_sink.get() is None
+        await _emit_run_event({"type": "token", "delta": "x"})
+
+    def test_stream_route_emits_sse_frames(self, sidecar_client, auth_headers):
+        from core.sidecar_orchestrator import _emit_run_event
+
+        async def fake_execute_sync(self, run_id, ctx):
+            await _emit_run_event({"type": "token", "delta": "streamed"})
+            return {
+                "summary": "streamed",
+                "provider": "zen",
+                "model": "m",
+                "input_tokens": 2,
+                "output_tokens": 3,
+                "cost_usd": 0.0,
+            }
+
+        with patch.object(SidecarOrchestrator, "execute_sync", fake_execute_sync):
+            resp = sidecar_client.post(
+                "/sidecar/execute/stream",
+                json={"runId": "run-sse-1", "agentId": "agent-1"},
+                headers=auth_headers,
+            )
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        frames = [f for f in resp.text.split("\n\n") if f.strip()]
+        assert frames[0].startswith("event: token")
+        assert frames[-1].startswith("event: result")
+        result = json.loads(frames[-1].split("data: ", 1)[1])
+        assert result["status"] == "completed"
+        assert result["output"] == "streamed"
+        assert result["output_tokens"] == 3
+        assert get_idempotency_store().get("run-sse-1").status == "completed"
+
+    def test_health_reports_streaming_stats(self, sidecar_client):
+        resp = sidecar_client.get("/sidecar/health")
+        assert "streams" in resp.json()["streaming"]
@@ -0,0 +1,239 @@
+"""Tests for sidecar admission control (bounded workers + priority queue)."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+
+from core.config import settings
+from core.sidecar_admission import AdmissionController, AdmissionRejected
+from core.sidecar_idempotency import MemoryIdempotencyStore
+from core.sidecar_orchestrator import is_duplicate_run, set_idempotency_store
+
+
+@pytest.fixture(autouse=True)
+def _reset_idempotency_store():
+    set_idempotency_store(MemoryIdempotencyStore())
+    yield
+    set_idempotency_store(MemoryIdempotencyStore())
+
+
+class TestAdmissionController:
+    @pytest.mark.asyncio
+    async def test_admits_up_to_max_workers(self):
+        ctl = AdmissionController(max_workers=2, max_queue=4)
+        await ctl.acquire("r1")
+        await ctl.acquire("r2")
+        assert ctl.active == 2
+        assert ctl.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_served_by_tier_then_arrival(self):
+        ctl = AdmissionController(max_workers=1, max_queue=4)
+        await ctl.acquire("running")
+        order: list[str] = []
+
+        async def wait(run_id, tier):
+            await ctl.acquire(run_id, tier=tier)
+            order.append(run_id)
+
+        tasks = [
+            asyncio.create_task(wait("bronze-1", "bronze")),
+            asyncio.create_task(wait("none-1", "")),
+            asyncio.create_task(wait("gold-1", "gold")),
+        ]
+        await asyncio.sleep(0)
+        assert ctl.queue_depth == 3
+
+        for finished in ("running", "gold-1", "bronze-1"):
+            ctl.release(finished)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert order == ["gold-1", "bronze-1", "none-1"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejected_with_429(self):
+        ctl = AdmissionController(max_workers=1, max_queue=1)
+        await ctl.acquire("r1")
+        waiter = asyncio.create_task(ctl.acquire("r2"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await ctl.acquire("r3")
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after >= 1
+        assert ctl.stats()["rejected_429"] == 1
+
+        ctl.release("r1")
+        await waiter
+
+    @pytest.mark.asyncio
+    async def test_deadline_expiry_rejected_with_503(self):
+        ctl = AdmissionController(max_workers=1, max_queue=4)
+        await ctl.acquire("r1")
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await ctl.acquire("r2", deadline=time.time() + 0.05)
+        assert exc_info.value.status_code == 503
+        assert ctl.queue_depth == 0
+        assert ctl.stats()["rejected_503"] == 1
+
+    @pytest.mark.asyncio
+    async def test_release_is_idempotent(self):
+        ctl = AdmissionController(max_workers=1, max_queue=1)
+        await ctl.acquire("r1")
+        ctl.release("r1")
+        ctl.release("r1")
+        assert ctl.active == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        ctl = AdmissionController(max_workers=1, max_queue=2)
+        await ctl.acquire("r1")
+        waiter = asyncio.create_task(ctl.acquire("r2"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert ctl.queue_depth == 0
+        ctl.release("r1")
+        assert ctl.active == 0
+
+    @pytest.mark.asyncio
+    async def test_stats_shape(self):
+        ctl = AdmissionController(max_workers=3, max_queue=0)
+        async with ctl.admit("r1"):
+            stats = ctl.stats()
+            assert stats["active"] == 1
+        stats = ctl.stats()
+        assert stats["max_queue"] == 12  # defaults to 4x workers
+        assert stats["admitted"] == 1
+        assert stats["active"] == 0
+        assert stats["queue_wait_ms_p50"] == 0.0
+
+
+class TestAdmissionRoutes:
+    @pytest.fixture
+    def client(self):
+        from dashboard.sidecar import create_sidecar_app
+
+        app = create_sidecar_app()
+        return app, TestClient(app)
+
+    @pytest.fixture
+    def auth_headers(self):
+        from dashboard.auth import create_token
+
+        return {"Authorization": f"Bearer {create_token(settings.dashboard_username)}"}
+
+    def test_execute_shed_with_retry_after(self, client, auth_headers):
+        app, test_client = client
+        app.state.admission.max_workers = 0
+        app.state.admission.max_queue = 0
+
+        resp = test_client.post(
+            "/sidecar/execute",
+            json={"runId": "run-shed-1", "agentId": "agent-1"},
+            headers=auth_headers,
+        )
+
+        assert resp.status_code == 429
+        assert int(resp.headers["Retry-After"]) >= 1
+        assert resp.json()["status"] == "rejected"
+        assert not is_duplicate_run("run-shed-1")
+
+    def test_stream_shed_before_response_starts(self, client, auth_headers):
+        app, test_client = client
+        app.state.admission.max_workers = 0
+        app.state.admission.max_queue = 0
+
+        resp = test_client.post(
+            "/sidecar/execute/stream",
+            json={"runId": "run-shed-2", "agentId": "agent-1"},
+            headers=auth_headers,
+        )
+
+        assert resp.status_code == 429
+        assert "Retry-After" in resp.headers
+        assert not is_duplicate_run("run-shed-2")
+
+    @staticmethod
+    def _asgi_post(app, path, body, headers, send):
+        """Drive one POST through the ASGI app with a custom send callable."""
+        payload = json.dumps(body).encode()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.4"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"content-type", b"application/json")]
+            + [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("test", 1),
+            "server": ("test", 80),
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": payload, "more_body": False}
+
+        return app(scope, receive, send)
+
+    @pytest.mark.asyncio
+    async def test_stream_slot_released_when_body_never_sent(self, client, auth_headers):
+        app, _ = client
+
+        async def send(message):
+            raise OSError("client went away")
+
+        with pytest.raises(ClientDisconnect):
+            await self._asgi_post(
+                app,
+                "/sidecar/execute/stream",
+                {"runId": "run-gone-1", "agentId": "agent-1"},
+                auth_headers,
+                send,
+            )
+        assert app.state.admission.active == 0
+        assert not is_duplicate_run("run-gone-1")
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_queued_frees_run_key(self, client, auth_headers):
+        app, _ = client
+        app.state.admission.max_workers = 0
+
+        async def send(message):
+            pass
+
+        request = asyncio.create_task(
+            self._asgi_post(
+                app,
+                "/sidecar/execute",
+                {"runId": "run-queued-1", "agentId": "agent-1"},
+                auth_headers,
+                send,
+            )
+        )
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if app.state.admission.queue_depth:
+                break
+        assert is_duplicate_run("run-queued-1")
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        assert not is_duplicate_run("run-queued-1")
+
+    def test_health_reports_admission(self, client):
+        _, test_client = client
+        resp = test_client.get("/sidecar/health")
+        admission = resp.json()["admission"]
+        assert admission["queue_depth"] == 0
+        assert "rejected_429" in admission
@@ -0,0 +1,207 @@
+"""Tests for the sidecar idempotency store backends (D-08)."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.sidecar_idempotency import (
+    RUN_STATUS_COMPLETED,
+    RUN_STATUS_RUNNING,
+    MemoryIdempotencyStore,
+    SqliteIdempotencyStore,
+    build_idempotency_store,
+)
+from core.sidecar_orchestrator import (
+    SidecarOrchestrator,
+    claim_run,
+    complete_run,
+    release_run,
+    set_idempotency_store,
+)
+from dashboard.auth import create_token
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        s = MemoryIdempotencyStore()
+    else:
+        s = SqliteIdempotencyStore(tmp_path / "runs.db")
+    yield s
+    s.close()
+
+
+class TestIdempotencyStore:
+    def test_first_claim_wins(self, store):
+        assert store.claim("run-1", ttl=60).claimed is True
+        second = store.claim("run-1", ttl=60)
+        assert second.claimed is False
+        assert second.status == RUN_STATUS_RUNNING
+        assert second.result is None
+
+    def test_completed_result_is_replayed(self, store):
+        store.claim("run-1", ttl=60)
+        store.complete("run-1", {"status": "completed", "output": "done"}, ttl=60)
+        retry = store.claim("run-1", ttl=60)
+        assert retry.claimed is False
+        assert retry.status == RUN_STATUS_COMPLETED
+        assert retry.result == {"status": "completed", "output": "done"}
+
+    def test_release_allows_reclaim(self, store):
+        store.claim("run-1", ttl=60)
+        store.release("run-1")
+        assert store.get("run-1") is None
+        assert store.claim("run-1", ttl=60).claimed is True
+
+    def test_expired_claim_can_be_reclaimed(self, store):
+        store.claim("run-1", ttl=0.01)
+        time.sleep(0.02)
+        assert store.get("run-1") is None
+        assert store.claim("run-1", ttl=60).claimed is True
+
+    def test_prune_removes_only_expired(self, store):
+        store.claim("old", ttl=0.01)
+        store.claim("live", ttl=60)
+        time.sleep(0.02)
+        assert store.prune() == 1
+        assert store.get("live") is not None
+
+
+class TestMemoryStorePruning:
+    def test_reclaimed_key_survives_stale_heap_entry(self):
+        store = MemoryIdempotencyStore()
+        store.claim("run-1", ttl=0.01)
+        store.complete("run-1", {"output": "x"}, ttl=60)
+        time.sleep(0.02)
+        assert store.prune() == 0
+        assert store.get("run-1").status == RUN_STATUS_COMPLETED
+
+
+class TestSqliteStoreSharing:
+    def test_two_handles_share_claims(self, tmp_path):
+        """Separate connections (as in separate workers) see each other's claims."""
+        db = tmp_path / "runs.db"
+        worker_a = SqliteIdempotencyStore(db)
+        worker_b = SqliteIdempotencyStore(db)
+        try:
+            assert worker_a.claim("run-1", ttl=60).claimed is True
+            assert worker_b.claim("run-1", ttl=60).claimed is False
+            worker_a.complete("run-1", {"output": "ok"}, ttl=60)
+            assert worker_b.get("run-1").result == {"output": "ok"}
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    def test_uses_wal_journal(self, tmp_path):
+        store = SqliteIdempotencyStore(tmp_path / "runs.db")
+        try:
+            mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode.lower() == "wal"
+        finally:
+            store.close()
+
+
+class TestBuildIdempotencyStore:
+    def test_default_is_memory(self):
+        assert build_idempotency_store("").name == "memory"
+
+    def test_sqlite_backend(self, tmp_path):
+        store = build_idempotency_store("sqlite", db_path=str(tmp_path / "r.db"))
+        assert store.name == "sqlite"
+        store.close()
+
+    def test_redis_without_url_falls_back(self):
+        assert build_idempotency_store("redis", redis_url="").name == "memory"
+
+
+class TestAsyncStoreCalls:
+    @pytest.mark.asyncio
+    async def test_blocking_store_runs_off_the_event_loop(self, tmp_path):
+        store = SqliteIdempotencyStore(tmp_path / "runs.db")
+        threads = []
+        claim = store.claim
+
+        def recording_claim(run_key, ttl):
+            threads.append(threading.get_ident())
+            return claim(run_key, ttl)
+
+        store.claim = recording_claim
+        set_idempotency_store(store)
+        try:
+            assert (await claim_run("run-async-1")).claimed is True
+            await complete_run("run-async-1", {"output": "done"})
+            assert (await claim_run("run-async-1")).result == {"output": "done"}
+            await release_run("run-async-1")
+            assert store.get("run-async-1") is None
+        finally:
+            set_idempotency_store(MemoryIdempotencyStore())
+            store.close()
+        assert threads and threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_memory_store_stays_inline(self):
+        assert MemoryIdempotencyStore.blocking is False
+        assert (await claim_run("run-inline-1")).claimed is True
+        await release_run("run-inline-1")
+
+
+class TestExecuteReplaysStoredResult:
+    def test_retry_after_completion_returns_stored_response(self):
+        from dashboard.sidecar import create_sidecar_app
+
+        app = create_sidecar_app()
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_token('admin')}"}
+        calls = []
+
+        async def fake_execute_sync(self, run_id, ctx):
+            calls.append(run_id)
+            return {
+                "summary": "first",
+                "provider": "zen",
+                "model": "m",
+                "input_tokens": 1,
+                "output_tokens": 2,
+                "cost_usd": 0.0,
+            }
+
+        try:
+            with patch.object(SidecarOrchestrator, "execute_sync", fake_execute_sync):
+                payload = {"runId": "run-replay-1", "agentId": "agent-1"}
+                first = client.post("/sidecar/execute", json=payload, headers=headers)
+                retry = client.post("/sidecar/execute", json=payload, headers=headers)
+        finally:
+            set_idempotency_store(MemoryIdempotencyStore())
+
+        assert calls == ["run-replay-1"]
+        assert first.json()["deduplicated"] is False
+        assert retry.json()["deduplicated"] is True
+        assert retry.json()["output"] == "first"
+        assert retry.json()["status"] == "completed"
+
+    def test_failed_run_releases_key(self):
+        from dashboard.sidecar import create_sidecar_app
+
+        app = create_sidecar_app()
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_token('admin')}"}
+
+        async def failing_execute_sync(self, run_id, ctx):
+            raise RuntimeError("provider down")
+
+        try:
+            with patch.object(SidecarOrchestrator, "execute_sync", failing_execute_sync):
+                resp = client.post(
+                    "/sidecar/execute",
+                    json={"runId": "run-fail-1", "agentId": "agent-1"},
+                    headers=headers,
+                )
+            from core.sidecar_orchestrator import is_duplicate_run
+
+            assert resp.json()["status"] == "failed"
+            assert is_duplicate_run("run-fail-1") is False
+        finally:
+            set_idempotency_store(MemoryIdempotencyStore())
@@ -143,15 +143,15 @@ class TestEffectiveness:
 
 
 def _make_settings_with_allowlist(allowlist: str):
-    """Create a mock settings object with a custom mcp_tool_allowlist value.
+    """Create a settings copy with a custom mcp_tool_allowlist value.
 
     Settings is a frozen dataclass, so we replace the module-level reference.
     """
+    import dataclasses
+
     from core.config import settings as real_settings
 
-    mock_settings = MagicMock(wraps=real_settings)
-    mock_settings.mcp_tool_allowlist = allowlist
-    return mock_settings
+    return dataclasses.replace(real_settings, mcp_tool_allowlist=allowlist)
 
 
 class TestMCPToolProxy:
@@ -0,0 +1,24 @@
+"""Tests for the shared SQLite store helpers."""
+
+from core.sqlite_db import IN_CHUNK, open_db, select_in
+
+
+class TestOpenDb:
+    def test_creates_parent_and_applies_schema(self, tmp_path):
+        conn = open_db(tmp_path / "nested" / "x.db", "CREATE TABLE t (k TEXT PRIMARY KEY);")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        conn.close()
+
+
+class TestSelectIn:
+    def test_chunks_past_parameter_limit(self, tmp_path):
+        conn = open_db(tmp_path / "x.db", "CREATE TABLE t (k INTEGER, g TEXT);")
+        n = IN_CHUNK * 2 + 7
+        conn.executemany(
+            "INSERT INTO t VALUES (?, ?)", [(i, "a" if i % 2 else "b") for i in range(n)]
+        )
+        rows = select_in(conn, "SELECT k FROM t WHERE g = ? AND k IN ({marks})", range(n), ("a",))
+        assert sorted(k for (k,) in rows) == list(range(1, n, 2))
+        assert select_in(conn, "SELECT k FROM t WHERE k IN ({marks})", []) == []
+        conn.close()
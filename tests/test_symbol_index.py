@@ -0,0 +1,122 @@
+"""Tests for the persistent incremental symbol index."""
+
+import os
+
+import pytest
+
+import tools.symbol_index as symbol_index
+from tools.symbol_index import SymbolIndex
+
+
+def _write(root, rel, text):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    _write(
+        tmp_path,
+        "pkg/app.py",
+        "import os\n"
+        "from pathlib import Path\n\n"
+        "LIMIT = 3\n\n"
+        "class App(Base):\n"
+        "    async def run(self, n):\n"
+        "        return helper(n)\n\n"
+        "def helper(x):\n"
+        "    return os.path.join(x)\n",
+    )
+    _write(tmp_path, "web/ui.js", "export class Widget extends Base {\n  render(props) {\n  }\n}\n")
+    return tmp_path
+
+
+class TestIndexing:
+    def test_definitions_and_outline(self, workspace):
+        index = SymbolIndex(str(workspace))
+        index.refresh()
+
+        names = {(s.kind, s.name) for s in index.definitions()}
+        assert {("class", "App"), ("method", "run"), ("function", "helper")} <= names
+        assert ("constant", "LIMIT") in names
+        assert ("method", "render") in names
+
+        outline = index.outline("pkg/app.py")
+        assert [s.signature for s in outline] == [
+            "class App(Base)",
+            "async def run(self, n)",
+            "def helper(x)",
+        ]
+
+    def test_imports_and_references(self, workspace):
+        index = SymbolIndex(str(workspace))
+        index.refresh()
+
+        assert ("pkg/app.py", 2, "from pathlib import Path") in index.imports(name="pathlib")
+        assert index.references("helper") == [("pkg/app.py", 8)]
+
+    def test_scope_limits_results_to_subdirectory(self, workspace):
+        index = SymbolIndex(str(workspace))
+        index.refresh()
+
+        scoped = index.definitions(str(workspace / "web"))
+        assert {s.file for s in scoped} == {"web/ui.js"}
+
+
+class TestInvalidation:
+    def test_only_changed_files_are_reparsed(self, workspace):
+        index = SymbolIndex(str(workspace))
+        files = index.collect(str(workspace))
+        assert index.update(files) == 2
+        assert index.update(files) == 0
+
+        path = _write(workspace, "pkg/app.py", "def renamed():\n    pass\n")
+        os.utime(path, (1, 1))
+        assert index.update(files) == 1
+        assert [s.name for s in index.definitions(kinds=("function",))] == ["renamed"]
+
+    def test_touch_without_content_change_skips_parse(self, workspace):
+        index = SymbolIndex(str(workspace))
+        files = index.collect(str(workspace))
+        index.update(files)
+
+        os.utime(files[0], (12345, 12345))
+        assert index.update(files) == 0
+
+    def test_deleted_files_are_pruned(self, workspace):
+        index = SymbolIndex(str(workspace))
+        index.refresh()
+        os.remove(workspace / "web" / "ui.js")
+
+        index.refresh()
+        assert not index.definitions(name="Widget")
+
+    def test_index_persists_across_instances(self, workspace):
+        SymbolIndex(str(workspace)).refresh()
+        reopened = SymbolIndex(str(workspace))
+        assert reopened.update(reopened.collect(str(workspace))) == 0
+        assert reopened.definitions(name="App", kinds=("class",))
+
+    def test_parallel_parse(self, workspace, monkeypatch):
+        for i in range(6):
+            _write(workspace, f"many/mod{i}.py", f"def f{i}():\n    pass\n")
+        monkeypatch.setattr(symbol_index, "PARALLEL_PARSE_THRESHOLD", 4)
+
+        index = SymbolIndex(str(workspace))
+        index.refresh()
+        assert len(index.definitions(str(workspace / "many"), kinds=("function",))) == 6
+
+
+class TestCodeIntelReferences:
+    @pytest.mark.asyncio
+    async def test_find_references_action(self, workspace):
+        from tools.code_intel import CodeIntelTool
+
+        result = await CodeIntelTool(str(workspace)).execute(
+            action="find_references", name="helper"
+        )
+        assert result.success is True
+        assert "pkg/app.py:8" in result.output
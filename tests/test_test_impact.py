@@ -0,0 +1,171 @@
+"""Tests for the test impact map and TestRunnerTool's change-aware modes."""
+
+import os
+import subprocess
+
+import pytest
+
+from tools import test_runner
+from tools.test_impact import ImpactMap, plan_shards
+
+
+def _write(root, rel, text):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class TestImpactMap:
+    def _map(self, tmp_path):
+        impact = ImpactMap(str(tmp_path))
+        impact.record(
+            {
+                "tests/test_a.py::test_a": {
+                    "path": "tests/test_a.py",
+                    "duration": 1.5,
+                    "files": ["pkg/a.py", "tests/test_a.py"],
+                },
+                "tests/test_b.py::test_b": {
+                    "path": "tests/test_b.py",
+                    "outcome": "failed",
+                    "files": ["pkg/b.py"],
+                },
+                "tests/unit/test_c.py::test_c": {"path": "tests/unit/test_c.py", "files": []},
+            },
+            full=True,
+        )
+        return impact
+
+    def test_changed_source_selects_covering_tests(self, tmp_path):
+        nodeids, new_files = self._map(tmp_path).affected(["pkg/a.py", "README.md"])
+        assert nodeids == {"tests/test_a.py::test_a"}
+        assert new_files == []
+
+    def test_changed_test_file_and_conftest(self, tmp_path):
+        impact = self._map(tmp_path)
+        assert impact.affected(["tests/unit/test_c.py"])[0] == {"tests/unit/test_c.py::test_c"}
+        assert impact.affected(["tests/unit/conftest.py"])[0] == {"tests/unit/test_c.py::test_c"}
+        assert len(impact.affected(["conftest.py"])[0]) == 3
+
+    def test_unknown_test_file_is_run_whole(self, tmp_path):
+        _write(tmp_path, "tests/test_new.py", "def test_x():\n    pass\n")
+        assert self._map(tmp_path).affected(["tests/test_new.py"]) == (set(), ["tests/test_new.py"])
+
+    def test_full_run_replaces_map_and_marks_fresh(self, tmp_path):
+        impact = self._map(tmp_path)
+        assert not impact.is_stale(60)
+        assert impact.failing_tests() == ["tests/test_b.py::test_b"]
+
+        impact.record({"tests/test_b.py::test_b": {"path": "tests/test_b.py"}}, full=True)
+        assert impact.known_tests() == ["tests/test_b.py::test_b"]
+        assert impact.failing_tests() == []
+
+
+class TestPlanShards:
+    def test_balances_by_duration(self):
+        durations = {"a": 4.0, "b": 3.0, "c": 2.0, "d": 1.0, "e": 1.0, "f": 1.0}
+        shards = plan_shards(list(durations), durations, 2)
+        loads = sorted(sum(durations[n] for n in shard) for shard in shards)
+        assert loads == [6.0, 6.0]
+
+    def test_never_more_shards_than_tests(self):
+        assert len(plan_shards(["a", "b"], {}, 8)) == 2
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "pkg/__init__.py", "")
+    _write(tmp_path, "pkg/a.py", "def fa():\n    return 1\n")
+    _write(tmp_path, "pkg/b.py", "def fb():\n    return 2\n")
+    _write(
+        tmp_path, "tests/test_a.py", "from pkg.a import fa\n\ndef test_a():\n    assert fa() == 1\n"
+    )
+    _write(
+        tmp_path, "tests/test_b.py", "from pkg.b import fb\n\ndef test_b():\n    assert fb() == 2\n"
+    )
+    _write(tmp_path, "pyproject.toml", "[tool.pytest.ini_options]\npythonpath = ['.']\n")
+    _write(tmp_path, ".gitignore", ".frood/\n")
+    for argv in (
+        ["git", "init", "-q"],
+        ["git", "add", "-A"],
+        ["git", "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "init"],
+    ):
+        subprocess.run(argv, cwd=tmp_path, check=True)
+    return tmp_path
+
+
+class TestImpactedRuns:
+    @pytest.mark.asyncio
+    async def test_first_run_builds_map_then_selects_changed(self, project):
+        tool = test_runner.TestRunnerTool(str(project))
+        first = await tool.execute(framework="pytest", mode="impacted", verbose=False)
+        assert first.success is True
+        assert "rebuilding" in first.output
+        assert "2 passed" in first.output
+
+        _write(project, "pkg/a.py", "def fa():\n    return 3\n")
+        second = await tool.execute(framework="pytest", mode="impacted", verbose=False)
+
+        assert second.success is False
+        assert "1 of 2 known tests" in second.output
+        assert "- tests/test_a.py::test_a" in second.output
+        assert "test_b" not in second.output
+
+    @pytest.mark.asyncio
+    async def test_no_changes_runs_nothing(self, project):
+        tool = test_runner.TestRunnerTool(str(project))
+        await tool.execute(framework="pytest", mode="impacted", verbose=False)
+
+        result = await tool.execute(framework="pytest", mode="impacted", verbose=False)
+        assert result.success is True
+        assert "No tests affected" in result.output
+
+    @pytest.mark.asyncio
+    async def test_sharded_full_run_merges_results(self, project):
+        result = await test_runner.TestRunnerTool(str(project)).execute(
+            framework="pytest", workers=2, verbose=False
+        )
+        assert result.success is True
+        assert "**Workers:** 2" in result.output
+        assert "2 passed" in result.output
+
+    @pytest.mark.asyncio
+    async def test_deleted_test_file_is_dropped_from_selection(self, project):
+        tool = test_runner.TestRunnerTool(str(project))
+        await tool.execute(framework="pytest", mode="impacted", verbose=False)
+        # test_a fails, then its file is deleted: the failing id must not reach pytest.
+        _write(project, "pkg/a.py", "def fa():\n    return 3\n")
+        await tool.execute(framework="pytest", mode="impacted", verbose=False)
+        os.remove(project / "tests" / "test_a.py")
+        _write(project, "pkg/b.py", "def fb():\n    return 2  # touched\n")
+
+        result = await tool.execute(framework="pytest", mode="impacted", workers=2, verbose=False)
+        assert result.success is True
+        assert "1 passed" in result.output
+        assert tool.impact_map.known_tests() == ["tests/test_b.py::test_b"]
+
+    @pytest.mark.asyncio
+    async def test_impacted_first_runs_new_file_once(self, project):
+        tool = test_runner.TestRunnerTool(str(project))
+        await tool.execute(framework="pytest", mode="impacted", verbose=False)
+        _write(project, "tests/test_c.py", "def test_c():\n    pass\n")
+
+        result = await tool.execute(framework="pytest", mode="impacted_first", verbose=False)
+        assert result.success is True
+        assert "remaining 2 tests" in result.output
+
+    @pytest.mark.asyncio
+    async def test_stale_map_rebuilt_despite_path(self, project):
+        tool = test_runner.TestRunnerTool(str(project))
+        first = await tool.execute(
+            framework="pytest", mode="impacted", path="tests/test_a.py", verbose=False
+        )
+        assert "path/filter ignored" in first.output
+        assert "2 passed" in first.output
+        assert not tool.impact_map.is_stale(test_runner.FULL_RUN_INTERVAL)
+
+        second = await tool.execute(
+            framework="pytest", mode="impacted", path="tests/test_a.py", verbose=False
+        )
+        assert "No tests affected" in second.output
@@ -15,8 +15,19 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from tools.mcp_client import MCPManager
 from tools.unified_context import UnifiedContextTool
 
+
+@pytest.fixture(autouse=True)
+async def fresh_mcp_pool():
+    """Each test gets its own pool so no jcodemunch connection outlives it."""
+    manager = MCPManager()
+    with patch("tools.unified_context.get_mcp_manager", return_value=manager):
+        yield manager
+    await manager.disconnect_all()
+
+
 # ---------------------------------------------------------------------------
 # Mock helper classes
 # ---------------------------------------------------------------------------
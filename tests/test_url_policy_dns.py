@@ -0,0 +1,133 @@
+"""Tests for url_policy's cached, non-blocking DNS checks and batched audit log."""
+
+import json
+import socket
+from unittest.mock import patch
+
+import pytest
+
+import core.url_policy as url_policy
+from core.url_policy import UrlPolicy, clear_dns_cache, resolve_url, resolve_url_sync
+from tools.http_client import _pinned_create_connection
+
+
+def _answer(*ips):
+    def getaddrinfo(host, port, *args, **kwargs):
+        calls.append(host)
+        return [
+            (
+                socket.AF_INET6 if ":" in ip else socket.AF_INET,
+                socket.SOCK_STREAM,
+                6,
+                "",
+                (ip, port),
+            )
+            for ip in ips
+        ]
+
+    calls: list[str] = []
+    getaddrinfo.calls = calls
+    return getaddrinfo
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_dns_cache()
+    yield
+    clear_dns_cache()
+
+
+class TestResolution:
+    @pytest.mark.asyncio
+    async def test_verdict_is_cached_per_host(self):
+        fake = _answer("93.184.216.34", "93.184.216.34")
+        with patch("socket.getaddrinfo", fake):
+            first = await resolve_url("https://docs.test/a")
+            second = await resolve_url("https://DOCS.test/b")
+            assert resolve_url_sync("https://docs.test/c") is second
+        assert first.addresses == ("93.184.216.34",) and first.reason is None
+        assert fake.calls == ["docs.test"]
+
+    @pytest.mark.asyncio
+    async def test_any_private_address_blocks(self):
+        with patch("socket.getaddrinfo", _answer("93.184.216.34", "10.0.0.5")):
+            resolution = await resolve_url("http://rebind.test/")
+            allowed, reason = await UrlPolicy(audit_log_path="/dev/null").check_async(
+                "http://rebind.test/"
+            )
+        assert resolution.addresses == ()
+        assert "10.0.0.5" in resolution.reason
+        assert not allowed and "private/internal" in reason
+
+    def test_expired_entries_are_resolved_again(self):
+        fake = _answer("93.184.216.34")
+        with patch("socket.getaddrinfo", fake), patch.object(url_policy, "DNS_CACHE_TTL", 0.0):
+            resolve_url_sync("https://docs.test/")
+            resolve_url_sync("https://docs.test/")
+        assert len(fake.calls) == 2
+
+    def test_blocked_names_skip_dns(self):
+        fake = _answer("93.184.216.34")
+        with patch("socket.getaddrinfo", fake):
+            assert "localhost alias" in resolve_url_sync("http://LOCALHOST:8080/").reason
+        assert fake.calls == []
+
+
+class TestPinnedConnections:
+    def test_connects_to_checked_address(self):
+        with (
+            patch("socket.getaddrinfo", _answer("93.184.216.34")),
+            patch("socket.create_connection") as connect,
+        ):
+            _pinned_create_connection(("docs.test", 443), 5.0)
+        connect.assert_called_once_with(("93.184.216.34", 443), 5.0, None)
+
+    def test_refuses_private_address(self):
+        with (
+            patch("socket.getaddrinfo", _answer("169.254.169.254")),
+            patch("socket.create_connection") as connect,
+            pytest.raises(OSError, match="private/internal"),
+        ):
+            _pinned_create_connection(("metadata.test", 80))
+        connect.assert_not_called()
+
+    def test_failed_lookup_is_not_retried_unchecked(self):
+        answers = [
+            socket.gaierror("timed out"),
+            [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 80))],
+        ]
+
+        def getaddrinfo(host, port, *args, **kwargs):
+            answer = answers.pop(0)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        with (
+            patch("socket.getaddrinfo", getaddrinfo),
+            patch("socket.create_connection") as connect,
+            pytest.raises(OSError, match=r"Cannot resolve rebind\.test"),
+        ):
+            _pinned_create_connection(("rebind.test", 80))
+        connect.assert_not_called()
+
+
+class TestBatchedAuditLog:
+    @pytest.mark.asyncio
+    async def test_entries_written_in_one_batch(self, tmp_path):
+        log = tmp_path / "audit.jsonl"
+        policy = UrlPolicy(denylist=["*.bad.test"], audit_log_path=str(log))
+        with patch.object(url_policy, "AUDIT_FLUSH_INTERVAL", 0.0):
+            for i in range(3):
+                allowed, _ = await policy.check_async(f"https://x{i}.bad.test/")
+                assert not allowed
+            assert not log.exists()
+            await policy._audit_flush
+
+        entries = [json.loads(line) for line in log.read_text().splitlines()]
+        assert [e["url"] for e in entries] == [f"https://x{i}.bad.test/" for i in range(3)]
+
+    def test_written_immediately_without_event_loop(self, tmp_path):
+        log = tmp_path / "audit.jsonl"
+        UrlPolicy(denylist=["bad.test"], audit_log_path=str(log)).check("http://bad.test/")
+        assert "bad.test" in log.read_text()
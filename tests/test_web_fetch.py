@@ -0,0 +1,222 @@
+"""Tests for WebFetchTool's HTTP cache and HTML-to-text extraction."""
+
+import asyncio
+from email.utils import formatdate
+from unittest.mock import AsyncMock, patch
+
+import httpcore
+import httpx
+import pytest
+
+from core.url_policy import Resolution
+from tools.html_text import HTMLTextExtractor
+from tools.web_cache import WebCache, freshness
+from tools.web_search import WebFetchTool, _PinnedNetworkBackend
+
+PAGE = """<!doctype html><html><head><title>Guide</title>
+<style>body { color: red }</style><script>track()</script></head>
+<body><nav><a href="/">Home</a> | <a href="/docs">Docs</a></nav>
+<main><h1>Install</h1><p>Run the
+    installer &amp; restart.</p><pre>  pip install x</pre></main>
+<footer>Copyright</footer></body></html>"""
+
+
+class TestHTMLTextExtractor:
+    def test_drops_markup_and_chrome(self):
+        extractor = HTMLTextExtractor()
+        for i in range(0, len(PAGE), 11):
+            extractor.feed(PAGE[i : i + 11])
+        extractor.close()
+        assert (
+            extractor.text()
+            == "Guide\n\n# Install\n\nRun the installer & restart.\n\n  pip install x"
+        )
+
+    def test_budget_stops_extraction(self):
+        extractor = HTMLTextExtractor(limit=100)
+        for _ in range(1000):
+            extractor.feed("<p>" + "word " * 20 + "</p>")
+            if extractor.full:
+                break
+        assert extractor.full
+        assert len(extractor.text()) == 100 and extractor.truncated
+
+
+class TestFreshness:
+    def test_directives(self):
+        now = 1_700_000_000.0
+        assert freshness({"cache-control": "max-age=60"}, now) == (60.0, False)
+        assert freshness({"cache-control": "max-age=60", "age": "50"}, now) == (10.0, False)
+        assert freshness({"cache-control": "no-store", "etag": '"a"'}, now) is None
+        assert freshness({"cache-control": "no-cache", "etag": '"a"'}, now) == (0.0, True)
+        assert freshness({}, now) is None
+        headers = {
+            "date": formatdate(now, usegmt=True),
+            "last-modified": formatdate(now - 1000, usegmt=True),
+        }
+        assert freshness(headers, now) == (100.0, False)
+
+
+class FakeServer:
+    """MockTransport handler serving PAGE with configurable caching headers."""
+
+    def __init__(self, headers: dict[str, str] | None = None):
+        self.headers = headers or {}
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == "/evil":
+            return httpx.Response(302, headers={"location": "http://internal.test/admin"})
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"location": "https://docs.test/guide"})
+        etag = self.headers.get("etag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=self.headers)
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html; charset=utf-8", **self.headers},
+            stream=httpx.ByteStream(PAGE.encode()),
+        )
+
+
+@pytest.fixture
+def make_tool(tmp_path):
+    def make(server: FakeServer) -> WebFetchTool:
+        tool = WebFetchTool(cache=WebCache(tmp_path / "web_cache.db"))
+        tool._http = httpx.AsyncClient(transport=httpx.MockTransport(server))
+        return tool
+
+    async def resolve(url):
+        host = httpx.URL(url).host
+        if host == "internal.test":
+            return Resolution(host, reason="Blocked: internal.test resolves to private/internal IP")
+        return Resolution(host, ("93.184.216.34",))
+
+    with (
+        patch("tools.web_search._url_policy.check_async", AsyncMock(return_value=(True, ""))),
+        patch("tools.web_search.resolve_url", side_effect=resolve),
+    ):
+        yield make
+
+
+@pytest.mark.asyncio
+class TestWebFetchCaching:
+    async def test_fresh_hit_skips_network(self, make_tool):
+        server = FakeServer({"cache-control": "max-age=600"})
+        tool = make_tool(server)
+        first = await tool.execute(url="https://docs.test/guide")
+        second = await tool.execute(url="https://docs.test/guide#install")
+
+        assert first.output == second.output
+        assert "Run the installer & restart." in first.output
+        assert "<script>" not in first.output and "Copyright" not in first.output
+        assert len(server.requests) == 1
+        # The URL keeps its hostname; pinning happens in the network backend.
+        assert server.requests[0].url.host == "docs.test"
+        stats = tool._cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["bytes_saved"] == len(PAGE.encode())
+        assert stats["lifetime"]["hit_rate"] == 0.5
+
+    async def test_stale_entry_is_revalidated(self, make_tool):
+        server = FakeServer({"cache-control": "no-cache", "etag": '"v1"'})
+        tool = make_tool(server)
+        first = await tool.execute(url="https://docs.test/old")
+        second = await tool.execute(url="https://docs.test/old")
+
+        assert second.output == first.output
+        # Revalidation goes straight to the redirect target, conditionally.
+        assert server.requests[-1].url.path == "/guide"
+        assert server.requests[-1].headers["if-none-match"] == '"v1"'
+        assert tool._cache.stats()["revalidated"] == 1
+
+    async def test_no_store_is_refetched(self, make_tool):
+        server = FakeServer({"cache-control": "no-store", "etag": '"v1"'})
+        tool = make_tool(server)
+        await tool.execute(url="https://docs.test/guide")
+        await tool.execute(url="https://docs.test/guide")
+        assert len(server.requests) == 2
+        assert "if-none-match" not in server.requests[1].headers
+
+    async def test_concurrent_fetches_share_one_request(self, make_tool):
+        server = FakeServer({"cache-control": "max-age=600"})
+        tool = make_tool(server)
+        results = await asyncio.gather(
+            *(tool.execute(url="https://docs.test/guide") for _ in range(5))
+        )
+        assert len({r.output for r in results}) == 1
+        assert len(server.requests) == 1
+        stats = tool._cache.stats()
+        assert stats["coalesced"] + stats["hits"] == 4
+
+    async def test_stale_copy_served_when_origin_fails(self, make_tool):
+        server = FakeServer({"cache-control": "max-age=0", "etag": '"v1"'})
+        tool = make_tool(server)
+        first = await tool.execute(url="https://docs.test/guide")
+
+        def down(request):
+            raise httpx.ConnectError("connection refused")
+
+        tool._http = httpx.AsyncClient(transport=httpx.MockTransport(down))
+        result = await tool.execute(url="https://docs.test/guide")
+        assert result.success and result.output == first.output
+        assert tool._cache.stats()["stale_served"] == 1
+
+    async def test_plain_text_truncated_to_budget(self, make_tool):
+        def big(request):
+            return httpx.Response(200, headers={"content-type": "text/plain"}, text="x" * 80000)
+
+        tool = make_tool(FakeServer())
+        tool._http = httpx.AsyncClient(transport=httpx.MockTransport(big))
+        result = await tool.execute(url="https://docs.test/big.txt")
+        assert result.output.endswith("... (content truncated)")
+        assert len(result.output) < 50100
+
+    async def test_redirect_to_private_address_is_blocked(self, make_tool):
+        server = FakeServer()
+        result = await make_tool(server).execute(url="https://docs.test/evil")
+        assert not result.success and result.error.startswith("Redirect blocked:")
+        assert len(server.requests) == 1
+
+
+class RecordingBackend(httpcore.AsyncNetworkBackend):
+    """Inner backend that records dials and answers every request with 200."""
+
+    def __init__(self):
+        self.dialed: list[tuple[str, int]] = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.dialed.append((host, port))
+        reply = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+        return httpcore.AsyncMockStream([reply] * 4)
+
+    async def sleep(self, seconds):
+        pass
+
+
+@pytest.mark.asyncio
+class TestPinnedBackend:
+    async def test_dials_checked_address_and_pools_per_host(self):
+        async def resolve(host, port):
+            return Resolution(host, ("93.184.216.34",))
+
+        inner = RecordingBackend()
+        pool = httpcore.AsyncConnectionPool(network_backend=_PinnedNetworkBackend(inner))
+        with patch("tools.web_search.resolve_host", side_effect=resolve):
+            for url in ("http://a.test/", "http://a.test/x", "http://b.test/"):
+                response = await pool.request("GET", url)
+                assert response.status == 200
+        # Same IP, two hosts: one connection each, never shared across hosts.
+        assert inner.dialed == [("93.184.216.34", 80), ("93.184.216.34", 80)]
+        await pool.aclose()
+
+    async def test_blocked_host_is_not_dialed(self):
+        async def resolve(host, port):
+            return Resolution(host, reason="Blocked: private address")
+
+        inner = RecordingBackend()
+        with patch("tools.web_search.resolve_host", side_effect=resolve):
+            with pytest.raises(httpcore.ConnectError, match="private"):
+                await _PinnedNetworkBackend(inner).connect_tcp("rebind.test", 443)
+        assert inner.dialed == []
@@ -0,0 +1,150 @@
+"""Tests for per-client WebSocket send queues and drop policies."""
+
+import asyncio
+import json
+
+import pytest
+
+from dashboard.websocket_manager import (
+    POLICY_COALESCE,
+    POLICY_DROP_OLDEST,
+    POLICY_NEVER_DROP,
+    WebSocketManager,
+    message_policy,
+)
+
+
+class FakeWS:
+    """WebSocket stand-in; `gate` blocks sends to simulate a slow client."""
+
+    def __init__(self, blocked: bool = False):
+        self.sent: list[dict] = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+        self.closed_with: int | None = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_with = code
+
+
+async def _drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestMessagePolicy:
+    def test_policies(self):
+        assert message_policy("agent_progress") == POLICY_COALESCE
+        assert message_policy("agent_input_request") == POLICY_NEVER_DROP
+        assert message_policy("chat_message") == POLICY_NEVER_DROP
+        assert message_policy("intelligence_event") == POLICY_DROP_OLDEST
+        assert message_policy("something_new") == POLICY_DROP_OLDEST
+
+
+class TestBroadcastQueues:
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_fast_client(self):
+        mgr = WebSocketManager()
+        fast, slow = FakeWS(), FakeWS(blocked=True)
+        await mgr.connect(fast)
+        await mgr.connect(slow)
+
+        await mgr.broadcast("intelligence_event", {"n": 1})
+        await _drain()
+
+        assert fast.sent == [{"type": "intelligence_event", "data": {"n": 1}}]
+        assert slow.sent == []
+        stats = {id(c.ws): c for c in mgr._connections}
+        assert len(stats[id(slow)].queue) == 0  # picked up by writer, blocked in send
+        mgr.disconnect(fast)
+        mgr.disconnect(slow)
+
+    @pytest.mark.asyncio
+    async def test_progress_updates_coalesce_per_task(self):
+        mgr = WebSocketManager()
+        ws = FakeWS(blocked=True)
+        await mgr.connect(ws)
+        await mgr.broadcast("intelligence_event", {"n": 0})  # occupies the writer
+        await _drain()
+        for pct in (10, 50, 90):
+            await mgr.broadcast("agent_progress", {"task_id": "t1", "progress": pct})
+        await mgr.broadcast("agent_progress", {"task_id": "t2", "progress": 5})
+
+        ws.gate.set()
+        await _drain()
+
+        progress = [m["data"] for m in ws.sent if m["type"] == "agent_progress"]
+        assert progress == [{"task_id": "t1", "progress": 90}, {"task_id": "t2", "progress": 5}]
+        assert mgr.client_stats()[0]["coalesced"] == 2
+        mgr.disconnect(ws)
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_telemetry_before_chat(self):
+        mgr = WebSocketManager(max_queue=2)
+        ws = FakeWS(blocked=True)
+        await mgr.connect(ws)
+        await mgr.broadcast("intelligence_event", {"n": 0})  # held by writer
+        await _drain()
+        await mgr.broadcast("intelligence_event", {"n": 1})
+        await mgr.broadcast("chat_message", {"text": "hi"})
+        await mgr.broadcast("chat_message", {"text": "there"})  # evicts n=1
+
+        stats = mgr.client_stats()[0]
+        assert stats["dropped"] == 1
+        assert stats["queued"] == 2
+
+        ws.gate.set()
+        await _drain()
+        assert [m["data"] for m in ws.sent] == [{"n": 0}, {"text": "hi"}, {"text": "there"}]
+        mgr.disconnect(ws)
+
+    @pytest.mark.asyncio
+    async def test_client_disconnected_when_never_drop_backlog_overflows(self):
+        mgr = WebSocketManager(max_queue=1)
+        ws = FakeWS(blocked=True)
+        await mgr.connect(ws)
+        await mgr.broadcast("chat_message", {"text": "a"})  # held by writer
+        await _drain()
+        await mgr.broadcast("chat_message", {"text": "b"})
+        await mgr.broadcast("chat_message", {"text": "c"})
+        await _drain()
+
+        assert mgr.connection_count == 0
+        assert mgr.slow_disconnects == 1
+        assert ws.closed_with == 1013
+
+    @pytest.mark.asyncio
+    async def test_lagging_client_disconnected(self):
+        mgr = WebSocketManager(max_lag_seconds=0.01)
+        ws = FakeWS(blocked=True)
+        await mgr.connect(ws)
+        await mgr.broadcast("intelligence_event", {"n": 0})
+        await _drain()
+        await mgr.broadcast("intelligence_event", {"n": 1})
+        await asyncio.sleep(0.02)
+        await mgr.broadcast("intelligence_event", {"n": 2})
+        await _drain()
+
+        assert mgr.connection_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_send_removes_connection(self):
+        class BrokenWS(FakeWS):
+            async def send_text(self, text):
+                raise RuntimeError("socket closed")
+
+        ws = BrokenWS()
+        mgr = WebSocketManager()
+        await mgr.connect(ws)
+        await mgr.broadcast("intelligence_event", {})
+        await _drain()
+        assert mgr.connection_count == 0
+        assert ws.closed_with == 1011
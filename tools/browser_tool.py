@@ -174,7 +174,9 @@ class BrowserTool(Tool):
         try:
             from tools.web_search import _url_policy
 
-            allowed, reason = _url_policy.check(url, agent_id=kwargs.get("agent_id", "default"))
+            allowed, reason = await _url_policy.check_async(
+                url, agent_id=kwargs.get("agent_id", "default")
+            )
             if not allowed:
                 return ToolResult(error=f"Blocked: {reason}", success=False)
         except ImportError:
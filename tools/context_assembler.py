@@ -9,6 +9,12 @@ assembles relevant context from multiple sources:
 3. Git history — recent changes to relevant files
 4. Skills — relevant skill content for the current task type
 
+Sources are fetched concurrently, each within its own time budget, so a slow
+source is dropped rather than holding up the rest. Once all have answered,
+the token budget is divided among them by how relevant their results were.
+Parsed doc sections are cached until the file changes, and the git log until
+HEAD moves.
+
 Returns a deduplicated, token-budgeted context bundle.
 """
 
@@ -16,18 +22,27 @@ import asyncio
 import hashlib
 import logging
 import re
+from dataclasses import dataclass
 from pathlib import Path
 
 from tools.base import Tool, ToolResult
 
 logger = logging.getLogger("frood.tools.context_assembler")
 
-# Budget allocation (fraction of max_tokens per source)
+# Budget allocation (fraction of max_tokens per source). These are priors:
+# the final split is weighted by each source's relevance and shared out among
+# the sources that produced something.
 _BUDGET_MEMORY = 0.35
 _BUDGET_DOCS = 0.25
 _BUDGET_GIT = 0.20
 _BUDGET_SKILLS = 0.20
 
+# Seconds each source may take before it is left out of the bundle
+_TIMEOUT_MEMORY = 3.0
+_TIMEOUT_DOCS = 1.0
+_TIMEOUT_GIT = 3.0
+_TIMEOUT_SKILLS = 1.0
+
 _STOP_WORDS = frozenset(
     ["the", "a", "an", "is", "are", "was", "were", "be", "been", "being", "have", "has", "had", "do", "does", "did", "will", "would", "could", "should", "may", "might", "can", "shall", "must", "need", "let", "lets", "please", "want", "like", "just", "make", "get", "use", "this", "that", "these", "those", "its", "me", "my", "we", "our", "you", "your", "they", "them", "their", "and", "or", "but", "if", "then", "else", "when", "where", "how", "what", "which", "who", "not", "no", "so", "too", "very", "also", "about", "to", "for", "with", "from", "at", "by", "on", "in", "of", "up", "out", "off", "all", "any", "some", "now", "here", "there", "yes", "ok", "done"]
 )
@@ -49,6 +64,109 @@ def _truncate_to_budget(text, max_tokens):
     return text[:max_chars] + "\n... (truncated to fit context budget)"
 
 
+@dataclass
+class _Section:
+    """One candidate block of context and its relevance (0..1)."""
+
+    label: str
+    body: str
+    score: float
+
+
+def _content_hash(text):
+    return hashlib.sha256(text[:200].encode()).hexdigest()[:16]
+
+
+def _keyword_score(hits, keywords):
+    return min(1.0, hits / max(len(keywords), 1))
+
+
+# path -> (mtime_ns, size, [(section_name, body, body_lower)])
+_doc_cache: dict[Path, tuple[int, int, list[tuple[str, str, str]]]] = {}
+# resolved workspace -> (HEAD sha, `git log` output)
+_git_cache: dict[str, tuple[str, str]] = {}
+
+
+def clear_context_caches():
+    """Drop cached doc sections and git logs (tests, or after bulk edits)."""
+    _doc_cache.clear()
+    _git_cache.clear()
+
+
+def _doc_sections(path):
+    """The ``## `` sections of a doc file, re-parsed only when it changes."""
+    try:
+        stat = path.stat()
+    except OSError:
+        _doc_cache.pop(path, None)
+        return []
+    cached = _doc_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    try:
+        content = path.read_text(encoding="utf-8")
+    except Exception:
+        return []
+
+    sections = []
+    current_section = ""
+    current_lines = []
+    for line in content.split("\n"):
+        if line.startswith("## "):
+            if current_lines:
+                body = "\n".join(current_lines).strip()
+                sections.append((current_section, body, body.lower()))
+            current_section = line.lstrip("#").strip()
+            current_lines = [line]
+        else:
+            current_lines.append(line)
+    if current_lines:
+        body = "\n".join(current_lines).strip()
+        sections.append((current_section, body, body.lower()))
+
+    _doc_cache[path] = (stat.st_mtime_ns, stat.st_size, sections)
+    return sections
+
+
+def _git_head(workspace):
+    """HEAD's commit id, read from the repository files (no subprocess).
+
+    Returns None when it cannot be determined; callers then skip caching.
+    """
+    for directory in (workspace, *workspace.parents):
+        git_dir = directory / ".git"
+        if git_dir.exists():
+            break
+    else:
+        return None
+    try:
+        if git_dir.is_file():  # worktree or submodule: "gitdir: <path>"
+            text = git_dir.read_text().strip()
+            if not text.startswith("gitdir:"):
+                return None
+            git_dir = (directory / text[len("gitdir:") :].strip()).resolve()
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref:"):
+            return head
+        ref = head[len("ref:") :].strip()
+        common = git_dir
+        if (git_dir / "commondir").exists():
+            common = (git_dir / (git_dir / "commondir").read_text().strip()).resolve()
+        for base in (git_dir, common):
+            ref_path = base / ref
+            if ref_path.exists():
+                return ref_path.read_text().strip()
+        packed = common / "packed-refs"
+        if packed.exists():
+            for line in packed.read_text().splitlines():
+                sha, _, name = line.partition(" ")
+                if name.strip() == ref:
+                    return sha
+    except OSError:
+        return None
+    return None
+
+
 class ContextAssemblerTool(Tool):
     """Assemble smart project context from multiple sources."""
 
@@ -105,25 +223,53 @@ class ContextAssemblerTool(Tool):
 
         keywords = _extract_keywords(topic)
         top_k = 10 if depth == "deep" else 5
-        sections = []
-        seen = set()
-
-        # Source 1: Semantic Memory
-        await self._search_memory(topic, top_k, seen, sections, max_tokens)
-
-        # Source 2: Project Docs
-        self._search_docs(keywords, sections, seen, max_tokens)
 
-        # Source 3: Git History
+        # (name, prior budget share, seconds allowed, fetch) per source, in output order
+        sources = [
+            ("memory", _BUDGET_MEMORY, _TIMEOUT_MEMORY, self._search_memory(topic, top_k)),
+            ("docs", _BUDGET_DOCS, _TIMEOUT_DOCS, asyncio.to_thread(self._search_docs, keywords)),
+        ]
         if scope != "global":
-            await self._search_git(keywords, sections, seen, max_tokens)
+            sources.append(("git", _BUDGET_GIT, _TIMEOUT_GIT, self._search_git(keywords)))
+        sources.append(("skills", _BUDGET_SKILLS, _TIMEOUT_SKILLS, self._search_skills(keywords)))
 
-        # Source 4: Skills
-        self._search_skills(keywords, sections, seen, max_tokens)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(fetch, timeout) for _, _, timeout, fetch in sources),
+            return_exceptions=True,
+        )
 
-        if not sections:
+        # Deduplicate in source order, then weight each source's prior share
+        # by its best relevance score.
+        seen = set()
+        found = []
+        for (name, prior, _, _), result in zip(sources, results, strict=True):
+            if isinstance(result, BaseException):
+                reason = "timed out" if isinstance(result, TimeoutError) else result
+                logger.debug(f"Context source {name} skipped: {reason}")
+                continue
+            kept = []
+            for section in result:
+                h = _content_hash(section.body)
+                if h not in seen:
+                    seen.add(h)
+                    kept.append(section)
+            if kept:
+                weight = prior * (0.5 + max(s.score for s in kept))
+                found.append((weight, kept))
+
+        if not found:
             return ToolResult(output=f"No relevant context found for: {topic}", success=True)
 
+        total_weight = sum(weight for weight, _ in found)
+        sections = []
+        for weight, kept in found:
+            source_budget = max_tokens * weight / total_weight
+            score_sum = sum(s.score for s in kept)
+            for section in kept:
+                share = section.score / score_sum if score_sum else 1.0 / len(kept)
+                budgeted = _truncate_to_budget(section.body, int(source_budget * share))
+                sections.append(f"## {section.label}\n\n{budgeted}")
+
         header = f"# Context: {topic}\n\n"
         body = "\n\n".join(sections)
         output = _truncate_to_budget(header + body, max_tokens)
@@ -132,153 +278,136 @@ class ContextAssemblerTool(Tool):
 
         return ToolResult(output=output + footer, success=True)
 
-    async def _search_memory(self, topic, top_k, seen, sections, max_tokens):
+    async def _search_memory(self, topic, top_k):
         if not self._memory_store:
-            return
+            return []
         try:
             results = await self._memory_store.semantic_search(query=topic, top_k=top_k)
-            if not results:
-                return
-            lines = []
-            for r in results:
-                if r.get("score", 0) < 0.20:
-                    continue
-                text = r.get("text", "").strip()
-                section = r.get("section", "")
-                h = hashlib.sha256(text[:200].encode()).hexdigest()[:16]
-                if h in seen:
-                    continue
-                seen.add(h)
-                label = f"[{section}]" if section else ""
-                lines.append(f"- {label} {text[:300]}")
-            if lines:
-                content = "\n".join(lines)
-                budgeted = _truncate_to_budget(content, int(max_tokens * _BUDGET_MEMORY))
-                sections.append(f"## Relevant Memories\n\n{budgeted}")
         except Exception as e:
             logger.debug(f"Memory search failed: {e}")
-
-    def _search_docs(self, keywords, sections, seen, max_tokens):
+            return []
+        lines = []
+        best = 0.0
+        seen = set()
+        for r in results or []:
+            score = r.get("score", 0)
+            if score < 0.20:
+                continue
+            text = r.get("text", "").strip()
+            section = r.get("section", "")
+            h = _content_hash(text)
+            if h in seen:
+                continue
+            seen.add(h)
+            best = max(best, score)
+            label = f"[{section}]" if section else ""
+            lines.append(f"- {label} {text[:300]}")
+        if not lines:
+            return []
+        return [_Section("Relevant Memories", "\n".join(lines), min(best, 1.0))]
+
+    def _search_docs(self, keywords):
         workspace = Path(self._workspace) if self._workspace else Path(".")
         doc_files = [
             workspace / "CLAUDE.md",
             workspace / ".frood" / "memory" / "MEMORY.md",
         ]
-        budget_per_doc = int(max_tokens * _BUDGET_DOCS) // max(len(doc_files), 1)
-
+        found = []
         for doc_path in doc_files:
-            if not doc_path.exists():
-                continue
-            try:
-                content = doc_path.read_text(encoding="utf-8")
-            except Exception:
-                continue
-
-            current_section = ""
-            current_lines = []
             matches = []
-
-            for line in content.split("\n"):
-                if line.startswith("## "):
-                    if current_lines:
-                        body = "\n".join(current_lines).strip()
-                        score = sum(1 for kw in keywords if kw in body.lower())
-                        if score >= 2:
-                            matches.append((score, current_section, body))
-                    current_section = line.lstrip("#").strip()
-                    current_lines = [line]
-                else:
-                    current_lines.append(line)
-
-            if current_lines:
-                body = "\n".join(current_lines).strip()
-                score = sum(1 for kw in keywords if kw in body.lower())
-                if score >= 2:
-                    matches.append((score, current_section, body))
-
+            for section_name, body, lowered in _doc_sections(doc_path):
+                hits = sum(1 for kw in keywords if kw in lowered)
+                if hits >= 2:
+                    matches.append((hits, section_name, body))
             matches.sort(key=lambda x: x[0], reverse=True)
-            for score, section_name, body in matches[:3]:
-                h = hashlib.sha256(body[:200].encode()).hexdigest()[:16]
-                if h in seen:
-                    continue
-                seen.add(h)
+            for hits, section_name, body in matches[:3]:
                 label = f"{doc_path.name}: {section_name}" if section_name else doc_path.name
-                budgeted = _truncate_to_budget(body, budget_per_doc)
-                sections.append(f"## {label}\n\n{budgeted}")
-
-    async def _search_git(self, keywords, sections, seen, max_tokens):
-        workspace = self._workspace or "."
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "git",
-                "log",
-                "--oneline",
-                "--name-only",
-                "-20",
-                cwd=workspace,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
-            log_output = stdout.decode(errors="replace")
-        except Exception:
-            return
+                found.append(_Section(label, body, _keyword_score(hits, keywords)))
+        return found
 
+    async def _search_git(self, keywords):
+        log_output = await self._git_log()
         if not log_output.strip():
-            return
+            return []
 
         commits = log_output.strip().split("\n\n")
         relevant = []
         for block in commits[:20]:
             if not block.strip():
                 continue
-            score = sum(1 for kw in keywords if kw in block.lower())
-            if score >= 1:
-                relevant.append((score, block.strip()))
+            hits = sum(1 for kw in keywords if kw in block.lower())
+            if hits >= 1:
+                relevant.append((hits, block.strip()))
 
         if not relevant:
-            return
+            return []
 
         relevant.sort(key=lambda x: x[0], reverse=True)
         content = "\n\n".join(block for _, block in relevant[:5])
-
-        h = hashlib.sha256(content[:200].encode()).hexdigest()[:16]
-        if h in seen:
-            return
-        seen.add(h)
-
-        budgeted = _truncate_to_budget(content, int(max_tokens * _BUDGET_GIT))
-        sections.append(f"## Recent Git Activity\n\n{budgeted}")
-
-    def _search_skills(self, keywords, sections, seen, max_tokens):
+        return [_Section("Recent Git Activity", content, _keyword_score(relevant[0][0], keywords))]
+
+    async def _git_log(self):
+        """Recent commits with their files, cached until HEAD moves."""
+        workspace = Path(self._workspace or ".").resolve()
+        key = str(workspace)
+        head = await asyncio.to_thread(_git_head, workspace)
+        cached = _git_cache.get(key)
+        if head and cached and cached[0] == head:
+            return cached[1]
+
+        proc = None
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "git",
+                "log",
+                "--oneline",
+                "--name-only",
+                "-20",
+                cwd=key,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, _ = await proc.communicate()
+        except Exception:
+            return ""
+        finally:
+            # Out of time budget: don't leave the subprocess behind.
+            if proc is not None and proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+        log_output = stdout.decode(errors="replace")
+        if head and proc.returncode == 0:
+            _git_cache[key] = (head, log_output)
+        return log_output
+
+    async def _search_skills(self, keywords):
         if not self._skill_loader:
-            return
+            return []
         try:
             all_skills = self._skill_loader.all_skills()
         except Exception:
-            return
+            return []
 
         scored = []
         for skill in all_skills:
             skill_text = f"{skill.name} {skill.description}".lower()
-            score = sum(1 for kw in keywords if kw in skill_text)
-            if score >= 1:
-                scored.append((score, skill))
+            hits = sum(1 for kw in keywords if kw in skill_text)
+            if hits >= 1:
+                scored.append((hits, skill))
 
         if not scored:
-            return
+            return []
 
         scored.sort(key=lambda x: x[0], reverse=True)
         skill_lines = []
         for _, skill in scored[:3]:
             desc = skill.description[:150] if skill.description else ""
             skill_lines.append(f"- **{skill.name}**: {desc}")
-
-        if skill_lines:
-            content = "\n".join(skill_lines)
-            h = hashlib.sha256(content[:200].encode()).hexdigest()[:16]
-            if h in seen:
-                return
-            seen.add(h)
-            budgeted = _truncate_to_budget(content, int(max_tokens * _BUDGET_SKILLS))
-            sections.append(f"## Relevant Skills\n\n{budgeted}")
+        return [
+            _Section(
+                "Relevant Skills", "\n".join(skill_lines), _keyword_score(scored[0][0], keywords)
+            )
+        ]
@@ -12,10 +12,14 @@ Task types:
 """
 
 import asyncio
+import heapq
 import json
 import logging
+import os
+import random
 import time
 import uuid
+from collections import defaultdict
 from collections.abc import Awaitable, Callable
 from dataclasses import asdict, dataclass, field
 from enum import Enum
@@ -39,6 +43,21 @@ class JobState(str, Enum):
     FAILED = "failed"
 
 
+class OverlapPolicy(str, Enum):
+    """What to do when a job comes due while a previous run is still going."""
+
+    SKIP = "skip"  # Drop this occurrence
+    QUEUE = "queue"  # Run once more when the current run finishes
+    ALLOW = "allow"  # Run alongside, up to the job's max_concurrency
+
+
+class MisfirePolicy(str, Enum):
+    """What to do with a run that is overdue by more than the grace period."""
+
+    RUN_ONCE = "run_once"  # Run one catch-up for all missed occurrences
+    SKIP = "skip"  # Skip missed occurrences; wait for the next one
+
+
 @dataclass
 class CronJob:
     """A scheduled task."""
@@ -66,6 +85,12 @@ class CronJob:
     depends_on: str = ""  # Job ID this depends on (for planned sequences)
     plan_id: str = ""  # Group ID for planned sequences
 
+    # Concurrency and downtime handling
+    overlap_policy: str = "skip"  # skip | queue | allow
+    max_concurrency: int = 1  # Simultaneous runs of this job (overlap_policy=allow)
+    misfire_policy: str = "run_once"  # run_once | skip
+    misfire_grace_seconds: int = 60  # Lateness tolerated before a run counts as missed
+
     def to_dict(self) -> dict:
         return asdict(self)
 
@@ -75,13 +100,33 @@ class CronJob:
 
 
 class CronScheduler:
-    """Persistent cron scheduler with heartbeat loop."""
-
-    def __init__(self, data_path: str = "cron_jobs.json"):
+    """Persistent cron scheduler.
+
+    Jobs wait in a min-heap keyed by their next fire time (stagger and jitter
+    included); the loop sleeps until the earliest one is due, or until the
+    job set changes. Due jobs run as tasks, at most ``max_concurrent`` at a
+    time overall, with each job's overlap policy deciding what happens if its
+    previous run has not finished. Runs missed during downtime are handled
+    by the job's misfire policy. The job file is rewritten only when its
+    contents change.
+    """
+
+    def __init__(self, data_path: str = "cron_jobs.json", max_concurrent: int = 4):
         self._jobs: dict[str, CronJob] = {}
         self._data_path = Path(data_path)
         self._task_callback: Callable[[str, str, str], Awaitable[None]] | None = None
         self._running = False
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        # Heap of (fire_at, job_id). An entry is live only while _scheduled
+        # still maps the job to that time; anything else is skipped on pop.
+        self._heap: list[tuple[float, str]] = []
+        self._scheduled: dict[str, float] = {}
+        self._stagger: dict[str, float] = {}
+        self._active: dict[str, int] = defaultdict(int)
+        self._queued: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._saved = ""
 
     def on_trigger(self, callback: Callable[[str, str, str], Awaitable[None]]):
         """Set callback(title, description, task_type) for when a job triggers."""
@@ -92,6 +137,7 @@ class CronScheduler:
         if not job.next_run:
             job.next_run = self._compute_next_run(job.schedule)
         self._jobs[job.id] = job
+        self._rebuild()
         self._persist()
         logger.info(f"Cron job added: {job.id} — {job.name}")
         return job
@@ -100,102 +146,230 @@ class CronScheduler:
         """Remove a scheduled job."""
         if job_id in self._jobs:
             del self._jobs[job_id]
+            self._queued.discard(job_id)
+            self._rebuild()
             self._persist()
             return True
         return False
 
+    def set_enabled(self, job_id: str, enabled: bool) -> bool:
+        """Enable or disable a job; returns False if it does not exist."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        if job.enabled != enabled:
+            job.enabled = enabled
+            self._rebuild()
+            self._persist()
+        return True
+
     def list_jobs(self) -> list[CronJob]:
         """List all scheduled jobs."""
         return list(self._jobs.values())
 
     async def start(self):
-        """Start the scheduler heartbeat loop."""
-        import random
-        from collections import defaultdict
-
+        """Run the scheduler until stop() is called."""
         self._load()
         self._running = True
+        self._rebuild()
         logger.info(f"Cron scheduler started with {len(self._jobs)} jobs")
+        try:
+            while self._running:
+                self._wake.clear()
+                now = time.time()
+                changed = False
+                while self._heap and self._heap[0][0] <= now:
+                    fire_at, job_id = heapq.heappop(self._heap)
+                    if self._scheduled.get(job_id) != fire_at:
+                        continue  # superseded entry
+                    del self._scheduled[job_id]
+                    self._dispatch(self._jobs[job_id], fire_at, now)
+                    changed = True
+                if changed:
+                    self._persist()
+
+                delay = self._heap[0][0] - time.time() if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
+        finally:
+            self._running = False
+            for task in list(self._tasks):
+                task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._persist()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    # -- scheduling ----------------------------------------------------------
 
-        # Auto-stagger: compute offsets for jobs sharing the same schedule
+    def _compute_stagger(self) -> dict[str, float]:
+        """Offsets that spread jobs sharing a schedule over a 60-second window.
+
+        A job's stagger_seconds overrides its automatic slot; jitter_seconds
+        adds a random delay on top. Only recurring jobs are staggered: the
+        "once" and "planned" schedule strings are placeholders, not times.
+        """
         schedule_groups: dict[str, list[str]] = defaultdict(list)
         for job in self._jobs.values():
-            schedule_groups[job.schedule].append(job.id)
-
-        stagger_offsets: dict[str, float] = {}
-        for schedule_expr, job_ids in schedule_groups.items():
-            if len(job_ids) <= 1:
-                for jid in job_ids:
-                    stagger_offsets[jid] = 0.0
-                continue
-            # Spread jobs evenly over a 60-second window (or use manual override)
-            auto_gap = 60.0 / len(job_ids)
+            if job.job_type == JobType.RECURRING:
+                schedule_groups[job.schedule].append(job.id)
+
+        offsets: dict[str, float] = {}
+        for job_ids in schedule_groups.values():
+            auto_gap = 60.0 / len(job_ids) if len(job_ids) > 1 else 0.0
             for idx, jid in enumerate(job_ids):
                 job = self._jobs[jid]
-                if job.stagger_seconds > 0:
-                    stagger_offsets[jid] = float(job.stagger_seconds)
+                if len(job_ids) > 1 and job.stagger_seconds > 0:
+                    offsets[jid] = float(job.stagger_seconds)
                 else:
-                    stagger_offsets[jid] = idx * auto_gap
-                # Add random jitter if configured
-                if job.jitter_seconds > 0:
-                    stagger_offsets[jid] += random.uniform(0, job.jitter_seconds)
-
-        logger.info(f"Computed stagger offsets for {len(stagger_offsets)} jobs")
-
-        while self._running:
-            now = time.time()
-            for job in self._jobs.values():
-                effective_next = job.next_run + stagger_offsets.get(job.id, 0.0)
-                if not job.enabled or effective_next > now:
-                    continue
-
-                # Check dependency for planned jobs
-                if job.job_type == JobType.PLANNED and job.depends_on:
-                    dep = self._jobs.get(job.depends_on)
-                    if dep and dep.state != JobState.COMPLETED:
-                        continue  # Dependency not yet completed
-
-                logger.info(f"Cron trigger: {job.id} — {job.name}")
-                job.last_run = now
-                job.state = JobState.RUNNING
-                job.run_count += 1
+                    offsets[jid] = idx * auto_gap
+                if len(job_ids) > 1 and job.jitter_seconds > 0:
+                    offsets[jid] += random.uniform(0, job.jitter_seconds)
+        return offsets
+
+    def _rebuild(self):
+        """Recompute stagger offsets and the heap after the job set changed."""
+        previous = self._stagger
+        self._stagger = self._compute_stagger()
+        # Keep already-drawn jitter so a rebuild does not reshuffle run times.
+        for jid, offset in previous.items():
+            job = self._jobs.get(jid)
+            if job is not None and job.jitter_seconds > 0 and jid in self._stagger:
+                self._stagger[jid] = offset
+        self._scheduled = {}
+        for job in self._jobs.values():
+            if self._ready(job):
+                self._scheduled[job.id] = job.next_run + self._stagger.get(job.id, 0.0)
+        self._heap = [(t, jid) for jid, t in self._scheduled.items()]
+        heapq.heapify(self._heap)
+        self._wake.set()
+
+    def _ready(self, job: CronJob) -> bool:
+        """Whether the job should be waiting in the heap."""
+        if not job.enabled:
+            return False
+        if job.state == JobState.RUNNING and job.job_type != JobType.RECURRING:
+            return False  # popped already; recurring jobs stay queued while running
+        if job.job_type == JobType.PLANNED:
+            if job.state in (JobState.COMPLETED, JobState.FAILED):
+                return False  # each step runs once
+            if job.depends_on:
+                dep = self._jobs.get(job.depends_on)
+                if dep and dep.state != JobState.COMPLETED:
+                    return False  # scheduled when the dependency completes
+        return True
+
+    def _schedule(self, job: CronJob):
+        if self._ready(job):
+            fire_at = job.next_run + self._stagger.get(job.id, 0.0)
+            self._scheduled[job.id] = fire_at
+            heapq.heappush(self._heap, (fire_at, job.id))
+            self._wake.set()
+
+    def _advance(self, job: CronJob, now: float):
+        """Move a recurring job to its next occurrence after now."""
+        next_run = self._compute_next_run(job.schedule, job.next_run or now)
+        if next_run <= now:
+            next_run = self._compute_next_run(job.schedule, now)
+        job.next_run = next_run
+
+    def _dispatch(self, job: CronJob, fire_at: float, now: float):
+        """Handle a job whose fire time has come."""
+        recurring = job.job_type == JobType.RECURRING
+        # Planned steps fire when their dependency completes, so they are
+        # never late.
+        late = 0.0 if job.job_type == JobType.PLANNED else now - fire_at
+        if late > job.misfire_grace_seconds and job.misfire_policy == MisfirePolicy.SKIP:
+            logger.warning(f"Cron job {job.id} missed its run by {late:.0f}s; skipping")
+            if recurring:
+                self._advance(job, now)
+                self._schedule(job)
+            elif job.job_type == JobType.ONCE:
+                del self._jobs[job.id]
+            return
 
+        if recurring:
+            # The next occurrence is scheduled now, so a slow run cannot
+            # delay it; the overlap policy decides if it may start.
+            self._advance(job, now)
+            self._schedule(job)
+
+        active = self._active[job.id]
+        if active:
+            policy = job.overlap_policy
+            if policy == OverlapPolicy.QUEUE:
+                self._queued.add(job.id)
+                logger.info(f"Cron job {job.id} still running; queued one more run")
+                return
+            if policy != OverlapPolicy.ALLOW or active >= max(1, job.max_concurrency):
+                logger.info(f"Cron job {job.id} still running; skipped this run")
+                return
+        self._launch(job)
+
+    def _launch(self, job: CronJob):
+        logger.info(f"Cron trigger: {job.id} — {job.name}")
+        job.last_run = time.time()
+        job.state = JobState.RUNNING
+        job.run_count += 1
+        self._active[job.id] += 1
+        task = asyncio.create_task(self._run(job), name=f"cron-{job.id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: CronJob):
+        failed = False
+        try:
+            async with self._slots:
                 if self._task_callback:
-                    try:
-                        await self._task_callback(
+                    await asyncio.wait_for(
+                        self._task_callback(
                             job.task_title or job.name,
                             job.task_description or job.description,
                             job.task_type,
-                        )
-                        job.state = JobState.COMPLETED
-                    except Exception as e:
-                        logger.error(f"Cron callback error: {e}")
-                        job.state = JobState.FAILED
-                        job.error_history.append({"time": now, "error": str(e)})
-                        # Keep only last 10 errors
-                        job.error_history = job.error_history[-10:]
-
-                # Handle one-time jobs: disable after execution
-                if job.job_type == JobType.ONCE:
-                    job.enabled = False
-                    job.state = JobState.COMPLETED
-                elif job.job_type == JobType.RECURRING:
-                    job.next_run = self._compute_next_run(job.schedule, now)
-                    job.state = JobState.PENDING
-
-            # Clean up completed one-time jobs
-            completed_once = [
-                jid for jid, j in self._jobs.items() if j.job_type == JobType.ONCE and not j.enabled
-            ]
-            for jid in completed_once:
-                del self._jobs[jid]
-                logger.info(f"Removed completed one-time job: {jid}")
-
-            self._persist()
-            await asyncio.sleep(30)  # Check every 30 seconds
-
-    def stop(self):
-        self._running = False
+                        ),
+                        timeout=job.timeout_seconds or None,
+                    )
+        except Exception as e:
+            failed = True
+            error = str(e) or type(e).__name__
+            logger.error(f"Cron callback error: {error}")
+            job.error_history.append({"time": time.time(), "error": error})
+            # Keep only last 10 errors
+            job.error_history = job.error_history[-10:]
+        finally:
+            self._active[job.id] -= 1
+            if not self._active[job.id]:
+                del self._active[job.id]
+        self._finished(job, failed)
+
+    def _finished(self, job: CronJob, failed: bool):
+        """Record a run's outcome and schedule whatever it unblocks."""
+        if job.id not in self._jobs:
+            return  # removed while running
+        if self._active.get(job.id):
+            pass  # another run of this job is still going
+        elif job.job_type == JobType.ONCE:
+            del self._jobs[job.id]
+            logger.info(f"Removed completed one-time job: {job.id}")
+        elif job.job_type == JobType.PLANNED:
+            job.state = JobState.FAILED if failed else JobState.COMPLETED
+            if not failed:
+                for other in self._jobs.values():
+                    if other.depends_on == job.id and other.state == JobState.PENDING:
+                        other.next_run = time.time()  # next step runs right away
+                        self._schedule(other)
+        else:
+            job.state = JobState.PENDING
+
+        if job.id in self._queued and not self._active.get(job.id) and job.enabled:
+            self._queued.discard(job.id)
+            self._launch(job)
+        self._persist()
 
     def _compute_next_run(self, schedule: str, from_time: float = 0.0) -> float:
         """Compute the next run time from a schedule string.
@@ -292,10 +466,16 @@ class CronScheduler:
         return from_time + 3600
 
     def _persist(self):
-        """Save jobs to disk."""
+        """Save jobs to disk if they changed since the last save."""
         try:
-            data = [j.to_dict() for j in self._jobs.values()]
-            self._data_path.write_text(json.dumps(data, indent=2))
+            data = json.dumps([j.to_dict() for j in self._jobs.values()], indent=2)
+            if data == self._saved:
+                return
+            # Write-then-rename so a crash never leaves a truncated file.
+            tmp = self._data_path.with_name(self._data_path.name + ".tmp")
+            tmp.write_text(data)
+            os.replace(tmp, self._data_path)
+            self._saved = data
         except Exception as e:
             logger.error(f"Failed to persist cron jobs: {e}")
 
@@ -304,10 +484,15 @@ class CronScheduler:
         if not self._data_path.exists():
             return
         try:
-            data = json.loads(self._data_path.read_text())
-            for item in data:
+            text = self._data_path.read_text()
+            for item in json.loads(text):
                 job = CronJob.from_dict(item)
+                if job.state == JobState.RUNNING:
+                    # Interrupted by a shutdown; the misfire policy decides
+                    # whether it runs again.
+                    job.state = JobState.PENDING
                 self._jobs[job.id] = job
+            self._saved = text
             logger.info(f"Loaded {len(self._jobs)} cron jobs")
         except Exception as e:
             logger.error(f"Failed to load cron jobs: {e}")
@@ -506,9 +691,7 @@ class CronTool(Tool):
 
     def _toggle(self, action: str, **kwargs) -> ToolResult:
         job_id = kwargs.get("job_id", "")
-        jobs = {j.id: j for j in self._scheduler.list_jobs()}
-        if job_id in jobs:
-            jobs[job_id].enabled = action == "enable"
+        if self._scheduler.set_enabled(job_id, action == "enable"):
             return ToolResult(
                 output=f"Job {job_id} {'enabled' if action == 'enable' else 'disabled'}"
             )
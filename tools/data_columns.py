@@ -0,0 +1,619 @@
+"""
+Columnar tables for DataTool.
+
+A table is a list of typed columns instead of a dict per row:
+
+- int / float — array('q') / array('d'). Cells whose text is not the
+  canonical form of their number ("1.50", "", "N/A", ...) are kept verbatim
+  in a per-column overrides dict, so output reproduces the input exactly.
+- dict — dictionary-encoded: array('i') of codes into the list of distinct
+  values. Used for text, and for numeric columns with many exceptions.
+- object — a plain list, for JSON values that cannot be hashed.
+
+Types are inferred while loading. Numeric views (NaN where a cell is not a
+number) are built once per column — once per distinct value for dictionary
+columns — so filters and aggregates never call float() per row. Filters are
+compiled into predicates evaluated over whole columns.
+"""
+
+import csv
+import io
+import math
+import sys
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from itertools import compress
+
+
+class _Missing:
+    """Placeholder for a key absent from a JSON row."""
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+_NAN = float("nan")
+_INT64 = (-(2**63), 2**63 - 1)
+_FLOAT_INT = 2**53  # beyond this, ints do not survive a float round trip
+
+# A numeric column is dictionary-encoded once more than this share of its
+# cells (and at least _MIN_OVERRIDES) need verbatim overrides.
+_OVERRIDE_SHARE = 0.125
+_MIN_OVERRIDES = 64
+
+
+def _cell(raw):
+    """Cell value as DataTool has always seen it: missing reads as ""."""
+    return "" if raw is MISSING else raw
+
+
+def _text(raw) -> str:
+    """Cell text for display, filters and CSV export; csv writes None as ""."""
+    return "" if raw is MISSING or raw is None else str(raw)
+
+
+def _to_float(raw) -> float:
+    if raw is MISSING:
+        return _NAN
+    try:
+        return float(raw)
+    except (ValueError, TypeError):
+        return _NAN
+
+
+def _parse(raw) -> tuple[int | float | None, bool]:
+    """Number stored for a cell → (value, exact).
+
+    exact means the cell can be rebuilt from the value alone; otherwise it
+    needs an override (value is still its number, or None).
+    """
+    if isinstance(raw, str):
+        if raw[:1].isdigit() or raw[:1] == "-":
+            try:
+                value = int(raw)
+            except ValueError:
+                pass
+            else:
+                return value, str(value) == raw and _INT64[0] <= value <= _INT64[1]
+        try:
+            value = float(raw)
+        except ValueError:
+            return None, False
+        return value, repr(value) == raw
+    if isinstance(raw, bool) or raw is None or raw is MISSING:
+        return None, False
+    if isinstance(raw, int):
+        return raw, _INT64[0] <= raw <= _INT64[1]
+    if isinstance(raw, float):
+        return raw, True
+    return None, False
+
+
+class Column:
+    """One typed column; built by appending cells, then read by row index."""
+
+    __slots__ = (
+        "_entry_index",
+        "_numbers",
+        "codes",
+        "entries",
+        "fmt_int",
+        "kind",
+        "length",
+        "name",
+        "objects",
+        "overrides",
+        "textual",
+        "values",
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.kind = "int"
+        self.length = 0
+        self.textual: bool | None = None  # cells were strings (CSV) rather than JSON numbers
+        self.values = array("q")
+        self.fmt_int: bytearray | None = None  # float columns: cell was written as an int
+        self.overrides: dict[int, object] = {}
+        self.codes: array | None = None
+        self.entries: list | None = None
+        self._entry_index: dict | None = None
+        self.objects: list | None = None
+        self._numbers: array | None = None
+
+    # -- Building -------------------------------------------------------------
+
+    @classmethod
+    def from_cells(cls, name: str, cells: tuple[str, ...]) -> "Column":
+        """Build from a complete column of CSV strings.
+
+        Whole-column conversions run first; only columns they reject are
+        built cell by cell.
+        """
+        col = cls(name)
+        if not cells:
+            return col
+        col.textual = True
+        col.length = len(cells)
+        try:
+            values = array("q", map(int, cells))
+            if tuple(map(str, values)) == cells:
+                col.values = values
+                return col
+        except (ValueError, OverflowError):
+            pass
+        try:
+            values = array("d", map(float, cells))
+        except ValueError:
+            values = None
+        if values is not None:
+            # Cells that are not repr(value) must be written as ints ("30"), or are overrides.
+            mismatched = bytearray(map(str.__ne__, map(repr, values), cells))
+            overrides = {}
+            for i in compress(range(len(cells)), mismatched):
+                value = values[i]
+                if not (
+                    value.is_integer() and abs(value) <= _FLOAT_INT and str(int(value)) == cells[i]
+                ):
+                    overrides[i] = cells[i]
+            if len(overrides) <= len(cells) * _OVERRIDE_SHARE:
+                col.kind = "float"
+                col.values = values
+                col.overrides = overrides
+                if any(mismatched):
+                    for i in overrides:
+                        mismatched[i] = 0
+                    col.fmt_int = mismatched
+                return col
+
+        col.length = 0
+        for k, cell in enumerate(cells):
+            col.append(cell)
+            if col.kind == "dict":
+                col._extend_text(cells[k + 1 :])
+                break
+        col.finish()
+        return col
+
+    def _extend_text(self, cells: tuple[str, ...]) -> None:
+        """Append string cells to a dictionary column in bulk."""
+        if not all(isinstance(key, str) for key in self._entry_index):
+            for cell in cells:
+                self.append(cell)
+            return
+        index = defaultdict(None, self._entry_index)
+        index.default_factory = index.__len__
+        self.codes.extend(map(index.__getitem__, cells))
+        self.entries = list(index)
+        self._entry_index = dict(index)
+        self.length += len(cells)
+
+    def append(self, raw) -> None:
+        self._numbers = None
+        if self.kind == "object":
+            self.objects.append(raw)
+        elif self.kind == "dict":
+            self._append_entry(raw)
+        else:
+            self._append_number(raw)
+        self.length += 1
+
+    def _append_number(self, raw) -> None:
+        if isinstance(raw, (list, dict)):
+            self._to_objects()
+            self.objects.append(raw)
+            return
+        if self.textual is None and raw is not MISSING and raw is not None:
+            self.textual = isinstance(raw, str)
+        value, exact = _parse(raw)
+        if exact and isinstance(raw, str) != bool(self.textual):
+            exact = False
+
+        if exact and self.kind == "int" and isinstance(value, float):
+            # First fractional cell: earlier ints keep their int formatting.
+            self.values = array("d", self.values)
+            self.fmt_int = bytearray(b"\x01") * len(self.values)
+            self.kind = "float"
+        if self.kind == "float" and isinstance(value, int):
+            exact = exact and abs(value) <= _FLOAT_INT
+            value = float(value)
+            integral = True
+        else:
+            integral = False
+
+        if not exact:
+            self.overrides[self.length] = raw
+            if value is None:
+                value = 0 if self.kind == "int" else _NAN
+            elif self.kind == "int" and not (
+                isinstance(value, int) and _INT64[0] <= value <= _INT64[1]
+            ):
+                value = 0
+        self.values.append(value)
+        if self.fmt_int is not None:
+            self.fmt_int.append(integral)
+        elif integral:
+            self.fmt_int = bytearray(len(self.values) - 1)
+            self.fmt_int.append(1)
+
+        if (
+            len(self.overrides) > _MIN_OVERRIDES
+            and len(self.overrides) > (self.length + 1) * _OVERRIDE_SHARE
+        ):
+            self._to_dict(self.length + 1)
+
+    def _append_entry(self, raw) -> None:
+        if isinstance(raw, (list, dict)):
+            self._to_objects()
+            self.objects.append(raw)
+            return
+        key = raw if isinstance(raw, str) else (type(raw), raw)
+        code = self._entry_index.get(key)
+        if code is None:
+            code = self._entry_index[key] = len(self.entries)
+            self.entries.append(raw)
+        self.codes.append(code)
+
+    def finish(self) -> None:
+        """Settle the type once loading is done: mostly-text numeric columns become text.
+
+        Blank cells and numbers that merely need their spelling kept ("007")
+        do not count against a numeric type.
+        """
+        if self.kind not in ("int", "float") or not self.overrides:
+            return
+        foreign = sum(
+            1
+            for raw in self.overrides.values()
+            if raw is not MISSING and raw is not None and raw != "" and _parse(raw)[0] is None
+        )
+        if foreign > self.length * _OVERRIDE_SHARE:
+            self._to_dict(self.length)
+
+    def _to_dict(self, length: int) -> None:
+        raws = [self._raw_numeric(i) for i in range(length)]
+        self.kind = "dict"
+        self.codes = array("i")
+        self.entries = []
+        self._entry_index = {}
+        for raw in raws:
+            self._append_entry(raw)
+        self.values = array("q")
+        self.fmt_int = None
+        self.overrides = {}
+
+    def _to_objects(self) -> None:
+        self.objects = [self.raw(i) for i in range(self.length)]
+        self.kind = "object"
+        self.values = array("q")
+        self.fmt_int = None
+        self.overrides = {}
+        self.codes = self.entries = self._entry_index = None
+
+    # -- Reading --------------------------------------------------------------
+
+    def raw(self, i: int):
+        """The cell as loaded (MISSING if the row had no such key)."""
+        if self.kind == "dict":
+            return self.entries[self.codes[i]]
+        if self.kind == "object":
+            return self.objects[i]
+        return self._raw_numeric(i)
+
+    def _raw_numeric(self, i: int):
+        if i in self.overrides:
+            return self.overrides[i]
+        return self._format(self.values[i], self.fmt_int is not None and self.fmt_int[i])
+
+    def _format(self, value, integral):
+        if self.kind == "int" or integral:
+            value = int(value)
+            return str(value) if self.textual else value
+        return repr(value) if self.textual else value
+
+    def text(self, i: int) -> str:
+        return _text(self.raw(i))
+
+    def numbers(self) -> array:
+        """Cells as floats, NaN where a cell is not a number. Cached."""
+        if self._numbers is None:
+            if self.kind == "dict":
+                per_entry = [_to_float(e) for e in self.entries]
+                nums = array("d", map(per_entry.__getitem__, self.codes))
+            elif self.kind == "object":
+                nums = array("d", map(_to_float, self.objects))
+            else:
+                nums = array("d", self.values)
+                for i, raw in self.overrides.items():
+                    nums[i] = _to_float(raw)
+            self._numbers = nums
+        return self._numbers
+
+    def value_counts(self) -> Counter:
+        """Occurrences of each distinct cell, in first-seen order."""
+        counts: Counter = Counter()
+        if self.kind == "dict":
+            for code, n in Counter(self.codes).items():
+                counts[_cell(self.entries[code])] += n
+        elif self.kind == "object":
+            counts.update(_cell(raw) for raw in self.objects)
+        else:
+            rows = range(self.length)
+            flags = self.fmt_int if self.fmt_int is not None else bytes(self.length)
+            pairs = zip(self.values, flags)
+            if self.overrides:
+                keep = bytearray(b"\x01") * self.length
+                for i in self.overrides:
+                    keep[i] = 0
+                rows, pairs = compress(rows, keep), compress(pairs, keep)
+            # First row of each distinct (value, flag): later rows overwrite earlier
+            # ones in the dict, so walk backwards.
+            rows, pairs = list(rows), list(pairs)
+            first = dict(zip(reversed(pairs), reversed(rows)))
+            found = [(first[pair], self._format(*pair), n) for pair, n in Counter(pairs).items()]
+            found.extend((i, _cell(raw), 1) for i, raw in self.overrides.items())
+            # Counter.most_common breaks ties by insertion order, so insert by first row.
+            for _, key, n in sorted(found, key=lambda f: f[0]):
+                counts[key] += n
+        return counts
+
+    def missing_rows(self) -> list[int]:
+        """Rows whose JSON object had no such key."""
+        if self.kind == "dict":
+            code = self._entry_index.get((_Missing, MISSING))
+            if code is None:
+                return []
+            return list(compress(range(self.length), map(code.__eq__, self.codes)))
+        if self.kind == "object":
+            return [i for i, raw in enumerate(self.objects) if raw is MISSING]
+        return sorted(i for i, raw in self.overrides.items() if raw is MISSING)
+
+    def equal_rows(self, val: str) -> list[int]:
+        """Rows whose text is exactly val."""
+        n = self.length
+        if self.kind == "dict":
+            hit = bytearray(_text(e) == val for e in self.entries)
+            if not any(hit):
+                return []
+            return list(compress(range(n), map(hit.__getitem__, self.codes)))
+        if self.kind == "object":
+            return [i for i, raw in enumerate(self.objects) if _text(raw) == val]
+
+        rows = {i for i, raw in self.overrides.items() if _text(raw) == val}
+        target, _ = _parse(val)
+        if self.kind == "int":
+            # "30.0" can only match an override; canonical int cells read "30"
+            target = target if isinstance(target, int) else None
+        elif target is not None:
+            target = float(target)
+        if target is not None:
+            candidates = compress(range(n), map(target.__eq__, self.values))
+            rows.update(i for i in candidates if self.text(i) == val)
+        return sorted(rows)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the column's buffers."""
+        if self.kind == "dict":
+            size = self.codes.itemsize * len(self.codes)
+            size += sum(sys.getsizeof(e) for e in self.entries)
+        elif self.kind == "object":
+            size = sys.getsizeof(self.objects) + sum(sys.getsizeof(o) for o in self.objects)
+        else:
+            size = self.values.itemsize * len(self.values)
+            size += len(self.fmt_int or b"")
+            size += sum(sys.getsizeof(raw) + 64 for raw in self.overrides.values())
+        if self._numbers is not None:
+            size += 8 * len(self._numbers)
+        return size
+
+    @property
+    def type_name(self) -> str:
+        return {"dict": "str", "object": "json"}.get(self.kind, self.kind)
+
+
+class Table:
+    """Named columns of equal length."""
+
+    def __init__(self, columns: list[Column] | None = None, length: int = 0):
+        self.columns = columns or []
+        self.length = length
+        self._by_name = {c.name: c for c in self.columns}
+        # JSON rows whose keys were not in column order: row → key order as loaded.
+        self._key_orders: dict[int, tuple[str, ...]] = {}
+
+    @property
+    def names(self) -> list[str]:
+        return [c.name for c in self.columns]
+
+    def column(self, name: str) -> Column | None:
+        return self._by_name.get(name)
+
+    def _add_column(self, name: str) -> Column:
+        col = Column(name)
+        for _ in range(self.length):
+            col.append(MISSING)
+        self.columns.append(col)
+        self._by_name[name] = col
+        return col
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "Table":
+        """Build from JSON objects; keys absent from a row read as missing."""
+        table = cls()
+        names: tuple[str, ...] = ()
+        for record in records:
+            if not isinstance(record, dict):
+                raise ValueError("JSON rows must be objects")
+            for name in record:
+                if name not in table._by_name:
+                    table._add_column(name)
+                    names += (name,)
+            for col in table.columns:
+                col.append(record.get(col.name, MISSING))
+            order = tuple(record)
+            if order != names[: len(order)] and order != tuple(n for n in names if n in record):
+                table._key_orders[table.length] = order
+            table.length += 1
+        for col in table.columns:
+            col.finish()
+        return table
+
+    @classmethod
+    def from_csv(cls, text: str) -> "Table":
+        """Build from CSV with a header row; short rows are padded with None, as
+        csv.DictReader does.
+        """
+        reader = csv.reader(io.StringIO(text))
+        header = next(reader, None)
+        table = cls()
+        if not header:
+            return table
+        # Duplicate headers: the last occurrence wins, as with csv.DictReader.
+        positions = {name: i for i, name in enumerate(header)}
+        rows = [row for row in reader if row]
+        width = len(header)
+
+        if all(len(row) == width for row in rows):
+            # Rectangular (the usual case): build each column from all its cells at once.
+            by_position = list(zip(*rows)) if rows else [()] * width
+            del rows
+            table.columns = [
+                Column.from_cells(name, by_position[i]) for name, i in positions.items()
+            ]
+            table._by_name = {c.name: c for c in table.columns}
+            table.length = len(by_position[0])
+            return table
+
+        for name in positions:
+            table._add_column(name)
+        slots = [(table._by_name[name], i) for name, i in positions.items()]
+        for row in rows:
+            width = len(row)
+            for col, i in slots:
+                col.append(row[i] if i < width else None)
+            table.length += 1
+        for col in table.columns:
+            col.finish()
+        return table
+
+    def record(self, i: int) -> dict:
+        """Row i as loaded: its own keys, in their original order."""
+        order = self._key_orders.get(i)
+        if order is not None:
+            return {name: self._by_name[name].raw(i) for name in order}
+        return {c.name: raw for c in self.columns if (raw := c.raw(i)) is not MISSING}
+
+    def text_row(self, i: int) -> dict[str, str]:
+        return {c.name: c.text(i) for c in self.columns}
+
+    def nbytes(self) -> int:
+        return sum(c.nbytes() for c in self.columns)
+
+
+# -- Compiled operations --------------------------------------------------------
+
+_FILTER_OPS = ("!=", ">=", "<=", ">", "<", "=")
+
+
+def compile_filter(expr: str):
+    """Compile 'col=val', 'col!=val', 'col>val', ... → function(table) → row indices.
+
+    Returns None when expr has no operator. Equality compares cell text;
+    ordering comparisons only match numeric cells.
+    """
+    for op in _FILTER_OPS:
+        if op in expr:
+            name, val = (part.strip() for part in expr.split(op, 1))
+            break
+    else:
+        return None
+
+    if op in ("=", "!="):
+
+        def select(table: Table) -> list[int]:
+            col = table.column(name)
+            if col is None:
+                matched = val == ""
+                return list(range(table.length)) if matched == (op == "=") else []
+            rows = col.equal_rows(val)
+            if op == "=":
+                return rows
+            keep = bytearray(b"\x01") * table.length
+            for i in rows:
+                keep[i] = 0
+            return list(compress(range(table.length), keep))
+
+        return select
+
+    try:
+        bound = float(val)
+    except ValueError:
+        return lambda table: []
+    # x > bound  ⇔  bound < x, etc.; NaN (non-numeric cells) compares False.
+    test = {">": bound.__lt__, "<": bound.__gt__, ">=": bound.__le__, "<=": bound.__ge__}[op]
+
+    def select(table: Table) -> list[int]:
+        col = table.column(name)
+        if col is None:
+            return []
+        return list(compress(range(table.length), map(test, col.numbers())))
+
+    return select
+
+
+def sort_rows(col: Column | None, rows: list[int], descending: bool) -> list[int]:
+    """Numbers first in numeric order, then other cells by text; stable."""
+    if col is None:
+        return rows
+    nums = col.numbers()
+    if col.kind in ("int", "float") and not col.overrides:
+        key = nums.__getitem__
+    else:
+
+        def key(i):
+            x = nums[i]
+            return (0, x) if x == x else (1, col.text(i))
+
+    return sorted(rows, key=key, reverse=descending)
+
+
+def group_rows(col: Column | None, length: int) -> tuple[array, list]:
+    """Hash rows by cell → (group code per row, group keys); missing cells group as "(empty)"."""
+    if col is None:
+        return array("i", bytes(4 * length)), ["(empty)"] * min(1, length)
+
+    index: dict = {}
+    keys: list = []
+    if col.kind == "dict":
+        remap = array("i")
+        for entry in col.entries:
+            key = "(empty)" if entry is MISSING else entry
+            if key not in index:
+                index[key] = len(keys)
+                keys.append(key)
+            remap.append(index[key])
+        return array("i", map(remap.__getitem__, col.codes)), keys
+
+    codes = array("i")
+    for i in range(length):
+        raw = col.raw(i)
+        key = "(empty)" if raw is MISSING else raw
+        code = index.get(key)
+        if code is None:
+            code = index[key] = len(keys)
+            keys.append(key)
+        codes.append(code)
+    return codes, keys
+
+
+def numeric_values(col: Column | None) -> list[float]:
+    if col is None:
+        return []
+    return [x for x in col.numbers() if x == x]
+
+
+def stdev(values: list[float], mean: float) -> float:
+    return math.sqrt(math.fsum((x - mean) ** 2 for x in values) / (len(values) - 1))
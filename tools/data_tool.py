@@ -1,8 +1,9 @@
 """
 Data tool — CSV/JSON processing, statistics, and visualization.
 
-Uses Python standard library only (csv, json, statistics).
+Uses Python standard library only (csv, json, statistics, array).
 Agents can load, query, transform, and visualize structured data.
+Datasets are held as typed columns (tools/data_columns.py).
 """
 
 import csv
@@ -10,9 +11,19 @@ import io
 import json
 import logging
 import statistics
-from collections import Counter, defaultdict
+from array import array
+from collections import Counter
 
 from tools.base import Tool, ToolResult
+from tools.data_columns import (
+    Column,
+    Table,
+    compile_filter,
+    group_rows,
+    numeric_values,
+    sort_rows,
+    stdev,
+)
 
 logger = logging.getLogger("frood.tools.data")
 
@@ -21,7 +32,7 @@ class DataTool(Tool):
     """Process structured data: load, query, stats, chart, transform, export."""
 
     def __init__(self):
-        self._datasets: dict[str, list[dict]] = {}
+        self._datasets: dict[str, Table] = {}
 
     @property
     def name(self) -> str:
@@ -137,27 +148,26 @@ class DataTool(Tool):
         if fmt == "json":
             parsed = json.loads(data_str)
             if isinstance(parsed, list):
-                rows = parsed
+                table = Table.from_records(parsed)
             elif isinstance(parsed, dict):
-                rows = [parsed]
+                table = Table.from_records([parsed])
             else:
                 return ToolResult(error="JSON must be an array or object", success=False)
         else:
-            reader = csv.DictReader(io.StringIO(data_str))
-            rows = list(reader)
+            table = Table.from_csv(data_str)
 
-        self._datasets[name] = rows
-        columns = list(rows[0].keys()) if rows else []
+        self._datasets[name] = table
+        columns = [f"{c.name} ({c.type_name})" for c in table.columns]
 
         return ToolResult(
             output=(
-                f"Dataset '{name}' loaded: {len(rows)} rows, "
+                f"Dataset '{name}' loaded: {table.length} rows, "
                 f"{len(columns)} columns\n"
                 f"Columns: {', '.join(columns)}"
             )
         )
 
-    def _get_dataset(self, kwargs: dict) -> tuple[str, list[dict]]:
+    def _get_dataset(self, kwargs: dict) -> tuple[str, Table]:
         name = kwargs.get("dataset", "default")
         if name not in self._datasets:
             raise ValueError(
@@ -167,67 +177,65 @@ class DataTool(Tool):
         return name, self._datasets[name]
 
     def _query(self, kwargs: dict) -> ToolResult:
-        name, rows = self._get_dataset(kwargs)
+        name, table = self._get_dataset(kwargs)
         filter_expr = kwargs.get("filter", "")
         sort_by = kwargs.get("sort_by", "")
         limit = kwargs.get("limit", 50)
 
-        result = list(rows)
+        selected = list(range(table.length))
 
         # Apply filter
         if filter_expr:
-            result = self._apply_filter(result, filter_expr)
+            selected = self._apply_filter(table, filter_expr)
 
         # Sort
         if sort_by:
             desc = sort_by.startswith("-")
             col = sort_by.lstrip("-")
-            result.sort(key=lambda r: self._sort_key(r.get(col, "")), reverse=desc)
+            selected = sort_rows(table.column(col), selected, desc)
 
         # Limit
-        result = result[:limit]
+        selected = selected[:limit]
 
-        if not result:
+        if not selected:
             return ToolResult(output=f"Query on '{name}': 0 rows matched.")
 
-        return ToolResult(output=self._rows_to_table(result, name, len(rows)))
+        rows = [table.text_row(i) for i in selected]
+        return ToolResult(output=self._rows_to_table(rows, name, table.length))
 
     def _stats(self, kwargs: dict) -> ToolResult:
-        name, rows = self._get_dataset(kwargs)
+        name, table = self._get_dataset(kwargs)
         column = kwargs.get("column", "")
 
         if not column:
             return ToolResult(error="column is required for stats", success=False)
 
-        values = [r.get(column, "") for r in rows]
-        numeric = []
-        for v in values:
-            try:
-                numeric.append(float(v))
-            except (ValueError, TypeError):
-                pass
+        col = table.column(column)
+        counts = self._value_counts(table, col)
+        numeric = numeric_values(col)
 
-        non_empty = [v for v in values if v]
-        unique = len(set(values))
+        non_empty = sum(n for v, n in counts.items() if v)
+        unique = len(counts)
 
         output = f"# Statistics: {name}.{column}\n\n"
         output += "| Metric | Value |\n|--------|-------|\n"
-        output += f"| Total rows | {len(values)} |\n"
-        output += f"| Non-empty | {len(non_empty)} |\n"
+        output += f"| Total rows | {table.length} |\n"
+        output += f"| Non-empty | {non_empty} |\n"
         output += f"| Unique values | {unique} |\n"
 
         if numeric:
+            mean = statistics.fmean(numeric)
             output += f"| Numeric values | {len(numeric)} |\n"
             output += f"| Min | {min(numeric):.4g} |\n"
             output += f"| Max | {max(numeric):.4g} |\n"
-            output += f"| Mean | {statistics.mean(numeric):.4g} |\n"
+            output += f"| Mean | {mean:.4g} |\n"
             output += f"| Median | {statistics.median(numeric):.4g} |\n"
             if len(numeric) >= 2:
-                output += f"| Std Dev | {statistics.stdev(numeric):.4g} |\n"
+                output += f"| Std Dev | {stdev(numeric, mean):.4g} |\n"
             output += f"| Sum | {sum(numeric):.4g} |\n"
         else:
             # For non-numeric, show top values
-            freq = Counter(values).most_common(10)
+            freq = counts.most_common(10)
             output += "\n## Top Values\n\n"
             output += "| Value | Count |\n|-------|-------|\n"
             for val, count in freq:
@@ -236,32 +244,27 @@ class DataTool(Tool):
         return ToolResult(output=output)
 
     def _chart(self, kwargs: dict) -> ToolResult:
-        name, rows = self._get_dataset(kwargs)
+        name, table = self._get_dataset(kwargs)
         column = kwargs.get("column", "")
 
         if not column:
             return ToolResult(error="column is required for chart", success=False)
 
-        values = [r.get(column, "") for r in rows]
+        col = table.column(column)
 
         # Try numeric chart first
-        numeric = []
-        for v in values:
-            try:
-                numeric.append(float(v))
-            except (ValueError, TypeError):
-                pass
+        numeric = numeric_values(col)
 
-        if len(numeric) > len(values) * 0.5:
+        if len(numeric) > table.length * 0.5:
             # Numeric histogram
             return ToolResult(output=self._ascii_histogram(numeric, column))
         else:
             # Category bar chart
-            freq = Counter(values).most_common(20)
-            return ToolResult(output=self._ascii_bar_chart(freq, column))
+            counts = self._value_counts(table, col)
+            return ToolResult(output=self._ascii_bar_chart(counts.most_common(20), column))
 
     def _transform(self, kwargs: dict) -> ToolResult:
-        name, rows = self._get_dataset(kwargs)
+        name, table = self._get_dataset(kwargs)
         group_by = kwargs.get("group_by", "")
         agg = kwargs.get("agg", "count")
         value_column = kwargs.get("value_column", "")
@@ -274,57 +277,81 @@ class DataTool(Tool):
                 success=False,
             )
 
-        groups: dict[str, list] = defaultdict(list)
-        for row in rows:
-            key = row.get(group_by, "(empty)")
-            if value_column:
-                try:
-                    groups[key].append(float(row.get(value_column, 0)))
-                except (ValueError, TypeError):
-                    pass
-            else:
-                groups[key].append(1)
+        codes, keys = group_rows(table.column(group_by), table.length)
+        results = self._aggregate(codes, len(keys), agg, table, value_column)
 
         result_rows = []
-        for key, vals in sorted(groups.items()):
-            if agg == "count":
-                result = len(vals)
-            elif agg == "sum":
-                result = sum(vals)
-            elif agg == "avg":
-                result = statistics.mean(vals) if vals else 0
-            elif agg == "min":
-                result = min(vals) if vals else 0
-            elif agg == "max":
-                result = max(vals) if vals else 0
-            else:
-                result = len(vals)
-
+        for g in sorted(range(len(keys)), key=keys.__getitem__):
+            result = results[g]
             result_rows.append(
                 {
-                    group_by: key,
+                    group_by: keys[g],
                     f"{agg}({value_column or '*'})": f"{result:.4g}"
                     if isinstance(result, float)
                     else str(result),
                 }
             )
 
-        return ToolResult(output=self._rows_to_table(result_rows, f"{name} grouped", len(rows)))
+        return ToolResult(output=self._rows_to_table(result_rows, f"{name} grouped", table.length))
+
+    @staticmethod
+    def _aggregate(codes, groups: int, agg: str, table: Table, value_column: str) -> list:
+        """One result per group; groups without numeric values yield 0.
+
+        Rows without the value column's key count as 0, like row.get(col, 0).
+        """
+        if not value_column:
+            counts = Counter(codes)
+            return [counts[g] for g in range(groups)]
+
+        col = table.column(value_column)
+        if col is None:
+            nums = array("d", bytes(8 * table.length))
+        else:
+            nums = col.numbers()
+            missing = col.missing_rows()
+            if missing:
+                nums = array("d", nums)
+                for i in missing:
+                    nums[i] = 0.0
+        counts = [0] * groups
+        if agg in ("min", "max"):
+            best: list = [None] * groups
+            better = (lambda x, b: x < b) if agg == "min" else (lambda x, b: x > b)
+            for g, x in zip(codes, nums):
+                if x == x:
+                    counts[g] += 1
+                    if best[g] is None or better(x, best[g]):
+                        best[g] = x
+            return [b if b is not None else 0 for b in best]
+
+        sums = [0.0] * groups
+        for g, x in zip(codes, nums):
+            if x == x:
+                counts[g] += 1
+                sums[g] += x
+        if agg == "sum":
+            return [sums[g] if counts[g] else 0 for g in range(groups)]
+        if agg == "avg":
+            return [sums[g] / counts[g] if counts[g] else 0 for g in range(groups)]
+        return counts
 
     def _export(self, kwargs: dict) -> ToolResult:
-        name, rows = self._get_dataset(kwargs)
+        name, table = self._get_dataset(kwargs)
         fmt = kwargs.get("format", "csv")
 
-        if not rows:
+        if not table.length:
             return ToolResult(output="(empty dataset)")
 
         if fmt == "json":
-            return ToolResult(output=json.dumps(rows, indent=2))
+            return ToolResult(
+                output=json.dumps([table.record(i) for i in range(table.length)], indent=2)
+            )
         else:
             output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=rows[0].keys())
-            writer.writeheader()
-            writer.writerows(rows)
+            writer = csv.writer(output, lineterminator="\r\n")
+            writer.writerow(table.names)
+            writer.writerows([c.text(i) for c in table.columns] for i in range(table.length))
             return ToolResult(output=output.getvalue())
 
     def _list_datasets(self) -> ToolResult:
@@ -332,56 +359,24 @@ class DataTool(Tool):
             return ToolResult(output="No datasets loaded.")
 
         lines = ["# Loaded Datasets\n"]
-        for name, rows in self._datasets.items():
-            cols = list(rows[0].keys()) if rows else []
+        for name, table in self._datasets.items():
+            cols = table.names
             lines.append(
-                f"- **{name}**: {len(rows)} rows, {len(cols)} columns "
-                f"({', '.join(cols[:5])}{'...' if len(cols) > 5 else ''})"
+                f"- **{name}**: {table.length} rows, {len(cols)} columns "
+                f"({', '.join(cols[:5])}{'...' if len(cols) > 5 else ''}), "
+                f"~{table.nbytes() / 1024:.0f} KB"
             )
         return ToolResult(output="\n".join(lines))
 
     # -- Helpers ---------------------------------------------------------------
 
     @staticmethod
-    def _apply_filter(rows: list[dict], expr: str) -> list[dict]:
-        """Simple filter: 'col=val', 'col>val', 'col<val', 'col!=val'."""
-        for op in ("!=", ">=", "<=", ">", "<", "="):
-            if op in expr:
-                parts = expr.split(op, 1)
-                col, val = parts[0].strip(), parts[1].strip()
-                break
-        else:
-            return rows
-
-        result = []
-        for row in rows:
-            cell = row.get(col, "")
-            try:
-                cell_num = float(cell)
-                val_num = float(val)
-                numeric = True
-            except (ValueError, TypeError):
-                cell_num = val_num = 0
-                numeric = False
-
-            if (
-                (op == "=" and cell == val)
-                or (op == "!=" and cell != val)
-                or (op == ">" and numeric and cell_num > val_num)
-                or (op == "<" and numeric and cell_num < val_num)
-                or (op == ">=" and numeric and cell_num >= val_num)
-                or (op == "<=" and numeric and cell_num <= val_num)
-            ):
-                result.append(row)
-
-        return result
-
-    @staticmethod
-    def _sort_key(val: str):
-        try:
-            return (0, float(val))
-        except (ValueError, TypeError):
-            return (1, val)
+    def _apply_filter(table: Table, expr: str) -> list[int]:
+        """Simple filter: 'col=val', 'col>val', 'col<val', 'col!=val' → matching row indices."""
+        select = compile_filter(expr)
+        if select is None:
+            return list(range(table.length))
+        return select(table)
 
     @staticmethod
     def _rows_to_table(rows: list[dict], title: str, total: int) -> str:
@@ -401,6 +396,13 @@ class DataTool(Tool):
 
         return "\n".join(lines)
 
+    @staticmethod
+    def _value_counts(table: Table, col: Column | None) -> Counter:
+        """Value counts of col; a missing column counts every row as empty."""
+        if col:
+            return col.value_counts()
+        return Counter({"": table.length}) if table.length else Counter()
+
     @staticmethod
     def _ascii_bar_chart(freq: list[tuple], label: str) -> str:
         if not freq:
@@ -1,27 +1,223 @@
 """
 File watcher tool — monitor files and directories for changes.
 
-Detects file modifications, creations, and deletions and can trigger
-actions on change.
+Detects file modifications, creations, deletions and renames and can
+trigger actions on change.
+
+A snapshot hashes the watched tree once. On Linux it also registers inotify
+watches (through ctypes, no extra dependency), so a later check only stats
+and re-hashes the paths the kernel reported as touched. Where inotify is
+unavailable, or its event queue overflowed, check falls back to an
+mtime/size index: every file is stat'ed, but only files whose stat changed
+are read. Either way the bytes read scale with what changed, not with the
+size of the tree.
 """
 
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
 import hashlib
 import logging
 import os
+import struct
+import sys
 import time
+from dataclasses import dataclass, field
 
 from tools.base import Tool, ToolResult
 
 logger = logging.getLogger("frood.tools.file_watcher")
 
+_DEFAULT_IGNORES = [".git", "node_modules", "__pycache__", ".venv", "venv"]
+
+# Wait for a burst of events to settle before evaluating them.
+DEBOUNCE_SECONDS = 0.1
+_MAX_DEBOUNCE_SECONDS = 2.0
+
+# A stat is only trusted if the file's mtime was at least this far in the past
+# when it was hashed; otherwise a same-size rewrite within one timestamp tick
+# would look unchanged ("racily clean", as git calls it).
+_RACY_WINDOW_NS = 1_000_000_000
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+    | _IN_DONT_FOLLOW
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # noqa: B018 — probe the symbol
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def inotify_available() -> bool:
+    return _libc is not None
+
+
+class _TreeNotifier:
+    """Recursive inotify watch over one directory tree.
+
+    drain() returns the relative paths touched since the last call and the
+    (old, new) pairs of completed renames. An overflowed queue, or a watch
+    limit hit while adding directories, marks the notifier unreliable and
+    the caller falls back to a stat scan.
+    """
+
+    def __init__(self, root: str, is_ignored):
+        self._root = root
+        self._is_ignored = is_ignored
+        self._fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._dirs: dict[int, str] = {}  # wd -> absolute directory path
+        self.reliable = True
+        self.last_event = 0.0
+        self._add_tree(root)
+
+    def _add_dir(self, path: str) -> None:
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                logger.warning("inotify watch limit reached — falling back to stat scans")
+                self.reliable = False
+            return
+        self._dirs[wd] = path
+
+    def _add_tree(self, top: str) -> list[str]:
+        """Watch top and its subdirectories; return the files found under it."""
+        files = []
+        for dirpath, dirs, filenames in os.walk(top):
+            dirs[:] = [d for d in dirs if not self._is_ignored(os.path.join(dirpath, d))]
+            self._add_dir(dirpath)
+            files.extend(os.path.join(dirpath, f) for f in filenames)
+        return files
+
+    def drain(self) -> tuple[set[str], list[tuple[str, str]], set[str]]:
+        """Read pending events → (touched files, renames, touched directories)."""
+        touched: set[str] = set()
+        dirs_gone: set[str] = set()
+        moved_from: dict[int, str] = {}
+        renames: list[tuple[str, str]] = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.reliable = False
+                break
+            if not data:
+                break
+            self.last_event = time.monotonic()
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    self.reliable = False
+                    continue
+                directory = self._dirs.get(wd)
+                if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF) and directory == self._root:
+                    # The root itself was removed or moved away; no parent watch
+                    # reports that, so only a stat scan can say what is left.
+                    self.reliable = False
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO) and not self._is_ignored(path):
+                        # New subtree: watch it and treat its files as touched.
+                        touched.update(self._add_tree(path))
+                    if mask & (_IN_DELETE | _IN_MOVED_FROM):
+                        dirs_gone.add(path)
+                    continue
+                if mask & _IN_MOVED_FROM:
+                    moved_from[cookie] = path
+                elif mask & _IN_MOVED_TO and cookie in moved_from:
+                    renames.append((moved_from.pop(cookie), path))
+                touched.add(path)
+        return touched, renames, dirs_gone
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+@dataclass
+class _Watch:
+    """A snapshot plus whatever is needed to find what changed since."""
+
+    target: str
+    ext_filter: set[str] | None
+    ignore: list[str]
+    timestamp: float
+    # rel path -> (mtime_ns, size, hash, hashed_at_ns) at snapshot time
+    index: dict[str, tuple[int, int, str, int]]
+    notifier: _TreeNotifier | None = None
+    # Paths reported changed since the snapshot (inotify mode)
+    dirty: set[str] = field(default_factory=set)
+    renames: list[tuple[str, str]] = field(default_factory=list)
+    # Latest known state of changed files, to avoid re-hashing on repeat checks
+    current: dict[str, tuple[int, int, str, int]] = field(default_factory=dict)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.notifier and self.notifier.reliable else "stat"
+
 
 class FileWatcherTool(Tool):
     """Watch files/directories for changes and report modifications."""
 
     def __init__(self, workspace_path: str = "."):
         self._workspace = workspace_path
-        self._snapshots: dict[str, dict[str, str]] = {}  # watch_id -> {path: hash}
-        self._watches: dict[str, dict] = {}  # watch_id -> config
+        self._watches: dict[str, _Watch] = {}
 
     @property
     def name(self) -> str:
@@ -31,7 +227,8 @@ class FileWatcherTool(Tool):
     def description(self) -> str:
         return (
             "Monitor files and directories for changes. Take a snapshot, then "
-            "check for modifications later. Reports added, modified, and deleted files."
+            "check for modifications later. Reports added, modified, deleted "
+            "and renamed files."
         )
 
     @property
@@ -41,8 +238,8 @@ class FileWatcherTool(Tool):
             "properties": {
                 "action": {
                     "type": "string",
-                    "enum": ["snapshot", "check", "diff", "list"],
-                    "description": "Watcher action: snapshot (save state), check (compare), diff (show changes), list (show watches)",
+                    "enum": ["snapshot", "check", "diff", "list", "stop"],
+                    "description": "Watcher action: snapshot (save state), check (compare), diff (show changes), list (show watches), stop (drop a watch)",
                 },
                 "watch_id": {
                     "type": "string",
@@ -59,6 +256,15 @@ class FileWatcherTool(Tool):
                     "description": "Comma-separated file extensions to watch (e.g., '.py,.js')",
                     "default": "",
                 },
+                "ignore": {
+                    "type": "string",
+                    "description": (
+                        "Comma-separated glob patterns to ignore, matched against relative "
+                        "paths and path components (e.g., '*.log,build'). .git, "
+                        "node_modules, __pycache__ and virtualenvs are always ignored."
+                    ),
+                    "default": "",
+                },
             },
             "required": ["action"],
         }
@@ -69,6 +275,7 @@ class FileWatcherTool(Tool):
         watch_id: str = "default",
         path: str = "",
         extensions: str = "",
+        ignore: str = "",
         **kwargs,
     ) -> ToolResult:
         if not action:
@@ -76,81 +283,200 @@ class FileWatcherTool(Tool):
 
         target = os.path.join(self._workspace, path) if path else self._workspace
         ext_filter = set(e.strip() for e in extensions.split(",")) if extensions else None
+        ignore_globs = _DEFAULT_IGNORES + [g.strip() for g in ignore.split(",") if g.strip()]
 
         if action == "snapshot":
-            return self._take_snapshot(watch_id, target, ext_filter)
-        elif action == "check":
-            return self._check_changes(watch_id, target, ext_filter)
-        elif action == "diff":
-            return self._show_diff(watch_id, target, ext_filter)
+            return await asyncio.to_thread(
+                self._take_snapshot, watch_id, target, ext_filter, ignore_globs
+            )
+        elif action in ("check", "diff"):
+            # diff is the same as check — a full diff would require storing file contents
+            return await self._check_changes(watch_id)
         elif action == "list":
             return self._list_watches()
+        elif action == "stop":
+            return self._stop_watch(watch_id)
         else:
             return ToolResult(error=f"Unknown action: {action}", success=False)
 
-    def _collect_hashes(self, target: str, ext_filter: set | None) -> dict[str, str]:
-        """Collect file hashes for the target path."""
-        hashes = {}
-        skip_dirs = {".git", "node_modules", "__pycache__", ".venv", "venv"}
-
-        if os.path.isfile(target):
-            hashes[target] = self._file_hash(target)
-            return hashes
-
-        for root, dirs, files in os.walk(target):
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-            for fname in files:
-                if ext_filter:
-                    ext = os.path.splitext(fname)[1]
-                    if ext not in ext_filter:
-                        continue
-                full = os.path.join(root, fname)
-                try:
-                    rel = os.path.relpath(full, self._workspace)
-                except ValueError:
-                    rel = full
-                hashes[rel] = self._file_hash(full)
-        return hashes
+    # -- Filtering ------------------------------------------------------------
+
+    def _rel(self, full: str) -> str:
+        try:
+            return os.path.relpath(full, self._workspace)
+        except ValueError:
+            return full
+
+    @staticmethod
+    def _ignored(rel: str, globs: list[str]) -> bool:
+        parts = rel.replace(os.sep, "/").split("/")
+        for pattern in globs:
+            if fnmatch.fnmatch(rel, pattern) or any(fnmatch.fnmatch(p, pattern) for p in parts):
+                return True
+        return False
+
+    def _wanted(self, watch: _Watch, rel: str) -> bool:
+        if watch.ext_filter and os.path.splitext(rel)[1] not in watch.ext_filter:
+            return False
+        return not self._ignored(rel, watch.ignore)
+
+    # -- Stat / hash ------------------------------------------------------------
 
     @staticmethod
     def _file_hash(filepath: str) -> str:
         try:
             h = hashlib.md5(usedforsecurity=False)  # nosec B324
             with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
+                for chunk in iter(lambda: f.read(65536), b""):
                     h.update(chunk)
             return h.hexdigest()
         except (OSError, PermissionError):
             return "error"
 
-    def _take_snapshot(self, watch_id: str, target: str, ext_filter: set | None) -> ToolResult:
-        hashes = self._collect_hashes(target, ext_filter)
-        self._snapshots[watch_id] = hashes
-        self._watches[watch_id] = {
-            "target": target,
-            "ext_filter": list(ext_filter) if ext_filter else None,
-            "timestamp": time.time(),
-            "file_count": len(hashes),
-        }
+    def _stat_tree(self, watch: _Watch) -> dict[str, tuple[int, int]]:
+        """rel path -> (mtime_ns, size) for every watched file (no reads)."""
+        stats: dict[str, tuple[int, int]] = {}
+        if os.path.isfile(watch.target):
+            candidates = [watch.target]
+        else:
+            candidates = []
+            for root, dirs, files in os.walk(watch.target):
+                dirs[:] = [
+                    d
+                    for d in dirs
+                    if not self._ignored(self._rel(os.path.join(root, d)), watch.ignore)
+                ]
+                candidates.extend(os.path.join(root, f) for f in files)
+        for full in candidates:
+            rel = self._rel(full)
+            if not self._wanted(watch, rel):
+                continue
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            stats[rel] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def _hashed(self, rel: str, stat: tuple[int, int]) -> tuple[int, int, str, int]:
+        return (*stat, self._file_hash(os.path.join(self._workspace, rel)), time.time_ns())
+
+    def _state(self, watch: _Watch, rel: str, stat: tuple[int, int]) -> tuple[int, int, str, int]:
+        """Current (mtime_ns, size, hash, hashed_at), hashing only if the stat is new."""
+        for known in (watch.current.get(rel), watch.index.get(rel)):
+            if known and known[:2] == stat and known[0] + _RACY_WINDOW_NS < known[3]:
+                return known
+        state = self._hashed(rel, stat)
+        watch.current[rel] = state
+        return state
+
+    # -- Actions ----------------------------------------------------------------
+
+    def _take_snapshot(
+        self, watch_id: str, target: str, ext_filter: set | None, ignore: list[str]
+    ) -> ToolResult:
+        self._stop_watch(watch_id)
+        watch = _Watch(
+            target=target, ext_filter=ext_filter, ignore=ignore, timestamp=time.time(), index={}
+        )
+        if inotify_available() and os.path.isdir(target):
+            try:
+                watch.notifier = _TreeNotifier(
+                    target, lambda full: self._ignored(self._rel(full), ignore)
+                )
+            except OSError as e:
+                logger.info(f"inotify unavailable for '{watch_id}' ({e}) — using stat scans")
+        # Hash after the watches exist so nothing written in between is missed.
+        for rel, stat in self._stat_tree(watch).items():
+            watch.index[rel] = self._hashed(rel, stat)
+        self._watches[watch_id] = watch
         return ToolResult(
-            output=f"Snapshot '{watch_id}' taken: {len(hashes)} files tracked.",
+            output=f"Snapshot '{watch_id}' taken: {len(watch.index)} files tracked ({watch.mode}).",
             success=True,
         )
 
-    def _check_changes(self, watch_id: str, target: str, ext_filter: set | None) -> ToolResult:
-        if watch_id not in self._snapshots:
+    def _absorb(self, watch: _Watch) -> None:
+        """Drain pending inotify events into watch.dirty and watch.renames."""
+        touched, renames, dirs_gone = watch.notifier.drain()
+        watch.dirty.update(self._rel(p) for p in touched)
+        watch.renames.extend((self._rel(a), self._rel(b)) for a, b in renames)
+        for gone in dirs_gone:
+            prefix = self._rel(gone) + os.sep
+            watch.dirty.update(r for r in watch.index if r.startswith(prefix))
+            watch.dirty.update(r for r in watch.current if r.startswith(prefix))
+
+    async def _settle(self, watch: _Watch) -> None:
+        """Drain inotify events, waiting until a burst has been quiet for DEBOUNCE_SECONDS."""
+        notifier = watch.notifier
+        deadline = time.monotonic() + _MAX_DEBOUNCE_SECONDS
+        while True:
+            # Reading the queue and watching new subtrees (os.walk) block.
+            await asyncio.to_thread(self._absorb, watch)
+            if not notifier.reliable:
+                return
+            quiet_for = time.monotonic() - notifier.last_event
+            if quiet_for >= DEBOUNCE_SECONDS or time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(DEBOUNCE_SECONDS - quiet_for)
+
+    def _evaluate(self, watch: _Watch) -> tuple[set[str], set[str], set[str], list]:
+        """Compare the current state of candidate paths with the snapshot."""
+        current: dict[str, tuple[int, int]] = {}
+        if watch.mode == "inotify":
+            candidates = watch.dirty
+            for rel in candidates:
+                if not self._wanted(watch, rel):
+                    continue
+                try:
+                    st = os.stat(os.path.join(self._workspace, rel))
+                except OSError:
+                    continue
+                current[rel] = (st.st_mtime_ns, st.st_size)
+        else:
+            current = self._stat_tree(watch)
+            candidates = set(current) | set(watch.index)
+
+        added, modified, deleted = set(), set(), set()
+        for rel in candidates:
+            if rel in current:
+                state = self._state(watch, rel, current[rel])
+                old = watch.index.get(rel)
+                if old is None:
+                    if self._wanted(watch, rel):
+                        added.add(rel)
+                elif old[2] != state[2]:
+                    modified.add(rel)
+            elif rel in watch.index:
+                deleted.add(rel)
+
+        # Collapse rename pairs: kernel-reported moves first, then content matches.
+        renamed = []
+        for old_rel, new_rel in watch.renames:
+            if old_rel in deleted and new_rel in added:
+                deleted.discard(old_rel)
+                added.discard(new_rel)
+                renamed.append((old_rel, new_rel))
+        by_hash = {watch.index[r][2]: r for r in deleted if watch.index[r][2] != "error"}
+        for rel in sorted(added):
+            old_rel = by_hash.pop(watch.current[rel][2], None)
+            if old_rel is not None:
+                deleted.discard(old_rel)
+                added.discard(rel)
+                renamed.append((old_rel, rel))
+        return added, modified, deleted, renamed
+
+    async def _check_changes(self, watch_id: str) -> ToolResult:
+        watch = self._watches.get(watch_id)
+        if watch is None:
             return ToolResult(
                 error=f"No snapshot found for '{watch_id}'. Take a snapshot first.", success=False
             )
 
-        old = self._snapshots[watch_id]
-        current = self._collect_hashes(target, ext_filter)
+        if watch.mode == "inotify":
+            await self._settle(watch)
+        added, modified, deleted, renamed = await asyncio.to_thread(self._evaluate, watch)
 
-        added = set(current.keys()) - set(old.keys())
-        deleted = set(old.keys()) - set(current.keys())
-        modified = {f for f in set(current.keys()) & set(old.keys()) if current[f] != old[f]}
-
-        if not added and not deleted and not modified:
+        if not added and not deleted and not modified and not renamed:
             return ToolResult(
                 output=f"No changes detected since snapshot '{watch_id}'.", success=True
             )
@@ -171,24 +497,35 @@ class FileWatcherTool(Tool):
             for f in sorted(deleted)[:50]:
                 lines.append(f"  - {f}")
             lines.append("")
+        if renamed:
+            lines.append(f"### Renamed ({len(renamed)})")
+            for old_rel, new_rel in sorted(renamed)[:50]:
+                lines.append(f"  > {old_rel} -> {new_rel}")
+            lines.append("")
 
         lines.append(
             f"**Total:** {len(added)} added, {len(modified)} modified, {len(deleted)} deleted"
+            + (f", {len(renamed)} renamed" if renamed else "")
         )
         return ToolResult(output="\n".join(lines), success=True)
 
-    def _show_diff(self, watch_id: str, target: str, ext_filter: set | None) -> ToolResult:
-        """Same as check but with file content diffs for modified files."""
-        # Delegate to check for now — full diff would require storing file contents
-        return self._check_changes(watch_id, target, ext_filter)
+    def _stop_watch(self, watch_id: str) -> ToolResult:
+        watch = self._watches.pop(watch_id, None)
+        if watch is None:
+            return ToolResult(error=f"No watch named '{watch_id}'.", success=False)
+        if watch.notifier:
+            watch.notifier.close()
+        return ToolResult(output=f"Watch '{watch_id}' stopped.", success=True)
 
     def _list_watches(self) -> ToolResult:
         if not self._watches:
             return ToolResult(output="No active watches.", success=True)
 
         lines = ["## Active Watches\n"]
-        for wid, config in self._watches.items():
-            age = time.time() - config["timestamp"]
+        for wid, watch in self._watches.items():
+            age = time.time() - watch.timestamp
             age_str = f"{age:.0f}s ago" if age < 120 else f"{age / 60:.0f}m ago"
-            lines.append(f"- **{wid}**: {config['file_count']} files, snapshot {age_str}")
+            lines.append(
+                f"- **{wid}**: {len(watch.index)} files, snapshot {age_str} ({watch.mode})"
+            )
         return ToolResult(output="\n".join(lines), success=True)
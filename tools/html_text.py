@@ -0,0 +1,217 @@
+"""
+Streaming HTML-to-text extraction for WebFetchTool.
+
+Pages are fed to HTMLTextExtractor as they download. Scripts, styles,
+navigation, footers, sidebars, forms and other page chrome are dropped,
+block elements become line breaks, and extraction stops once the text
+budget is filled — so the budget holds page content, not markup, and the
+rest of a large page need not be downloaded at all.
+"""
+
+import re
+from html.parser import HTMLParser
+
+# Elements whose whole subtree is never content.
+_SKIP = frozenset(
+    {
+        "script",
+        "style",
+        "noscript",
+        "template",
+        "svg",
+        "canvas",
+        "iframe",
+        "object",
+        "nav",
+        "footer",
+        "aside",
+        "form",
+        "button",
+        "select",
+        "dialog",
+    }
+)
+# ARIA landmarks that mark page chrome on generic elements.
+_SKIP_ROLES = frozenset(
+    {"navigation", "banner", "contentinfo", "complementary", "search", "menu", "menubar"}
+)
+_CONTENT = frozenset({"main", "article"})
+_BLOCK = frozenset(
+    {
+        "p",
+        "div",
+        "section",
+        "article",
+        "main",
+        "header",
+        "table",
+        "tr",
+        "ul",
+        "ol",
+        "dl",
+        "dt",
+        "dd",
+        "blockquote",
+        "figure",
+        "figcaption",
+        "details",
+        "summary",
+        "hr",
+        "br",
+    }
+)
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_VOID = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+_SPACES = re.compile(r"[ \t\r\f\v\n]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+# Raw text kept beyond the budget so whitespace cleanup cannot leave it short.
+_SLACK = 4096
+
+
+def is_html(content_type: str, head: str) -> bool:
+    """Whether a response should go through the extractor."""
+    if "html" in content_type.lower():
+        return True
+    if content_type and not content_type.lower().startswith("text/plain"):
+        return False
+    return head.lstrip()[:15].lower().startswith(("<!doctype html", "<html"))
+
+
+class HTMLTextExtractor(HTMLParser):
+    """Incremental HTML → readable text with a character budget.
+
+    feed() chunks as they arrive and stop once ``full`` is set; text()
+    returns at most ``limit`` characters, with ``truncated`` recording
+    whether anything was cut.
+    """
+
+    def __init__(self, limit: int = 50_000):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.title = ""
+        self.full = False
+        self.truncated = False
+        self._parts: list[str] = []
+        self._size = 0
+        self._skip_tag: str | None = None
+        self._skip_depth = 0
+        self._content_depth = 0
+        self._pre = 0
+        self._in_title = False
+        self._title: list[str] = []
+
+    def _emit(self, text: str) -> None:
+        if self.full:
+            return
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.limit + _SLACK:
+            self.full = True
+
+    def _skips(self, tag: str, attrs) -> bool:
+        if tag in _SKIP:
+            return True
+        if tag == "header" and not self._content_depth:
+            return True
+        for name, value in attrs:
+            if name == "role" and value and value.lower() in _SKIP_ROLES:
+                return True
+            if name == "hidden" or (name == "aria-hidden" and value == "true"):
+                return True
+        return False
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag not in _VOID and self._skips(tag, attrs):
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag in _CONTENT:
+            self._content_depth += 1
+        if tag == "pre":
+            self._pre += 1
+            self._emit("\n\n")
+        elif tag in _HEADINGS:
+            self._emit("\n\n" + "#" * _HEADINGS[tag] + " ")
+        elif tag == "li":
+            self._emit("\n- ")
+        elif tag in ("td", "th"):
+            self._emit(" | ")
+        elif tag in _BLOCK:
+            self._emit("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag == "title":
+            self._in_title = False
+            self.title = _SPACES.sub(" ", "".join(self._title)).strip()
+            return
+        if tag in _CONTENT and self._content_depth:
+            self._content_depth -= 1
+        if tag == "pre" and self._pre:
+            self._pre -= 1
+            self._emit("\n\n")
+        elif tag in _HEADINGS or tag == "p":
+            self._emit("\n\n")
+        elif tag in _BLOCK:
+            self._emit("\n")
+
+    def handle_data(self, data):
+        if self._skip_tag is not None:
+            return
+        if self._in_title:
+            self._title.append(data)
+        elif self._pre:
+            self._emit(data)
+        else:
+            self._emit(_SPACES.sub(" ", data))
+
+    def text(self) -> str:
+        """The extracted text so far, cleaned up and cut to the budget."""
+        # Collapsed text leaves at most one leading space; deeper indents are <pre>.
+        lines = [
+            line[1:] if line[:1] == " " and line[1:2] != " " else line
+            for line in "".join(self._parts).split("\n")
+        ]
+        body = _BLANK_LINES.sub("\n\n", "\n".join(line.rstrip() for line in lines)).strip()
+        if self.title and not body.startswith(f"# {self.title}"):
+            body = f"{self.title}\n\n{body}" if body else self.title
+        if len(body) > self.limit:
+            self.truncated = True
+            body = body[: self.limit]
+        elif self.full:
+            self.truncated = True
+        return body
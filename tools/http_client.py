@@ -6,10 +6,13 @@ Includes SSRF protection (blocks private/internal IPs).
 """
 
 import asyncio
+import http.client
 import json
 import logging
 import re
+import socket
 import time
+import urllib.request
 from urllib.parse import urlparse
 
 from tools.base import Tool, ToolResult
@@ -40,8 +43,94 @@ try:
 except ImportError:
     _url_policy = None
 
+from core.url_policy import resolve_host, resolve_host_sync
 from tools.domain_cooldown import cooldown_error, is_cooling, record_429
 
+# -- Connections pinned to SSRF-checked addresses ------------------------------
+#
+# Every connection — including those made while following redirects — resolves
+# its host through url_policy and connects to the addresses that passed the
+# SSRF check, so DNS cannot be rebound to an internal address between the
+# policy check and the connect.
+
+
+def _pinned_create_connection(address, timeout=None, source_address=None):
+    """socket.create_connection that only dials checked addresses."""
+    host, port = address
+    resolution = resolve_host_sync(host, port)
+    if resolution.reason:
+        raise OSError(resolution.reason)
+    if not resolution.addresses:
+        # Never fall back to resolving the name again unchecked: a rebinding
+        # server could answer the second lookup with an internal address.
+        raise OSError(f"Cannot resolve {host}")
+    error: OSError | None = None
+    for ip in resolution.addresses:
+        try:
+            return socket.create_connection((ip, port), timeout, source_address)
+        except OSError as e:
+            error = e
+    raise error
+
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _pinned_create_connection
+
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _pinned_create_connection
+
+
+class _PinnedHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PinnedHTTPConnection, req)
+
+
+class _PinnedHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PinnedHTTPSConnection, req, context=self._context)
+
+
+def _urlopen(req, timeout: float):
+    """urlopen with pinned connections; with a proxy configured the proxy resolves."""
+    if urllib.request.getproxies():
+        return urllib.request.urlopen(req, timeout=timeout)  # nosec B310
+    opener = urllib.request.build_opener(_PinnedHTTPHandler, _PinnedHTTPSHandler)
+    return opener.open(req, timeout=timeout)  # nosec B310
+
+
+def _pinned_resolver():
+    """aiohttp resolver that hands the connector checked addresses only."""
+    from aiohttp.abc import AbstractResolver
+
+    class PinnedResolver(AbstractResolver):
+        async def resolve(self, host, port=0, family=socket.AF_INET):
+            resolution = await resolve_host(host, port)
+            if resolution.reason:
+                raise OSError(resolution.reason)
+            if not resolution.addresses:
+                raise OSError(f"Cannot resolve {host}")
+            return [
+                {
+                    "hostname": host,
+                    "host": ip,
+                    "port": port,
+                    "family": socket.AF_INET6 if ":" in ip else socket.AF_INET,
+                    "proto": 0,
+                    "flags": socket.AI_NUMERICHOST,
+                }
+                for ip in resolution.addresses
+            ]
+
+        async def close(self):
+            pass
+
+    return PinnedResolver()
+
 
 class HttpClientTool(Tool):
     """Make HTTP API requests with structured response handling."""
@@ -145,7 +234,9 @@ class HttpClientTool(Tool):
 
         # URL policy check (SSRF + allowlist/denylist + per-agent limits)
         if _url_policy:
-            allowed, reason = _url_policy.check(url, agent_id=kwargs.get("agent_id", "default"))
+            allowed, reason = await _url_policy.check_async(
+                url, agent_id=kwargs.get("agent_id", "default")
+            )
             if not allowed:
                 return ToolResult(error=f"Blocked: {reason}", success=False)
 
@@ -192,7 +283,8 @@ class HttpClientTool(Tool):
 
         start = time.monotonic()
         try:
-            async with aiohttp.ClientSession() as session:
+            connector = aiohttp.TCPConnector(resolver=_pinned_resolver())
+            async with aiohttp.ClientSession(connector=connector) as session:
                 async with session.request(method, url, **req_kwargs) as resp:
                     elapsed = time.monotonic() - start
                     if resp.status == 429:
@@ -242,7 +334,6 @@ class HttpClientTool(Tool):
     ) -> ToolResult:
         """Fallback using urllib (no aiohttp dependency)."""
         import urllib.error
-        import urllib.request
 
         headers = headers or {}
 
@@ -261,7 +352,7 @@ class HttpClientTool(Tool):
             resp = await asyncio.wait_for(
                 loop.run_in_executor(
                     None,
-                    lambda: urllib.request.urlopen(req, timeout=timeout),  # nosec B310
+                    lambda: _urlopen(req, timeout),
                 ),
                 timeout=timeout + 5,
             )
@@ -0,0 +1,382 @@
+"""
+BM25 inverted index for the knowledge base.
+
+Chunks produced by knowledge_tool._chunk_text are indexed as they are
+imported, so keyword queries no longer open every chunk file. Everything
+lives in one SQLite file (<knowledge_dir>/bm25.db):
+
+- chunks    — chunk id, owning document, chunk index, token count and text
+- postings  — one row per term: document frequency, score-bound statistics
+              and a compact posting list (varint-encoded chunk-id deltas and
+              term frequencies, in chunk-id order)
+- stats     — corpus totals for the BM25 length normalisation
+
+New chunks get increasing ids, so imports append to posting lists without
+decoding them; deletes rewrite only the postings of the removed chunks'
+terms. Queries run WAND over the posting lists: each term carries an
+upper bound on its score contribution, and chunks that cannot beat the
+current top-k threshold are skipped without being scored.
+"""
+
+import heapq
+import logging
+import math
+import string
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.sqlite_db import open_db
+
+logger = logging.getLogger("frood.tools.knowledge_index")
+
+K1 = 1.2
+B = 0.75
+
+_STRIP = string.punctuation + "“”‘’«»…"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc TEXT NOT NULL,
+    name TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks(doc);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL,
+    max_tf INTEGER NOT NULL,
+    min_len INTEGER NOT NULL,
+    last_id INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    """Whitespace tokens, as _chunk_text splits them, lowercased and edge-punctuation stripped."""
+    tokens = []
+    for word in text.lower().split():
+        word = word.strip(_STRIP)
+        if word:
+            tokens.append(word)
+    return tokens
+
+
+# -- Posting list encoding ------------------------------------------------------
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _encode(pairs: list[tuple[int, int]], prev: int = 0) -> bytes:
+    out = bytearray()
+    for chunk_id, tf in pairs:
+        _put_varint(out, chunk_id - prev)
+        _put_varint(out, tf)
+        prev = chunk_id
+    return bytes(out)
+
+
+def _decode(data: bytes) -> tuple[list[int], list[int]]:
+    ids: list[int] = []
+    tfs: list[int] = []
+    value = shift = 0
+    prev = 0
+    want_id = True
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        if want_id:
+            prev += value
+            ids.append(prev)
+        else:
+            tfs.append(value)
+        want_id = not want_id
+        value = shift = 0
+    return ids, tfs
+
+
+@dataclass
+class Hit:
+    """A ranked chunk."""
+
+    doc: str
+    name: str
+    chunk_index: int
+    text: str
+    score: float
+
+
+class _Cursor:
+    """Iterator over one term's posting list with skip-to support."""
+
+    __slots__ = ("bound", "idf", "ids", "pos", "tfs")
+
+    def __init__(self, ids: list[int], tfs: list[int], idf: float, bound: float):
+        self.ids = ids
+        self.tfs = tfs
+        self.pos = 0
+        self.idf = idf
+        self.bound = bound
+
+    @property
+    def doc(self) -> int | None:
+        return self.ids[self.pos] if self.pos < len(self.ids) else None
+
+    def seek(self, target: int) -> None:
+        self.pos = bisect_left(self.ids, target, self.pos)
+
+
+class BM25Index:
+    """Persistent BM25 index over knowledge-base chunks."""
+
+    def __init__(self, db_path: str | Path):
+        self._db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = open_db(self._db_path, _SCHEMA)
+
+    # -- Stats ------------------------------------------------------------------
+
+    def _stat(self, key: str) -> int:
+        row = self._conn.execute("SELECT value FROM stats WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump(self, chunks: int, tokens: int) -> None:
+        for key, delta in (("chunks", chunks), ("tokens", tokens)):
+            self._conn.execute(
+                "INSERT INTO stats VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                (key, delta),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._stat("chunks")
+
+    def documents(self) -> set[str]:
+        with self._lock:
+            return {r[0] for r in self._conn.execute("SELECT DISTINCT doc FROM chunks")}
+
+    # -- Updates ----------------------------------------------------------------
+
+    def replace_document(self, doc: str, name: str, chunks: list[str]) -> None:
+        """Index a document's chunks, replacing any earlier version of it."""
+        self.add_chunks(doc, name, 0, chunks)
+
+    def add_chunks(self, doc: str, name: str, start: int, chunks: list[str]) -> None:
+        """Index chunks start, start+1, ... of a document.
+
+        Chunks already indexed at those positions or later are replaced, so a
+        document can be indexed batch by batch and a batch can be retried.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._remove(doc, start)
+                per_term: dict[str, list[tuple[int, int, int]]] = {}
+                total = 0
+                for i, text in enumerate(chunks, start):
+                    tokens = tokenize(text)
+                    cur = self._conn.execute(
+                        "INSERT INTO chunks (doc, name, chunk_index, length, text) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (doc, name, i, len(tokens), text),
+                    )
+                    total += len(tokens)
+                    for term, tf in Counter(tokens).items():
+                        per_term.setdefault(term, []).append((cur.lastrowid, tf, len(tokens)))
+                for term, entries in per_term.items():
+                    self._append(term, entries)
+                self._bump(len(chunks), total)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _append(self, term: str, entries: list[tuple[int, int, int]]) -> None:
+        row = self._conn.execute(
+            "SELECT df, max_tf, min_len, last_id, data FROM postings WHERE term = ?", (term,)
+        ).fetchone()
+        pairs = [(cid, tf) for cid, tf, _ in entries]
+        max_tf = max(tf for _, tf, _ in entries)
+        min_len = min(length for _, _, length in entries)
+        if row is None:
+            self._conn.execute(
+                "INSERT INTO postings VALUES (?, ?, ?, ?, ?, ?)",
+                (term, len(pairs), max_tf, min_len, pairs[-1][0], _encode(pairs)),
+            )
+            return
+        df, old_max, old_min, last_id, data = row
+        self._conn.execute(
+            "UPDATE postings SET df = ?, max_tf = ?, min_len = ?, last_id = ?, data = ? "
+            "WHERE term = ?",
+            (
+                df + len(pairs),
+                max(old_max, max_tf),
+                min(old_min, min_len),
+                pairs[-1][0],
+                data + _encode(pairs, prev=last_id),
+                term,
+            ),
+        )
+
+    def remove_document(self, doc: str) -> int:
+        """Drop a document's chunks from the index. Returns how many were removed."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                removed = self._remove(doc)
+                self._conn.execute("COMMIT")
+                return removed
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _remove(self, doc: str, start: int = 0) -> int:
+        rows = self._conn.execute(
+            "SELECT id, length, text FROM chunks WHERE doc = ? AND chunk_index >= ?", (doc, start)
+        ).fetchall()
+        if not rows:
+            return 0
+        gone = {r[0] for r in rows}
+        terms = set()
+        for _, _, text in rows:
+            terms.update(tokenize(text))
+        for term in terms:
+            row = self._conn.execute(
+                "SELECT min_len, data FROM postings WHERE term = ?", (term,)
+            ).fetchone()
+            if row is None:
+                continue
+            ids, tfs = _decode(row[1])
+            kept = [(cid, tf) for cid, tf in zip(ids, tfs) if cid not in gone]
+            if not kept:
+                self._conn.execute("DELETE FROM postings WHERE term = ?", (term,))
+                continue
+            # min_len stays as is: still a valid (if looser) lower bound.
+            self._conn.execute(
+                "UPDATE postings SET df = ?, max_tf = ?, last_id = ?, data = ? WHERE term = ?",
+                (len(kept), max(tf for _, tf in kept), kept[-1][0], _encode(kept), term),
+            )
+        self._conn.execute("DELETE FROM chunks WHERE doc = ? AND chunk_index >= ?", (doc, start))
+        self._bump(-len(rows), -sum(r[1] for r in rows))
+        return len(rows)
+
+    # -- Retrieval --------------------------------------------------------------
+
+    def search(self, query: str, top_k: int = 5) -> list[Hit]:
+        """Top-k chunks by BM25 score, best first."""
+        with self._lock:
+            return self._search(query, top_k)
+
+    def _search(self, query: str, top_k: int) -> list[Hit]:
+        terms = set(tokenize(query))
+        n_chunks = self._stat("chunks")
+        if not terms or n_chunks <= 0 or top_k <= 0:
+            return []
+        avgdl = max(self._stat("tokens") / n_chunks, 1e-9)
+
+        cursors = []
+        for term in terms:
+            row = self._conn.execute(
+                "SELECT df, max_tf, min_len, data FROM postings WHERE term = ?", (term,)
+            ).fetchone()
+            if row is None:
+                continue
+            df, max_tf, min_len, data = row
+            idf = math.log(1 + (n_chunks - df + 0.5) / (df + 0.5))
+            # BM25 grows with tf and shrinks with length, so this bounds every posting.
+            norm = K1 * (1 - B + B * min_len / avgdl)
+            bound = idf * max_tf * (K1 + 1) / (max_tf + norm)
+            ids, tfs = _decode(data)
+            cursors.append(_Cursor(ids, tfs, idf, bound))
+
+        lengths: dict[int, int] = {}
+
+        def length_of(chunk_id: int) -> int:
+            if chunk_id not in lengths:
+                row = self._conn.execute(
+                    "SELECT length FROM chunks WHERE id = ?", (chunk_id,)
+                ).fetchone()
+                lengths[chunk_id] = row[0] if row else 0
+            return lengths[chunk_id]
+
+        heap: list[tuple[float, int]] = []
+        while True:
+            cursors = [c for c in cursors if c.doc is not None]
+            if not cursors:
+                break
+            cursors.sort(key=lambda c: c.doc)
+            threshold = heap[0][0] if len(heap) >= top_k else 0.0
+
+            # Pivot: first cursor at which the summed bounds could beat the threshold.
+            acc = 0.0
+            pivot = None
+            for i, c in enumerate(cursors):
+                acc += c.bound
+                if acc > threshold:
+                    pivot = i
+                    break
+            if pivot is None:
+                break
+            pivot_doc = cursors[pivot].doc
+
+            if cursors[0].doc == pivot_doc:
+                dl = length_of(pivot_doc)
+                norm = K1 * (1 - B + B * dl / avgdl)
+                score = 0.0
+                for c in cursors:
+                    if c.doc != pivot_doc:
+                        break
+                    tf = c.tfs[c.pos]
+                    score += c.idf * tf * (K1 + 1) / (tf + norm)
+                    c.pos += 1
+                if len(heap) < top_k:
+                    heapq.heappush(heap, (score, pivot_doc))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, pivot_doc))
+            else:
+                # Nothing before the pivot can reach the threshold on its own.
+                for c in cursors[:pivot]:
+                    c.seek(pivot_doc)
+
+        hits = []
+        for score, chunk_id in sorted(heap, key=lambda x: (-x[0], x[1])):
+            row = self._conn.execute(
+                "SELECT doc, name, chunk_index, text FROM chunks WHERE id = ?", (chunk_id,)
+            ).fetchone()
+            if row:
+                hits.append(Hit(row[0], row[1], row[2], row[3], score))
+        return hits
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def reciprocal_rank_fusion(rankings: list[list[tuple]], k: int = 60) -> list[tuple[tuple, float]]:
+    """Fuse several best-first rankings of hashable keys → [(key, fused score)], best first.
+
+    Rank-based, so BM25 and cosine scores need no common scale.
+    """
+    fused: dict[tuple, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda kv: -kv[1])
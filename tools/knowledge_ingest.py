@@ -0,0 +1,373 @@
+"""
+Knowledge ingestion pipeline — parse, chunk, embed and upsert as concurrent stages.
+
+KnowledgeTool hands a batch of files to IngestPipeline, which runs:
+
+    parse   documents are read on a process pool; PDFs a few pages per task,
+            so a large file never has to be held in memory as one string
+    chunk   page text is cut into the same chunks _chunk_text would produce,
+            by StreamingChunker, as it arrives
+    embed   chunks from all files are embedded in fixed-size batches
+    upsert  each embedded batch is written to the embedding store and the
+            BM25 index, and the per-file progress is checkpointed
+
+Stages are connected by bounded queues, so a slow embedding API holds back
+parsing instead of letting chunks pile up. The checkpoint
+(<knowledge_dir>/import_progress.json) records how many chunks of each file
+have been stored; an interrupted import resumes after them.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger("frood.tools.knowledge_ingest")
+
+# PDF pages extracted per parse task.
+PDF_PAGES_PER_TASK = 8
+
+_parse_pool: ProcessPoolExecutor | None = None
+_parse_pool_size = 0
+
+
+def get_parse_pool(workers: int) -> Executor | None:
+    """Shared process pool for document parsing; None means use threads."""
+    global _parse_pool, _parse_pool_size
+    if workers <= 1:
+        return None
+    if _parse_pool is None or _parse_pool_size != workers:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            _parse_pool = ProcessPoolExecutor(max_workers=workers)
+            _parse_pool_size = workers
+        except (OSError, NotImplementedError) as e:
+            logger.info("Process pool unavailable, parsing on threads: %s", e)
+            _parse_pool = None
+            return None
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+atexit.register(shutdown_parse_pool)
+
+
+def file_hash(path: str | Path) -> str:
+    """SHA-256 of a file's bytes, truncated like the content checksums."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+class StreamingChunker:
+    """Incremental equivalent of knowledge_tool._chunk_text.
+
+    feed() text as it is extracted and flush() at the end; the chunks are
+    the ones _chunk_text would return for the whole text.
+    """
+
+    def __init__(self, chunk_size: int = 500, overlap: int = 50):
+        self._size = max(1, int(chunk_size / 0.75))
+        self._step = max(1, self._size - max(0, int(overlap / 0.75)))
+        self._words: list[str] = []
+
+    def feed(self, text: str) -> list[str]:
+        self._words.extend(text.split())
+        chunks = []
+        while len(self._words) >= self._size:
+            chunks.append(" ".join(self._words[: self._size]))
+            del self._words[: self._step]
+        return chunks
+
+    def flush(self) -> list[str]:
+        chunks = []
+        while self._words:
+            chunks.append(" ".join(self._words[: self._size]))
+            del self._words[: self._step]
+        return chunks
+
+
+class ImportProgress:
+    """Per-file count of chunks already stored, persisted after every batch."""
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._entries: dict[str, dict] = {}
+        if self._path.exists():
+            try:
+                self._entries = json.loads(self._path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable import checkpoint: {e}")
+
+    def resume_point(self, key: str, source_hash: str) -> int:
+        """Chunks of this file version stored by an earlier, interrupted run."""
+        entry = self._entries.get(key)
+        if entry and entry.get("source_hash") == source_hash:
+            return int(entry.get("stored", 0))
+        return 0
+
+    def update(self, key: str, source_hash: str, stored: int) -> None:
+        self._entries[key] = {"source_hash": source_hash, "stored": stored}
+
+    def discard(self, keys) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def save(self) -> None:
+        if not self._entries:
+            self._path.unlink(missing_ok=True)
+            return
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._entries), encoding="utf-8")
+        os.replace(tmp, self._path)
+
+
+@dataclass
+class IngestFile:
+    """One document moving through the pipeline."""
+
+    key: str  # path as the caller named it; DocumentMeta.file_path
+    path: Path
+    source_hash: str
+    resume_from: int = 0
+    checksum: str = ""
+    chunk_count: int = 0
+    stored: int = 0
+    error: str = ""
+    discarded: int = 0  # chunks removed again after the parse failed part-way
+
+
+@dataclass
+class IngestReport:
+    chunks: int
+    seconds: float
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds > 0 else 0.0
+
+
+class IngestPipeline:
+    """Streams files through parse → chunk → embed → upsert.
+
+    reader(path, first_page, max_pages) → (segments, more) runs on the
+    executor and must be picklable for a process pool. embedding_store may
+    be None, in which case only the BM25 index is written.
+    """
+
+    def __init__(
+        self,
+        reader: Callable[[str, int, int], tuple[list[str], bool]],
+        bm25,
+        progress: ImportProgress,
+        embedding_store=None,
+        chunk_size: int = 500,
+        overlap: int = 50,
+        workers: int = 4,
+        batch_size: int = 64,
+        executor: Executor | None = None,
+    ):
+        self._reader = reader
+        self._bm25 = bm25
+        self._progress = progress
+        self._store = embedding_store
+        self._chunk_size = chunk_size
+        self._overlap = overlap
+        self._workers = max(1, workers)
+        self._batch_size = max(1, batch_size)
+        self._executor = executor
+
+    async def run(self, files: list[IngestFile]) -> IngestReport:
+        """Ingest files; per-file failures land in IngestFile.error.
+
+        Embedding or storage failures abort the run and propagate; what was
+        stored before them is checkpointed.
+        """
+        started = time.monotonic()
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=4 * self._batch_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=2)
+        parse_slots = asyncio.Semaphore(self._workers)
+
+        producers = [asyncio.create_task(self._produce(f, chunks, parse_slots)) for f in files]
+        embedder = asyncio.create_task(self._embed(chunks, batches))
+        upserter = asyncio.create_task(self._upsert(batches))
+        tasks = [*producers, embedder, upserter]
+        try:
+            await self._wait(producers, [embedder, upserter])
+            end = asyncio.create_task(chunks.put(None))
+            tasks.append(end)
+            await self._wait([end, embedder, upserter], [])
+        except Exception:
+            # If embedding failed, the upsert stage still stores what was embedded.
+            drain = embedder.done() and not upserter.done()
+            for task in tasks:
+                if not (drain and task is upserter):
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.to_thread(self._discard_failed, files)
+            raise
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self._progress.save()
+        await asyncio.to_thread(self._discard_failed, files)
+
+        stored = sum(f.stored - f.resume_from for f in files if f.stored > f.resume_from)
+        return IngestReport(chunks=stored, seconds=time.monotonic() - started)
+
+    def _discard_failed(self, files: list[IngestFile]) -> None:
+        """Remove the chunks already stored for files whose parse failed part-way.
+
+        They would otherwise stay searchable without a DocumentMeta.
+        """
+        discarded = []
+        for f in files:
+            if not f.error or f.stored == 0:
+                continue
+            try:
+                self._bm25.remove_document(f.key)
+                if self._store is not None:
+                    self._store.remove_entries("knowledge", f.key)
+            except Exception as e:
+                logger.error(f"Could not remove partial import of {f.path}: {e}")
+                continue
+            f.discarded, f.stored = f.stored, 0
+            discarded.append(f.key)
+        if discarded:
+            self._progress.discard(discarded)
+            self._progress.save()
+
+    @staticmethod
+    async def _wait(tasks: list[asyncio.Task], watch: list[asyncio.Task]) -> None:
+        """Wait for tasks, re-raising the first failure among them or the watched stages."""
+        pending = set(tasks) | set(watch)
+        while not all(task.done() for task in tasks):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+
+    async def _segments(self, path: Path):
+        """Extracted text of a file, a page range at a time, reading one range ahead."""
+        loop = asyncio.get_running_loop()
+        first = 0
+        pending = loop.run_in_executor(
+            self._executor, self._reader, str(path), first, PDF_PAGES_PER_TASK
+        )
+        while True:
+            segments, more = await pending
+            if more:
+                first += PDF_PAGES_PER_TASK
+                pending = loop.run_in_executor(
+                    self._executor, self._reader, str(path), first, PDF_PAGES_PER_TASK
+                )
+            for segment in segments:
+                yield segment
+            if not more:
+                return
+
+    async def _produce(self, f: IngestFile, out: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        chunker = StreamingChunker(self._chunk_size, self._overlap)
+        hasher = hashlib.sha256()
+        index = 0
+        first = True
+        f.stored = max(f.stored, f.resume_from)
+
+        async def emit(texts: list[str]) -> None:
+            nonlocal index
+            for text in texts:
+                if index >= f.resume_from:
+                    await out.put((f, index, text))
+                index += 1
+
+        async with slots:
+            try:
+                async for segment in self._segments(f.path):
+                    hasher.update((segment if first else "\n\n" + segment).encode("utf-8"))
+                    first = False
+                    await emit(chunker.feed(segment))
+            except Exception as e:
+                logger.warning(f"Failed to parse {f.path}: {e}")
+                f.error = f"Failed to read {f.path.name}: {e}"
+                return
+        await emit(chunker.flush())
+        f.checksum = hasher.hexdigest()[:16]
+        f.chunk_count = index
+        if index == 0:
+            f.error = f"Empty content in {f.path.name}"
+
+    async def _embed(self, chunks: asyncio.Queue, out: asyncio.Queue) -> None:
+        batch: list = []
+        while True:
+            item = await chunks.get()
+            if item is not None:
+                batch.append(item)
+            if batch and (item is None or len(batch) >= self._batch_size):
+                vectors = None
+                if self._store is not None:
+                    try:
+                        vectors = await self._store.embed_texts([text for _, _, text in batch])
+                    except Exception:
+                        await out.put(None)
+                        raise
+                await out.put((batch, vectors))
+                batch = []
+            if item is None:
+                await out.put(None)
+                return
+
+    async def _upsert(self, batches: asyncio.Queue) -> None:
+        while True:
+            item = await batches.get()
+            if item is None:
+                return
+            batch, vectors = item
+            if self._store is not None:
+                await self._store.add_entries(
+                    [
+                        {
+                            "text": text,
+                            "source": "knowledge",
+                            "section": f.path.name,
+                            "metadata": {
+                                "file_path": f.key,
+                                "file_name": f.path.name,
+                                "file_type": f.path.suffix.lower(),
+                                "chunk_index": index,
+                            },
+                        }
+                        for f, index, text in batch
+                    ],
+                    vectors=vectors,
+                )
+
+            # Chunks of one file are contiguous and in order within a batch.
+            runs: list[tuple[IngestFile, int, list[str]]] = []
+            for f, index, text in batch:
+                if runs and runs[-1][0] is f:
+                    runs[-1][2].append(text)
+                else:
+                    runs.append((f, index, [text]))
+            for f, start, texts in runs:
+                await asyncio.to_thread(self._bm25.add_chunks, f.key, f.path.name, start, texts)
+                f.stored = start + len(texts)
+                self._progress.update(f.key, f.source_hash, f.stored)
+            await asyncio.to_thread(self._progress.save)
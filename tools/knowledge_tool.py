@@ -3,7 +3,11 @@ Knowledge base tool — document import and RAG-powered retrieval.
 
 Enables agents to import documents (PDF, CSV, HTML, Markdown, text, JSON)
 into a vector store and query them via semantic search. Builds on the
-existing EmbeddingStore and Qdrant infrastructure.
+existing EmbeddingStore and Qdrant infrastructure. Every imported chunk is
+also indexed in a persistent BM25 index (tools/knowledge_index.py), which
+serves keyword search when embeddings are unavailable and is fused with
+vector results when they are. Imports stream through the parse → chunk →
+embed → upsert pipeline in tools/knowledge_ingest.py.
 
 Usage flow:
 1. import_file / import_dir — ingest documents into the knowledge base
@@ -12,6 +16,7 @@ Usage flow:
 4. delete — remove a document from the knowledge base
 """
 
+import asyncio
 import csv
 import hashlib
 import io
@@ -22,11 +27,18 @@ from dataclasses import asdict, dataclass, field
 from html.parser import HTMLParser
 from pathlib import Path
 
-import aiofiles
-
 from core.config import settings
 from core.sandbox import WorkspaceSandbox
 from tools.base import Tool, ToolResult
+from tools.knowledge_index import BM25Index, reciprocal_rank_fusion
+from tools.knowledge_ingest import (
+    ImportProgress,
+    IngestFile,
+    IngestPipeline,
+    IngestReport,
+    file_hash,
+    get_parse_pool,
+)
 
 logger = logging.getLogger("frood.tools.knowledge")
 
@@ -44,6 +56,7 @@ class DocumentMeta:
     checksum: str
     chunk_count: int
     imported_at: float = field(default_factory=time.time)
+    source_hash: str = ""  # hash of the file's bytes; empty for older imports
 
 
 class _HTMLTextExtractor(HTMLParser):
@@ -103,11 +116,69 @@ def _chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> list[str
     return chunks
 
 
+def _csv_to_text(content: str) -> str:
+    """Format CSV rows as "header: value" lines."""
+    rows = list(csv.reader(io.StringIO(content)))
+    if not rows:
+        return ""
+
+    headers = rows[0]
+    text_parts = []
+    for row in rows[1:]:
+        parts = [f"{h}: {v}" for h, v in zip(headers, row) if v.strip()]
+        text_parts.append("; ".join(parts))
+
+    return "\n".join(text_parts)
+
+
+def _read_document(
+    path: str, first_page: int = 0, max_pages: int | None = None
+) -> tuple[list[str], bool]:
+    """Extract text from a supported file → (segments, more).
+
+    PDFs yield the non-empty pages from first_page, at most max_pages of them,
+    and whether pages remain; other files yield their whole text as one
+    segment. Runs on the ingestion parse pool, so it must stay module-level.
+    """
+    file = Path(path)
+    suffix = file.suffix.lower()
+
+    if suffix == ".pdf":
+        try:
+            import pypdf
+        except ImportError:
+            return [f"[PDF import requires pypdf: pip install pypdf] ({file.name})"], False
+
+        reader = pypdf.PdfReader(path)
+        total = len(reader.pages)
+        stop = total if max_pages is None else min(total, first_page + max_pages)
+        pages = []
+        for i in range(first_page, stop):
+            text = reader.pages[i].extract_text()
+            if text:
+                pages.append(text)
+        return pages, stop < total
+
+    if first_page:
+        return [], False
+    content = file.read_text(encoding="utf-8", errors="replace")
+    if suffix == ".csv":
+        return [_csv_to_text(content)], False
+    if suffix in (".html", ".htm"):
+        return [_extract_html_text(content)], False
+    # .txt, .md, .json — plain text
+    return [content], False
+
+
 def _checksum(content: str) -> str:
     """Compute SHA-256 checksum of content."""
     return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
 
 
+def _interrupted(error: Exception) -> str:
+    return f"Import interrupted: {error}. Progress was saved; run the same import again to resume."
+
+
 class KnowledgeTool(Tool):
     """Import documents and query a knowledge base via semantic search.
 
@@ -126,6 +197,8 @@ class KnowledgeTool(Tool):
         self._knowledge_dir.mkdir(parents=True, exist_ok=True)
         self._index_path = self._knowledge_dir / "index.json"
         self._documents: dict[str, DocumentMeta] = {}
+        self._bm25: BM25Index | None = None
+        self._bm25_lock = asyncio.Lock()
         self._load_index()
 
     @property
@@ -167,6 +240,39 @@ class KnowledgeTool(Tool):
             "required": ["action"],
         }
 
+    async def _keyword_index(self) -> BM25Index:
+        """Keyword index, opened on first use in a worker thread."""
+        async with self._bm25_lock:
+            if self._bm25 is None:
+                self._bm25 = await asyncio.to_thread(self._open_bm25)
+        return self._bm25
+
+    def _open_bm25(self) -> BM25Index:
+        """Open bm25.db, backfilling documents imported before it existed.
+
+        Those documents only have chunk_*.txt files under a directory named
+        after the file's stem, which documents with the same stem share.
+        Every document is backfilled under its own full path before the
+        directories are renamed to ``<stem>.migrated``.
+        """
+        index = BM25Index(self._knowledge_dir / "bm25.db")
+        indexed = index.documents()
+        legacy_dirs: set[Path] = set()
+        for doc in list(self._documents.values()):
+            chunk_dir = self._knowledge_dir / Path(doc.file_name).stem
+            if doc.file_path in indexed or not chunk_dir.is_dir():
+                continue
+            chunk_files = sorted(chunk_dir.glob("chunk_*.txt"))[: doc.chunk_count]
+            chunks = [p.read_text(encoding="utf-8", errors="replace") for p in chunk_files]
+            index.replace_document(doc.file_path, doc.file_name, chunks)
+            legacy_dirs.add(chunk_dir)
+        for chunk_dir in legacy_dirs:
+            try:
+                chunk_dir.rename(chunk_dir.with_name(f"{chunk_dir.name}.migrated"))
+            except OSError as e:
+                logger.warning(f"Could not rename migrated chunk dir {chunk_dir}: {e}")
+        return index
+
     def _load_index(self):
         """Load document index from disk."""
         if not self._index_path.exists():
@@ -190,127 +296,119 @@ class KnowledgeTool(Tool):
         except Exception as e:
             logger.error(f"Failed to save knowledge index: {e}")
 
-    async def _read_file(self, path: Path) -> str:
-        """Read and extract text from a supported file."""
-        suffix = path.suffix.lower()
-
-        if suffix == ".pdf":
-            return await self._read_pdf(path)
-        elif suffix == ".csv":
-            return await self._read_csv(path)
-        elif suffix in (".html", ".htm"):
-            async with aiofiles.open(path, encoding="utf-8", errors="replace") as f:
-                html = await f.read()
-            return _extract_html_text(html)
-        else:
-            # .txt, .md, .json — read as plain text
-            async with aiofiles.open(path, encoding="utf-8", errors="replace") as f:
-                return await f.read()
-
-    async def _read_pdf(self, path: Path) -> str:
-        """Extract text from a PDF file."""
-        try:
-            import pypdf
-        except ImportError:
-            return f"[PDF import requires pypdf: pip install pypdf] ({path.name})"
+    async def _import_files(
+        self, file_paths: list[str]
+    ) -> tuple[list[tuple[str, int]], IngestReport | None]:
+        """Import files through the ingestion pipeline.
 
-        reader = pypdf.PdfReader(str(path))
-        pages = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                pages.append(text)
-        return "\n\n".join(pages)
+        Returns a (status_message, chunk_count) pair per path, in order, and
+        the pipeline report (None when nothing needed importing). Pipeline
+        failures propagate after finished documents have been recorded.
+        """
+        results: dict[str, tuple[str, int]] = {}
+        progress = ImportProgress(self._knowledge_dir / "import_progress.json")
+        jobs: list[IngestFile] = []
+
+        for file_path in file_paths:
+            try:
+                resolved = self._sandbox.resolve_path(file_path)
+            except Exception as e:
+                results[file_path] = (f"Path blocked by sandbox: {e}", 0)
+                continue
 
-    async def _read_csv(self, path: Path) -> str:
-        """Read CSV and format as text with headers."""
-        async with aiofiles.open(path, encoding="utf-8", errors="replace") as f:
-            content = await f.read()
+            path = Path(resolved)
+            if not path.exists():
+                results[file_path] = (f"File not found: {file_path}", 0)
+                continue
+            if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                results[file_path] = (f"Unsupported file type: {path.suffix}", 0)
+                continue
 
-        reader = csv.reader(io.StringIO(content))
-        rows = list(reader)
-        if not rows:
-            return ""
+            # Skip unchanged files; older entries only carry a content checksum
+            source_hash = await asyncio.to_thread(file_hash, path)
+            existing = self._documents.get(file_path)
+            if existing and not existing.source_hash:
+                segments, _ = await asyncio.to_thread(_read_document, str(path))
+                if _checksum("\n\n".join(segments)) == existing.checksum:
+                    existing.source_hash = source_hash
+            if existing and existing.source_hash == source_hash:
+                results[file_path] = (
+                    f"Already imported (unchanged): {path.name}",
+                    existing.chunk_count,
+                )
+                continue
 
-        headers = rows[0]
-        text_parts = []
-        for row in rows[1:]:
-            parts = [f"{h}: {v}" for h, v in zip(headers, row) if v.strip()]
-            text_parts.append("; ".join(parts))
+            jobs.append(
+                IngestFile(
+                    key=file_path,
+                    path=path,
+                    source_hash=source_hash,
+                    resume_from=progress.resume_point(file_path, source_hash),
+                )
+            )
 
-        return "\n".join(text_parts)
+        report = None
+        if jobs:
+            workers = max(1, int(settings.knowledge_import_workers))
+            store = self._embedding_store
+            pipeline = IngestPipeline(
+                _read_document,
+                await self._keyword_index(),
+                progress,
+                embedding_store=store if store and store.is_available else None,
+                chunk_size=settings.knowledge_chunk_size,
+                overlap=settings.knowledge_chunk_overlap,
+                workers=workers,
+                batch_size=int(settings.knowledge_embed_batch_size),
+                executor=get_parse_pool(workers),
+            )
+            try:
+                report = await pipeline.run(jobs)
+            finally:
+                self._record_imports(jobs, progress)
+            logger.info(
+                f"Imported {report.chunks} chunks in {report.seconds:.1f}s "
+                f"({report.chunks_per_second:.1f} chunks/s)"
+            )
 
-    async def _import_single_file(self, file_path: str) -> tuple[str, int]:
-        """Import a single file. Returns (status_message, chunk_count)."""
-        try:
-            resolved = self._sandbox.resolve_path(file_path)
-        except Exception as e:
-            return f"Path blocked by sandbox: {e}", 0
-
-        path = Path(resolved)
-        if not path.exists():
-            return f"File not found: {file_path}", 0
-        if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            return f"Unsupported file type: {path.suffix}", 0
-
-        # Read and extract text
-        content = await self._read_file(path)
-        if not content.strip():
-            return f"Empty content in {path.name}", 0
-
-        # Check if already imported with same content
-        checksum = _checksum(content)
-        existing = self._documents.get(file_path)
-        if existing and existing.checksum == checksum:
-            return f"Already imported (unchanged): {path.name}", existing.chunk_count
-
-        # Chunk the text
-        chunks = _chunk_text(
-            content,
-            chunk_size=settings.knowledge_chunk_size,
-            overlap=settings.knowledge_chunk_overlap,
-        )
+        for job in jobs:
+            if job.error:
+                results[job.key] = (job.error, 0)
+            else:
+                results[job.key] = (
+                    f"Imported {job.path.name}: {job.chunk_count} chunks",
+                    job.chunk_count,
+                )
+        return [results[p] for p in file_paths], report
 
-        if not chunks:
-            return f"No content to index in {path.name}", 0
+    def _record_imports(self, jobs: list[IngestFile], progress: ImportProgress) -> None:
+        """Add fully stored documents to the index and drop their checkpoints.
 
-        # Store embeddings
-        if self._embedding_store and self._embedding_store.is_available:
-            items = [
-                {
-                    "text": chunk,
-                    "source": "knowledge",
-                    "section": path.name,
-                    "metadata": {
-                        "file_path": file_path,
-                        "file_name": path.name,
-                        "file_type": path.suffix.lower(),
-                        "chunk_index": i,
-                    },
-                }
-                for i, chunk in enumerate(chunks)
-            ]
-            await self._embedding_store.add_entries(items)
-        else:
-            # Fallback: store chunks as text files in knowledge dir
-            chunk_dir = self._knowledge_dir / path.stem
-            chunk_dir.mkdir(parents=True, exist_ok=True)
-            for i, chunk in enumerate(chunks):
-                chunk_path = chunk_dir / f"chunk_{i:04d}.txt"
-                async with aiofiles.open(chunk_path, "w", encoding="utf-8") as f:
-                    await f.write(chunk)
-
-        # Update index
-        self._documents[file_path] = DocumentMeta(
-            file_path=file_path,
-            file_name=path.name,
-            file_type=path.suffix.lower(),
-            checksum=checksum,
-            chunk_count=len(chunks),
-        )
+        A document whose re-import failed after its chunks were replaced is
+        dropped from the index: the pipeline removed its chunks.
+        """
+        finished = [
+            job for job in jobs if not job.error and job.checksum and job.stored >= job.chunk_count
+        ]
+        dropped = [job.key for job in jobs if job.discarded and job.key in self._documents]
+        for key in dropped:
+            del self._documents[key]
+        if not finished:
+            if dropped:
+                self._save_index()
+            return
+        for job in finished:
+            self._documents[job.key] = DocumentMeta(
+                file_path=job.key,
+                file_name=job.path.name,
+                file_type=job.path.suffix.lower(),
+                checksum=job.checksum,
+                chunk_count=job.chunk_count,
+                source_hash=job.source_hash,
+            )
         self._save_index()
-
-        return f"Imported {path.name}: {len(chunks)} chunks", len(chunks)
+        progress.discard(job.key for job in finished)
+        progress.save()
 
     async def execute(self, action: str = "", **kwargs) -> ToolResult:
         if action == "import_file":
@@ -329,7 +427,10 @@ class KnowledgeTool(Tool):
         if not path:
             return ToolResult(error="Path is required for import_file", success=False)
 
-        msg, count = await self._import_single_file(path)
+        try:
+            [(msg, count)], _ = await self._import_files([path])
+        except Exception as e:
+            return ToolResult(error=_interrupted(e), success=False)
         return ToolResult(output=msg, success=count > 0 or "unchanged" in msg.lower())
 
     async def _action_import_dir(self, path: str = "", **kwargs) -> ToolResult:
@@ -345,22 +446,32 @@ class KnowledgeTool(Tool):
         if not dir_path.is_dir():
             return ToolResult(error=f"Not a directory: {path}", success=False)
 
-        results = []
-        total_chunks = 0
-        for file_path in sorted(dir_path.rglob("*")):
-            if file_path.suffix.lower() in SUPPORTED_EXTENSIONS:
-                msg, count = await self._import_single_file(str(file_path))
-                results.append(msg)
-                total_chunks += count
-
-        if not results:
+        knowledge_dir = self._knowledge_dir.resolve()
+        file_paths = [
+            str(file_path)
+            for file_path in sorted(dir_path.rglob("*"))
+            if file_path.suffix.lower() in SUPPORTED_EXTENSIONS
+            and not file_path.resolve().is_relative_to(knowledge_dir)
+        ]
+        if not file_paths:
             return ToolResult(
                 output=f"No supported files found in {path}. "
                 f"Supported: {', '.join(sorted(SUPPORTED_EXTENSIONS))}"
             )
 
+        try:
+            results, report = await self._import_files(file_paths)
+        except Exception as e:
+            return ToolResult(error=_interrupted(e), success=False)
+
+        total_chunks = sum(count for _, count in results)
         summary = f"Imported {len(results)} files ({total_chunks} total chunks):\n"
-        summary += "\n".join(f"  - {r}" for r in results)
+        summary += "\n".join(f"  - {msg}" for msg, _ in results)
+        if report and report.chunks:
+            summary += (
+                f"\n\nThroughput: {report.chunks} chunks in {report.seconds:.1f}s "
+                f"({report.chunks_per_second:.1f} chunks/s)"
+            )
         return ToolResult(output=summary)
 
     async def _action_query(self, query: str = "", top_k: int = 5, **kwargs) -> ToolResult:
@@ -376,6 +487,7 @@ class KnowledgeTool(Tool):
                 top_k=top_k,
                 source_filter="knowledge",
             )
+            results = await self._fuse_keyword_hits(query, results or [], top_k)
 
             if not results:
                 return ToolResult(output="No results found in knowledge base.")
@@ -384,9 +496,11 @@ class KnowledgeTool(Tool):
             full_texts = []
             for i, r in enumerate(results, 1):
                 source = r.get("metadata", {}).get("file_name", r.get("section", "unknown"))
-                score = r.get("score", 0)
+                # Vector similarity; keyword-only hits from the fusion have none.
+                score = r.get("score")
+                label = f"{score:.3f}" if score is not None else "keyword"
                 text = r.get("text", "")
-                lines.append(f"[{i}] ({score:.3f}) {source}\n    {text[:300]}\n")
+                lines.append(f"[{i}] ({label}) {source}\n    {text[:300]}\n")
                 full_texts.append(text)
 
             # RLM enhancement: if combined results are large, process through
@@ -403,6 +517,45 @@ class KnowledgeTool(Tool):
         # Fallback: simple text search across stored chunks
         return await self._fallback_search(query, top_k)
 
+    async def _fuse_keyword_hits(self, query: str, results: list[dict], top_k: int) -> list[dict]:
+        """Merge BM25 hits into vector results by reciprocal rank fusion.
+
+        Results are matched on (file_path, chunk_index) and ordered by the
+        fused score (fused_score). Vector results keep their similarity as
+        score; keyword-only hits have none.
+        """
+        index = await self._keyword_index()
+        hits = await asyncio.to_thread(index.search, query, top_k)
+        if not hits:
+            return results
+
+        by_key: dict[tuple, dict] = {}
+        vector_rank = []
+        for r in results:
+            meta = r.get("metadata", {})
+            key = (meta.get("file_path"), meta.get("chunk_index"))
+            by_key.setdefault(key, r)
+            vector_rank.append(key)
+        keyword_rank = []
+        for hit in hits:
+            key = (hit.doc, hit.chunk_index)
+            by_key.setdefault(
+                key,
+                {
+                    "text": hit.text,
+                    "section": hit.name,
+                    "metadata": {
+                        "file_path": hit.doc,
+                        "file_name": hit.name,
+                        "chunk_index": hit.chunk_index,
+                    },
+                },
+            )
+            keyword_rank.append(key)
+
+        fused = reciprocal_rank_fusion([vector_rank, keyword_rank])
+        return [{**by_key[key], "fused_score": score} for key, score in fused[:top_k]]
+
     async def _try_rlm_synthesis(self, query: str, combined_text: str) -> str | None:
         """Attempt RLM synthesis of large knowledge results.
 
@@ -428,35 +581,16 @@ class KnowledgeTool(Tool):
         return None
 
     async def _fallback_search(self, query: str, top_k: int) -> ToolResult:
-        """Simple keyword search when no embedding API is available."""
-        query_words = set(query.lower().split())
-        scored = []
+        """BM25 keyword search when no embedding API is available."""
+        index = await self._keyword_index()
+        hits = await asyncio.to_thread(index.search, query, top_k)
 
-        for doc in self._documents.values():
-            chunk_dir = self._knowledge_dir / Path(doc.file_name).stem
-            if not chunk_dir.exists():
-                continue
-            for chunk_path in sorted(chunk_dir.glob("chunk_*.txt")):
-                try:
-                    async with aiofiles.open(chunk_path, encoding="utf-8") as f:
-                        chunk_text = await f.read()
-                    # Simple word overlap scoring
-                    chunk_words = set(chunk_text.lower().split())
-                    overlap = len(query_words & chunk_words)
-                    if overlap > 0:
-                        score = overlap / len(query_words)
-                        scored.append((score, doc.file_name, chunk_text[:300]))
-                except Exception:
-                    continue
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-
-        if not scored:
+        if not hits:
             return ToolResult(output="No results found in knowledge base.")
 
-        lines = [f"Found {min(len(scored), top_k)} results (keyword search):\n"]
-        for i, (score, source, text) in enumerate(scored[:top_k], 1):
-            lines.append(f"[{i}] ({score:.2f}) {source}\n    {text}\n")
+        lines = [f"Found {len(hits)} results (keyword search):\n"]
+        for i, hit in enumerate(hits, 1):
+            lines.append(f"[{i}] ({hit.score:.2f}) {hit.name}\n    {hit.text[:300]}\n")
 
         return ToolResult(output="\n".join(lines))
 
@@ -492,12 +626,8 @@ class KnowledgeTool(Tool):
         if not doc:
             return ToolResult(error=f"Document not found: {path}", success=False)
 
-        # Clean up chunk files
-        chunk_dir = self._knowledge_dir / Path(doc.file_name).stem
-        if chunk_dir.exists():
-            import shutil
-
-            shutil.rmtree(chunk_dir, ignore_errors=True)
+        index = await self._keyword_index()
+        await asyncio.to_thread(index.remove_document, doc.file_path)
 
         self._save_index()
         logger.info(f"Deleted knowledge document: {doc.file_name}")
@@ -0,0 +1,227 @@
+"""
+Lazy tools — registry entries that defer importing and building the real tool.
+
+A ``LazyTool`` carries a tool's name, description and parameter schema, so a
+registry holding it can list and describe the tool without importing its
+module. The module is imported and the tool constructed (off the event loop)
+on the first ``execute``, or ahead of time by ``warm_up``.
+
+Schemas come from a ``ToolSchemaCache`` on disk, fingerprinted by the tool
+module's source file and the newest source file beside it in its package. A
+cache miss — first run, or the module or a sibling changed — means the tool
+is built once at startup to read its schema, exactly as an eager registry
+would.
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from tools.base import Tool, ToolResult
+
+logger = logging.getLogger("frood.tools.lazy")
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Where a tool lives and how to construct it.
+
+    ``build`` receives the imported tool class and returns the instance, so
+    constructor arguments (workspace, shared backends) stay with the caller.
+    """
+
+    module: str
+    class_name: str
+    build: Callable[[type], Tool]
+
+    @property
+    def key(self) -> str:
+        return f"{self.module}:{self.class_name}"
+
+    def load(self) -> Tool:
+        cls = getattr(importlib.import_module(self.module), self.class_name)
+        return self.build(cls)
+
+    def fingerprint(self, dir_stamps: dict[str, int] | None = None) -> str:
+        """Identity of the module source, found without importing the module.
+
+        Tool modules lean on helpers from their own package (``tools.base``
+        and the like), so the newest source file in the module's directory
+        is part of the identity. ``dir_stamps`` memoizes that per directory
+        across a batch of specs.
+        """
+        try:
+            spec = importlib.util.find_spec(self.module)
+            origin = spec.origin if spec else None
+            if not origin:
+                return ""
+            stat = os.stat(origin)
+            directory = os.path.dirname(origin)
+            if dir_stamps is None:
+                dir_stamps = {}
+            if directory not in dir_stamps:
+                dir_stamps[directory] = _newest_source_mtime(directory)
+            return f"{origin}:{stat.st_mtime_ns}:{stat.st_size}:{dir_stamps[directory]}"
+        except (ImportError, OSError, ValueError):
+            return ""
+
+
+def _newest_source_mtime(directory: str) -> int:
+    with os.scandir(directory) as entries:
+        return max(
+            (e.stat().st_mtime_ns for e in entries if e.name.endswith(".py") and e.is_file()),
+            default=0,
+        )
+
+
+def tool_schema(tool: Tool) -> dict:
+    return {"name": tool.name, "description": tool.description, "parameters": tool.parameters}
+
+
+class ToolSchemaCache:
+    """JSON file of tool schemas keyed by ToolSpec.key, checked by fingerprint."""
+
+    def __init__(self, path: Path | str):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._entries: dict[str, dict] = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, spec: ToolSpec, fingerprint: str) -> dict | None:
+        entry = self._entries.get(spec.key)
+        if entry and fingerprint and entry.get("fingerprint") == fingerprint:
+            return entry.get("schema")
+        return None
+
+    def put(self, spec: ToolSpec, fingerprint: str, schema: dict):
+        with self._lock:
+            entry = {"fingerprint": fingerprint, "schema": schema}
+            if self._entries.get(spec.key) != entry:
+                self._entries[spec.key] = entry
+                self._dirty = True
+
+    def save(self):
+        """Write the file if anything changed since it was loaded."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self._path.with_name(self._path.name + ".tmp")
+                tmp.write_text(json.dumps(self._entries, indent=1), encoding="utf-8")
+                os.replace(tmp, self._path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save tool schema cache {self._path}: {e}")
+
+
+class LazyTool(Tool):
+    """Stand-in that builds the real tool on first use."""
+
+    def __init__(
+        self,
+        spec: ToolSpec,
+        schema: dict,
+        cache: ToolSchemaCache | None = None,
+        fingerprint: str = "",
+    ):
+        self._spec = spec
+        self._schema = schema
+        self._cache = cache
+        self._fingerprint = fingerprint
+        self._tool: Tool | None = None
+        self._lock = threading.Lock()
+        # Set by ToolRegistry so a refreshed schema invalidates its schema cache.
+        self.on_schema_change: Callable[[], None] | None = None
+
+    @property
+    def name(self) -> str:
+        return self._schema["name"]
+
+    @property
+    def description(self) -> str:
+        return self._schema["description"]
+
+    @property
+    def parameters(self) -> dict:
+        return self._schema["parameters"]
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def resolve(self) -> Tool:
+        """Import and construct the tool (once); blocking."""
+        with self._lock:
+            if self._tool is None:
+                tool = self._spec.load()
+                schema = tool_schema(tool)
+                if schema != self._schema and schema["name"] == self.name:
+                    # Picked up by the next tools/list and the next startup.
+                    self._schema = schema
+                    if self._cache is not None:
+                        self._cache.put(self._spec, self._fingerprint, schema)
+                        self._cache.save()
+                    if self.on_schema_change is not None:
+                        self.on_schema_change()
+                self._tool = tool
+                logger.info(f"Loaded tool on demand: {self.name}")
+            return self._tool
+
+    async def load(self) -> Tool:
+        if self._tool is not None:
+            return self._tool
+        return await asyncio.to_thread(self.resolve)
+
+    async def execute(self, **kwargs) -> ToolResult:
+        try:
+            tool = await self.load()
+        except Exception as e:
+            logger.warning(f"Tool {self.name} failed to load: {e}")
+            return ToolResult(error=f"Tool {self.name} is unavailable: {e}", success=False)
+        return await tool.execute(**kwargs)
+
+
+def lazy_tools(specs: list[ToolSpec], cache: ToolSchemaCache) -> list[Tool]:
+    """Wrap specs as LazyTools, building only those without a cached schema.
+
+    Specs whose module fails to import are skipped with a warning, matching
+    the eager registry's behaviour for missing optional dependencies.
+    """
+    tools: list[Tool] = []
+    dir_stamps: dict[str, int] = {}
+    for spec in specs:
+        fingerprint = spec.fingerprint(dir_stamps)
+        schema = cache.get(spec, fingerprint)
+        if schema is not None:
+            tools.append(LazyTool(spec, schema, cache, fingerprint))
+            continue
+        try:
+            tool = spec.load()
+        except Exception as e:
+            logger.warning(f"Skipping {spec.class_name} from {spec.module}: {e}")
+            continue
+        cache.put(spec, fingerprint, tool_schema(tool))
+        tools.append(tool)
+    cache.save()
+    return tools
+
+
+async def warm_up(tools: list[Tool]):
+    """Build every not-yet-loaded LazyTool in the background, one at a time."""
+    for tool in tools:
+        if isinstance(tool, LazyTool) and not tool.loaded:
+            try:
+                await tool.load()
+            except Exception as e:
+                logger.warning(f"Warm-up of {tool.name} failed: {e}")
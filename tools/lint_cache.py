@@ -0,0 +1,152 @@
+"""
+Lint result cache — per-file linter diagnostics keyed by what can change them.
+
+LinterTool stores each file's diagnostics under a key derived from the
+linter name and version, the hash of the config files that apply to the
+file, the file's workspace-relative path (per-file ignores depend on it),
+and the file's content hash. Entries live in SQLite under
+<workspace>/.frood/lint_cache.db and are evicted least-recently-used once
+the table exceeds its size bound.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from core.sqlite_db import open_db, select_in
+
+logger = logging.getLogger("frood.tools.lint_cache")
+
+# Upper bound on cached file results per workspace.
+MAX_ENTRIES = 20000
+
+# Config files that change a linter's verdicts, looked up in every directory
+# from the workspace root down to the linted file.
+CONFIG_FILES = {
+    "ruff": ("pyproject.toml", "ruff.toml", ".ruff.toml"),
+    "eslint": (
+        ".eslintrc",
+        ".eslintrc.js",
+        ".eslintrc.cjs",
+        ".eslintrc.json",
+        ".eslintrc.yml",
+        ".eslintrc.yaml",
+        "eslint.config.js",
+        "eslint.config.mjs",
+        "eslint.config.cjs",
+        "package.json",
+        ".eslintignore",
+    ),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    diagnostics TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used);
+"""
+
+
+class LintCache:
+    """Bounded on-disk LRU of per-file lint results for one workspace."""
+
+    def __init__(
+        self,
+        workspace_path: str,
+        db_path: str | Path | None = None,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        # realpath: linters report resolved paths, and keys use paths relative to this
+        self._workspace = os.path.realpath(workspace_path)
+        self._db_path = Path(db_path or os.path.join(self._workspace, ".frood", "lint_cache.db"))
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = open_db(self._db_path, _SCHEMA)
+
+    # -- Keys -----------------------------------------------------------------
+
+    def keys_for(self, linter: str, version: str, files: list[str]) -> dict[str, str]:
+        """Cache key for each readable file (absolute paths) → {file: key}."""
+        config_hashes: dict[str, str] = {}
+        keys: dict[str, str] = {}
+        for full in files:
+            try:
+                with open(full, "rb") as f:
+                    content = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                continue
+            rel = os.path.relpath(full, self._workspace).replace(os.sep, "/")
+            config = self._config_hash(linter, os.path.dirname(full), config_hashes)
+            raw = "\0".join((linter, version, config, rel, content))
+            keys[full] = hashlib.sha256(raw.encode()).hexdigest()
+        return keys
+
+    def _config_hash(self, linter: str, directory: str, memo: dict[str, str]) -> str:
+        """Hash of every applicable config file from the workspace root down to directory."""
+        if directory in memo:
+            return memo[directory]
+        parent = os.path.dirname(directory)
+        inside = directory.startswith(self._workspace + os.sep)
+        h = hashlib.sha256(self._config_hash(linter, parent, memo).encode() if inside else b"")
+        for name in CONFIG_FILES.get(linter, ()):
+            try:
+                with open(os.path.join(directory, name), "rb") as f:
+                    h.update(name.encode() + b"\0" + f.read())
+            except OSError:
+                continue
+        memo[directory] = h.hexdigest()
+        return memo[directory]
+
+    # -- Storage --------------------------------------------------------------
+
+    def get_many(self, keys: list[str]) -> dict[str, object]:
+        """Cached diagnostics for the keys that hit; refreshes their LRU stamp."""
+        with self._lock:
+            rows = select_in(
+                self._conn, "SELECT key, diagnostics FROM results WHERE key IN ({marks})", keys
+            )
+            found: dict[str, object] = {key: json.loads(diagnostics) for key, diagnostics in rows}
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE results SET last_used = ? WHERE key = ?", [(now, k) for k in found]
+                )
+        return found
+
+    def put_many(self, entries: list[tuple[str, str, object]]) -> None:
+        """Store (key, file, diagnostics) rows, then evict down to the size bound."""
+        if not entries:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    [(key, file, json.dumps(diag), now) for key, file, diag in entries],
+                )
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+                if count > self._max_entries:
+                    self._conn.execute(
+                        "DELETE FROM results WHERE key IN "
+                        "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                        (count - self._max_entries,),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
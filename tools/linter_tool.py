@@ -3,23 +3,45 @@ Linter tool — run code linters and return structured diagnostics.
 
 Supports ruff (Python), eslint (JavaScript/TypeScript), and custom linter commands.
 Returns structured output with file, line, severity, and message.
+
+Read-only ruff and eslint runs go through a per-file result cache (see
+tools/lint_cache.py). Only files whose content, config or linter version
+changed are passed to the linter, in one batched invocation, and their
+fresh diagnostics are merged with the cached ones.
 """
 
 import asyncio
 import json
 import logging
+import os
 import shutil
 
 from tools.base import Tool, ToolResult
+from tools.lint_cache import LintCache
 
 logger = logging.getLogger("frood.tools.linter")
 
+_ESLINT_EXTS = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"}
+_ESLINT_SKIP_DIRS = {"node_modules", ".git", "dist", "build", "coverage", ".next", ".frood"}
+_BATCH_FILES = 1000  # files per linter invocation, to stay clear of argv limits
+
+# (linter, workspace) -> version string, resolved once per process; each
+# workspace may pin its own linter (e.g. eslint from its node_modules)
+_linter_versions: dict[tuple[str, str], str] = {}
+
 
 class LinterTool(Tool):
     """Run linters and return structured diagnostics."""
 
     def __init__(self, workspace_path: str = "."):
         self._workspace = workspace_path
+        self._cache: LintCache | None = None
+
+    @property
+    def cache(self) -> LintCache:
+        if self._cache is None:
+            self._cache = LintCache(self._workspace)
+        return self._cache
 
     @property
     def name(self) -> str:
@@ -118,6 +140,11 @@ class LinterTool(Tool):
         return "ruff"  # Will fail gracefully if not installed
 
     async def _run_ruff(self, path: str, fix: bool) -> ToolResult:
+        if not fix:
+            cached = await self._run_cached("ruff", path)
+            if cached is not None:
+                return cached
+
         cmd = ["ruff", "check", "--output-format=json"]
         if fix:
             cmd.append("--fix")
@@ -191,6 +218,11 @@ class LinterTool(Tool):
         return ToolResult(output="\n".join(lines), success=False)
 
     async def _run_eslint(self, path: str, fix: bool) -> ToolResult:
+        if not fix:
+            cached = await self._run_cached("eslint", path)
+            if cached is not None:
+                return cached
+
         cmd = ["npx", "eslint", "--format=json"]
         if fix:
             cmd.append("--fix")
@@ -261,6 +293,120 @@ class LinterTool(Tool):
 
         return ToolResult(output="\n".join(lines), success=total_errors == 0)
 
+    # -- Cached runs ------------------------------------------------------------
+
+    async def _capture(self, cmd: list[str], timeout: float = 120.0) -> tuple[int, str] | None:
+        """Run cmd in the workspace → (returncode, stdout), or None if it could not run."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=self._workspace,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError:
+            return None
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        return proc.returncode, stdout.decode("utf-8", errors="replace")
+
+    async def _linter_version(self, linter: str) -> str | None:
+        key = (linter, os.path.realpath(self._workspace))
+        if key not in _linter_versions:
+            cmd = ["ruff", "--version"] if linter == "ruff" else ["npx", "eslint", "--version"]
+            result = await self._capture(cmd, timeout=60.0)
+            if result is None or result[0] != 0:
+                return None
+            _linter_versions[key] = result[1].strip()
+        return _linter_versions[key]
+
+    async def _lint_targets(self, linter: str, path: str) -> list[str] | None:
+        """Absolute paths of the files the linter would check under path."""
+        target = os.path.join(self._workspace, path) if path else self._workspace
+        if linter == "ruff":
+            # Let ruff apply its own include/exclude and .gitignore rules.
+            result = await self._capture(["ruff", "check", "--show-files", path or "."])
+            if result is None or result[0] != 0:
+                return None
+            return sorted(os.path.realpath(line) for line in result[1].splitlines() if line)
+
+        if os.path.isfile(target):
+            return [os.path.realpath(target)]
+        files = []
+        for root, dirs, names in os.walk(target):
+            dirs[:] = [d for d in dirs if d not in _ESLINT_SKIP_DIRS and not d.startswith(".")]
+            files.extend(
+                os.path.realpath(os.path.join(root, n))
+                for n in names
+                if os.path.splitext(n)[1] in _ESLINT_EXTS
+            )
+        return sorted(files)
+
+    async def _lint_batch(self, linter: str, files: list[str]) -> dict[str, object] | None:
+        """Lint files in as few invocations as possible → {file: diagnostics}."""
+        fresh: dict[str, object] = {}
+        for i in range(0, len(files), _BATCH_FILES):
+            batch = files[i : i + _BATCH_FILES]
+            if linter == "ruff":
+                cmd = ["ruff", "check", "--output-format=json", "--force-exclude", *batch]
+            else:
+                cmd = ["npx", "eslint", "--format=json", *batch]
+            result = await self._capture(cmd)
+            # Both linters exit 0 when clean and 1 when they report issues; anything else is a crash.
+            if result is None or result[0] not in (0, 1):
+                return None
+            try:
+                reported = json.loads(result[1]) if result[1].strip() else []
+            except json.JSONDecodeError:
+                return None
+            for f in batch:
+                fresh[f] = [] if linter == "ruff" else _empty_eslint_result(f)
+            for entry in reported:
+                key = entry.get("filename") if linter == "ruff" else entry.get("filePath")
+                key = os.path.realpath(key or "")
+                if linter == "ruff":
+                    fresh.setdefault(key, []).append(entry)
+                else:
+                    fresh[key] = _drop_ignored_warning(entry)
+        return fresh
+
+    async def _run_cached(self, linter: str, path: str) -> ToolResult | None:
+        """Lint via the result cache; None means fall back to a plain run."""
+        version = await self._linter_version(linter)
+        files = await self._lint_targets(linter, path) if version else None
+        if files is None:
+            return None
+
+        cache = self.cache
+        keys = await asyncio.to_thread(cache.keys_for, linter, version, files)
+        hits = await asyncio.to_thread(cache.get_many, list(keys.values()))
+        misses = [f for f, key in keys.items() if key not in hits]
+
+        fresh: dict[str, object] = {}
+        if misses:
+            linted = await self._lint_batch(linter, misses)
+            if linted is None:
+                return None
+            fresh = linted
+            await asyncio.to_thread(
+                cache.put_many, [(keys[f], f, fresh[f]) for f in misses if f in fresh]
+            )
+        logger.debug(f"{linter}: {len(hits)} cached, {len(misses)} linted")
+
+        # Unreadable files got no key and were skipped; keys keeps the files' order.
+        merged = [
+            hits[key] if key in hits else fresh[f]
+            for f, key in keys.items()
+            if key in hits or f in fresh
+        ]
+        if linter == "ruff":
+            return self._format_ruff_issues([i for issues in merged for i in issues], fix=False)
+        return self._format_eslint_results(merged, fix=False)
+
     async def _run_custom(self, command: str) -> ToolResult:
         proc = await asyncio.create_subprocess_shell(
             command,
@@ -286,3 +432,22 @@ class LinterTool(Tool):
             output=f"## Linter Results (exit code: {proc.returncode})\n\n{combined}",
             success=passed,
         )
+
+
+def _empty_eslint_result(file_path: str) -> dict:
+    return {"filePath": file_path, "messages": [], "errorCount": 0, "warningCount": 0}
+
+
+def _drop_ignored_warning(result: dict) -> dict:
+    """Remove eslint's "File ignored ..." warning emitted for explicitly passed ignored files."""
+    messages = [
+        m for m in result.get("messages", []) if not m.get("message", "").startswith("File ignored")
+    ]
+    if len(messages) == len(result.get("messages", [])):
+        return result
+    return {
+        **result,
+        "messages": messages,
+        "errorCount": sum(1 for m in messages if m.get("severity") == 2),
+        "warningCount": sum(1 for m in messages if m.get("severity") != 2),
+    }
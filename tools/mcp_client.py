@@ -5,11 +5,16 @@ Uses the official ``mcp`` Python SDK for protocol handling.
 Supports stdio (local process) transport.  SSE/HTTP planned for Phase 7.
 
 Tools from MCP servers are auto-discovered and registered with namespaced names.
+Connections are pooled by MCPManager: servers start on first use, are shared by
+every caller, and are stopped again once idle.
 """
 
+import asyncio
 import logging
 import os
 import shutil
+import time
+from collections.abc import Callable
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
@@ -19,6 +24,15 @@ from tools.base import Tool, ToolResult
 
 logger = logging.getLogger("frood.tools.mcp")
 
+# Budget for spawning a server process and completing the MCP handshake
+CONNECT_TIMEOUT = 30.0
+# Idle servers are pinged at most this often; a server that fails is restarted
+# on its next call
+HEALTH_INTERVAL = 60.0
+PING_TIMEOUT = 5.0
+# After a failed start, calls fail fast for this long instead of respawning
+RESTART_BACKOFF = 10.0
+
 
 class MCPConnection:
     """Manages a connection to a single MCP server via the MCP SDK."""
@@ -93,6 +107,12 @@ class MCPConnection:
             self._session = None
         logger.info(f"MCP server disconnected: {self.name}")
 
+    async def ping(self):
+        """Round-trip a ping; raises if the server is gone or not connected."""
+        if not self._session:
+            raise RuntimeError(f"MCP server {self.name} not connected")
+        await self._session.send_ping()
+
     async def list_tools(self) -> list[dict]:
         """Discover available tools from the server."""
         if not self._session:
@@ -153,14 +173,14 @@ class MCPConnection:
 
 
 class MCPToolProxy(Tool):
-    """Proxy tool that forwards calls to an MCP server."""
+    """Proxy tool that forwards calls to an MCP server through the pool."""
 
-    def __init__(self, server_name: str, tool_info: dict, connection: MCPConnection):
+    def __init__(self, server_name: str, tool_info: dict, manager: "MCPManager"):
         self._server_name = server_name
         self._tool_name = tool_info.get("name", "")
         self._description = tool_info.get("description", "")
         self._schema = tool_info.get("inputSchema", {"type": "object", "properties": {}})
-        self._connection = connection
+        self._manager = manager
 
     @property
     def name(self) -> str:
@@ -176,42 +196,294 @@ class MCPToolProxy(Tool):
 
     async def execute(self, **kwargs) -> ToolResult:
         try:
-            result = await self._connection.call_tool(self._tool_name, kwargs)
+            result = await self._manager.call_tool(self._server_name, self._tool_name, kwargs)
             return ToolResult(output=result)
         except Exception as e:
             return ToolResult(error=f"MCP tool error: {e}", success=False)
 
 
-class MCPManager:
-    """Manages connections to multiple MCP servers."""
+class _PooledServer:
+    """Pool entry for one MCP server: its config and current connection."""
+
+    def __init__(
+        self,
+        name: str,
+        config: dict,
+        factory: Callable[[str, dict], MCPConnection] | None,
+        max_concurrency: int,
+    ):
+        self.name = name
+        self.config = config
+        self.factory = factory
+        self.slots = asyncio.Semaphore(max_concurrency)
+        # The runner task owns the connection: the SDK's stdio transport must
+        # be entered and exited in the same task.
+        self.task: asyncio.Task | None = None
+        self.ready: asyncio.Future | None = None
+        self.stop: asyncio.Event | None = None
+        self.active = 0
+        self.last_used = 0.0
+        self.last_checked = 0.0
+        self.retry_at = 0.0
+        self.last_error = ""
+        self.starts = 0
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
 
-    def __init__(self):
-        self._connections: dict[str, MCPConnection] = {}
+    def connection(self) -> MCPConnection | None:
+        """The live connection, or None while stopped or still starting."""
+        if not self.running or not self.ready.done() or self.ready.exception():
+            return None
+        return self.ready.result()
+
+
+class MCPManager:
+    """Pool of long-lived connections to MCP servers.
+
+    Servers are registered with their config and started on first use; after
+    that every caller shares one connection per server, with at most
+    ``max_concurrency`` calls in flight. A server that stops answering is
+    restarted on its next call, and one left idle for ``idle_timeout`` seconds
+    is shut down until it is needed again.
+    """
+
+    def __init__(self, idle_timeout: float = 300.0, max_concurrency: int = 4):
+        self._idle_timeout = idle_timeout
+        self._max_concurrency = max(1, max_concurrency)
+        self._servers: dict[str, _PooledServer] = {}
+        self._reaper: asyncio.Task | None = None
+
+    def register_server(
+        self,
+        name: str,
+        config: dict,
+        connection_factory: Callable[[str, dict], MCPConnection] | None = None,
+    ):
+        """Make a server available to the pool without starting it.
+
+        Registering the same config again is a no-op; a changed config retires
+        the running connection so the next call starts the new one.
+        """
+        entry = self._servers.get(name)
+        if entry is not None:
+            entry.factory = connection_factory
+            if entry.config == config:
+                return
+            entry.config = config
+            entry.retry_at = 0.0
+            self._retire(entry)
+            return
+        self._servers[name] = _PooledServer(name, config, connection_factory, self._max_concurrency)
 
     async def connect_server(self, name: str, config: dict) -> list[Tool]:
-        """Connect to an MCP server and return proxy tools for its capabilities."""
-        conn = MCPConnection(name, config)
+        """Start an MCP server and return proxy tools for its capabilities."""
+        self.register_server(name, config)
         try:
-            await conn.connect()
-            self._connections[name] = conn
+            tool_infos = await self.list_tools(name, timeout=CONNECT_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Failed to connect MCP server {name}: {e}")
+            return []
+        tools = [MCPToolProxy(name, info, self) for info in tool_infos]
+        logger.info(f"MCP server {name}: discovered {len(tools)} tools")
+        return tools
+
+    async def start(self, name: str, timeout: float | None = None):
+        """Wait up to timeout for a registered server to be running.
+
+        On timeout the start carries on in the background.
+        """
+        await self._acquire(self._entry(name), timeout)
 
-            # Discover tools
-            tool_infos = await conn.list_tools()
-            tools = [MCPToolProxy(name, info, conn) for info in tool_infos]
+    async def list_tools(self, name: str, timeout: float | None = None) -> list[dict]:
+        """Discover tools from a registered server, starting it if needed."""
+        entry = self._entry(name)
+        async with entry.slots:
+            entry.active += 1  # keeps the idle reaper off a server mid-request
+            try:
+                conn = await self._acquire(entry, timeout)
+                return await conn.list_tools()
+            finally:
+                entry.active -= 1
+                entry.last_used = time.monotonic()
+
+    async def call_tool(
+        self,
+        name: str,
+        tool_name: str,
+        arguments: dict,
+        timeout: float | None = None,
+    ) -> str:
+        """Call a tool on a registered server over its pooled connection.
+
+        ``timeout`` covers both waiting for the server to start and the call
+        itself. A start that outlives it keeps going in the background, so a
+        slow cold start still leaves a warm server for the next caller.
+        """
+        entry = self._entry(name)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        async with entry.slots:
+            entry.active += 1
+            try:
+                conn = await self._acquire(entry, timeout)
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                entry.calls += 1
+                try:
+                    return await asyncio.wait_for(
+                        conn.call_tool(tool_name, arguments), timeout=remaining
+                    )
+                except TimeoutError:
+                    raise  # a slow tool is not a dead server
+                except Exception:
+                    entry.failures += 1
+                    # The entry may have been restarted while we pinged.
+                    if not await self._healthy(conn) and entry.connection() is conn:
+                        logger.warning(f"MCP server {name} stopped responding; restarting")
+                        self._retire(entry)
+                    raise
+            finally:
+                entry.active -= 1
+                entry.last_used = time.monotonic()
+
+    def stats(self) -> dict:
+        """Per-server pool counters, for diagnostics."""
+        return {
+            name: {
+                "running": entry.connection() is not None,
+                "active": entry.active,
+                "starts": entry.starts,
+                "calls": entry.calls,
+                "failures": entry.failures,
+                "last_error": entry.last_error,
+            }
+            for name, entry in self._servers.items()
+        }
 
-            logger.info(f"MCP server {name}: discovered {len(tools)} tools")
-            return tools
+    async def disconnect_all(self):
+        """Stop every running server and the idle reaper."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        tasks = [entry.task for entry in self._servers.values() if entry.running]
+        for entry in self._servers.values():
+            self._retire(entry)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # -- internals ---------------------------------------------------------
+
+    def _entry(self, name: str) -> _PooledServer:
+        entry = self._servers.get(name)
+        if entry is None:
+            raise KeyError(f"MCP server {name} is not registered")
+        return entry
+
+    async def _acquire(self, entry: _PooledServer, timeout: float | None) -> MCPConnection:
+        """Return the server's connection, starting it if it is not running."""
+        if not entry.running:
+            if time.monotonic() < entry.retry_at:
+                raise ConnectionError(f"MCP server {entry.name} unavailable: {entry.last_error}")
+            self._start(entry)
+        return await asyncio.wait_for(asyncio.shield(entry.ready), timeout=timeout)
+
+    def _start(self, entry: _PooledServer):
+        loop = asyncio.get_running_loop()
+        entry.ready = loop.create_future()
+        # Nobody may be waiting when a background start fails.
+        entry.ready.add_done_callback(lambda f: f.cancelled() or f.exception())
+        entry.stop = asyncio.Event()
+        entry.task = loop.create_task(
+            self._run(entry, entry.ready, entry.stop), name=f"mcp-{entry.name}"
+        )
+        if self._reaper is None or self._reaper.done():
+            self._reaper = loop.create_task(self._reap(), name="mcp-pool-reaper")
 
+    async def _run(self, entry: _PooledServer, ready: asyncio.Future, stop: asyncio.Event):
+        """Own one connection from start to shutdown."""
+        factory = entry.factory or MCPConnection
+        conn = factory(entry.name, entry.config)
+        try:
+            await asyncio.wait_for(conn.connect(), timeout=CONNECT_TIMEOUT)
         except Exception as e:
-            logger.error(f"Failed to connect MCP server {name}: {e}")
+            entry.retry_at = time.monotonic() + RESTART_BACKOFF
+            entry.last_error = str(e) or type(e).__name__
+            logger.warning(f"MCP server {entry.name} failed to start: {entry.last_error}")
+            ready.set_exception(e)
             try:
                 await conn.disconnect()
             except Exception:
                 pass
-            return []
+            return
+        entry.starts += 1
+        entry.last_error = ""
+        entry.last_used = entry.last_checked = time.monotonic()
+        ready.set_result(conn)
+        try:
+            await stop.wait()
+        finally:
+            try:
+                await conn.disconnect()
+            except Exception as e:
+                logger.debug(f"MCP server {entry.name} did not shut down cleanly: {e}")
 
-    async def disconnect_all(self):
-        """Disconnect all MCP servers."""
-        for name, conn in self._connections.items():
-            await conn.disconnect()
-        self._connections.clear()
+    def _retire(self, entry: _PooledServer):
+        """Signal the runner to close its connection; the next call starts a new one."""
+        if entry.stop is not None:
+            entry.stop.set()
+        entry.task = None
+
+    async def _healthy(self, conn: MCPConnection) -> bool:
+        try:
+            await asyncio.wait_for(conn.ping(), timeout=PING_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def _reap(self):
+        """Stop idle servers and ping quiet ones until nothing is running."""
+        tick = max(1.0, min(self._idle_timeout, HEALTH_INTERVAL) / 2)
+        while any(entry.running for entry in self._servers.values()):
+            await asyncio.sleep(tick)
+            now = time.monotonic()
+            for entry in list(self._servers.values()):
+                conn = entry.connection()
+                if conn is None or entry.active:
+                    continue
+                if now - entry.last_used >= self._idle_timeout:
+                    logger.info(f"MCP server {entry.name} idle; shutting down")
+                    self._retire(entry)
+                elif now - entry.last_checked >= HEALTH_INTERVAL:
+                    entry.last_checked = now
+                    if not await self._healthy(conn) and entry.connection() is conn:
+                        logger.warning(f"MCP server {entry.name} failed health check")
+                        self._retire(entry)
+
+
+_manager: MCPManager | None = None
+
+
+def get_mcp_manager() -> MCPManager:
+    """Process-wide MCP connection pool, configured from settings."""
+    global _manager
+    if _manager is None:
+        from core.config import settings
+
+        _manager = MCPManager(
+            idle_timeout=settings.mcp_pool_idle_timeout,
+            max_concurrency=settings.mcp_pool_max_concurrency,
+        )
+    return _manager
+
+
+async def shutdown_mcp_manager() -> None:
+    """Stop the process-wide pool's servers, if the pool was ever created.
+
+    Called from every shutdown path (MCP server transports, Frood, the
+    dashboard and sidecar apps) so pooled child processes do not outlive
+    the process and no runner task is left pending when the loop closes.
+    """
+    if _manager is not None:
+        await _manager.disconnect_all()
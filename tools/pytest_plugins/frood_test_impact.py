@@ -0,0 +1,158 @@
+"""
+pytest plugin loaded by TestRunnerTool (``-p frood_test_impact``).
+
+Runs inside the workspace's own pytest process, so it may only use the
+standard library and pytest. This directory is put on PYTHONPATH for that
+process, so keep it free of other modules. Controlled by environment
+variables:
+
+- FROOD_TEST_IMPACT_OUT     — write collected node ids and per-test results here as JSON
+- FROOD_TEST_IMPACT_SELECT  — file of node ids or test file paths (relative to the
+                              working directory) to keep; everything else is deselected
+- FROOD_TEST_IMPACT_TRACE=1 — also record which workspace files each test ran
+
+File coverage is recorded per test with sys.monitoring where available
+(each code object reports once per test, then disables itself), or a
+call-only profile hook on older interpreters. Files executed while a test
+module is imported are attributed to every test in that module.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+_OUT = os.environ.get("FROOD_TEST_IMPACT_OUT", "")
+_SELECT = os.environ.get("FROOD_TEST_IMPACT_SELECT", "")
+_TRACE = os.environ.get("FROOD_TEST_IMPACT_TRACE") == "1"
+
+
+class _FileTracer:
+    """Collects the filenames of code executed between start() and stop()."""
+
+    def __init__(self):
+        self.files: set[str] = set()
+        self._tool = None
+        monitoring = getattr(sys, "monitoring", None)
+        if monitoring is None:
+            return
+        for tool_id in (monitoring.COVERAGE_ID, monitoring.PROFILER_ID):
+            try:
+                monitoring.use_tool_id(tool_id, "frood-test-impact")
+            except ValueError:
+                continue  # taken by coverage.py or a profiler
+            self._tool = tool_id
+            monitoring.register_callback(tool_id, monitoring.events.PY_START, self._on_start)
+            break
+
+    def _on_start(self, code, offset):
+        self.files.add(code.co_filename)
+        return sys.monitoring.DISABLE
+
+    def _on_call(self, frame, event, arg):
+        if event == "call":
+            self.files.add(frame.f_code.co_filename)
+
+    def start(self) -> None:
+        self.files = set()
+        if self._tool is not None:
+            sys.monitoring.restart_events()
+            sys.monitoring.set_events(self._tool, sys.monitoring.events.PY_START)
+        else:
+            sys.setprofile(self._on_call)
+            threading.setprofile(self._on_call)
+
+    def stop(self) -> set[str]:
+        if self._tool is not None:
+            sys.monitoring.set_events(self._tool, 0)
+        else:
+            sys.setprofile(None)
+            threading.setprofile(None)
+        return self.files
+
+
+_tracer = _FileTracer() if _TRACE else None
+_module_files: dict[str, set[str]] = {}
+_results: dict[str, dict] = {}
+_collected: list[str] = []
+
+
+def _relpath(path) -> str:
+    return os.path.relpath(str(path), os.getcwd()).replace(os.sep, "/")
+
+
+def _workspace_files(files: set[str]) -> list[str]:
+    root = os.getcwd()
+    rels = set()
+    for name in files:
+        if not name.endswith(".py") or not os.path.isabs(name):
+            continue
+        rel = os.path.relpath(name, root)
+        if rel.startswith("..") or "site-packages" in rel or rel.startswith((".venv", "venv")):
+            continue
+        rels.add(rel.replace(os.sep, "/"))
+    return sorted(rels)
+
+
+def pytest_collection_modifyitems(config, items):
+    if not _SELECT:
+        return
+    with open(_SELECT) as f:
+        wanted = {line.strip() for line in f if line.strip()}
+    selected, deselected = [], []
+    for item in items:
+        keep = item.nodeid in wanted or _relpath(item.path) in wanted
+        (selected if keep else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def pytest_collection_finish(session):
+    _collected.extend(item.nodeid for item in session.items)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    if _tracer is None or not isinstance(collector, pytest.Module):
+        yield
+        return
+    _tracer.start()
+    try:
+        yield
+    finally:
+        _module_files[collector.nodeid] = _tracer.stop()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    entry = _results.setdefault(item.nodeid, {"outcome": "passed", "duration": 0.0})
+    entry["path"] = _relpath(item.path)
+    started = time.perf_counter()
+    if _tracer is not None:
+        _tracer.start()
+    try:
+        yield
+    finally:
+        entry["duration"] = round(time.perf_counter() - started, 4)
+        if _tracer is not None:
+            files = _tracer.stop() | _module_files.get(item.nodeid.split("::")[0], set())
+            entry["files"] = _workspace_files(files)
+
+
+def pytest_runtest_logreport(report):
+    entry = _results.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0})
+    if report.failed:
+        entry["outcome"] = "failed" if report.when == "call" else "error"
+    elif report.skipped and entry["outcome"] == "passed":
+        entry["outcome"] = "skipped"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _OUT:
+        return
+    with open(_OUT, "w") as f:
+        json.dump({"collected": _collected, "tests": _results}, f)
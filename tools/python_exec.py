@@ -9,13 +9,27 @@ Security:
 - Blocks dangerous imports (os.system, subprocess, shutil.rmtree, etc.)
 - Strips API keys and secrets from the subprocess environment
 - Enforces execution timeout and output limits
+
+Snippets normally run on a warm worker pool (see python_exec_worker.py): a
+few interpreters per workspace are started ahead of time with common
+modules imported, and each snippet runs in a fresh child forked from one of
+them under CPU and address-space rlimits. Workers are recycled after
+PYTHON_EXEC_MAX_RUNS jobs or when their memory grows. Where fork() is
+unavailable or the pool is disabled, every snippet gets a cold subprocess.
 """
 
 import asyncio
+import atexit
+import json
 import logging
 import os
 import re
+import select
+import signal
+import subprocess
 import tempfile
+import threading
+import time
 
 from tools.base import Tool, ToolResult
 
@@ -56,6 +70,211 @@ _SECRET_ENV_PATTERNS = [
     "DASHBOARD_PASSWORD",
 ]
 
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_exec_worker.py")
+_WORKER_START_TIMEOUT = 30.0  # Seconds a new worker may take to import and report ready
+_WORKER_GRACE_SECONDS = 5.0  # Extra time a worker gets to report after the job's timeout
+_MAX_WORKER_GROWTH_KB = 64 * 1024  # Recycle a worker whose RSS grew this much
+
+
+class WorkerError(Exception):
+    """A pool worker died or stopped answering.
+
+    started is False when the job never reached the worker, so it is safe to
+    retry cold; otherwise the snippet may already have run (and had side
+    effects) and must not be run again.
+    """
+
+    def __init__(self, message: str, started: bool = False):
+        super().__init__(message)
+        self.started = started
+
+
+class _ExecWorker:
+    """One warm worker process, serving a single job at a time."""
+
+    def __init__(self, workspace: str, env: dict[str, str], preload: str):
+        self.proc = subprocess.Popen(  # nosec B603 — fixed argv, no shell
+            ["python", _WORKER_SCRIPT, preload],
+            cwd=workspace,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            start_new_session=True,
+        )
+        self.runs = 0
+        self.baseline_kb = 0
+        self.rss_kb = 0
+        self._ready = False
+        self.job_sent = False
+        self._buf = b""
+
+    def _readline(self, deadline: float) -> dict:
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise WorkerError(f"worker {self.proc.pid} exited")
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return json.loads(line)
+
+    def run(self, job: dict) -> dict:
+        if not self._ready:
+            hello = self._readline(time.monotonic() + _WORKER_START_TIMEOUT)
+            self.baseline_kb = self.rss_kb = hello.get("rss_kb", 0)
+            self._ready = True
+        self.job_sent = False
+        try:
+            self.proc.stdin.write(json.dumps(job).encode() + b"\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            raise WorkerError(f"worker {self.proc.pid} not accepting jobs: {e}") from e
+        self.job_sent = True
+        result = self._readline(time.monotonic() + job["timeout"] + _WORKER_GRACE_SECONDS)
+        self.runs += 1
+        self.rss_kb = result.get("rss_kb", self.rss_kb)
+        return result
+
+    def kill(self) -> None:
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class PythonWorkerPool:
+    """Pre-started interpreters for one workspace.
+
+    run() blocks, so callers go through asyncio.to_thread. A worker that
+    times out or dies is killed and replaced; healthy workers are recycled
+    after max_runs jobs or once their memory grows past the limit.
+    """
+
+    def __init__(
+        self,
+        workspace: str,
+        size: int = 2,
+        preload: str = "",
+        max_runs: int = 200,
+        memory_mb: int = 0,
+    ):
+        self._workspace = workspace
+        self._preload = preload
+        self._max_runs = max_runs
+        self._memory_mb = memory_mb
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: list[_ExecWorker] = [self._spawn() for _ in range(size)]
+        self._closed = False
+        self.recycled = 0
+
+    def _spawn(self) -> _ExecWorker:
+        return _ExecWorker(self._workspace, PythonExecTool._safe_env(), self._preload)
+
+    def _retire(self, worker: _ExecWorker) -> None:
+        worker.kill()
+        self.recycled += 1
+        if self._closed:
+            return
+        try:
+            replacement = self._spawn()
+        except OSError as e:
+            logger.warning(f"Could not replace Python worker: {e}")
+            return
+        with self._lock:
+            self._idle.append(replacement)
+
+    def run(self, code: str, timeout: float) -> dict:
+        job = {
+            "code": code,
+            "timeout": timeout,
+            "memory_mb": self._memory_mb,
+            "filename": os.path.join(self._workspace, "<python_exec>"),
+        }
+        with self._slots:
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is None:
+                try:
+                    worker = self._spawn()
+                except OSError as e:
+                    raise WorkerError(f"cannot start worker: {e}") from e
+            try:
+                result = worker.run(job)
+            except TimeoutError:
+                self._retire(worker)
+                return {"returncode": None, "timed_out": True, "stdout": "", "stderr": ""}
+            except (WorkerError, OSError, ValueError) as e:
+                self._retire(worker)
+                raise WorkerError(str(e), started=worker.job_sent) from e
+
+            if (
+                worker.runs >= self._max_runs
+                or worker.rss_kb - worker.baseline_kb > _MAX_WORKER_GROWTH_KB
+            ):
+                self._retire(worker)
+            else:
+                with self._lock:
+                    self._idle.append(worker)
+            return result
+
+    def close(self) -> None:
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+
+_pools: dict[str, PythonWorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_worker_pool(workspace: str) -> PythonWorkerPool | None:
+    """Shared warm pool for a workspace, or None if pooling is off or unsupported."""
+    key = os.path.realpath(workspace)
+    with _pools_lock:
+        if key in _pools:
+            return _pools[key]
+        from core.config import settings
+
+        if settings.python_exec_pool_size <= 0 or not hasattr(os, "fork"):
+            return None
+        try:
+            pool = PythonWorkerPool(
+                workspace,
+                size=settings.python_exec_pool_size,
+                preload=settings.python_exec_preload,
+                max_runs=settings.python_exec_max_runs,
+                memory_mb=settings.python_exec_memory_mb,
+            )
+        except OSError as e:
+            logger.warning(f"Python worker pool unavailable ({e}) — using cold subprocesses")
+            return None
+        _pools[key] = pool
+        return pool
+
+
+@atexit.register
+def _close_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
 
 class PythonExecTool(Tool):
     """Execute Python code snippets in an isolated subprocess."""
@@ -132,6 +351,27 @@ class PythonExecTool(Tool):
         # Cap timeout at 5 minutes
         timeout = min(timeout, 300)
 
+        # Creating the pool starts interpreters; keep that off the event loop.
+        pool = await asyncio.to_thread(get_worker_pool, self._workspace)
+        if pool is not None:
+            try:
+                result = await asyncio.to_thread(pool.run, self._wrap_code(code), timeout)
+            except WorkerError as e:
+                if e.started:
+                    return ToolResult(
+                        error=f"Python worker died while running the snippet: {e}",
+                        success=False,
+                    )
+                logger.warning(f"Python worker failed ({e}) — retrying in a fresh subprocess")
+            else:
+                if result["timed_out"]:
+                    return ToolResult(error=f"Execution timed out after {timeout}s", success=False)
+                return self._format_result(result["returncode"], result["stdout"], result["stderr"])
+
+        return await self._run_subprocess(code, timeout)
+
+    async def _run_subprocess(self, code: str, timeout: float) -> ToolResult:
+        """Cold path: run the snippet as a script in a brand-new interpreter."""
         # Write code to a temporary file
         with tempfile.NamedTemporaryFile(
             mode="w",
@@ -160,30 +400,10 @@ class PythonExecTool(Tool):
                 proc.kill()
                 return ToolResult(error=f"Execution timed out after {timeout}s", success=False)
 
-            output = stdout.decode("utf-8", errors="replace")
-            errors = stderr.decode("utf-8", errors="replace")
-
-            if len(output) > 50000:
-                output = output[:50000] + "\n... (output truncated)"
-            if len(errors) > 20000:
-                errors = errors[:20000] + "\n... (errors truncated)"
-
-            if proc.returncode != 0:
-                return ToolResult(
-                    output=output if output else "",
-                    error=f"Exit code {proc.returncode}:\n{errors}",
-                    success=False,
-                )
-
-            result_parts = []
-            if output:
-                result_parts.append(output)
-            if errors:
-                result_parts.append(f"STDERR:\n{errors}")
-
-            return ToolResult(
-                output="\n".join(result_parts) if result_parts else "(no output)",
-                success=True,
+            return self._format_result(
+                proc.returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace"),
             )
         finally:
             try:
@@ -191,6 +411,31 @@ class PythonExecTool(Tool):
             except OSError:
                 pass
 
+    @staticmethod
+    def _format_result(returncode: int, output: str, errors: str) -> ToolResult:
+        if len(output) > 50000:
+            output = output[:50000] + "\n... (output truncated)"
+        if len(errors) > 20000:
+            errors = errors[:20000] + "\n... (errors truncated)"
+
+        if returncode != 0:
+            return ToolResult(
+                output=output if output else "",
+                error=f"Exit code {returncode}:\n{errors}",
+                success=False,
+            )
+
+        result_parts = []
+        if output:
+            result_parts.append(output)
+        if errors:
+            result_parts.append(f"STDERR:\n{errors}")
+
+        return ToolResult(
+            output="\n".join(result_parts) if result_parts else "(no output)",
+            success=True,
+        )
+
     @staticmethod
     def _wrap_code(code: str) -> str:
         """Wrap code to capture exceptions cleanly."""
@@ -0,0 +1,176 @@
+"""
+Warm worker for PythonExecTool — run as a standalone script, never imported.
+
+The worker starts once with a stripped environment, pre-imports common
+modules, then waits for jobs on stdin (one JSON object per line). Each job
+runs in a child forked from the worker, so snippets start with warm imports
+but share nothing with each other: whatever one snippet changes dies with
+its child. The child gets its own session, rlimits, and stdout/stderr
+files. The worker enforces the wall-clock timeout and reports the result on
+stdout as a single JSON line.
+
+This file is executed by path, so it may only use the standard library.
+"""
+
+import atexit
+import builtins
+import json
+import linecache
+import math
+import os
+import resource
+import select
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+_READ_LIMIT = 1024 * 1024  # bytes of stdout/stderr returned per job
+
+
+def _preload(modules: str) -> None:
+    for name in filter(None, (m.strip() for m in modules.split(","))):
+        try:
+            __import__(name)
+        except Exception:  # a missing optional module is not fatal
+            pass
+
+
+def _rss_kb() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_child(job: dict, out_fd: int, err_fd: int, proto_fds: tuple[int, int]) -> None:
+    """Runs in the forked child; never returns."""
+    rc = 1
+    try:
+        os.setsid()
+        for fd in proto_fds:
+            os.close(fd)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+
+        cpu = max(1, math.ceil(job["timeout"])) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+        if job.get("memory_mb"):
+            limit = job["memory_mb"] * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        filename = job["filename"]
+        source = job["code"]
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        namespace = {"__name__": "__main__", "__file__": filename, "__builtins__": builtins}
+        try:
+            exec(compile(source, filename, "exec"), namespace)  # noqa: S102 — sandboxed child
+            rc = 0
+        except SystemExit as e:
+            if e.code is None:
+                rc = 0
+            elif isinstance(e.code, int):
+                rc = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                rc = 1
+        except BaseException as e:
+            # Drop this module's own frame so the traceback starts at the snippet.
+            traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+            rc = 1
+        atexit._run_exitfuncs()
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(rc & 0xFF)
+
+
+def _wait(pid: int, timeout: float) -> tuple[int | None, bool]:
+    """Wait for pid up to timeout → (exit code, timed_out)."""
+    deadline = time.monotonic() + timeout
+    pidfd = None
+    if hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(pid)
+        except OSError:
+            pidfd = None
+    try:
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return os.waitstatus_to_exitcode(status), False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if pidfd is not None:
+                select.select([pidfd], [], [], remaining)
+            else:
+                time.sleep(min(remaining, 0.005))
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        os.kill(pid, signal.SIGKILL)  # child had not called setsid() yet
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status), True
+
+
+def _read(f) -> str:
+    f.seek(0)
+    data = f.read(_READ_LIMIT + 1)
+    text = data[:_READ_LIMIT].decode("utf-8", errors="replace")
+    return text + "\n... (output truncated)" if len(data) > _READ_LIMIT else text
+
+
+def _run_job(job: dict, proto_fds: tuple[int, int]) -> dict:
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        pid = os.fork()
+        if pid == 0:
+            _run_child(job, out.fileno(), err.fileno(), proto_fds)
+        returncode, timed_out = _wait(pid, job["timeout"])
+        return {
+            "returncode": returncode,
+            "timed_out": timed_out,
+            "stdout": _read(out),
+            "stderr": _read(err),
+            "rss_kb": _rss_kb(),
+        }
+
+
+def main() -> None:
+    # Snippets resolve imports from the workspace, like `python script.py` there.
+    sys.path[0] = os.getcwd()
+    proto_in, proto_out = os.dup(0), os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    if len(sys.argv) > 1:
+        _preload(sys.argv[1])
+    sys.stdout.flush()  # nothing buffered may leak into the first child's output
+    sys.stderr.flush()
+
+    reader = os.fdopen(proto_in, "rb")
+    writer = os.fdopen(proto_out, "wb", buffering=0)
+    writer.write(json.dumps({"ready": True, "rss_kb": _rss_kb()}).encode() + b"\n")
+    for line in reader:
+        try:
+            result = _run_job(json.loads(line), (proto_in, proto_out))
+        except Exception as e:
+            result = {"returncode": 1, "timed_out": False, "stdout": "", "stderr": str(e)}
+        writer.write(json.dumps(result).encode() + b"\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,22 @@ Tool registry — central registry for all available tools.
 
 Handles tool discovery, registration, execution, and schema generation.
 Optionally enforces per-tool rate limiting via ToolRateLimiter.
+
+Schemas are cached per registry version: anything that changes the visible
+tool set (register, unregister, enable/disable, a lazy tool's schema being
+refreshed on load) bumps the version, and schema sets are rebuilt — and
+re-serialized — only on the first request after that.
 """
 
 import asyncio
+import json
 import logging
 import time
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 from tools.base import Tool, ToolResult
+from tools.lazy_tool import LazyTool
 
 logger = logging.getLogger("frood.tools.registry")
 
@@ -47,6 +56,32 @@ _CODE_TASK_TYPES = {
 }
 
 
+# Distinct (filter, whitelist) combinations kept per version; callers use a
+# handful, so this only guards against unbounded ad-hoc whitelists.
+_SCHEMA_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class SchemaSet:
+    """OpenAI function-calling schemas for one registry version and filter.
+
+    Only the JSON array is cached (``encoded``), ready to be spliced into a
+    request body. ``schemas`` decodes a fresh list on each access, so callers
+    may mutate what they get without touching the shared cache entry.
+    """
+
+    version: int
+    encoded: str
+    count: int
+
+    @property
+    def schemas(self) -> list[dict]:
+        return json.loads(self.encoded)
+
+    def __len__(self) -> int:
+        return self.count
+
+
 class ToolRegistry:
     """Manages all available tools for agent execution."""
 
@@ -55,15 +90,30 @@ class ToolRegistry:
         self._rate_limiter = rate_limiter
         self._effectiveness_store = effectiveness_store
         self._disabled: set[str] = set()
+        self._version = 0
+        self._schema_cache: dict[tuple, SchemaSet] = {}
+
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the set of visible tool schemas may change."""
+        return self._version
+
+    def _invalidate_schemas(self):
+        self._version += 1
+        self._schema_cache.clear()
 
     def register(self, tool: Tool):
         """Register a tool."""
         self._tools[tool.name] = tool
+        if isinstance(tool, LazyTool):
+            tool.on_schema_change = self._invalidate_schemas
+        self._invalidate_schemas()
         logger.debug(f"Registered tool: {tool.name}")
 
     def unregister(self, name: str):
         """Remove a tool from the registry."""
-        self._tools.pop(name, None)
+        if self._tools.pop(name, None) is not None:
+            self._invalidate_schemas()
 
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -73,10 +123,12 @@ class ToolRegistry:
         """Enable or disable a tool by name. Returns True if tool exists."""
         if name not in self._tools:
             return False
-        if enabled:
-            self._disabled.discard(name)
-        else:
-            self._disabled.add(name)
+        if enabled != (name not in self._disabled):
+            if enabled:
+                self._disabled.discard(name)
+            else:
+                self._disabled.add(name)
+            self._invalidate_schemas()
         logger.info(f"Tool '{name}' {'enabled' if enabled else 'disabled'}")
         return True
 
@@ -159,11 +211,38 @@ class ToolRegistry:
 
         return result
 
+    def schema_set(
+        self, task_type: str | None = None, names: Iterable[str] | None = None
+    ) -> SchemaSet:
+        """Cached schemas for enabled tools, filtered by task type and/or whitelist.
+
+        ``task_type=None`` skips the code-tool filter (see
+        ``schemas_for_task_type``); ``names=None`` allows every tool.
+        """
+        code_only_excluded = task_type is not None and task_type not in _CODE_TASK_TYPES
+        whitelist = frozenset(names) if names is not None else None
+        version = self._version
+        key = (version, code_only_excluded, whitelist)
+        cached = self._schema_cache.get(key)
+        if cached is not None:
+            return cached
+
+        schemas = [
+            tool.to_schema()
+            for tool in list(self._tools.values())
+            if tool.name not in self._disabled
+            and not (code_only_excluded and tool.name in _CODE_ONLY_TOOLS)
+            and (whitelist is None or tool.name in whitelist)
+        ]
+        cached = SchemaSet(version, json.dumps(schemas), len(schemas))
+        if len(self._schema_cache) >= _SCHEMA_CACHE_SIZE:
+            self._schema_cache.clear()
+        self._schema_cache[key] = cached
+        return cached
+
     def all_schemas(self) -> list[dict]:
         """Get OpenAI function-calling schemas for all enabled tools."""
-        return [
-            tool.to_schema() for tool in self._tools.values() if tool.name not in self._disabled
-        ]
+        return self.schema_set().schemas
 
     def schemas_for_task_type(self, task_type: str) -> list[dict]:
         """Get tool schemas filtered by task type.
@@ -176,14 +255,7 @@ class ToolRegistry:
 
         Code task types receive the full tool set.
         """
-        if task_type in _CODE_TASK_TYPES:
-            return self.all_schemas()
-
-        return [
-            tool.to_schema()
-            for tool in self._tools.values()
-            if tool.name not in self._disabled and tool.name not in _CODE_ONLY_TOOLS
-        ]
+        return self.schema_set(task_type).schemas
 
     def list_tools(self) -> list[dict]:
         """List all registered tools with metadata."""
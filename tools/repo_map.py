@@ -5,13 +5,17 @@ Tree-sitter based repository mapping. Produces a compact
 representation of the codebase showing file structure, class hierarchies,
 and function signatures — giving LLMs efficient context about the project
 without reading every file.
+
+Signatures come from the shared SymbolIndex (tools/symbol_index.py), so only
+files changed since the previous map are parsed again.
 """
 
-import ast
+import asyncio
 import logging
 import os
 
 from tools.base import Tool, ToolResult
+from tools.symbol_index import INDEXED_EXTS, SymbolIndex, get_symbol_index
 
 logger = logging.getLogger("frood.tools.repo_map")
 
@@ -25,6 +29,7 @@ _SKIP_DIRS = {
     "build",
     ".tox",
     ".mypy_cache",
+    ".frood",
 }
 _CODE_EXTS = {".py", ".js", ".ts", ".jsx", ".tsx", ".go", ".rs", ".java", ".rb", ".php"}
 _CONFIG_EXTS = {".json", ".yaml", ".yml", ".toml", ".ini", ".cfg"}
@@ -36,6 +41,13 @@ class RepoMapTool(Tool):
 
     def __init__(self, workspace_path: str = "."):
         self._workspace = workspace_path
+        self._index: SymbolIndex | None = None
+
+    @property
+    def index(self) -> SymbolIndex:
+        if self._index is None:
+            self._index = get_symbol_index(self._workspace)
+        return self._index
 
     @property
     def name(self) -> str:
@@ -89,7 +101,9 @@ class RepoMapTool(Tool):
         root = os.path.join(self._workspace, path) if path else self._workspace
         if not os.path.isdir(root):
             return ToolResult(error=f"Directory not found: {path}", success=False)
+        return await asyncio.to_thread(self._build_map, root, depth, signatures, max_files)
 
+    def _build_map(self, root: str, depth: int, signatures: bool, max_files: int) -> ToolResult:
         lines = [f"## Repository Map: {os.path.basename(root) or '.'}\n"]
 
         # Collect all files
@@ -135,11 +149,18 @@ class RepoMapTool(Tool):
         # Signatures
         if signatures:
             lines.append("### Code Signatures\n")
+            indexed = [f[1] for f in code_files if f[2] in INDEXED_EXTS]
+            self.index.update(indexed)
             files_mapped = 0
             for rel_path, full_path, ext in code_files:
                 if files_mapped >= max_files:
                     break
-                sigs = self._extract_signatures(full_path, ext)
+                if ext not in INDEXED_EXTS:
+                    continue
+                sigs = [
+                    f"{'  ' if sym.depth else ''}{sym.signature}  # L{sym.line}"
+                    for sym in self.index.outline(self.index.relpath(full_path))
+                ]
                 if sigs:
                     lines.append(f"**{rel_path}**")
                     for sig in sigs:
@@ -152,103 +173,3 @@ class RepoMapTool(Tool):
             output = output[:100000] + "\n... (map truncated)"
 
         return ToolResult(output=output, success=True)
-
-    def _extract_signatures(self, filepath: str, ext: str) -> list[str]:
-        """Extract class/function signatures from a source file."""
-        if ext == ".py":
-            return self._python_signatures(filepath)
-        elif ext in (".js", ".ts", ".jsx", ".tsx"):
-            return self._js_signatures(filepath)
-        return []
-
-    def _python_signatures(self, filepath: str) -> list[str]:
-        try:
-            with open(filepath, encoding="utf-8", errors="replace") as f:
-                tree = ast.parse(f.read(), filename=filepath)
-        except SyntaxError:
-            return []
-
-        sigs = []
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, ast.ClassDef):
-                bases = ", ".join(getattr(b, "id", getattr(b, "attr", "?")) for b in node.bases)
-                sigs.append(f"class {node.name}({bases})  # L{node.lineno}")
-                for item in node.body:
-                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        args = self._format_args(item.args)
-                        prefix = "async " if isinstance(item, ast.AsyncFunctionDef) else ""
-                        sigs.append(f"  {prefix}def {item.name}({args})  # L{item.lineno}")
-            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                args = self._format_args(node.args)
-                prefix = "async " if isinstance(node, ast.AsyncFunctionDef) else ""
-                sigs.append(f"{prefix}def {node.name}({args})  # L{node.lineno}")
-        return sigs
-
-    @staticmethod
-    def _format_args(args: ast.arguments) -> str:
-        """Format function arguments compactly."""
-        parts = []
-        for a in args.args:
-            annotation = ""
-            if a.annotation:
-                if isinstance(a.annotation, ast.Name):
-                    annotation = f": {a.annotation.id}"
-                elif isinstance(a.annotation, ast.Constant):
-                    annotation = f": {a.annotation.value}"
-            parts.append(f"{a.arg}{annotation}")
-        if len(parts) > 5:
-            parts = parts[:5] + ["..."]
-        return ", ".join(parts)
-
-    def _js_signatures(self, filepath: str) -> list[str]:
-        """Extract JS/TS signatures via regex (no tree-sitter dependency)."""
-        import re
-
-        sigs = []
-        try:
-            with open(filepath, encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
-        except Exception:
-            return []
-
-        class_re = re.compile(r"(?:export\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?")
-        func_re = re.compile(r"(?:export\s+)?(?:async\s+)?function\s+(\w+)\s*\(([^)]*)\)")
-        arrow_re = re.compile(
-            r"(?:export\s+)?(?:const|let)\s+(\w+)\s*=\s*(?:async\s+)?\(([^)]*)\)\s*(?:=>|:\s*\w+\s*=>)"
-        )
-        method_re = re.compile(r"^\s+(?:async\s+)?(\w+)\s*\(([^)]*)\)\s*\{")
-
-        in_class = False
-        for i, line in enumerate(lines):
-            m = class_re.search(line)
-            if m:
-                extends = f" extends {m.group(2)}" if m.group(2) else ""
-                sigs.append(f"class {m.group(1)}{extends}  # L{i + 1}")
-                in_class = True
-                continue
-
-            m = func_re.search(line)
-            if m:
-                params = m.group(2).strip()
-                if len(params) > 40:
-                    params = params[:40] + "..."
-                sigs.append(f"function {m.group(1)}({params})  # L{i + 1}")
-                continue
-
-            m = arrow_re.search(line)
-            if m:
-                params = m.group(2).strip()
-                if len(params) > 40:
-                    params = params[:40] + "..."
-                sigs.append(f"const {m.group(1)} = ({params}) =>  # L{i + 1}")
-                continue
-
-            if in_class:
-                m = method_re.match(line)
-                if m and m.group(1) not in ("if", "for", "while", "switch", "try"):
-                    params = m.group(2).strip()
-                    if len(params) > 40:
-                        params = params[:40] + "..."
-                    sigs.append(f"  {m.group(1)}({params})  # L{i + 1}")
-
-        return sigs
@@ -4,12 +4,30 @@ Security analyzer tool — risk-score tool calls and code changes.
 Inspired by OpenHands' LLMSecurityAnalyzer. Analyzes proposed actions
 and code for security risks, assigning a risk level and providing
 remediation guidance.
+
+Each pattern table is compiled into a PatternSet: one combined alternation
+finds candidate regions in a single pass, and only those regions are
+re-checked pattern by pattern. Line numbers come from a newline index.
+
+Workspace scans (secrets, OWASP) keep a per-file content-hash cache in
+<workspace>/.frood/security_scan.db, so only changed files are rescanned;
+large batches of changed files are scanned in a process pool.
 """
 
+import asyncio
+import bisect
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
+from core.sqlite_db import open_db
 from tools.base import Tool, ToolResult
 
 logger = logging.getLogger("frood.tools.security_analyzer")
@@ -94,11 +112,282 @@ _PATTERNS = {
 }
 
 
+_SECRET_PATTERNS = [
+    (r"AKIA[0-9A-Z]{16}", "AWS Access Key ID", RISK_CRITICAL),
+    (r"ghp_[A-Za-z0-9_]{36,}", "GitHub Personal Access Token", RISK_CRITICAL),
+    (r"xoxb-[0-9A-Za-z-]+", "Slack Bot Token", RISK_CRITICAL),
+    (
+        r"-----BEGIN\s*(RSA|DSA|EC|OPENSSH|PGP)?\s*PRIVATE KEY-----",
+        "Private Key",
+        RISK_CRITICAL,
+    ),
+]
+
+_OWASP_PATTERNS = [
+    # SQL Injection — string concatenation in SQL queries
+    (
+        r"(SELECT|INSERT|UPDATE|DELETE)\s+.*['\"]\s*\+",
+        "SQL Injection — string concatenation in SQL query",
+        RISK_CRITICAL,
+    ),
+    (
+        r"f['\"].*\{.*\}.*(?:SELECT|INSERT|UPDATE|DELETE)\s",
+        "SQL Injection — f-string in SQL query",
+        RISK_CRITICAL,
+    ),
+    # Command Injection
+    (r"os\.system\s*\(", "Command Injection — os.system()", RISK_CRITICAL),
+    (
+        r"subprocess\.[a-z]+\(.*shell\s*=\s*True",
+        "Command Injection — subprocess with shell=True",
+        RISK_CRITICAL,
+    ),
+    # XSS (single pattern — avoids double-counting from overlapping regexes)
+    (r"\.innerHTML\s*\+?=", "XSS — innerHTML assignment", RISK_CRITICAL),
+]
+
+_BINARY_EXTS = (
+    ".pyc",
+    ".pyo",
+    ".so",
+    ".o",
+    ".a",
+    ".png",
+    ".jpg",
+    ".gif",
+    ".ico",
+    ".zip",
+    ".tar",
+    ".gz",
+    ".whl",
+)
+_OWASP_EXTS = (".py", ".js", ".ts", ".jsx", ".tsx", ".html", ".htm", ".php", ".rb")
+_WALK_SKIP_DIRS = {".git", ".venv", "venv", "node_modules", "__pycache__", ".tox"}
+
+# Per-file read cap for workspace scans
+_MAX_SCAN_BYTES = 200_000
+
+# Below this many changed files, scan inline — process start-up costs more.
+PARALLEL_SCAN_THRESHOLD = 64
+
+SCAN_CACHE_FILENAME = "security_scan.db"
+# Bumped when cached rows must be discarded (v1: secret contexts redacted).
+_SCAN_CACHE_VERSION = 1
+
+
+def redact_secret(secret: str) -> str:
+    """A short prefix plus a hash of a matched secret.
+
+    Enough to tell findings apart and locate them, without the credential
+    itself ending up in reports, issues or the scan cache.
+    """
+    digest = hashlib.sha256(secret.encode("utf-8", errors="replace")).hexdigest()[:12]
+    return f"{secret[:4]}...(sha256:{digest})"
+
+
+class PatternSet:
+    """A table of (pattern, description, risk) rules scanned in one pass.
+
+    The combined alternation locates candidate regions; each rule is then
+    re-run over just those regions so overlapping rules all still report.
+    """
+
+    def __init__(self, rules: list[tuple[str, str, str]], flags: int = 0):
+        self.rules = [(re.compile(p, flags), desc, risk) for p, desc, risk in rules]
+        self._combined = re.compile("|".join(f"(?:{p})" for p, _, _ in rules), flags)
+
+    def scan(self, text: str, describe=None, context_chars: int = 20) -> list[dict]:
+        """Return findings in rule order, then position.
+
+        describe(description) may rewrite each description (e.g. to add a path).
+        context_chars=0 is for secret rules: the context is the redacted match
+        instead of its surroundings.
+        """
+        regions: list[list[int]] = []
+        newlines: list[int] | None = None
+        for m in self._combined.finditer(text):
+            start = text.rfind("\n", 0, m.start()) + 1
+            end = text.find("\n", m.end())
+            end = len(text) if end == -1 else end
+            if regions and start <= regions[-1][1]:
+                regions[-1][1] = max(regions[-1][1], end)
+            else:
+                regions.append([start, end])
+        if not regions:
+            return []
+
+        newlines = [m.start() for m in re.finditer("\n", text)]
+        findings = []
+        for pattern, desc, risk in self.rules:
+            for start, end in regions:
+                for match in pattern.finditer(text, start, end):
+                    if context_chars:
+                        context = text[
+                            max(0, match.start() - context_chars) : match.end() + context_chars
+                        ].strip()[:100]
+                    else:
+                        context = redact_secret(match.group())
+                    findings.append(
+                        {
+                            "risk": risk,
+                            "description": describe(desc) if describe else desc,
+                            "line": bisect.bisect_left(newlines, match.start()) + 1,
+                            "context": context,
+                        }
+                    )
+        return findings
+
+
+_CODE_RULES = PatternSet(
+    [(p, desc, risk) for risk, patterns in _PATTERNS.items() for p, desc in patterns],
+    re.IGNORECASE,
+)
+_SECRET_RULES = PatternSet(_SECRET_PATTERNS)
+_OWASP_RULES = PatternSet(_OWASP_PATTERNS, re.IGNORECASE)
+
+
+def _scan_workspace_file(job: tuple[str, str, str]) -> tuple[str, list[dict]]:
+    """Scan one file for a workspace scan kind. Runs in worker processes."""
+    kind, full_path, rel_path = job
+    try:
+        with open(full_path, encoding="utf-8", errors="replace") as f:
+            content = f.read(_MAX_SCAN_BYTES)
+    except Exception:
+        return rel_path, []
+    if kind == "secrets":
+        return rel_path, _SECRET_RULES.scan(
+            content, describe=lambda d: f"{d} found in {rel_path}", context_chars=0
+        )
+    return rel_path, _OWASP_RULES.scan(content, describe=lambda d: f"{d} in {rel_path}")
+
+
+def finding_fingerprint(scope: str, finding: dict) -> str:
+    """Stable identity for a finding, independent of its line number."""
+    key = "|".join(
+        [
+            scope,
+            finding.get("risk", finding.get("severity", "")),
+            finding.get("description", ""),
+            finding.get("context", finding.get("detail", "")),
+        ]
+    )
+    return hashlib.sha256(key.encode("utf-8", errors="replace")).hexdigest()
+
+
+class ScanCache:
+    """Per-file scan results keyed by content hash, plus previously seen findings."""
+
+    def __init__(self, db_path: str | Path):
+        self._db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = open_db(
+            self._db_path,
+            """
+            CREATE TABLE IF NOT EXISTS scanned_files (
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                findings TEXT NOT NULL,
+                PRIMARY KEY (kind, path)
+            );
+            CREATE TABLE IF NOT EXISTS seen_findings (
+                scope TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (scope, fingerprint)
+            );
+            """,
+        )
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _SCAN_CACHE_VERSION:
+            # Older caches stored secret matches in plaintext.
+            self._conn.execute("DELETE FROM scanned_files")
+            self._conn.execute("DELETE FROM seen_findings")
+            self._conn.execute(f"PRAGMA user_version = {_SCAN_CACHE_VERSION}")
+
+    def entries(self, kind: str) -> dict[str, tuple[float, int, str, list[dict]]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime, size, hash, findings FROM scanned_files WHERE kind = ?",
+                (kind,),
+            ).fetchall()
+        return {r[0]: (r[1], r[2], r[3], json.loads(r[4])) for r in rows}
+
+    def store(self, kind: str, rows: list[tuple[str, float, int, str, list[dict]]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scanned_files (kind, path, mtime, size, hash, findings) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(kind, path, m, s, h, json.dumps(f)) for path, m, s, h, f in rows],
+            )
+
+    def forget(self, kind: str, paths: list[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM scanned_files WHERE kind = ? AND path = ?",
+                [(kind, p) for p in paths],
+            )
+
+    def record_findings(self, scope: str, fingerprints: list[str]) -> set[str]:
+        """Remember the current findings for scope; return those not seen before.
+
+        Findings that disappeared are forgotten, so a regression reports again.
+        """
+        now = time.time()
+        current = set(fingerprints)
+        with self._lock:
+            known = {
+                r[0]
+                for r in self._conn.execute(
+                    "SELECT fingerprint FROM seen_findings WHERE scope = ?", (scope,)
+                )
+            }
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "DELETE FROM seen_findings WHERE scope = ? AND fingerprint = ?",
+                [(scope, fp) for fp in known - current],
+            )
+            self._conn.executemany(
+                "INSERT INTO seen_findings (scope, fingerprint, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(scope, fingerprint) "
+                "DO UPDATE SET last_seen = excluded.last_seen",
+                [(scope, fp, now, now) for fp in current],
+            )
+            self._conn.execute("COMMIT")
+        return current - known
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _file_digest(path: str) -> str | None:
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            h.update(f.read(_MAX_SCAN_BYTES))
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
 class SecurityAnalyzerTool(Tool):
     """Analyze code and commands for security risks."""
 
     def __init__(self, workspace_path: str = "."):
         self._workspace = workspace_path
+        self._cache: ScanCache | None = None
+
+    @property
+    def cache(self) -> ScanCache:
+        """Scan cache under the workspace's .frood directory (opened on first use)."""
+        if self._cache is None:
+            self._cache = ScanCache(
+                os.path.join(os.path.realpath(self._workspace), ".frood", SCAN_CACHE_FILENAME)
+            )
+        return self._cache
 
     @property
     def name(self) -> str:
@@ -183,31 +472,15 @@ class SecurityAnalyzerTool(Tool):
         elif action == "scan_dependencies":
             return self._scan_dependencies()
         elif action == "scan_secrets":
-            return self._scan_secrets()
+            return await asyncio.to_thread(self._scan_secrets)
         elif action == "scan_owasp":
-            return self._scan_owasp()
+            return await asyncio.to_thread(self._scan_owasp)
         else:
             return ToolResult(error=f"Unknown action: {action}", success=False)
 
     def _scan_text(self, text: str, source: str = "input") -> ToolResult:
         """Scan text for security patterns."""
-        findings = []
-        for risk_level, patterns in _PATTERNS.items():
-            for pattern, description in patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE):
-                    # Find line number
-                    line_num = text[: match.start()].count("\n") + 1
-                    context = text[max(0, match.start() - 20) : match.end() + 20].strip()
-                    findings.append(
-                        {
-                            "risk": risk_level,
-                            "description": description,
-                            "line": line_num,
-                            "context": context[:100],
-                        }
-                    )
-
-        return self._format_findings(findings, source)
+        return self._format_findings(_CODE_RULES.scan(text), source)
 
     def _scan_file(self, path: str) -> ToolResult:
         """Scan a file for security patterns."""
@@ -344,146 +617,95 @@ class SecurityAnalyzerTool(Tool):
 
         return self._format_findings(findings, source="requirements.txt dependency scan")
 
-    def _scan_secrets(self) -> ToolResult:
-        """Scan workspace files for leaked secrets and credentials."""
-        secret_patterns = [
-            (r"AKIA[0-9A-Z]{16}", "AWS Access Key ID", RISK_CRITICAL),
-            (r"ghp_[A-Za-z0-9_]{36,}", "GitHub Personal Access Token", RISK_CRITICAL),
-            (r"xoxb-[0-9A-Za-z-]+", "Slack Bot Token", RISK_CRITICAL),
-            (
-                r"-----BEGIN\s*(RSA|DSA|EC|OPENSSH|PGP)?\s*PRIVATE KEY-----",
-                "Private Key",
-                RISK_CRITICAL,
-            ),
-        ]
+    def scan_workspace(self, kind: str) -> list[dict]:
+        """Findings for a workspace scan kind ("secrets" or "owasp").
 
-        findings = []
+        Files whose (mtime, size) or content hash are unchanged reuse their
+        cached findings; the rest are rescanned, in parallel for big batches.
+        """
         workspace_real = os.path.realpath(self._workspace)
-
-        # Walk workspace, skip hidden dirs and common non-text dirs
-        skip_dirs = {
-            ".git",
-            ".venv",
-            "venv",
-            "node_modules",
-            "__pycache__",
-            ".tox",
-        } | _SCAN_EXCLUDE_DIRS
+        files = self._scan_targets(kind, workspace_real)
+        cache = self.cache
+        cached = cache.entries(kind)
+
+        results: dict[str, list[dict]] = {}
+        touched: list[tuple[str, float, int, str, list[dict]]] = []
+        pending: list[tuple[str, str, float, int, str]] = []
+        for full, rel in files:
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            prev = cached.get(rel)
+            if prev and prev[0] == st.st_mtime and prev[1] == st.st_size:
+                results[rel] = prev[3]
+                continue
+            digest = _file_digest(full)
+            if digest is None:
+                continue
+            if prev and prev[2] == digest:
+                results[rel] = prev[3]
+                touched.append((rel, st.st_mtime, st.st_size, digest, prev[3]))
+            else:
+                pending.append((full, rel, st.st_mtime, st.st_size, digest))
+
+        scanned = self._scan_files(kind, [(kind, full, rel) for full, rel, *_ in pending])
+        fresh = [(rel, m, sz, h, scanned.get(rel, [])) for _, rel, m, sz, h in pending]
+        for rel, *_, found in fresh:
+            results[rel] = found
+        if touched or fresh:
+            cache.store(kind, touched + fresh)
+        gone = [rel for rel in cached if rel not in results]
+        if gone:
+            cache.forget(kind, gone)
+        if pending:
+            logger.info(f"{kind} scan: {len(pending)} changed of {len(files)} files rescanned")
+
+        return [f for rel in sorted(results) for f in results[rel]]
+
+    @staticmethod
+    def _scan_targets(kind: str, workspace_real: str) -> list[tuple[str, str]]:
+        """(full, relative) paths a workspace scan of this kind covers."""
+        skip_dirs = _WALK_SKIP_DIRS | (
+            _SCAN_EXCLUDE_DIRS if kind == "secrets" else _OWASP_EXCLUDE_DIRS
+        )
+        targets = []
         for root, dirs, files in os.walk(workspace_real):
             dirs[:] = [d for d in dirs if d not in skip_dirs]
             for fname in files:
-                # Only scan text-like files
-                if fname.endswith(
-                    (
-                        ".pyc",
-                        ".pyo",
-                        ".so",
-                        ".o",
-                        ".a",
-                        ".png",
-                        ".jpg",
-                        ".gif",
-                        ".ico",
-                        ".zip",
-                        ".tar",
-                        ".gz",
-                        ".whl",
-                    )
-                ):
+                if kind == "secrets":
+                    # Only scan text-like files
+                    if fname.endswith(_BINARY_EXTS) or fname.startswith(SCAN_CACHE_FILENAME):
+                        continue
+                elif not fname.endswith(_OWASP_EXTS):
                     continue
                 if fname in _SCAN_EXCLUDE_FILES:
                     continue
                 fpath = os.path.join(root, fname)
-                rel_path = os.path.relpath(fpath, workspace_real)
-                try:
-                    with open(fpath, encoding="utf-8", errors="replace") as f:
-                        file_content = f.read(200_000)  # Cap at 200KB per file
-                except Exception:
-                    continue
+                targets.append((fpath, os.path.relpath(fpath, workspace_real)))
+        return targets
+
+    @staticmethod
+    def _scan_files(kind: str, jobs: list[tuple[str, str, str]]) -> dict[str, list[dict]]:
+        if len(jobs) >= PARALLEL_SCAN_THRESHOLD:
+            workers = min(len(jobs) // 16 + 1, os.cpu_count() or 1, 8)
+            try:
+                ctx = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                    return dict(pool.map(_scan_workspace_file, jobs, chunksize=32))
+            except Exception as e:
+                logger.warning(f"Parallel {kind} scan failed, scanning inline: {e}")
+        return dict(_scan_workspace_file(job) for job in jobs)
 
-                for pattern, desc, risk in secret_patterns:
-                    for match in re.finditer(pattern, file_content):
-                        line_num = file_content[: match.start()].count("\n") + 1
-                        findings.append(
-                            {
-                                "risk": risk,
-                                "description": f"{desc} found in {rel_path}",
-                                "line": line_num,
-                                "context": match.group()[:40] + "...",
-                            }
-                        )
-
-        return self._format_findings(findings, source="workspace secret scan")
+    def _scan_secrets(self) -> ToolResult:
+        """Scan workspace files for leaked secrets and credentials."""
+        return self._format_findings(self.scan_workspace("secrets"), source="workspace secret scan")
 
     def _scan_owasp(self) -> ToolResult:
         """Scan workspace for OWASP Top 10 vulnerability patterns."""
-        owasp_patterns = [
-            # SQL Injection — string concatenation in SQL queries
-            (
-                r"(SELECT|INSERT|UPDATE|DELETE)\s+.*['\"]\s*\+",
-                "SQL Injection — string concatenation in SQL query",
-                RISK_CRITICAL,
-            ),
-            (
-                r"f['\"].*\{.*\}.*(?:SELECT|INSERT|UPDATE|DELETE)\s",
-                "SQL Injection — f-string in SQL query",
-                RISK_CRITICAL,
-            ),
-            # Command Injection
-            (r"os\.system\s*\(", "Command Injection — os.system()", RISK_CRITICAL),
-            (
-                r"subprocess\.[a-z]+\(.*shell\s*=\s*True",
-                "Command Injection — subprocess with shell=True",
-                RISK_CRITICAL,
-            ),
-            # XSS (single pattern — avoids double-counting from overlapping regexes)
-            (r"\.innerHTML\s*\+?=", "XSS — innerHTML assignment", RISK_CRITICAL),
-        ]
-
-        findings = []
-        workspace_real = os.path.realpath(self._workspace)
-
-        skip_dirs = {
-            ".git",
-            ".venv",
-            "venv",
-            "node_modules",
-            "__pycache__",
-            ".tox",
-        } | _OWASP_EXCLUDE_DIRS
-        for root, dirs, files in os.walk(workspace_real):
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-            for fname in files:
-                if not fname.endswith(
-                    (".py", ".js", ".ts", ".jsx", ".tsx", ".html", ".htm", ".php", ".rb")
-                ):
-                    continue
-                if fname in _SCAN_EXCLUDE_FILES:
-                    continue
-                fpath = os.path.join(root, fname)
-                rel_path = os.path.relpath(fpath, workspace_real)
-                try:
-                    with open(fpath, encoding="utf-8", errors="replace") as f:
-                        file_content = f.read(200_000)
-                except Exception:
-                    continue
-
-                for pattern, desc, risk in owasp_patterns:
-                    for match in re.finditer(pattern, file_content, re.IGNORECASE):
-                        line_num = file_content[: match.start()].count("\n") + 1
-                        context = file_content[
-                            max(0, match.start() - 20) : match.end() + 20
-                        ].strip()
-                        findings.append(
-                            {
-                                "risk": risk,
-                                "description": f"{desc} in {rel_path}",
-                                "line": line_num,
-                                "context": context[:100],
-                            }
-                        )
-
-        return self._format_findings(findings, source="OWASP vulnerability scan")
+        return self._format_findings(
+            self.scan_workspace("owasp"), source="OWASP vulnerability scan"
+        )
 
     def _format_findings(self, findings: list[dict], source: str) -> ToolResult:
         """Format security findings into structured output."""
@@ -0,0 +1,616 @@
+"""
+Symbol index — persistent, incremental code index shared by repo_map and code_intel.
+
+Parses Python (ast) and JavaScript/TypeScript (regex) source files into a
+SQLite database under <workspace>/.frood/symbol_index.db:
+
+- files    — path, mtime, size and content hash of every indexed file
+- symbols  — classes, functions, methods and constants with line ranges
+- imports  — import statements (Python)
+- refs     — identifier references (Python names and attribute accesses)
+
+Only files whose (mtime, size) changed are re-read; if the content hash is
+also unchanged the stored entries are kept and only the stat is updated.
+Large batches of changed files are parsed in parallel in a process pool.
+"""
+
+import ast
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.sqlite_db import open_db, select_in
+
+logger = logging.getLogger("frood.tools.symbol_index")
+
+PYTHON_EXTS = {".py"}
+JS_EXTS = {".js", ".jsx", ".ts", ".tsx", ".mjs"}
+INDEXED_EXTS = PYTHON_EXTS | JS_EXTS
+
+SKIP_DIRS = {
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    "dist",
+    "build",
+    ".tox",
+    ".mypy_cache",
+    ".frood",
+}
+
+# Below this many changed files, parse inline — process start-up costs more.
+PARALLEL_PARSE_THRESHOLD = 32
+
+# Files larger than this are recorded but not parsed (generated bundles etc.)
+MAX_PARSE_BYTES = 2 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    parsed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    file TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    is_async INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols(file);
+CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
+CREATE TABLE IF NOT EXISTS imports (
+    file TEXT NOT NULL,
+    module TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    is_from INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_imports_file ON imports(file);
+CREATE TABLE IF NOT EXISTS refs (
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_refs_name ON refs(name);
+CREATE INDEX IF NOT EXISTS idx_refs_file ON refs(file);
+"""
+
+
+@dataclass
+class Symbol:
+    """A definition row from the index."""
+
+    file: str  # workspace-relative path
+    kind: str  # class | function | method | constant
+    name: str
+    parent: str  # enclosing class for methods, "" otherwise
+    depth: int  # 0 = module level, 1 = direct member of a top-level class, ...
+    line: int
+    end_line: int
+    is_async: bool
+    params: str  # base classes for classes, argument names for functions
+    signature: str  # compact one-line signature (repo_map style)
+
+
+# ---------------------------------------------------------------------------
+# Parsing (module-level so it can run in worker processes)
+# ---------------------------------------------------------------------------
+
+
+def _format_args(args: ast.arguments) -> str:
+    """Format function arguments compactly."""
+    parts = []
+    for a in args.args:
+        annotation = ""
+        if a.annotation:
+            if isinstance(a.annotation, ast.Name):
+                annotation = f": {a.annotation.id}"
+            elif isinstance(a.annotation, ast.Constant):
+                annotation = f": {a.annotation.value}"
+        parts.append(f"{a.arg}{annotation}")
+    if len(parts) > 5:
+        parts = parts[:5] + ["..."]
+    return ", ".join(parts)
+
+
+def _parse_python(source: str, filename: str) -> dict | None:
+    try:
+        tree = ast.parse(source, filename=filename)
+    except (SyntaxError, ValueError):
+        return None
+
+    symbols: list[tuple] = []
+    imports: list[tuple] = []
+    refs: set[tuple[str, int]] = set()
+
+    def visit(node: ast.AST, depth: int, parent_class: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                bases = ", ".join(getattr(b, "id", getattr(b, "attr", "?")) for b in child.bases)
+                symbols.append(
+                    (
+                        "class",
+                        child.name,
+                        parent_class,
+                        depth,
+                        child.lineno,
+                        child.end_lineno or child.lineno,
+                        0,
+                        bases,
+                        f"class {child.name}({bases})",
+                    )
+                )
+                visit(child, depth + 1, child.name)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                is_async = isinstance(child, ast.AsyncFunctionDef)
+                prefix = "async " if is_async else ""
+                symbols.append(
+                    (
+                        "method" if parent_class else "function",
+                        child.name,
+                        parent_class,
+                        depth,
+                        child.lineno,
+                        child.end_lineno or child.lineno,
+                        int(is_async),
+                        ", ".join(a.arg for a in child.args.args),
+                        f"{prefix}def {child.name}({_format_args(child.args)})",
+                    )
+                )
+                visit(child, depth + 1, "")
+            else:
+                if depth == 0 and isinstance(child, ast.Assign):
+                    for target in child.targets:
+                        if isinstance(target, ast.Name) and target.id.isupper():
+                            symbols.append(
+                                (
+                                    "constant",
+                                    target.id,
+                                    "",
+                                    0,
+                                    child.lineno,
+                                    child.end_lineno or child.lineno,
+                                    0,
+                                    "",
+                                    target.id,
+                                )
+                            )
+                visit(child, depth, parent_class)
+
+    visit(tree, 0, "")
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append((alias.name, alias.name, node.lineno, 0))
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                imports.append((node.module or "", alias.name, node.lineno, 1))
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            refs.add((node.id, node.lineno))
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load):
+            refs.add((node.attr, node.lineno))
+
+    return {"symbols": symbols, "imports": imports, "refs": sorted(refs)}
+
+
+_JS_CLASS_RE = re.compile(r"(?:export\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?")
+_JS_FUNC_RE = re.compile(r"(?:export\s+)?(async\s+)?function\s+(\w+)\s*\(([^)]*)\)")
+_JS_ARROW_RE = re.compile(
+    r"(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(async\s+)?\(([^)]*)\)\s*(?:=>|:\s*\w+\s*=>)"
+)
+_JS_METHOD_RE = re.compile(r"^\s+(async\s+)?(\w+)\s*\(([^)]*)\)\s*\{")
+_JS_KEYWORDS = {"if", "for", "while", "switch", "try", "catch", "return", "function"}
+
+
+def _short(params: str) -> str:
+    params = params.strip()
+    return params[:40] + "..." if len(params) > 40 else params
+
+
+def _parse_js(source: str) -> dict:
+    """Regex extraction for JS/TS (no tree-sitter dependency)."""
+    symbols: list[tuple] = []
+    current_class = ""
+    for i, line in enumerate(source.splitlines(), start=1):
+        m = _JS_CLASS_RE.search(line)
+        if m:
+            extends = f" extends {m.group(2)}" if m.group(2) else ""
+            current_class = m.group(1)
+            symbols.append(
+                (
+                    "class",
+                    m.group(1),
+                    "",
+                    0,
+                    i,
+                    i + 29,
+                    0,
+                    m.group(2) or "",
+                    f"class {m.group(1)}{extends}",
+                )
+            )
+            continue
+        m = _JS_FUNC_RE.search(line)
+        if m:
+            symbols.append(
+                (
+                    "function",
+                    m.group(2),
+                    "",
+                    0,
+                    i,
+                    i + 19,
+                    int(bool(m.group(1))),
+                    m.group(3).strip(),
+                    f"function {m.group(2)}({_short(m.group(3))})",
+                )
+            )
+            continue
+        m = _JS_ARROW_RE.search(line)
+        if m:
+            symbols.append(
+                (
+                    "function",
+                    m.group(1),
+                    "",
+                    0,
+                    i,
+                    i + 19,
+                    int(bool(m.group(2))),
+                    m.group(3).strip(),
+                    f"const {m.group(1)} = ({_short(m.group(3))}) =>",
+                )
+            )
+            continue
+        if current_class:
+            m = _JS_METHOD_RE.match(line)
+            if m and m.group(2) not in _JS_KEYWORDS:
+                symbols.append(
+                    (
+                        "method",
+                        m.group(2),
+                        current_class,
+                        1,
+                        i,
+                        i + 19,
+                        int(bool(m.group(1))),
+                        m.group(3).strip(),
+                        f"{m.group(2)}({_short(m.group(3))})",
+                    )
+                )
+    return {"symbols": symbols, "imports": [], "refs": []}
+
+
+def parse_file(full_path: str) -> dict | None:
+    """Parse one file. Returns None when it cannot be read or parsed."""
+    try:
+        with open(full_path, encoding="utf-8", errors="replace") as f:
+            source = f.read()
+    except OSError:
+        return None
+    ext = os.path.splitext(full_path)[1]
+    if ext in PYTHON_EXTS:
+        return _parse_python(source, full_path)
+    if ext in JS_EXTS:
+        return _parse_js(source)
+    return None
+
+
+def _parse_job(job: tuple[str, str]) -> tuple[str, dict | None]:
+    rel, full = job
+    return rel, parse_file(full)
+
+
+def _content_hash(full_path: str) -> str | None:
+    h = hashlib.sha256()
+    try:
+        with open(full_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+class SymbolIndex:
+    """On-disk symbol index for one workspace."""
+
+    def __init__(self, workspace_path: str, db_path: str | Path | None = None):
+        self._workspace = os.path.abspath(workspace_path)
+        self._db_path = Path(db_path or os.path.join(self._workspace, ".frood", "symbol_index.db"))
+        self._lock = threading.Lock()
+        self._conn = open_db(self._db_path, _SCHEMA)
+
+    @property
+    def workspace(self) -> str:
+        return self._workspace
+
+    def relpath(self, full_path: str) -> str:
+        try:
+            return os.path.relpath(full_path, self._workspace).replace(os.sep, "/")
+        except ValueError:
+            return full_path
+
+    # -- Updating -------------------------------------------------------------
+
+    def collect(self, search_path: str) -> list[str]:
+        """All indexable files under search_path (or search_path itself), sorted."""
+        if os.path.isfile(search_path):
+            return [search_path]
+        files = []
+        for root, dirs, filenames in os.walk(search_path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for fname in filenames:
+                if os.path.splitext(fname)[1] in INDEXED_EXTS:
+                    files.append(os.path.join(root, fname))
+        return sorted(files)
+
+    def refresh(self, search_path: str = "") -> list[str]:
+        """Bring the index up to date for search_path; prune deleted files.
+
+        Returns the workspace-relative paths of the files now in scope.
+        """
+        search_path = search_path or self._workspace
+        files = self.collect(search_path)
+        self.update(files)
+        rels = [self.relpath(f) for f in files]
+        if os.path.isdir(search_path):
+            self._prune(self._scope(search_path), set(rels))
+        return rels
+
+    def update(self, full_paths: list[str]) -> int:
+        """Re-index any of full_paths that changed. Returns the number re-parsed."""
+        known = self._stats_for([self.relpath(p) for p in full_paths])
+        touched: list[tuple[str, float, int, str]] = []
+        changed: list[tuple[str, str, float, int, str]] = []
+
+        for full in full_paths:
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            rel = self.relpath(full)
+            prev = known.get(rel)
+            if prev and prev[0] == st.st_mtime and prev[1] == st.st_size:
+                continue
+            digest = _content_hash(full)
+            if digest is None:
+                continue
+            if prev and prev[2] == digest:
+                touched.append((rel, st.st_mtime, st.st_size, digest))
+            else:
+                changed.append((rel, full, st.st_mtime, st.st_size, digest))
+
+        if touched:
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE files SET mtime = ?, size = ?, hash = ? WHERE path = ?",
+                    [(m, s, h, rel) for rel, m, s, h in touched],
+                )
+        if changed:
+            results = self._parse_all(
+                [(rel, full) for rel, full, _, size, _ in changed if size <= MAX_PARSE_BYTES]
+            )
+            self._store(changed, results)
+        return len(changed)
+
+    def _parse_all(self, jobs: list[tuple[str, str]]) -> dict[str, dict | None]:
+        if len(jobs) >= PARALLEL_PARSE_THRESHOLD:
+            workers = min(len(jobs) // 8 + 1, os.cpu_count() or 1, 8)
+            try:
+                ctx = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                    return dict(pool.map(_parse_job, jobs, chunksize=16))
+            except Exception as e:
+                logger.warning(f"Parallel parse failed, parsing inline: {e}")
+        return dict(_parse_job(job) for job in jobs)
+
+    def _store(self, changed: list[tuple], results: dict[str, dict | None]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for rel, _full, mtime, size, digest in changed:
+                    self._delete_entries(rel)
+                    parsed = results.get(rel)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO files (path, mtime, size, hash, parsed) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (rel, mtime, size, digest, int(parsed is not None)),
+                    )
+                    if parsed is None:
+                        continue
+                    self._conn.executemany(
+                        "INSERT INTO symbols (file, kind, name, parent, depth, line, end_line, "
+                        "is_async, params, signature) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(rel, *row) for row in parsed["symbols"]],
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO imports (file, module, name, line, is_from) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(rel, *row) for row in parsed["imports"]],
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO refs (file, name, line) VALUES (?, ?, ?)",
+                        [(rel, *row) for row in parsed["refs"]],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _delete_entries(self, rel: str) -> None:
+        for table in ("symbols", "imports", "refs"):
+            self._conn.execute(f"DELETE FROM {table} WHERE file = ?", (rel,))  # noqa: S608
+
+    def _stats_for(self, rels: list[str]) -> dict[str, tuple[float, int, str]]:
+        with self._lock:
+            rows = select_in(
+                self._conn,
+                "SELECT path, mtime, size, hash FROM files WHERE path IN ({marks})",
+                rels,
+            )
+        return {path: (mtime, size, digest) for path, mtime, size, digest in rows}
+
+    def _prune(self, scope: str, present: set[str]) -> None:
+        where, args = self._scope_clause("path", scope)
+        with self._lock:
+            stale = [
+                row[0]
+                for row in self._conn.execute(f"SELECT path FROM files WHERE {where}", args)  # noqa: S608
+                if row[0] not in present
+            ]
+            if not stale:
+                return
+            self._conn.execute("BEGIN")
+            for rel in stale:
+                self._delete_entries(rel)
+                self._conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+            self._conn.execute("COMMIT")
+
+    # -- Queries --------------------------------------------------------------
+
+    def _scope(self, search_path: str) -> str:
+        rel = self.relpath(os.path.abspath(search_path))
+        return "" if rel == "." else rel
+
+    @staticmethod
+    def _scope_clause(column: str, scope: str) -> tuple[str, list]:
+        if not scope:
+            return "1=1", []
+        return f"({column} = ? OR substr({column}, 1, ?) = ?)", [scope, len(scope) + 1, scope + "/"]
+
+    def definitions(
+        self,
+        search_path: str = "",
+        name: str = "",
+        kinds: tuple[str, ...] = (),
+        max_depth: int | None = None,
+        exact: bool = False,
+    ) -> list[Symbol]:
+        """Definitions in scope, optionally filtered by (substring) name and kind."""
+        where, args = self._scope_clause("file", self._scope(search_path or self._workspace))
+        clauses = [where]
+        if name:
+            if exact:
+                clauses.append("name = ?")
+                args.append(name)
+            else:
+                clauses.append("instr(name, ?) > 0")
+                args.append(name)
+        if kinds:
+            clauses.append(f"kind IN ({','.join('?' * len(kinds))})")
+            args.extend(kinds)
+        if max_depth is not None:
+            clauses.append("depth <= ?")
+            args.append(max_depth)
+        sql = (
+            "SELECT file, kind, name, parent, depth, line, end_line, is_async, params, signature "  # noqa: S608
+            f"FROM symbols WHERE {' AND '.join(clauses)} ORDER BY file, line"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            Symbol(
+                file=r[0],
+                kind=r[1],
+                name=r[2],
+                parent=r[3],
+                depth=r[4],
+                line=r[5],
+                end_line=r[6],
+                is_async=bool(r[7]),
+                params=r[8],
+                signature=r[9],
+            )
+            for r in rows
+        ]
+
+    def outline(self, rel_file: str) -> list[Symbol]:
+        """Module-level definitions plus direct class members, in file order."""
+        where = "file = ? AND (depth = 0 OR (depth = 1 AND kind = 'method'))"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file, kind, name, parent, depth, line, end_line, is_async, params, "  # noqa: S608
+                f"signature FROM symbols WHERE {where} AND kind != 'constant' ORDER BY line",
+                (rel_file,),
+            ).fetchall()
+        return [
+            Symbol(
+                file=r[0],
+                kind=r[1],
+                name=r[2],
+                parent=r[3],
+                depth=r[4],
+                line=r[5],
+                end_line=r[6],
+                is_async=bool(r[7]),
+                params=r[8],
+                signature=r[9],
+            )
+            for r in rows
+        ]
+
+    def imports(self, search_path: str = "", name: str = "") -> list[tuple[str, int, str]]:
+        """(file, line, statement) for imports whose name or module matches."""
+        where, args = self._scope_clause("file", self._scope(search_path or self._workspace))
+        sql = f"SELECT file, line, module, name, is_from FROM imports WHERE {where}"  # noqa: S608
+        if name:
+            sql += " AND (instr(name, ?) > 0 OR (is_from = 1 AND instr(module, ?) > 0))"
+            args.extend([name, name])
+        sql += " ORDER BY file, line"
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            (f, line, f"from {module} import {nm}" if is_from else f"import {nm}")
+            for f, line, module, nm, is_from in rows
+        ]
+
+    def references(self, name: str, search_path: str = "") -> list[tuple[str, int]]:
+        """(file, line) of every load of identifier ``name`` in scope."""
+        where, args = self._scope_clause("file", self._scope(search_path or self._workspace))
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT file, line FROM refs WHERE name = ? AND {where} ORDER BY file, line",  # noqa: S608
+                [name, *args],
+            ).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: dict[str, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_symbol_index(workspace_path: str) -> SymbolIndex:
+    """Shared SymbolIndex per workspace (one SQLite connection per process)."""
+    key = os.path.abspath(workspace_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = SymbolIndex(key)
+            _indexes[key] = index
+        return index
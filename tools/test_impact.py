@@ -0,0 +1,210 @@
+"""
+Test impact map — which tests exercise which files, and how long they take.
+
+Backs TestRunnerTool's change-aware modes. Per-test file coverage and
+durations reported by the frood_test_impact pytest plugin
+(tools/pytest_plugins/) are stored in SQLite under
+<workspace>/.frood/test_impact.db:
+
+- tests     — node id, test file, last outcome, last duration
+- coverage  — (node id, workspace-relative file) pairs
+- meta      — bookkeeping such as the time of the last full traced run
+
+Coverage rows are replaced whenever a test runs traced, so the map follows
+the code; a periodic full run catches tests whose dependencies changed
+without them being selected.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from core.sqlite_db import open_db, select_in
+
+logger = logging.getLogger("frood.tools.test_impact")
+
+# Assumed duration for tests that have never been timed.
+DEFAULT_TEST_SECONDS = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    nodeid TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tests_path ON tests(path);
+CREATE TABLE IF NOT EXISTS coverage (
+    nodeid TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (nodeid, file)
+);
+CREATE INDEX IF NOT EXISTS idx_coverage_file ON coverage(file);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ImpactMap:
+    """On-disk test → file coverage map for one workspace."""
+
+    def __init__(self, workspace_path: str, db_path: str | Path | None = None):
+        self._workspace = os.path.abspath(workspace_path)
+        self._db_path = Path(db_path or os.path.join(self._workspace, ".frood", "test_impact.db"))
+        self._lock = threading.Lock()
+        self._conn = open_db(self._db_path, _SCHEMA)
+
+    # -- Recording ------------------------------------------------------------
+
+    def record(self, tests: dict[str, dict], full: bool = False) -> None:
+        """Store results from the plugin's JSON report.
+
+        Tests that carry a "files" list replace their coverage rows. After a
+        full run, tests that no longer exist are dropped.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if full:
+                    self._conn.execute("DELETE FROM tests")
+                    self._conn.execute("DELETE FROM coverage")
+                for nodeid, result in tests.items():
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO tests VALUES (?, ?, ?, ?, ?)",
+                        (
+                            nodeid,
+                            result.get("path") or nodeid.split("::")[0],
+                            result.get("outcome", "passed"),
+                            float(result.get("duration", 0.0)),
+                            now,
+                        ),
+                    )
+                    if "files" in result:
+                        self._conn.execute("DELETE FROM coverage WHERE nodeid = ?", (nodeid,))
+                        self._conn.executemany(
+                            "INSERT OR IGNORE INTO coverage VALUES (?, ?)",
+                            [(nodeid, f) for f in result["files"]],
+                        )
+                if full:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('last_full_run', ?)", (str(now),)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def forget_files(self, paths: list[str]) -> None:
+        """Drop every test defined in the given (deleted) test files."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for path in paths:
+                    self._conn.execute(
+                        "DELETE FROM coverage WHERE nodeid IN "
+                        "(SELECT nodeid FROM tests WHERE path = ?)",
+                        (path,),
+                    )
+                    self._conn.execute("DELETE FROM tests WHERE path = ?", (path,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # -- Queries --------------------------------------------------------------
+
+    @property
+    def last_full_run(self) -> float:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_full_run'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return time.time() - self.last_full_run > max_age_seconds
+
+    def known_tests(self) -> list[str]:
+        return [r[0] for r in self._conn.execute("SELECT nodeid FROM tests ORDER BY nodeid")]
+
+    def failing_tests(self) -> list[str]:
+        return [
+            r[0]
+            for r in self._conn.execute(
+                "SELECT nodeid FROM tests WHERE outcome IN ('failed', 'error') ORDER BY nodeid"
+            )
+        ]
+
+    def durations(self, nodeids: list[str]) -> dict[str, float]:
+        return dict(
+            select_in(
+                self._conn, "SELECT nodeid, duration FROM tests WHERE nodeid IN ({marks})", nodeids
+            )
+        )
+
+    def affected(self, changed: list[str]) -> tuple[set[str], list[str]]:
+        """Tests impacted by changed workspace-relative paths.
+
+        Returns (node ids, test files to run whole). A changed file selects
+        every test that executed it, every test defined in it, and — for a
+        conftest.py — every known test below its directory. Changed test files
+        the map has never seen are returned as paths so new tests still run.
+        """
+        nodeids: set[str] = set()
+        new_files: list[str] = []
+        for rel in changed:
+            rel = rel.replace(os.sep, "/")
+            hits = {
+                r[0]
+                for r in self._conn.execute("SELECT nodeid FROM coverage WHERE file = ?", (rel,))
+            }
+            hits.update(
+                r[0] for r in self._conn.execute("SELECT nodeid FROM tests WHERE path = ?", (rel,))
+            )
+            if os.path.basename(rel) == "conftest.py":
+                prefix = os.path.dirname(rel)
+                pattern = f"{prefix}/%" if prefix else "%"
+                hits.update(
+                    r[0]
+                    for r in self._conn.execute(
+                        "SELECT nodeid FROM tests WHERE path LIKE ?", (pattern,)
+                    )
+                )
+            if (
+                not hits
+                and _looks_like_test_file(rel)
+                and os.path.exists(os.path.join(self._workspace, rel))
+            ):
+                new_files.append(rel)
+            nodeids.update(hits)
+        return nodeids, new_files
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _looks_like_test_file(rel: str) -> bool:
+    name = os.path.basename(rel)
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def plan_shards(nodeids: list[str], durations: dict[str, float], workers: int) -> list[list[str]]:
+    """Split tests into at most `workers` shards of roughly equal total duration.
+
+    Longest-processing-time-first: each test, slowest first, goes to the
+    currently lightest shard. Tests without history count as
+    DEFAULT_TEST_SECONDS.
+    """
+    workers = max(1, min(workers, len(nodeids)))
+    shards: list[list[str]] = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    ordered = sorted(nodeids, key=lambda n: (-durations.get(n, DEFAULT_TEST_SECONDS), n))
+    for nodeid in ordered:
+        lightest = loads.index(min(loads))
+        shards[lightest].append(nodeid)
+        loads[lightest] += durations.get(nodeid, DEFAULT_TEST_SECONDS)
+    return [s for s in shards if s]
@@ -3,23 +3,57 @@ Test runner tool — execute test suites and parse structured results.
 
 Supports pytest (Python), jest/vitest (JavaScript), and generic test commands.
 Returns structured pass/fail/error counts and failure details.
+
+For pytest there are change-aware modes. "impacted" runs only the tests that
+executed a file changed since a git ref (per the test impact map, see
+tools/test_impact.py). "impacted_first" runs those first, then the rest if
+they pass. Selected tests can be spread over several pytest processes,
+balanced by recorded durations. When the map is missing or older than
+FULL_RUN_INTERVAL the run is widened to the full suite to rebuild it.
 """
 
 import asyncio
 import json
 import logging
+import os
+import shutil
 import sys
+import tempfile
+import time
+from collections import Counter
 
 from tools.base import Tool, ToolResult
+from tools.test_impact import ImpactMap, plan_shards
 
 logger = logging.getLogger("frood.tools.test_runner")
 
+_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pytest_plugins")
+_MAX_WORKERS = 16
+
+# Rebuild the impact map with a full traced run at least this often.
+FULL_RUN_INTERVAL = 24 * 3600
+
+
+def _in_scope(target: str, path: str) -> bool:
+    """Whether a node id or test file lies under the user's path argument."""
+    if not path:
+        return True
+    scope = path.rstrip("/").replace(os.sep, "/")
+    return target == scope or target.startswith((scope + "/", scope + "::"))
+
 
 class TestRunnerTool(Tool):
     """Run tests and return structured results."""
 
     def __init__(self, workspace_path: str = "."):
         self._workspace = workspace_path
+        self._impact: ImpactMap | None = None
+
+    @property
+    def impact_map(self) -> ImpactMap:
+        if self._impact is None:
+            self._impact = ImpactMap(self._workspace)
+        return self._impact
 
     @property
     def name(self) -> str:
@@ -64,6 +98,25 @@ class TestRunnerTool(Tool):
                     "description": "Verbose output (default: true)",
                     "default": True,
                 },
+                "mode": {
+                    "type": "string",
+                    "enum": ["all", "impacted", "impacted_first"],
+                    "description": (
+                        "pytest only: run everything (default), only tests affected by files "
+                        "changed since 'base', or affected tests first and the rest if they pass"
+                    ),
+                    "default": "all",
+                },
+                "base": {
+                    "type": "string",
+                    "description": "Git ref that changes are measured against (default: HEAD)",
+                    "default": "HEAD",
+                },
+                "workers": {
+                    "type": "integer",
+                    "description": "pytest only: parallel pytest processes (default: 1)",
+                    "default": 1,
+                },
             },
             "required": [],
         }
@@ -75,13 +128,21 @@ class TestRunnerTool(Tool):
         filter: str = "",
         command: str = "",
         verbose: bool = True,
+        mode: str = "all",
+        base: str = "HEAD",
+        workers: int = 1,
         **kwargs,
     ) -> ToolResult:
         if framework == "auto":
             framework = await self._detect_framework()
 
         if framework == "pytest":
-            return await self._run_pytest(path, filter, verbose)
+            if mode not in ("all", "impacted", "impacted_first"):
+                return ToolResult(error=f"Unknown mode: {mode}", success=False)
+            workers = max(1, min(int(workers or 1), _MAX_WORKERS))
+            if mode == "all" and workers == 1:
+                return await self._run_pytest(path, filter, verbose)
+            return await self._run_pytest_impact(path, filter, verbose, mode, base, workers)
         elif framework in ("jest", "vitest"):
             return await self._run_js_tests(framework, path, filter, verbose)
         elif framework == "custom":
@@ -199,3 +260,262 @@ class TestRunnerTool(Tool):
             output=f"## {framework} Results: {status} (exit code: {proc.returncode})\n\n{combined}",
             success=passed,
         )
+
+    # -- Change-aware pytest runs ---------------------------------------------
+
+    async def _changed_files(self, base: str) -> list[str] | None:
+        """Workspace-relative files changed since base, or None outside git."""
+        changed: set[str] = set()
+        for args in (
+            ["diff", "--name-only", "--relative", base, "--"],
+            ["ls-files", "--others", "--exclude-standard"],
+        ):
+            proc = await asyncio.create_subprocess_exec(
+                "git",
+                *args,
+                cwd=self._workspace,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30.0)
+            except TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return None
+            if proc.returncode != 0:
+                return None
+            changed.update(line for line in stdout.decode().splitlines() if line)
+        return sorted(changed)
+
+    async def _run_pytest_impact(
+        self, path: str, filter_: str, verbose: bool, mode: str, base: str, workers: int
+    ) -> ToolResult:
+        impact = self.impact_map
+        full = mode == "all" or impact.is_stale(FULL_RUN_INTERVAL)
+        note = "full run"
+        if mode != "all" and full:
+            note = "full run (impact map missing or stale — rebuilding)"
+
+        if not full:
+            changed = await self._changed_files(base)
+            if changed is None:
+                full = True
+                note = f"full run (could not diff against '{base}')"
+            else:
+                nodeids, new_files = await asyncio.to_thread(impact.affected, changed)
+                # Tests that failed last time are what the agent is fixing — run them first.
+                failing = impact.failing_tests()
+                first = [n for n in failing + sorted(nodeids - set(failing)) if _in_scope(n, path)]
+                new_files = [f for f in new_files if _in_scope(f, path)]
+                if not first and not new_files:
+                    if mode == "impacted":
+                        return ToolResult(
+                            output=(
+                                f"## pytest Results: PASSED\n\nNo tests affected by "
+                                f"{len(changed)} changed file(s) since {base}."
+                            ),
+                            success=True,
+                        )
+                    full = True
+                    note = "full run (no impacted tests)"
+                else:
+                    retried = len([n for n in failing if n not in nodeids and _in_scope(n, path)])
+                    note = (
+                        f"{len(first) + len(new_files)} of {len(impact.known_tests())} known tests — "
+                        f"impacted by {len(changed)} changed file(s) since {base}"
+                        + (f", plus {retried} that failed last run" if retried else "")
+                    )
+                    selection = first + new_files
+                    result = await self._run_selection(
+                        selection, path, filter_, verbose, workers, note, record_full=False
+                    )
+                    if mode == "impacted" or not result.success:
+                        return result
+                    # Tests in new files were recorded by the first run; don't repeat them.
+                    done = set(first)
+                    ran_whole = set(new_files)
+                    rest = [
+                        n
+                        for n in impact.known_tests()
+                        if n not in done
+                        and n.split("::")[0] not in ran_whole
+                        and _in_scope(n, path)
+                    ]
+                    if not rest:
+                        return result
+                    remainder = await self._run_selection(
+                        rest,
+                        path,
+                        filter_,
+                        verbose,
+                        workers,
+                        f"remaining {len(rest)} tests",
+                        record_full=False,
+                    )
+                    return ToolResult(
+                        output=result.output + "\n\n" + remainder.output,
+                        success=remainder.success,
+                    )
+
+        if mode != "all" and (path or filter_):
+            # A scoped run can't tell which tests vanished, so rebuild from the whole suite.
+            path = filter_ = ""
+            note += "; path/filter ignored for this run"
+        return await self._run_selection(
+            None, path, filter_, verbose, workers, note, record_full=not path and not filter_
+        )
+
+    def _pytest_cmd(self, targets: list[str], filter_: str, verbose: bool) -> list[str]:
+        cmd = [sys.executable, "-m", "pytest", "-p", "frood_test_impact"]
+        if verbose:
+            cmd.append("-v")
+        cmd.extend(["--tb=short", "--no-header"])
+        if filter_:
+            cmd.extend(["-k", filter_])
+        cmd.extend(targets)
+        return cmd
+
+    def _plugin_env(self, out: str, select: str = "") -> dict[str, str]:
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PLUGIN_DIR, env.get("PYTHONPATH", "")]))
+        env["FROOD_TEST_IMPACT_OUT"] = out
+        env["FROOD_TEST_IMPACT_TRACE"] = "1"
+        if select:
+            env["FROOD_TEST_IMPACT_SELECT"] = select
+        else:
+            env.pop("FROOD_TEST_IMPACT_SELECT", None)
+        return env
+
+    async def _run_shard(
+        self, cmd: list[str], env: dict[str, str], timeout: float
+    ) -> tuple[int | None, str]:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=self._workspace,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=env,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None, "Tests timed out (>5min)"
+        return proc.returncode, stdout.decode("utf-8", errors="replace")
+
+    async def _collect(self, path: str, filter_: str, tmpdir: str) -> list[str]:
+        out = os.path.join(tmpdir, "collect.json")
+        cmd = self._pytest_cmd([path] if path else [], filter_, False)
+        cmd.extend(["--collect-only", "-q"])
+        env = self._plugin_env(out)
+        env.pop("FROOD_TEST_IMPACT_TRACE")
+        await self._run_shard(cmd, env, 300.0)
+        try:
+            with open(out) as f:
+                return json.load(f).get("collected", [])
+        except (OSError, ValueError):
+            return []
+
+    async def _run_selection(
+        self,
+        selection: list[str] | None,
+        path: str,
+        filter_: str,
+        verbose: bool,
+        workers: int,
+        note: str,
+        record_full: bool,
+    ) -> ToolResult:
+        """Run the selected node ids / test files (None = everything under path), sharded."""
+        impact = self.impact_map
+        tmpdir = tempfile.mkdtemp(prefix="frood-tests-")
+        started = time.monotonic()
+        try:
+            if selection is None and workers > 1:
+                # Collection failures surface better from a plain unsharded run.
+                selection = await self._collect(path, filter_, tmpdir) or None
+            if selection is None:
+                shards: list[list[str] | None] = [None]
+            else:
+                selection = await asyncio.to_thread(self._drop_deleted, selection)
+                durations = await asyncio.to_thread(impact.durations, selection)
+                shards = plan_shards(selection, durations, workers)
+
+            jobs = []
+            for i, shard in enumerate(shards):
+                out = os.path.join(tmpdir, f"shard{i}.json")
+                if shard is None:
+                    targets, select = ([path] if path else []), ""
+                else:
+                    select = os.path.join(tmpdir, f"shard{i}.txt")
+                    with open(select, "w") as f:
+                        f.write("\n".join(shard))
+                    targets = sorted({n.split("::")[0] for n in shard})
+                cmd = self._pytest_cmd(targets, filter_, verbose)
+                jobs.append(self._run_shard(cmd, self._plugin_env(out, select), 300.0))
+            runs = await asyncio.gather(*jobs)
+
+            tests: dict[str, dict] = {}
+            for i in range(len(shards)):
+                try:
+                    with open(os.path.join(tmpdir, f"shard{i}.json")) as f:
+                        tests.update(json.load(f).get("tests", {}))
+                except (OSError, ValueError):
+                    pass
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+        if tests:
+            await asyncio.to_thread(impact.record, tests, record_full)
+        return self._format_merged(runs, tests, note, time.monotonic() - started)
+
+    def _drop_deleted(self, selection: list[str]) -> list[str]:
+        """Filter out node ids whose test file is gone and forget them in the map.
+
+        pytest exits with code 4 on a missing path argument and runs nothing.
+        """
+        gone = {
+            f
+            for f in {n.split("::")[0] for n in selection}
+            if not os.path.exists(os.path.join(self._workspace, f))
+        }
+        if not gone:
+            return selection
+        self.impact_map.forget_files(sorted(gone))
+        return [n for n in selection if n.split("::")[0] not in gone]
+
+    @staticmethod
+    def _format_merged(
+        runs: list[tuple[int | None, str]], tests: dict[str, dict], note: str, elapsed: float
+    ) -> ToolResult:
+        counts = Counter(r.get("outcome", "passed") for r in tests.values())
+        failures = sorted(n for n, r in tests.items() if r.get("outcome") in ("failed", "error"))
+        # Exit code 5 means the shard collected nothing (e.g. a test was removed).
+        exit_codes = [rc for rc, _ in runs]
+        passed = not failures and all(rc in (0, 5) for rc in exit_codes)
+        status = "PASSED" if passed else "FAILED"
+        exit_code = 0 if passed else max((rc for rc in exit_codes if rc), default=1)
+
+        lines = [f"## pytest Results: {status} (exit code: {exit_code})\n"]
+        lines.append(f"**Selection:** {note}")
+        if len(runs) > 1:
+            lines.append(f"**Workers:** {len(runs)}")
+        summary = ", ".join(
+            f"{counts[k]} {k}" for k in ("passed", "failed", "error", "skipped") if counts[k]
+        )
+        lines.append(f"**Summary:** {summary or 'no tests ran'} in {elapsed:.1f}s")
+        if failures:
+            lines.append(f"\n### Failures ({len(failures)})")
+            lines.extend(f"- {n}" for n in failures[:50])
+
+        budget = 50000 // max(1, len(runs))
+        for i, (rc, output) in enumerate(runs, 1):
+            if len(runs) > 1 and rc in (0, 5):
+                continue  # only failing shards' output is interesting
+            if len(output) > budget:
+                output = output[:budget] + "\n... (output truncated)"
+            header = f"\n### Shard {i} (exit code: {rc})\n" if len(runs) > 1 else "\n"
+            lines.append(header + output)
+        return ToolResult(output="\n".join(lines), success=passed)
@@ -29,7 +29,7 @@ from tools.context_assembler import (
     _extract_keywords,
     _truncate_to_budget,
 )
-from tools.mcp_client import MCPConnection
+from tools.mcp_client import MCPConnection, MCPManager, get_mcp_manager
 
 logger = logging.getLogger("frood.tools.unified_context")
 
@@ -192,6 +192,8 @@ _WORK_TYPE_KEYWORDS = {
     ],
 }
 
+_JCODEMUNCH_CONFIG = {"command": "uvx", "args": ["jcodemunch-mcp"]}
+
 # Task types that warrant fetching code symbols from jcodemunch
 _CODE_TASK_TYPES = {
     "coding",
@@ -235,7 +237,7 @@ class UnifiedContextTool(Tool):
 
     Sources:
     1. Semantic memory + project docs + git + skills  (via ContextAssemblerTool)
-    2. jcodemunch code symbols (MCP-to-MCP, per-call connect/disconnect, 3s timeout)
+    2. jcodemunch code symbols (MCP-to-MCP over the shared connection pool, 3s timeout)
     3. GSD workstream state   (active phases/plans from .planning/workstreams/)
     4. Effectiveness ranking  (top tools by task_type from EffectivenessStore)
 
@@ -251,12 +253,14 @@ class UnifiedContextTool(Tool):
         skill_loader=None,
         workspace="",
         effectiveness_store=None,
+        mcp_manager: MCPManager | None = None,
         **kwargs,
     ):
         self._memory_store = memory_store
         self._skill_loader = skill_loader
         self._workspace = workspace
         self._effectiveness_store = effectiveness_store
+        self._mcp_manager = mcp_manager
         self._assembler = ContextAssemblerTool(
             memory_store=memory_store,
             skill_loader=skill_loader,
@@ -420,19 +424,23 @@ class UnifiedContextTool(Tool):
     # ------------------------------------------------------------------
 
     async def _fetch_code_symbols(self, query: str, max_tokens: int) -> str | None:
-        """Fetch code symbols from jcodemunch via per-call MCPConnection.
+        """Fetch code symbols from jcodemunch over the pooled MCP connection.
 
-        Uses 3-second connect timeout and 5-second per-call timeout.
+        The server is started on first use and kept warm between requests.
+        Waiting for it is capped at 3 seconds (a slower cold start finishes
+        in the background) and each search at 5 seconds.
         Returns formatted section string or None on any failure.
         """
-        config = {"command": "uvx", "args": ["jcodemunch-mcp"]}
-        conn = MCPConnection("jcodemunch", config)
+        manager = self._mcp_manager or get_mcp_manager()
+        manager.register_server("jcodemunch", _JCODEMUNCH_CONFIG, connection_factory=MCPConnection)
         try:
-            await asyncio.wait_for(conn.connect(), timeout=3.0)
+            await manager.start("jcodemunch", timeout=3.0)
 
             # Search symbols
-            symbols_result = await asyncio.wait_for(
-                conn.call_tool("search_symbols", {"query": query, "repo": "local/frood-663daaca"}),
+            symbols_result = await manager.call_tool(
+                "jcodemunch",
+                "search_symbols",
+                {"query": query, "repo": "local/frood-663daaca"},
                 timeout=5.0,
             )
 
@@ -446,8 +454,10 @@ class UnifiedContextTool(Tool):
 
             # Also try text search for broader coverage
             try:
-                text_result = await asyncio.wait_for(
-                    conn.call_tool("search_text", {"query": query, "repo": "local/frood-663daaca"}),
+                text_result = await manager.call_tool(
+                    "jcodemunch",
+                    "search_text",
+                    {"query": query, "repo": "local/frood-663daaca"},
                     timeout=5.0,
                 )
                 if text_result:
@@ -466,11 +476,6 @@ class UnifiedContextTool(Tool):
         except Exception as e:
             logger.debug("jcodemunch fetch failed (non-critical): %s", e)
             return None
-        finally:
-            try:
-                await conn.disconnect()
-            except Exception:
-                pass
 
     # ------------------------------------------------------------------
     # Source: GSD workstream state
@@ -0,0 +1,437 @@
+"""
+On-disk HTTP cache for WebFetchTool.
+
+Agents fetch the same documentation pages again and again, within a run and
+across runs. Successful fetches are stored — as the extracted text the tool
+returns — together with the response's validators, following the private
+cache rules of RFC 9111:
+
+- fresh        Cache-Control max-age, else Expires, else 10% of the time
+               since Last-Modified (capped at a day); served without a request
+- stale        revalidated with If-None-Match / If-Modified-Since; a 304
+               refreshes the entry and its body is never downloaded again
+- not stored   no-store, Vary: *, or neither a freshness lifetime nor a
+               validator to revalidate with
+
+no-cache entries are stored but always revalidated. When revalidation fails
+on the network, a stale entry is served unless it was must-revalidate.
+Concurrent fetches of one URL share a single request. Entries live in a
+WAL-mode SQLite file capped by total size, least-recently-used first.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+from urllib.parse import urldefrag
+
+from core.sqlite_db import open_db
+
+logger = logging.getLogger("frood.tools.web_cache")
+
+# Heuristic freshness for responses with only Last-Modified.
+_HEURISTIC_SHARE = 0.1
+_HEURISTIC_MAX = 86400.0
+
+
+@dataclass
+class CachedPage:
+    """A fetched page as WebFetchTool returns it, plus what revalidation needs."""
+
+    url: str  # final URL after redirects; revalidation goes here
+    text: str
+    content_type: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    fresh_until: float = 0.0
+    must_revalidate: bool = False
+    body_bytes: int = 0  # bytes downloaded to produce text
+    storable: bool = True  # False for no-store and unvalidatable responses
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return self.fresh_until > (time.time() if now is None else now)
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_key(url: str) -> str:
+    """Pages differ by URL only; the fragment never reaches the server."""
+    return urldefrag(url)[0]
+
+
+def _directives(cache_control: str) -> dict[str, str]:
+    directives = {}
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip().strip('"')
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def freshness(headers, now: float | None = None) -> tuple[float, bool] | None:
+    """Freshness lifetime and must-revalidate flag of a 200 response.
+
+    headers is any case-insensitive mapping (httpx.Headers). Returns None
+    when the response must not be stored.
+    """
+    now = time.time() if now is None else now
+    cc = _directives(headers.get("cache-control", ""))
+    if "no-store" in cc or headers.get("vary", "").strip() == "*":
+        return None
+    date = _http_date(headers.get("date")) or now
+    last_modified = _http_date(headers.get("last-modified"))
+    if "no-cache" in cc:
+        lifetime = 0.0
+    elif "max-age" in cc:
+        try:
+            lifetime = max(0.0, float(cc["max-age"]))
+        except ValueError:
+            lifetime = 0.0
+    elif "expires" in headers:
+        expires = _http_date(headers.get("expires"))
+        lifetime = max(0.0, expires - date) if expires is not None else 0.0
+    elif last_modified is not None:
+        lifetime = min(_HEURISTIC_MAX, max(0.0, date - last_modified) * _HEURISTIC_SHARE)
+    else:
+        lifetime = 0.0
+    if lifetime <= 0 and not (headers.get("etag") or last_modified is not None):
+        return None
+    # Time the response already spent in upstream caches counts against it.
+    try:
+        age = max(0.0, float(headers.get("age", 0)))
+    except ValueError:
+        age = 0.0
+    return max(0.0, lifetime - age), "must-revalidate" in cc or "no-cache" in cc
+
+
+def page_from_response(url: str, text: str, headers, body_bytes: int) -> CachedPage:
+    """A CachedPage for a 200 response, marked unstorable when the headers say so."""
+    policy = freshness(headers)
+    page = CachedPage(
+        url=url,
+        text=text,
+        content_type=headers.get("content-type", ""),
+        etag=headers.get("etag", ""),
+        last_modified=headers.get("last-modified", ""),
+        body_bytes=body_bytes,
+    )
+    if policy is None:
+        page.storable = False
+    else:
+        lifetime, page.must_revalidate = policy
+        page.fresh_until = time.time() + lifetime
+    return page
+
+
+def refreshed(page: CachedPage, headers) -> CachedPage:
+    """Apply a 304's headers to the stored page."""
+    merged = {
+        "etag": headers.get("etag") or page.etag,
+        "last-modified": headers.get("last-modified") or page.last_modified,
+    }
+    for name in ("cache-control", "expires", "date", "age", "vary"):
+        if name in headers:
+            merged[name] = headers[name]
+    policy = freshness(merged)
+    if policy is None:
+        return replace(page, fresh_until=0.0, storable=False)
+    lifetime, must_revalidate = policy
+    return replace(
+        page,
+        etag=merged["etag"],
+        last_modified=merged["last-modified"],
+        fresh_until=time.time() + lifetime,
+        must_revalidate=must_revalidate,
+    )
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS web_cache (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    text TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    last_modified TEXT NOT NULL,
+    fresh_until REAL NOT NULL,
+    must_revalidate INTEGER NOT NULL,
+    body_bytes INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    last_hit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_web_cache_last_hit ON web_cache(last_hit);
+-- Lifetime counters, so any process (the dashboard) can report them.
+CREATE TABLE IF NOT EXISTS web_cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# fetch(stale_page_or_None) -> (page, not_modified)
+FetchFn = Callable[[CachedPage | None], Awaitable[tuple[CachedPage, bool]]]
+
+
+class WebCache:
+    """SQLite-backed page cache with revalidation and request coalescing."""
+
+    def __init__(self, db_path: str | Path, max_bytes: int = 128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = open_db(self._db_path, _SCHEMA, timeout=5.0)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "stale_served": 0,
+            "coalesced": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+        }
+
+    # -- Storage (sync, run in a worker thread) -------------------------------
+
+    def _get_sync(self, key: str) -> CachedPage | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, text, content_type, etag, last_modified, fresh_until, "
+                "must_revalidate, body_bytes FROM web_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE web_cache SET last_hit = ? WHERE key = ?", (time.time(), key)
+            )
+        url, text, content_type, etag, last_modified, fresh_until, must_revalidate, body_bytes = row
+        return CachedPage(
+            url=url,
+            text=text,
+            content_type=content_type,
+            etag=etag,
+            last_modified=last_modified,
+            fresh_until=fresh_until,
+            must_revalidate=bool(must_revalidate),
+            body_bytes=body_bytes,
+        )
+
+    def _put_sync(self, key: str, page: CachedPage) -> None:
+        size = len(page.text.encode("utf-8")) + len(page.url) + 256
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO web_cache (key, url, text, content_type, etag, "
+                "last_modified, fresh_until, must_revalidate, body_bytes, size, last_hit) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    page.url,
+                    page.text,
+                    page.content_type,
+                    page.etag,
+                    page.last_modified,
+                    page.fresh_until,
+                    int(page.must_revalidate),
+                    page.body_bytes,
+                    size,
+                    time.time(),
+                ),
+            )
+            self._evict_locked()
+
+    def _delete_sync(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM web_cache WHERE key = ?", (key,))
+
+    def _evict_locked(self) -> None:
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM web_cache").fetchone()
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM web_cache ORDER BY last_hit ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM web_cache WHERE key = ?", doomed)
+        self._stats["evictions"] += len(doomed)
+
+    # -- Async API ------------------------------------------------------------
+
+    async def _read(self, key: str) -> CachedPage | None:
+        try:
+            return await asyncio.to_thread(self._get_sync, key)
+        except Exception as e:
+            logger.warning("Web cache read failed (non-critical): %s", e)
+            return None
+
+    async def _store(self, key: str, page: CachedPage) -> None:
+        try:
+            if page.storable:
+                await asyncio.to_thread(self._put_sync, key, page)
+                self._stats["stores"] += 1
+            else:
+                await asyncio.to_thread(self._delete_sync, key)
+        except Exception as e:
+            logger.warning("Web cache write failed (non-critical): %s", e)
+
+    async def fetch(self, url: str, fetch: FetchFn) -> tuple[CachedPage, str]:
+        """Serve url from cache, revalidate it, or download it once.
+
+        fetch(stale_page_or_None) performs the request — conditional when
+        given a page — and returns (page, not_modified). Returns (page, source) with source one of "hit",
+        "revalidated", "stale", "coalesced" or "miss". Errors from fetch
+        propagate unless a stale page may be served instead.
+        """
+        key = cache_key(url)
+        cached = await self._read(key)
+        if cached is not None and cached.is_fresh():
+            await self._count("hits", cached.body_bytes)
+            return cached, "hit"
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            shared = await asyncio.shield(fut)
+            if shared is not None:
+                await self._count("coalesced", shared.body_bytes)
+                return shared, "coalesced"
+            return await self._fetch_and_store(key, cached, fetch)
+
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        page = None
+        try:
+            page, source = await self._fetch_and_store(key, cached, fetch)
+            return page, source
+        finally:
+            fut = self._inflight.pop(key, None)
+            if fut is not None and not fut.done():
+                fut.set_result(page)
+
+    async def _fetch_and_store(
+        self, key: str, cached: CachedPage | None, fetch: FetchFn
+    ) -> tuple[CachedPage, str]:
+        try:
+            page, not_modified = await fetch(cached)
+        except Exception as e:
+            if cached is None or cached.must_revalidate:
+                await self._count("misses")
+                raise
+            logger.info("Revalidation of %s failed, serving stale copy: %s", key, e)
+            await self._count("stale_served", cached.body_bytes)
+            return cached, "stale"
+        await self._store(key, page)
+        if not_modified:
+            await self._count("revalidated", page.body_bytes)
+            return page, "revalidated"
+        await self._count("misses")
+        return page, "miss"
+
+    async def _count(self, counter: str, body_bytes: int = 0) -> None:
+        self._stats[counter] += 1
+        self._stats["bytes_saved"] += body_bytes
+        try:
+            await asyncio.to_thread(self._bump_sync, counter, body_bytes)
+        except Exception as e:
+            logger.debug("Web cache stats write failed: %s", e)
+
+    def _bump_sync(self, counter: str, body_bytes: int) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO web_cache_stats (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [(counter, 1), ("bytes_saved", body_bytes)],
+            )
+
+    # -- Observability --------------------------------------------------------
+
+    @staticmethod
+    def _hit_rate(counters: dict[str, int]) -> float:
+        served = sum(
+            counters.get(k, 0) for k in ("hits", "revalidated", "stale_served", "coalesced")
+        )
+        lookups = served + counters.get("misses", 0)
+        return round(served / lookups, 3) if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for /api/stats/tokens.
+
+        Top-level counters cover this process; "lifetime" covers every
+        process sharing the cache file. hit_rate counts each fetch that
+        was served, or revalidated, without downloading the page.
+        """
+        with self._lock:
+            lifetime = dict(self._conn.execute("SELECT name, value FROM web_cache_stats"))
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM web_cache"
+            ).fetchone()
+        return {
+            **self._stats,
+            "hit_rate": self._hit_rate(self._stats),
+            "inflight": len(self._inflight),
+            "entries": entries,
+            "size_bytes": size,
+            "lifetime": {**lifetime, "hit_rate": self._hit_rate(lifetime)},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_web_cache: WebCache | None = None
+_web_cache_lock = threading.Lock()
+
+
+def get_web_cache() -> WebCache | None:
+    """The process-wide cache configured by WEB_CACHE_*, or None when disabled."""
+    global _web_cache
+    from core.config import settings
+
+    if not settings.web_cache_enabled:
+        return None
+    with _web_cache_lock:
+        if _web_cache is None:
+            try:
+                _web_cache = WebCache(
+                    settings.web_cache_db, max_bytes=settings.web_cache_max_mb * 1024 * 1024
+                )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Web cache unavailable: %s", e)
+                return None
+        return _web_cache
+
+
+def web_cache_stats() -> dict[str, Any] | None:
+    """Stats of the process-wide cache, or None when it is disabled or unreadable."""
+    cache = get_web_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.stats()
+    except sqlite3.Error as e:
+        logger.warning("Web cache stats unavailable: %s", e)
+        return None
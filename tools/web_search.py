@@ -9,7 +9,9 @@ fallback to DuckDuckGo HTML search when Brave is unavailable.
 import logging
 import os
 import re
+from urllib.parse import urljoin
 
+import httpcore
 import httpx
 
 from tools.base import Tool, ToolResult
@@ -160,7 +162,15 @@ class WebSearchTool(Tool):
 
 # URL policy: consolidated SSRF + allowlist/denylist from core module
 from core.config import settings
-from core.url_policy import _BLOCKED_IP_RANGES, UrlPolicy, _is_ssrf_target  # noqa: F401
+from core.url_policy import (  # noqa: F401
+    _BLOCKED_IP_RANGES,
+    UrlPolicy,
+    _is_ssrf_target,
+    resolve_host,
+    resolve_url,
+)
+from tools.html_text import HTMLTextExtractor, is_html
+from tools.web_cache import CachedPage, WebCache, get_web_cache, page_from_response, refreshed
 
 # Shared URL policy instance for web tools
 _url_policy = UrlPolicy(
@@ -170,8 +180,81 @@ _url_policy = UrlPolicy(
 )
 
 
+class _FetchError(Exception):
+    """A fetch failure whose message is the tool error, verbatim."""
+
+
+class _SsrfBlocked(_FetchError):
+    """The target resolved to a blocked address."""
+
+
+class _PinnedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Dials only the addresses url_policy approved for a host.
+
+    Request URLs keep their hostname, so the pool keys connections by host
+    and TLS checks the certificate (and sends SNI) for that host, while the
+    socket goes to the checked IP — a DNS answer that changes after the check
+    (rebinding) cannot redirect the connection to an internal address.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend | None = None):
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        resolution = await resolve_host(host, port)
+        if resolution.reason:
+            raise httpcore.ConnectError(resolution.reason)
+        if not resolution.addresses:
+            raise httpcore.ConnectError(f"Cannot resolve {host}")
+        error: Exception | None = None
+        for ip in resolution.addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    ip, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise httpcore.ConnectError("Unix sockets are not fetchable")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def _pinned_transport() -> httpx.AsyncHTTPTransport:
+    """An httpx transport whose connection pool dials through _PinnedNetworkBackend.
+
+    httpx exposes no network_backend option, so the default pool is swapped
+    for an equivalent one that uses the pinned backend.
+    """
+    transport = httpx.AsyncHTTPTransport()
+    transport._pool = httpcore.AsyncConnectionPool(
+        ssl_context=httpx.create_ssl_context(),
+        max_connections=100,  # httpx's default limits
+        max_keepalive_connections=20,
+        keepalive_expiry=5.0,
+        network_backend=_PinnedNetworkBackend(),
+    )
+    return transport
+
+
 class WebFetchTool(Tool):
-    """Fetch and extract content from a URL with SSRF protection."""
+    """Fetch and extract content from a URL with SSRF protection.
+
+    Responses go through the shared HTTP cache (tools.web_cache) and HTML is
+    reduced to readable text while it streams in, so the output budget holds
+    page content rather than markup.
+    """
+
+    MAX_TEXT = 50000
+    MAX_BODY_BYTES = 10 * 1024 * 1024
+    MAX_REDIRECTS = 5
+
+    def __init__(self, cache: WebCache | None = None):
+        self._cache = cache
+        self._http: httpx.AsyncClient | None = None
 
     @property
     def name(self) -> str:
@@ -191,6 +274,14 @@ class WebFetchTool(Tool):
             "required": ["url"],
         }
 
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """One pooled client per tool; redirects are followed by hand for SSRF checks."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                follow_redirects=False, timeout=15.0, transport=_pinned_transport()
+            )
+        return self._http
+
     async def execute(self, url: str = "", **kwargs) -> ToolResult:
         if not url:
             return ToolResult(error="No URL provided", success=False)
@@ -199,49 +290,127 @@ class WebFetchTool(Tool):
             return ToolResult(error="Only http/https URLs are supported", success=False)
 
         # URL policy check: SSRF + allowlist/denylist + per-agent limits
-        allowed, reason = _url_policy.check(url, agent_id=kwargs.get("agent_id", "default"))
+        allowed, reason = await _url_policy.check_async(
+            url, agent_id=kwargs.get("agent_id", "default")
+        )
         if not allowed:
             logger.warning(f"URL blocked: {url} — {reason}")
             return ToolResult(error=reason, success=False)
 
-        cooling, remaining = is_cooling(url)
-        if cooling:
-            return ToolResult(error=cooldown_error(url, remaining), success=False)
-
+        cache = self._cache or get_web_cache()
         try:
-            # Disable auto-redirects to validate each redirect destination for SSRF
-            async with httpx.AsyncClient(follow_redirects=False) as client:
-                response = await client.get(url, timeout=15.0)
-
-                # Follow redirects manually with SSRF checks (max 5 hops)
-                redirect_count = 0
-                while response.is_redirect and redirect_count < 5:
-                    redirect_count += 1
-                    next_url = str(response.next_request.url) if response.next_request else None
-                    if not next_url:
-                        break
-                    redirect_ssrf = _is_ssrf_target(next_url)
-                    if redirect_ssrf:
-                        logger.warning(f"SSRF blocked on redirect: {next_url} — {redirect_ssrf}")
-                        return ToolResult(error=f"Redirect blocked: {redirect_ssrf}", success=False)
-                    response = await client.get(next_url, timeout=15.0)
-
-                if response.status_code == 429:
-                    record_429(url)
-                    return ToolResult(
-                        error=cooldown_error(url, 600.0),
-                        success=False,
-                    )
-                response.raise_for_status()
+            if cache is None:
+                page, _ = await self._fetch(url, None)
+            else:
+                page, source = await cache.fetch(url, lambda stale: self._fetch(url, stale))
+                logger.debug(f"web_fetch {url}: {source}")
+        except _FetchError as e:
+            return ToolResult(error=str(e), success=False)
+        except Exception as e:
+            return ToolResult(error=f"Fetch failed: {e}", success=False)
+        return ToolResult(output=page.text)
 
-            text = response.text
+    async def _fetch(self, url: str, stale: CachedPage | None) -> tuple[CachedPage, bool]:
+        """GET url — conditionally, from where it last redirected to, when stale is given.
 
-            # Truncate very large responses
-            max_len = 50000
-            if len(text) > max_len:
-                text = text[:max_len] + "\n... (content truncated)"
+        Returns (page, not_modified).
+        """
+        cooling, remaining = is_cooling(url)
+        if cooling:
+            raise _FetchError(cooldown_error(url, remaining))
 
-            return ToolResult(output=text)
+        headers = stale.validators() if stale is not None else {}
+        target = url
+        if stale is not None and stale.url != url:
+            if (await resolve_url(stale.url)).reason is None:
+                target = stale.url
+            else:
+                headers = {}
 
-        except Exception as e:
-            return ToolResult(error=f"Fetch failed: {e}", success=False)
+        response = await self._send(target, headers)
+        try:
+            # Follow redirects manually with SSRF checks
+            redirect_count = 0
+            while response.is_redirect and redirect_count < self.MAX_REDIRECTS:
+                redirect_count += 1
+                location = response.headers.get("location")
+                if not location:
+                    break
+                next_url = urljoin(target, location)
+                if not next_url.startswith(("http://", "https://")):
+                    break
+                await response.aclose()
+                target = next_url
+                try:
+                    response = await self._send(target, headers)
+                except _SsrfBlocked as e:
+                    logger.warning(f"SSRF blocked on redirect: {next_url} — {e}")
+                    raise _FetchError(f"Redirect blocked: {e}") from None
+
+            if response.status_code == 304 and stale is not None:
+                return refreshed(stale, response.headers), True
+            if response.status_code == 429:
+                record_429(url)
+                raise _FetchError(cooldown_error(url, 600.0))
+            response.raise_for_status()
+
+            text = await self._read_text(response)
+            return page_from_response(
+                target, text, response.headers, response.num_bytes_downloaded
+            ), False
+        finally:
+            await response.aclose()
+
+    async def _send(self, url: str, headers: dict[str, str]) -> httpx.Response:
+        """Stream a GET of url, refusing hosts the SSRF check blocks.
+
+        The connection itself is made by _PinnedNetworkBackend, which dials
+        the same checked addresses.
+        """
+        resolution = await resolve_url(url)
+        if resolution.reason:
+            raise _SsrfBlocked(resolution.reason)
+        client = await self._get_http_client()
+        request = client.build_request("GET", url, headers=headers)
+        return await client.send(request, stream=True)
+
+    async def _read_text(self, response: httpx.Response) -> str:
+        """Stream the body, extracting text from HTML, until the text budget is full."""
+        content_type = response.headers.get("content-type", "")
+        extractor: HTMLTextExtractor | None = None
+        raw: list[str] = []
+        raw_len = 0
+        decided = False
+        cut = False
+        async for chunk in response.aiter_text():
+            if not decided:
+                decided = True
+                if is_html(content_type, chunk):
+                    extractor = HTMLTextExtractor(self.MAX_TEXT)
+            # Raw text is kept up to the budget: it is the output for non-HTML
+            # bodies and the fallback for HTML with no readable text.
+            if raw_len <= self.MAX_TEXT:
+                raw.append(chunk)
+                raw_len += len(chunk)
+            if extractor is not None:
+                extractor.feed(chunk)
+                if extractor.full:
+                    break
+            elif raw_len > self.MAX_TEXT:
+                break
+            if response.num_bytes_downloaded > self.MAX_BODY_BYTES:
+                cut = True
+                break
+
+        if extractor is not None:
+            extractor.close()
+            text = extractor.text()
+            if text:
+                if extractor.truncated or cut:
+                    text += "\n... (content truncated)"
+                return text
+
+        text = "".join(raw)
+        if len(text) > self.MAX_TEXT or cut:
+            text = text[: self.MAX_TEXT] + "\n... (content truncated)"
+        return text